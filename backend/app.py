@@ -2,6 +2,9 @@
 AshaAssist Backend Application
 Main application entry point with modular structure
 """
+import time
+_IMPORTS_STARTED = time.perf_counter()
+
 from flask import Flask, send_from_directory, request, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required
@@ -11,16 +14,22 @@ from datetime import datetime
 
 # Import configuration
 from config.settings import config
-from config.database import get_database, get_collections, ensure_indexes
+from config.database import get_database, get_collections
 from config.firebase import initialize_firebase
 
 # Import middleware
 from middleware.auth import init_jwt_middleware
+from middleware.metrics import init_metrics
+from middleware.query_inspector import init_query_inspector
+from middleware.conditional import init_conditional
 
 # Import services
-from services.auth_service import AuthService
-from services.seed_service import SeedService
+from services.bootstrap_service import BootstrapService
 from services.email_service import init_mail
+from services.email_outbox import init_email_outbox
+from services.scheduled_jobs import init_jobs
+from services.certificate_service import start_render_pool
+from utils.lazy import warm_up
 
 # Import routes
 from routes.auth import init_auth_routes
@@ -43,15 +52,28 @@ from routes.government_benefits import init_government_benefits_routes
 from routes.maternal_report import init_maternal_report_routes
 
 # Import utilities
-from utils.helpers import JSONEncoder
+from utils.json_provider import init_json_provider
+from utils.pagination import InvalidCursor
+from utils.cache import init_cache
+from utils.shared_cache import init_shared_cache
+from utils.jobs import job_runner
+from utils.startup_timer import StartupTimer
+
+_IMPORTS_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 
 def create_app(config_name='default'):
     """Application factory pattern"""
+    timer = StartupTimer()
+    timer.record('module imports', _IMPORTS_SECONDS)
     app = Flask(__name__)
     
     # Load configuration
     app.config.from_object(config[config_name])
     
+    # Fork the certificate render workers, if configured, before the Mongo client and the
+    # background services start their threads (skipped if another thread is already running)
+    start_render_pool(app)
+    
     # Create upload folder if it doesn't exist
     # Use /tmp for serverless environments like Vercel
     upload_folder = app.config['UPLOAD_FOLDER']
@@ -62,47 +84,59 @@ def create_app(config_name='default'):
     if not os.path.exists(upload_folder):
         os.makedirs(upload_folder)
     
-    # Set custom JSON encoder
-    app.json_encoder = JSONEncoder
+    # JSON provider that serializes ObjectId/datetime natively (orjson when installed)
+    json_backend = init_json_provider(app)
+    print(f"[JSON] Using {json_backend} response provider")
     
     # Configure CORS - Allow all origins for now to test
     # Once working, restrict to specific origins via CORS_ALLOWED_ORIGINS env var
     CORS(app, 
          supports_credentials=True,
-         allow_headers=['Content-Type', 'Authorization', 'Access-Control-Allow-Credentials'],
+         allow_headers=['Content-Type', 'Authorization', 'Access-Control-Allow-Credentials',
+                        'If-None-Match', 'If-Modified-Since'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-         expose_headers=['Content-Type', 'Authorization'])
+         expose_headers=['Content-Type', 'Authorization', 'ETag', 'Last-Modified'])
     
     print(f"[CORS DEBUG] CORS enabled for all origins (testing mode)")  # Debug logging
     
     jwt = init_jwt_middleware(app)
     
+    # Request/Mongo metrics (the command listener must be registered before the client is created)
+    if app.config.get('METRICS_ENABLED'):
+        init_metrics(app)
+    init_query_inspector(app)
+    fast_boot = app.config.get('FAST_BOOT')
+    timer.lap('app setup')
+    
     # Initialize database
     db = get_database()
     collections = get_collections(db)
-    ensure_indexes(collections)
+    init_conditional(app, collections)
+    init_cache(app)
+    init_shared_cache(app, collections)
+    init_jobs(app, collections)
+    timer.lap('database connection')
     
-    # Initialize Firebase
-    initialize_firebase()
+    # Indexes, default accounts and seed data. In fast-boot mode these are applied
+    # out of band by `python -m scripts.bootstrap` and only the marker is checked.
+    bootstrap_service = BootstrapService(collections)
+    if fast_boot:
+        if not bootstrap_service.is_current():
+            print("[STARTUP] WARNING: FAST_BOOT is enabled but bootstrap has not been applied; "
+                  "run `python -m scripts.bootstrap`")
+        timer.lap('bootstrap check')
+    else:
+        bootstrap_service.run(force=True, timer=timer)
+    
+    # Initialize Firebase (deferred to first use in fast-boot mode)
+    if not fast_boot:
+        initialize_firebase()
+        timer.lap('firebase')
     
     # Initialize email (Flask-Mail)
     init_mail(app)
-    
-    # Initialize services
-    auth_service = AuthService(collections['users'])
-    seed_service = SeedService(collections)
-    
-    # Create default accounts
-    auth_service.create_default_accounts()
-    
-    # Seed default health blogs
-    seed_service.create_default_health_blogs()
-
-    # Seed sample supply requests
-    seed_service.create_sample_supply_requests()
-
-    # Seed default locations
-    seed_service.create_default_locations()
+    init_email_outbox(app, collections)
+    timer.lap('mail')
 
     # Initialize routes
     init_auth_routes(app, collections)
@@ -143,18 +177,26 @@ def create_app(config_name='default'):
     from routes.notifications import init_notification_routes
     init_notification_routes(app, collections)
     
-    # Initialize jaundice detection routes (AI model)
+    timer.lap('routes')
+    
+    # Initialize jaundice detection routes (AI model, loaded on first use in fast-boot mode)
     from routes.jaundice import init_jaundice_routes
-    init_jaundice_routes(app, collections)
+    init_jaundice_routes(app, collections, preload=not fast_boot)
+    timer.lap('jaundice routes')
 
     # Initialize maternal risk prediction routes (ML model)
     from routes.maternal_risk import init_maternal_risk_routes
-    init_maternal_risk_routes(app, collections)
+    init_maternal_risk_routes(app, collections, preload=not fast_boot)
+    timer.lap('maternal risk routes')
     
     # Initialize chatbot routes (Mistral AI)
     from routes.chatbot import init_chatbot_routes
     init_chatbot_routes(app)
     
+    # Initialize admin metrics routes
+    from routes.metrics import init_metrics_routes
+    init_metrics_routes(app)
+    
     # Initialize translation routes (Argos Translate)
     from routes.translation import translation_bp
     app.register_blueprint(translation_bp)
@@ -210,6 +252,22 @@ def create_app(config_name='default'):
     @app.errorhandler(500)
     def internal_error(error):
         return {'error': 'Internal server error'}, 500
+
+    @app.errorhandler(InvalidCursor)
+    def invalid_cursor(error):
+        return {'error': str(error)}, 400
+    
+    if app.config.get('JOBS_ENABLED'):
+        job_runner.start()
+    
+    timer.lap('remaining routes')
+    app.config['STARTUP_REPORT'] = timer.print_report('Fast boot' if fast_boot else 'Startup')
+    
+    # Optionally load the lazily imported dependencies before the first request needs them
+    warmup = app.config.get('LAZY_WARMUP')
+    if warmup:
+        names = None if warmup.lower() == 'all' else [n.strip() for n in warmup.split(',') if n.strip()]
+        warm_up(names)
     
     return app
 
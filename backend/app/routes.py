@@ -1,6 +1,5 @@
 from flask import Blueprint, current_app
-from pymongo import MongoClient
-import os
+from config.database import get_client
 from .controllers import (
     register_user, login_user, patient_request_visit,
     asha_log_visit, admin_get_asha_reports, admin_get_requests, admin_approve_asha
@@ -9,8 +8,8 @@ from .controllers import (
 bp = Blueprint("api", __name__, url_prefix="/api")
 
 def get_db():
-    client = MongoClient(os.getenv("MONGO_URI"))
-    return client["ashaassist"]
+    # Shared process-wide client; creating one per request opened a new pool every call
+    return get_client()["ashaassist"]
 
 @bp.route("/register", methods=["POST"])
 def register():
@@ -0,0 +1,7 @@
+"""
+Endpoint benchmark suite
+Boots the application against a seeded database and measures the hot endpoints.
+
+    python -m benchmarks.run --backend mongomock --scale 0.1 --output bench.json
+    python -m benchmarks.compare before.json after.json
+"""
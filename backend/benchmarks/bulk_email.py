@@ -0,0 +1,149 @@
+"""
+Bulk email benchmark
+Sends the same personalised broadcast to N recipients two ways against a local
+SMTP stand-in server (aiosmtpd):
+  per-message - mail.send() for every message: one SMTP connection (and handshake) each
+  bulk        - services.email_outbox.send_bulk: one connection, reopened every MAIL_MAX_EMAILS
+--handshake-ms adds a delay to every EHLO to model the TLS + AUTH round trips of a
+real provider (a local server has almost none).
+
+Requires aiosmtpd (pip install aiosmtpd); it is not an application dependency.
+
+Usage (from backend/):
+    python -m benchmarks.bulk_email --recipients 500 --handshake-ms 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+
+from flask import Flask
+from flask_mail import Message
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.email_service import mail  # noqa: E402
+from services.email_outbox import personalise, send_bulk  # noqa: E402
+
+
+class CountingHandler:
+    """Accepts every message; counts messages and connections"""
+
+    def __init__(self, handshake_ms):
+        self.handshake = handshake_ms / 1000.0
+        self.messages = 0
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        if self.handshake:
+            await asyncio.sleep(self.handshake)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return '250 Message accepted for delivery'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def make_app(port, max_emails):
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER='127.0.0.1', MAIL_PORT=port, MAIL_USE_TLS=False, MAIL_USE_SSL=False,
+        MAIL_USERNAME=None, MAIL_PASSWORD=None, MAIL_DEFAULT_SENDER='bench@ashaassist.local',
+        MAIL_MAX_EMAILS=max_emails,
+    )
+    mail.init_app(app)
+    return app
+
+
+def make_job(recipients):
+    return {
+        'kind': 'bulk',
+        'subject': 'Community health camp this Saturday',
+        'recipients': [{'email': f'user{i}@example.com', 'name': f'User {i}'} for i in range(recipients)],
+        'html': '<p>Dear {{name}},</p><p>A free health camp is held at the Anganwadi centre on Saturday.</p>',
+        'body': 'Dear {{name}}, a free health camp is held at the Anganwadi centre on Saturday.',
+        'sender': 'bench@ashaassist.local',
+        'position': 0,
+    }
+
+
+def per_message(app, job):
+    started = time.perf_counter()
+    with app.app_context():
+        for recipient in job['recipients']:
+            mail.send(Message(
+                subject=job['subject'],
+                recipients=[recipient['email']],
+                html=personalise(job['html'], recipient['name']),
+                body=personalise(job['body'], recipient['name']),
+                sender=job['sender']
+            ))
+    seconds = time.perf_counter() - started
+    return {'sent': len(job['recipients']), 'seconds': round(seconds, 3),
+            'perSecond': round(len(job['recipients']) / seconds, 1)}
+
+
+def run(recipients, handshake_ms, max_emails, chunk_size):
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        sys.exit('aiosmtpd is not installed: pip install aiosmtpd')
+
+    results = {}
+    for name in ('per-message', 'bulk'):
+        handler = CountingHandler(handshake_ms)
+        port = _free_port()
+        controller = Controller(handler, hostname='127.0.0.1', port=port)
+        controller.start()
+        try:
+            app = make_app(port, max_emails)
+            job = make_job(recipients)
+            if name == 'per-message':
+                result = per_message(app, job)
+            else:
+                result = send_bulk(app, job, chunk_size=chunk_size)
+                result.pop('rejected', None)
+            result['connections'] = handler.connections
+            result['received'] = handler.messages
+            results[name] = result
+        finally:
+            controller.stop()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark per-message vs connection-reusing bulk email sends')
+    parser.add_argument('--recipients', type=int, default=500)
+    parser.add_argument('--handshake-ms', type=float, default=0.0, help='Simulated TLS/AUTH cost per connection')
+    parser.add_argument('--max-emails', type=int, default=100, help='Messages per connection (MAIL_MAX_EMAILS)')
+    parser.add_argument('--chunk-size', type=int, default=100)
+    parser.add_argument('--output', help='Write the results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args.recipients, args.handshake_ms, args.max_emails, args.chunk_size)
+    baseline = results['per-message']['perSecond']
+    for name, r in results.items():
+        print(f"[MAIL-BENCH] {name:11s} {r['sent']} messages in {r['seconds']}s ({r['perSecond']}/s) "
+              f"connections={r['connections']} received={r['received']} speedup={r['perSecond'] / baseline:.1f}x")
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"[MAIL-BENCH] Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare two benchmark result files
+
+Usage (from backend/):
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+
+def _delta(before, after):
+    if before in (None, 0) or after is None:
+        return ''
+    return f'{(after - before) / before * 100:+.1f}%'
+
+
+def compare(before, after):
+    """Return table rows comparing p50/p95/p99, commands and bytes per request"""
+    rows = []
+    names = list(before['endpoints']) + [n for n in after['endpoints'] if n not in before['endpoints']]
+    for name in names:
+        old = before['endpoints'].get(name)
+        new = after['endpoints'].get(name)
+        if not old or not new:
+            rows.append((name, 'only in ' + ('after' if new else 'before'), '', '', ''))
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            b, a = old['latencyMs'][metric], new['latencyMs'][metric]
+            rows.append((name, metric, f'{b}ms', f'{a}ms', _delta(b, a)))
+        b, a = old.get('mongoCommandsPerRequest'), new.get('mongoCommandsPerRequest')
+        rows.append((name, 'cmds/req', str(b), str(a), _delta(b, a)))
+        b, a = old.get('mongoReplyBytesPerRequest'), new.get('mongoReplyBytesPerRequest')
+        rows.append((name, 'reply bytes/req', str(b), str(a), _delta(b, a)))
+        b, a = old.get('responseBytes'), new.get('responseBytes')
+        rows.append((name, 'response bytes', str(b), str(a), _delta(b, a)))
+    b, a = before['memory'].get('peakRssMb'), after['memory'].get('peakRssMb')
+    rows.append(('process', 'peak RSS', f'{b}MB', f'{a}MB', _delta(b, a)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    args = parser.parse_args(argv)
+
+    with open(args.before) as fh:
+        before = json.load(fh)
+    with open(args.after) as fh:
+        after = json.load(fh)
+
+    for label, report in (('before', before), ('after', after)):
+        meta = report['meta']
+        print(f"{label:6s}: {meta.get('revision')} backend={meta['backend']} scale={meta['scale']} "
+              f"iterations={meta['iterations']} at {meta['timestamp']}")
+    if before['meta'].get('documents') != after['meta'].get('documents'):
+        print('warning: the runs used different datasets')
+    print()
+
+    header = ('endpoint', 'metric', 'before', 'after', 'change')
+    rows = compare(before, after)
+    widths = [max(len(str(r[i])) for r in rows + [header]) for i in range(5)]
+    for row in [header] + rows:
+        print('  '.join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Ward-scale benchmark dataset
+Fills a database through the synthetic data generator and returns the ids the benchmark needs.
+"""
+from datetime import datetime, timezone
+from config.database import get_collections
+from scripts.generate_synthetic_data import SyntheticDataGenerator
+
+# Fixed reference date so that two runs with the same seed see identical data
+REFERENCE_DATE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def seed_dataset(db, scale=1.0, seed=42, now=None):
+    """Drop and refill every collection. Returns the benchmark identities and the document counts."""
+    generator = SyntheticDataGenerator(get_collections(db), seed=seed, scale=scale,
+                                       now=now or REFERENCE_DATE, verbose=False)
+    summary = generator.generate(drop=True)
+
+    # The first beneficiary is one of the heavy notification recipients (see generate_notifications)
+    beneficiaries = generator.maternity + generator.palliative
+    return {
+        'adminId': summary['adminId'],
+        'ashaWorkerId': summary['ashaWorkerIds'][0],
+        'notificationUserId': str(beneficiaries[0][0]) if beneficiaries else summary['adminId'],
+        'counts': summary['counts'],
+    }
@@ -0,0 +1,105 @@
+"""
+Import-time and memory cost of booting the app, lazy vs eager
+Each measurement boots app.py (FAST_BOOT, mongomock) in a fresh interpreter:
+  lazy  - heavy dependencies are left to load on first use
+  eager - every registered lazy dependency and model is loaded right after boot,
+          which is what importing app.py cost before lazy loading
+
+Usage (from backend/):
+    python -m benchmarks.import_cost --runs 3 --output import-cost.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ('lazy', 'eager')
+
+# Modules reported as loaded/not loaded after boot
+HEAVY_MODULES = ['numpy', 'cv2', 'tensorflow', 'sklearn', 'firebase_admin', 'firebase_admin.auth',
+                 'deep_translator', 'requests', 'reportlab', 'qrcode']
+
+
+def _child(mode):
+    """Boot the app in this process and print one JSON line with the measurements"""
+    start = time.perf_counter()
+    os.chdir(BACKEND_DIR)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ['FAST_BOOT'] = 'True'
+    os.environ['LAZY_WARMUP'] = ''
+
+    from benchmarks.run import _prepare_database, _load_app, peak_rss_mb
+    _prepare_database(argparse.Namespace(backend='mongomock', database='ashaassist_import_cost',
+                                         mongodb_uri=None))
+    _load_app()
+    boot_seconds = time.perf_counter() - start
+
+    warmup_seconds = 0.0
+    if mode == 'eager':
+        from utils.lazy import warm_up
+        warmup_start = time.perf_counter()
+        warm_up(None, background=False)
+        warmup_seconds = time.perf_counter() - warmup_start
+
+    from utils.lazy import status
+    print(json.dumps({
+        'mode': mode,
+        'bootSeconds': round(boot_seconds, 3),
+        'warmupSeconds': round(warmup_seconds, 3),
+        'totalSeconds': round(boot_seconds + warmup_seconds, 3),
+        'peakRssMb': peak_rss_mb(),
+        'modulesLoaded': [m for m in HEAVY_MODULES if m in sys.modules],
+        'lazy': status(),
+    }))
+
+
+def measure(mode, runs):
+    """Boot `runs` fresh interpreters in `mode` and return the median measurements"""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.import_cost', '--child', mode],
+                                cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    result = dict(samples[-1])
+    for key in ('bootSeconds', 'warmupSeconds', 'totalSeconds', 'peakRssMb'):
+        values = [s[key] for s in samples if s[key] is not None]
+        result[key] = round(statistics.median(values), 3) if values else None
+    result['runs'] = runs
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure app import time and RSS with lazy vs eager dependencies')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters per mode (median is reported)')
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child)
+        return
+
+    results = {mode: measure(mode, args.runs) for mode in MODES}
+    for mode in MODES:
+        r = results[mode]
+        print(f"[IMPORT-COST] {mode:5s} boot={r['bootSeconds']}s warmup={r['warmupSeconds']}s "
+              f"total={r['totalSeconds']}s peakRss={r['peakRssMb']}MB loaded={','.join(r['modulesLoaded']) or '-'}")
+    lazy, eager = results['lazy'], results['eager']
+    if lazy['totalSeconds'] and eager['totalSeconds']:
+        print(f"[IMPORT-COST] lazy boot saves {eager['totalSeconds'] - lazy['totalSeconds']:.2f}s "
+              f"and {(eager['peakRssMb'] or 0) - (lazy['peakRssMb'] or 0):.0f}MB peak RSS")
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"[IMPORT-COST] Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
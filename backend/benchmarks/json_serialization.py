@@ -0,0 +1,133 @@
+"""
+JSON serialization micro-benchmark
+Serializes a 10k-row vaccination schedule list three ways:
+  legacy  - hand-built dicts (str()/isoformat() per field) + Flask's default provider
+  stdlib  - DocumentSerializer + MongoJSONProvider (standard library json)
+  orjson  - DocumentSerializer + OrjsonProvider (skipped when orjson is not installed)
+
+Usage (from backend/):
+    python -m benchmarks.json_serialization --rows 10000 --repeat 20
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from utils import json_provider  # noqa: E402
+from utils.serializers import vaccination_schedule_serializer  # noqa: E402
+
+
+def make_schedules(rows, seed=7):
+    """Schedule documents shaped like the vaccination_schedules collection"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 9, 30)
+    creators = [ObjectId() for _ in range(20)]
+    vaccines = ['BCG', 'OPV-0', 'Hepatitis B', 'Pentavalent-1', 'Rotavirus-1', 'IPV-1', 'MR-1']
+    docs = []
+    for i in range(rows):
+        created = start + timedelta(minutes=rng.randint(0, 500000), milliseconds=rng.randint(0, 999))
+        docs.append({
+            '_id': ObjectId(),
+            'title': f'Immunization camp {i}',
+            'date': (start + timedelta(days=i % 365)).strftime('%Y-%m-%d'),
+            'time': '10:00',
+            'location': f'Anganwadi Centre {i % 40}, Ward {i % 20 + 1}',
+            'vaccines': rng.sample(vaccines, 3),
+            'description': 'Routine immunization session for infants and children under five.',
+            'status': 'Scheduled',
+            'createdBy': rng.choice(creators),
+            'createdAt': created,
+            'updatedAt': created + timedelta(hours=2),
+        })
+    return docs
+
+
+def legacy_dto(doc):
+    """The per-field conversion the route performed before the shared serializer"""
+    return {
+        'id': str(doc['_id']),
+        'title': doc.get('title'),
+        'date': doc.get('date'),
+        'time': doc.get('time'),
+        'location': doc.get('location'),
+        'vaccines': doc.get('vaccines', []),
+        'description': doc.get('description', ''),
+        'status': doc.get('status', 'Scheduled'),
+        'createdBy': str(doc.get('createdBy')) if doc.get('createdBy') else None,
+        'createdAt': doc.get('createdAt').isoformat() if isinstance(doc.get('createdAt'), datetime) else doc.get('createdAt'),
+        'updatedAt': doc.get('updatedAt').isoformat() if isinstance(doc.get('updatedAt'), datetime) else doc.get('updatedAt'),
+    }
+
+
+def _time(fn, repeat):
+    samples = []
+    body = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return {'medianMs': round(statistics.median(samples), 2), 'minMs': round(samples[0], 2), 'bytes': len(body)}
+
+
+def run(rows, repeat):
+    docs = make_schedules(rows)
+    app = Flask(__name__)
+    variants = {
+        'legacy': (DefaultJSONProvider(app), lambda: [legacy_dto(d) for d in docs]),
+        'stdlib': (json_provider.MongoJSONProvider(app), lambda: vaccination_schedule_serializer.many(docs)),
+    }
+    if json_provider.orjson is not None:
+        variants['orjson'] = (json_provider.OrjsonProvider(app), lambda: vaccination_schedule_serializer.many(docs))
+
+    results = {}
+    outputs = {}
+    with app.app_context():
+        for name, (provider, build) in variants.items():
+            def respond(provider=provider, build=build):
+                return provider.response({'schedules': build()}).get_data()
+            results[name] = _time(respond, repeat)
+            outputs[name] = json.loads(respond())
+
+    # Every variant must produce the same document
+    reference = outputs['legacy']
+    results['identicalOutput'] = all(out == reference for out in outputs.values())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark JSON serialization of a large list response')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Write the results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.repeat)
+    baseline = results['legacy']['medianMs']
+    for name in ('legacy', 'stdlib', 'orjson'):
+        if name in results:
+            r = results[name]
+            print(f"[JSON-BENCH] {name:6s} median={r['medianMs']}ms min={r['minMs']}ms "
+                  f"bytes={r['bytes']} speedup={baseline / r['medianMs']:.1f}x")
+    print(f"[JSON-BENCH] identical output: {results['identicalOutput']}")
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"[JSON-BENCH] Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Endpoint benchmark runner
+Seeds a ward-scale dataset, boots the app through create_app() and drives the hot endpoints.
+
+Usage (from backend/):
+    python -m benchmarks.run --backend mongomock --scale 0.05
+    python -m benchmarks.run --backend mongod --mongodb-uri mongodb://localhost:27017/ --output bench.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import bson
+from pymongo import monitoring
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, method, path, role) - role picks the identity the request is made as
+ENDPOINTS = [
+    ('ward_analytics', 'GET', '/api/admin/ward-analytics', 'admin'),
+    ('children_details', 'GET', '/api/vaccination/children-details', 'asha_worker'),
+    ('supply_requests', 'GET', '/api/supply-requests?page=1&limit=10', 'admin'),
+    ('home_visit_users', 'GET', '/api/home-visits/users', 'asha_worker'),
+    ('notifications', 'GET', '/api/notifications', 'user'),
+    ('notifications_unread_count', 'GET', '/api/notifications/unread-count', 'user'),
+]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+class ReplySizeListener(monitoring.CommandListener):
+    """Sums the BSON size of command replies (documents sent back by the server)"""
+
+    def __init__(self):
+        self.reply_bytes = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.reply_bytes += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+
+reply_sizes = ReplySizeListener()
+
+
+def _prepare_database(args):
+    """Point the app configuration at the benchmark database and return a handle to it"""
+    os.environ['DATABASE_NAME'] = args.database
+    if args.mongodb_uri:
+        os.environ['MONGODB_URI'] = args.mongodb_uri
+    os.environ.setdefault('METRICS_ENABLED', 'True')
+
+    if args.backend == 'mongomock':
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit('mongomock is not installed: pip install mongomock (or use --backend mongod)')
+        import config.database as database
+        shared_client = mongomock.MongoClient()
+        # Every get_database() call in the app must see the seeded in-memory data
+        database.MongoClient = lambda *a, **kw: shared_client
+        return shared_client[args.database]
+
+    # Listeners only attach to clients created after registration, and seeding creates the shared client
+    from middleware.metrics import register_command_listener
+    register_command_listener()
+    monitoring.register(reply_sizes)
+    from config.database import get_client
+    return get_client()[args.database]
+
+
+def _load_app():
+    """Import app.py (shadowed by the app/ package) so its module-level create_app() runs"""
+    spec = importlib.util.spec_from_file_location('ashaassist_app', os.path.join(BACKEND_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def _measure(client, method, path, headers, iterations, warmup):
+    for _ in range(warmup):
+        client.open(path, method=method, headers=headers)
+    latencies = []
+    status = None
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.open(path, method=method, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        status = response.status_code
+        size = len(response.get_data())
+    latencies.sort()
+    return {
+        'status': status,
+        'responseBytes': size,
+        'iterations': iterations,
+        'latencyMs': {
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p95': round(percentile(latencies, 0.95), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'mean': round(sum(latencies) / len(latencies), 2),
+            'max': round(latencies[-1], 2),
+        },
+    }
+
+
+def run(args):
+    os.chdir(BACKEND_DIR)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+    db = _prepare_database(args)
+
+    print(f"[BENCH] Seeding {args.backend} database '{args.database}' at scale {args.scale}...")
+    from benchmarks.dataset import seed_dataset
+    seed_start = time.perf_counter()
+    seeded = seed_dataset(db, scale=args.scale, seed=args.seed)
+    seed_seconds = time.perf_counter() - seed_start
+    print(f"[BENCH] Seeded in {seed_seconds:.1f}s: {seeded['counts']}")
+
+    boot_start = time.perf_counter()
+    app = _load_app()
+    boot_seconds = time.perf_counter() - boot_start
+    rss_after_boot = peak_rss_mb()
+
+    from flask_jwt_extended import create_access_token
+    from middleware.metrics import registry
+    identities = {
+        'admin': seeded['adminId'],
+        'asha_worker': seeded['ashaWorkerId'],
+        'user': seeded['notificationUserId'],
+    }
+    with app.app_context():
+        tokens = {role: create_access_token(identity=uid, additional_claims={'userType': role})
+                  for role, uid in identities.items()}
+
+    client = app.test_client()
+    selected = [e for e in ENDPOINTS if not args.only or e[0] in args.only]
+    results = {}
+    for name, method, path, role in selected:
+        registry.reset()
+        headers = {'Authorization': f'Bearer {tokens[role]}'}
+        reply_bytes_before = reply_sizes.reply_bytes
+        result = _measure(client, method, path, headers, args.iterations, args.warmup)
+        reply_bytes = reply_sizes.reply_bytes - reply_bytes_before
+
+        snapshot = registry.snapshot()
+        route = path.split('?')[0]
+        endpoint_stats = next((e for e in snapshot['endpoints'] if e['endpoint'] == route), None)
+        result['path'] = path
+        monitored = endpoint_stats is not None and args.backend == 'mongod'
+        result['mongoCommandsPerRequest'] = endpoint_stats['mongo']['commandsPerRequest'] if monitored else None
+        result['mongoTimePerRequestMs'] = endpoint_stats['mongo']['timePerRequestMs'] if monitored else None
+        # Bytes of Mongo replies per request (warm-up requests included in the average's denominator)
+        result['mongoReplyBytesPerRequest'] = (round(reply_bytes / (args.iterations + args.warmup))
+                                               if args.backend == 'mongod' else None)
+        results[name] = result
+
+        latency = result['latencyMs']
+        print(f"[BENCH] {name:18s} {result['status']} p50={latency['p50']}ms p95={latency['p95']}ms "
+              f"p99={latency['p99']}ms cmds/req={result['mongoCommandsPerRequest']} "
+              f"replyBytes/req={result['mongoReplyBytesPerRequest']}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'backend': args.backend,
+            # mongomock issues no driver commands, so command counts are only meaningful on mongod
+            'commandMonitoring': args.backend == 'mongod',
+            'scale': args.scale,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'documents': seeded['counts'],
+            'seedSeconds': round(seed_seconds, 2),
+            'bootSeconds': round(boot_seconds, 2),
+        },
+        'memory': {
+            'peakRssAfterBootMb': rss_after_boot,
+            'peakRssMb': peak_rss_mb(),
+        },
+        'endpoints': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"[BENCH] Results written to {args.output}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hot AshaAssist endpoints')
+    parser.add_argument('--backend', choices=['mongomock', 'mongod'], default='mongomock')
+    parser.add_argument('--mongodb-uri', help='MongoDB URI for --backend mongod (defaults to MONGODB_URI)')
+    parser.add_argument('--database', default='ashaassist_bench',
+                        help='Database to seed; it is dropped and refilled (default: ashaassist_bench)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplier for the dataset volumes (1.0 = 50k users, 200k bookings, ...)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', nargs='*', help='Endpoint names to run (default: all)')
+    parser.add_argument('--output', default='benchmark-results.json')
+    run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Vaccination due-date benchmark
+Computes due dates and statuses of every vaccine for N children two ways:
+  per-child  - calculate_vaccination_milestones() per child, then the completed
+               vaccines cross-referenced by name (what the routes did per child)
+  vectorized - utils.vaccination_batch.due_table() over all children at once
+and checks that both agree on every due date and status.
+
+Usage (from backend/):
+    python -m benchmarks.vaccination_due_dates --children 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from utils.vaccination_utils import calculate_vaccination_milestones  # noqa: E402
+from utils.vaccination_batch import STATUS_LABELS, VACCINE_NAMES, completed_mask, due_table  # noqa: E402
+
+
+def make_children(count, seed=7):
+    """(ISO birth date, completed vaccine names) of children up to five years old"""
+    rng = random.Random(seed)
+    today = date.today()
+    children = []
+    for _ in range(count):
+        dob = today - timedelta(days=rng.randint(0, 5 * 365))
+        given = [name for name in VACCINE_NAMES if rng.random() < 0.5]
+        children.append((dob.isoformat(), given))
+    return children
+
+
+def per_child(children):
+    results = []
+    for dob, given in children:
+        milestones = calculate_vaccination_milestones(dob)
+        for milestone in milestones:
+            if milestone['vaccineName'] in given:
+                milestone['status'] = 'completed'
+        results.append(milestones)
+    return results
+
+
+def vectorized(children):
+    return due_table([dob for dob, _ in children], [completed_mask(given) for _, given in children])
+
+
+def _time(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return result, {'medianMs': round(statistics.median(samples), 1), 'minMs': round(samples[0], 1)}
+
+
+def _agree(expected, table, sample):
+    for child in sample:
+        for i, milestone in enumerate(expected[child]):
+            if milestone['dueDate'] != str(table.due_date[child, i]) or \
+                    milestone['status'] != STATUS_LABELS[table.status[child, i]]:
+                return False
+    return True
+
+
+def run(count, repeat):
+    children = make_children(count)
+    expected, slow = _time(lambda: per_child(children), repeat)
+    table, fast = _time(lambda: vectorized(children), repeat)
+    sample = random.Random(1).sample(range(count), min(count, 2000))
+    return {
+        'children': count,
+        'vaccines': len(VACCINE_NAMES),
+        'per-child': slow,
+        'vectorized': fast,
+        'identicalOutput': _agree(expected, table, sample),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark per-child vs vectorized vaccination due dates')
+    parser.add_argument('--children', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='Write the results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args.children, args.repeat)
+    baseline = results['per-child']['medianMs']
+    for name in ('per-child', 'vectorized'):
+        r = results[name]
+        print(f"[DUE-BENCH] {name:10s} {results['children']} children x {results['vaccines']} vaccines "
+              f"median={r['medianMs']}ms min={r['minMs']}ms speedup={baseline / r['medianMs']:.1f}x")
+    print(f"[DUE-BENCH] identical output: {results['identicalOutput']}")
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"[DUE-BENCH] Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
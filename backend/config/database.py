@@ -1,15 +1,95 @@
 """
 Database configuration and connection setup
 """
-import os
+import importlib.util
+import threading
 from pymongo import MongoClient
 from config.settings import Config
+from middleware.pool_monitor import pool_monitor
 
-def get_database():
-    """Get database connection"""
+# Python package each wire compressor needs (zlib ships with CPython)
+_COMPRESSOR_PACKAGES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': None}
+
+
+def _available_compressors(spec):
+    names = [c.strip().lower() for c in (spec or '').split(',') if c.strip()]
+    available = []
+    for name in names:
+        if name not in _COMPRESSOR_PACKAGES:
+            print(f"[MONGO] Ignoring unknown compressor '{name}'")
+            continue
+        package = _COMPRESSOR_PACKAGES[name]
+        if package is None or importlib.util.find_spec(package) is not None:
+            available.append(name)
+    return available
+
+
+def client_options():
+    """MongoClient keyword arguments built from Config"""
+    options = {
+        'maxPoolSize': Config.MONGO_MAX_POOL_SIZE,
+        'minPoolSize': Config.MONGO_MIN_POOL_SIZE,
+        'maxIdleTimeMS': Config.MONGO_MAX_IDLE_TIME_MS,
+        'waitQueueTimeoutMS': Config.MONGO_WAIT_QUEUE_TIMEOUT_MS or None,
+        'serverSelectionTimeoutMS': Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        'connectTimeoutMS': Config.MONGO_CONNECT_TIMEOUT_MS,
+        'socketTimeoutMS': Config.MONGO_SOCKET_TIMEOUT_MS or None,
+        'readPreference': Config.MONGO_READ_PREFERENCE,
+        'appname': 'ashaassist',
+    }
+    compressors = _available_compressors(Config.MONGO_COMPRESSORS)
+    if compressors:
+        options['compressors'] = ','.join(compressors)
+    return options
+
+
+class ConnectionManager:
+    """Owns the single MongoClient (and its connection pool) shared by the whole process"""
+
+    def __init__(self):
+        self._client = None
+        self._options = None
+        self._lock = threading.Lock()
+
+    def get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._options = client_options()
+                    self._client = MongoClient(Config.MONGODB_URI, event_listeners=[pool_monitor],
+                                               **self._options)
+                    print(f"[MONGO] Client created (pool {self._options['minPoolSize']}-"
+                          f"{self._options['maxPoolSize']}, compressors={self._options.get('compressors', 'none')}, "
+                          f"readPreference={self._options['readPreference']})")
+        return self._client
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def stats(self):
+        """Pool configuration and live connection pool statistics"""
+        return {
+            'connected': self._client is not None,
+            'options': dict(self._options) if self._options else client_options(),
+            'pool': pool_monitor.snapshot(),
+        }
+
+
+connection_manager = ConnectionManager()
+
+
+def get_client():
+    """The process-wide MongoClient"""
+    return connection_manager.get_client()
+
+
+def get_database(name=None):
+    """Get database connection (a handle on the shared client)"""
     try:
-        client = MongoClient(Config.MONGODB_URI)
-        db = client[Config.DATABASE_NAME]
+        db = get_client()[name or Config.DATABASE_NAME]
         print("Connected to MongoDB successfully!")
         return db
     except Exception as e:
@@ -38,14 +118,27 @@ def get_collections(db):
         'milestone_records': db.milestone_records,
         'maternity_profiles': db.maternity_profiles,
         'notifications': db.notifications,
+        'notification_reads': db.notification_reads,
+        'notification_counters': db.notification_counters,
+        'notification_stream_tokens': db.notification_stream_tokens,
         'anganwadi_stock': db.anganwadi_stock,
+        'system_meta': db.system_meta,
+        'cache_entries': db.cache_entries,
+        'ward_stats': db.ward_stats,
+        'activity_rollups': db.activity_rollups,
+        'immunization_status': db.immunization_status,
+        'vaccination_reminders': db.vaccination_reminders,
+        'email_outbox': db.email_outbox,
     }
 
 def ensure_indexes(collections):
-    """Create database indexes for optimal performance"""
+    """Create database indexes for optimal performance; returns False if any could not be created"""
     try:
         # Users: unique email and partial unique phone
         collections['users'].create_index([('email', 1)], unique=True)
+        # Keyset pages: admin user list (type + createdAt) and notification targeting (name)
+        collections['users'].create_index([('userType', 1), ('createdAt', -1)])
+        collections['users'].create_index([('name', 1)])
         indexes = collections['users'].index_information()
         if 'phone_1' in indexes:
             collections['users'].drop_index('phone_1')
@@ -62,20 +155,26 @@ def ensure_indexes(collections):
         collections['calendar_events'].create_index([('start', 1)])
         collections['calendar_events'].create_index([('end', 1)])
         collections['calendar_events'].create_index([('createdBy', 1)])
+        collections['calendar_events'].create_index([('date', 1)])
 
         # Health blogs: indexes for author, category, createdAt, status
         collections['health_blogs'].create_index([('createdBy', 1), ('createdAt', -1)])
         collections['health_blogs'].create_index([('category', 1), ('status', 1)])
         collections['health_blogs'].create_index([('status', 1), ('createdAt', -1)])
+        collections['health_blogs'].create_index([('createdAt', -1)])
 
         # Vaccination schedules & bookings
         collections['vaccination_schedules'].create_index([('date', 1)])
         collections['vaccination_schedules'].create_index([('createdBy', 1), ('date', -1)])
         collections['vaccination_bookings'].create_index([('scheduleId', 1)])
+        collections['vaccination_bookings'].create_index([('scheduleId', 1), ('createdAt', -1)])
         collections['vaccination_bookings'].create_index([('userId', 1), ('createdAt', -1)])
+        # Booking expiry job: schedules that still have open bookings
+        collections['vaccination_bookings'].create_index([('status', 1), ('scheduleId', 1)])
 
         # Palliative records: by user and date for timeline/listing; testType for filtering
         collections['palliative_records'].create_index([('userId', 1), ('date', -1)])
+        collections['palliative_records'].create_index([('userId', 1), ('testType', 1), ('date', -1)])
         collections['palliative_records'].create_index([('testType', 1)])
 
         # Visit requests: by user, status, and createdAt for filtering and listing
@@ -89,6 +188,7 @@ def ensure_indexes(collections):
         collections['community_classes'].create_index([('status', 1), ('date', -1)])
 
         # Supply requests: by user, status, category, createdAt
+        collections['supply_requests'].create_index([('createdAt', -1)])
         collections['supply_requests'].create_index([('userId', 1), ('createdAt', -1)])
         collections['supply_requests'].create_index([('status', 1), ('createdAt', -1)])
         collections['supply_requests'].create_index([('category', 1), ('status', 1)])
@@ -126,11 +226,36 @@ def ensure_indexes(collections):
         collections['notifications'].create_index([('recipientId', 1), ('createdAt', -1)])
         collections['notifications'].create_index([('recipientType', 1), ('createdAt', -1)])
         collections['notifications'].create_index([('recipientId', 1), ('isRead', 1), ('createdAt', -1)])
+        # Broadcast notifications: by audience (role) and createdAt
+        collections['notifications'].create_index([('audience', 1), ('createdAt', -1)])
 
         # Anganwadi stock: by itemName and category
         collections['anganwadi_stock'].create_index([('itemName', 1)])
         collections['anganwadi_stock'].create_index([('category', 1)])
 
-        print("Indexes ensured: users(email unique, phone partial unique), asha_feedback(userId+createdAt), calendar_events(start,end,createdBy), health_blogs(createdBy+createdAt, category+status, status+createdAt), vaccination_schedules(date,createdBy+date), vaccination_bookings(scheduleId,userId+createdAt), palliative_records(userId+date, testType), visit_requests(userId+createdAt, status+createdAt, requestType+status), supply_requests(userId+createdAt, status+createdAt, category+status), community_classes(date,createdBy+date,status+date), local_camps(date,createdBy+date,status+date), monthly_rations(userId+monthStartDate, monthStartDate+status, status+monthStartDate), locations(ward+type, name), home_visits(userId+visitDate, ashaWorkerId+visitDate, visitDate, verified+visitDate), milestone_records(userId+achievedDate, userId+milestoneId, status), developmental_milestones(order, isActive)")
+        # Shared cache entries (CACHE_BACKEND=mongo): removed by the TTL monitor once expired
+        collections['cache_entries'].create_index([('expiresAt', 1)], expireAfterSeconds=0)
+
+        # Activity rollups: range reads of one metric's buckets
+        collections['activity_rollups'].create_index([('metric', 1), ('ward', 1), ('period', 1), ('start', 1)])
+
+        # Immunization status: a mother's rows; children with a given vaccine pending past a date
+        collections['immunization_status'].create_index([('motherId', 1), ('childIndex', 1)])
+        collections['immunization_status'].create_index(
+            [('vaccines.vaccineName', 1), ('vaccines.status', 1), ('vaccines.dueDate', 1)])
+
+        # Vaccination reminders sent (keyed by child, dose and kind) expire once the dose is long past
+        collections['vaccination_reminders'].create_index([('expiresAt', 1)], expireAfterSeconds=0)
+
+        # Email outbox: claim queries (due pending / expired leases); sent and failed messages expire
+        collections['email_outbox'].create_index([('status', 1), ('nextAttemptAt', 1)])
+        collections['email_outbox'].create_index([('status', 1), ('lockedUntil', 1)])
+        collections['email_outbox'].create_index([('expiresAt', 1)], expireAfterSeconds=0)
+        # Notification stream tokens: removed once expired
+        collections['notification_stream_tokens'].create_index([('expiresAt', 1)], expireAfterSeconds=0)
+
+        print("Indexes ensured: users(email unique, phone partial unique, userType+createdAt, name), asha_feedback(userId+createdAt), calendar_events(start,end,createdBy,date), health_blogs(createdBy+createdAt, category+status, status+createdAt, createdAt), vaccination_schedules(date,createdBy+date), vaccination_bookings(scheduleId,scheduleId+createdAt,userId+createdAt,status+scheduleId), palliative_records(userId+date, userId+testType+date, testType), visit_requests(userId+createdAt, status+createdAt, requestType+status), supply_requests(createdAt, userId+createdAt, status+createdAt, category+status), community_classes(date,createdBy+date,status+date), local_camps(date,createdBy+date,status+date), monthly_rations(userId+monthStartDate, monthStartDate+status, status+monthStartDate), locations(ward+type, name), home_visits(userId+visitDate, ashaWorkerId+visitDate, visitDate, verified+visitDate), milestone_records(userId+achievedDate, userId+milestoneId, status), developmental_milestones(order, isActive), cache_entries(expiresAt TTL), activity_rollups(metric+ward+period+start), immunization_status(motherId+childIndex, vaccines.vaccineName+status+dueDate), vaccination_reminders(expiresAt TTL), email_outbox(status+nextAttemptAt, status+lockedUntil, expiresAt TTL), notification_stream_tokens(expiresAt TTL)")
+        return True
     except Exception as e:
         print(f'Warning: could not ensure indexes: {e}')
+        return False
@@ -4,9 +4,12 @@ Firebase configuration and initialization
 import os
 import json
 import base64
-import firebase_admin
-from firebase_admin import credentials
 from config.settings import Config
+from utils.lazy import lazy_module
+
+# firebase_admin is imported the first time Firebase is actually needed
+firebase_admin = lazy_module('firebase_admin')
+credentials = lazy_module('firebase_admin.credentials')
 
 def initialize_firebase():
     """Initialize Firebase Admin SDK"""
@@ -51,3 +54,10 @@ def initialize_firebase():
     except Exception as e:
         print(f"Error initializing Firebase: {e}")
         return False
+
+
+def ensure_firebase():
+    """Initialize Firebase on first use (startup initialization is skipped in fast-boot mode)"""
+    if firebase_admin._apps:
+        return True
+    return initialize_firebase()
@@ -2,6 +2,7 @@
 Application settings and configuration
 """
 import os
+import json
 from datetime import timedelta
 from dotenv import load_dotenv
 
@@ -15,9 +16,23 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     
     # Database settings
-    MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+    MONGODB_URI = os.getenv('MONGODB_URI') or os.getenv('MONGO_URI') or 'mongodb://localhost:27017/'
     DATABASE_NAME = os.getenv('DATABASE_NAME', 'ashaassist')
     
+    # Connection pool of the process-wide MongoClient (see config.database.ConnectionManager)
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 60000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', 10000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 10000))
+    # 0 disables the socket timeout (pymongo default)
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', 30000))
+    # Wire compression in order of preference; compressors whose library is missing are skipped
+    MONGO_COMPRESSORS = os.getenv('MONGO_COMPRESSORS', 'zstd,snappy,zlib')
+    # primary | primaryPreferred | secondary | secondaryPreferred | nearest
+    MONGO_READ_PREFERENCE = os.getenv('MONGO_READ_PREFERENCE', 'primary')
+    
     # Firebase settings
     FIREBASE_CREDENTIALS_PATH = os.getenv('FIREBASE_CREDENTIALS_PATH')
     
@@ -31,6 +46,89 @@ class Config:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME', '')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD', '')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_USERNAME', '')  # use same address as sender
+    # Email outbox (services/email_outbox.py): delivery threads per process (0: deliver with
+    # `python -m scripts.run_jobs` every EMAIL_OUTBOX_DRAIN_SECONDS instead), retries with
+    # exponential backoff from EMAIL_RETRY_BASE_SECONDS, and how long sent/failed messages are kept
+    EMAIL_OUTBOX_WORKERS = int(os.getenv('EMAIL_OUTBOX_WORKERS', 2))
+    EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv('EMAIL_OUTBOX_POLL_SECONDS', 5))
+    EMAIL_OUTBOX_DRAIN_SECONDS = int(os.getenv('EMAIL_OUTBOX_DRAIN_SECONDS', 60))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+    EMAIL_RETRY_BASE_SECONDS = float(os.getenv('EMAIL_RETRY_BASE_SECONDS', 30))
+    EMAIL_OUTBOX_RETENTION_DAYS = int(os.getenv('EMAIL_OUTBOX_RETENTION_DAYS', 30))
+    # Bulk sends reuse one SMTP connection: progress is saved every EMAIL_BULK_CHUNK_SIZE
+    # recipients, and the connection is reopened after MAIL_MAX_EMAILS messages (provider limit)
+    EMAIL_BULK_CHUNK_SIZE = int(os.getenv('EMAIL_BULK_CHUNK_SIZE', 100))
+    MAIL_MAX_EMAILS = int(os.getenv('MAIL_MAX_EMAILS', 100)) or None
+    
+    # Metrics (per-endpoint latency and Mongo command accounting)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() in ('true', '1', 'yes')
+    
+    # N+1 query detector: 'off' | 'log' | 'strict' (strict fails requests over budget)
+    QUERY_INSPECTOR_MODE = os.getenv('QUERY_INSPECTOR_MODE', 'off').lower()
+    QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', 5))
+    QUERY_DEFAULT_BUDGET = int(os.getenv('QUERY_DEFAULT_BUDGET', 0)) or None
+    # Per-route overrides, e.g. {"/api/admin/ward-analytics": 30}
+    QUERY_BUDGETS = json.loads(os.getenv('QUERY_BUDGETS', '{}') or '{}')
+    
+    # ETag/Last-Modified validation and 304 responses on read-mostly endpoints (middleware/conditional.py)
+    CONDITIONAL_GET = os.getenv('CONDITIONAL_GET', 'True').lower() in ('true', '1', 'yes')
+    
+    # In-process reference data cache (utils/cache.py); per-cache TTL overrides in seconds,
+    # e.g. {"locations": 60, "anganwadi_stock": 30}
+    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'True').lower() in ('true', '1', 'yes')
+    CACHE_TTLS = json.loads(os.getenv('CACHE_TTLS', '{}') or '{}')
+    # Shared tier behind it (utils/shared_cache.py): 'memory' | 'redis' | 'mongo'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory').lower()
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL') or os.getenv('REDIS_URL') or 'redis://localhost:6379/0'
+    # How often each worker re-reads the invalidation version counters from the shared backend
+    CACHE_VERSION_CHECK_SECONDS = float(os.getenv('CACHE_VERSION_CHECK_SECONDS', 1.0))
+    
+    # Periodic background jobs (utils/jobs.py). Disable where processes are short-lived
+    # (serverless) and run `python -m scripts.run_jobs` from a scheduler instead.
+    JOBS_ENABLED = os.getenv('JOBS_ENABLED', 'True').lower() in ('true', '1', 'yes')
+    # Full recount of the incrementally maintained ward analytics counters
+    WARD_STATS_RECONCILE_SECONDS = int(os.getenv('WARD_STATS_RECONCILE_SECONDS', 3600))
+    # Rebuild of the recent activity rollup buckets (services/activity_rollup_service.py)
+    ROLLUP_CATCHUP_SECONDS = int(os.getenv('ROLLUP_CATCHUP_SECONDS', 3600))
+    ROLLUP_CATCHUP_DAYS = int(os.getenv('ROLLUP_CATCHUP_DAYS', 35))
+    # Recount of the per-user unread notification counters (services/notification_service.py)
+    NOTIFICATION_COUNTERS_RECONCILE_SECONDS = int(os.getenv('NOTIFICATION_COUNTERS_RECONCILE_SECONDS', 3600))
+    # Stores 'Expired' on the bookings of past vaccination schedules (services/booking_expiry.py)
+    BOOKING_EXPIRY_SECONDS = int(os.getenv('BOOKING_EXPIRY_SECONDS', 3600))
+    # Daily due/overdue vaccination reminders for every child (services/vaccination_reminders.py)
+    VACCINATION_REMINDERS_SECONDS = int(os.getenv('VACCINATION_REMINDERS_SECONDS', 86400))
+    VACCINATION_REMINDER_OVERDUE_DAYS = int(os.getenv('VACCINATION_REMINDER_OVERDUE_DAYS', 90))
+    VACCINATION_REMINDER_EMAILS = os.getenv('VACCINATION_REMINDER_EMAILS', 'True').lower() in ('true', '1', 'yes')
+    VACCINATION_REMINDER_EMAIL_CHUNK_SIZE = int(os.getenv('VACCINATION_REMINDER_EMAIL_CHUNK_SIZE', 500))
+    # Processes rendering the certificates of a bulk schedule export (services/certificate_service.py).
+    # 0 or 1 (default) renders in the request thread; more are forked by every process that creates
+    # the app, so only set it for a dedicated export worker. At most CERTIFICATE_EXPORT_CONCURRENCY
+    # exports run at once per process (others get 503)
+    CERTIFICATE_RENDER_WORKERS = int(os.getenv('CERTIFICATE_RENDER_WORKERS', 0))
+    CERTIFICATE_EXPORT_CONCURRENCY = int(os.getenv('CERTIFICATE_EXPORT_CONCURRENCY', 2))
+    
+    # Server-Sent Events notification stream (services/notification_stream.py). Each open stream
+    # holds a worker thread: at most NOTIFICATION_STREAM_MAX_CONNECTIONS per process, closed after
+    # NOTIFICATION_STREAM_MAX_SECONDS (the client reconnects with a new token). Disable where requests are
+    # short-lived (serverless); clients then keep polling.
+    NOTIFICATION_STREAM_ENABLED = os.getenv('NOTIFICATION_STREAM_ENABLED', 'False' if os.getenv('VERCEL') else 'True').lower() in ('true', '1', 'yes')
+    NOTIFICATION_STREAM_MAX_CONNECTIONS = int(os.getenv('NOTIFICATION_STREAM_MAX_CONNECTIONS', 100))
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS = float(os.getenv('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 15))
+    NOTIFICATION_STREAM_MAX_SECONDS = float(os.getenv('NOTIFICATION_STREAM_MAX_SECONDS', 300))
+    # Lifetime of the single-use token a stream is opened with (POST /api/notifications/stream-token)
+    NOTIFICATION_STREAM_TOKEN_SECONDS = int(os.getenv('NOTIFICATION_STREAM_TOKEN_SECONDS', 60))
+    # Change streams need a replica set (Atlas); otherwise one tailing poll per process
+    NOTIFICATION_STREAM_CHANGE_STREAMS = os.getenv('NOTIFICATION_STREAM_CHANGE_STREAMS', 'True').lower() in ('true', '1', 'yes')
+    NOTIFICATION_STREAM_POLL_SECONDS = float(os.getenv('NOTIFICATION_STREAM_POLL_SECONDS', 2))
+    
+    # Fast boot: skip index creation, seeding and eager model loading at startup.
+    # Run `python -m scripts.bootstrap` once per deploy instead (recommended on Vercel).
+    FAST_BOOT = os.getenv('FAST_BOOT', 'False').lower() in ('true', '1', 'yes')
+    
+    # Heavy dependencies (TensorFlow, OpenCV, firebase_admin, ...) load on first use.
+    # LAZY_WARMUP loads them in a background thread after startup: 'all' or comma-separated names
+    # (e.g. 'jaundice_model,firebase_admin.auth'); empty disables the warm-up.
+    LAZY_WARMUP = os.getenv('LAZY_WARMUP', '').strip()
     
     # Upload settings
     UPLOAD_FOLDER = 'uploads'
@@ -0,0 +1,148 @@
+"""
+Conditional GET (ETag / Last-Modified)
+Lets read-mostly endpoints answer repeat polls with 304 Not Modified instead of
+re-sending the full body. There are two ways to validate:
+  content hash   - the ETag is a hash of the response body. The view still runs,
+                   only the transfer is saved. Used for data derived from static tables.
+  version stamps - the ETag is derived from per-collection version counters that are
+                   bumped on every write. A match is answered before the view runs,
+                   so the 304 costs one small system_meta lookup.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import request, current_app, make_response
+from flask_jwt_extended import get_jwt
+from werkzeug.http import is_resource_modified
+
+# Bump when the shape of a version-stamped response changes, so clients drop their old ETags
+REPRESENTATION_VERSION = 1
+
+_STAMP_PREFIX = 'collection_version:'
+
+
+class CollectionVersions:
+    """Per-collection version stamps stored in system_meta.
+
+    Call bump() after every insert/update/delete of a stamped collection. If the bump ran
+    before the write, a concurrent read could pair the new ETag with the old data.
+    """
+
+    def __init__(self, meta_collection=None):
+        self._meta = meta_collection
+
+    def init(self, meta_collection):
+        self._meta = meta_collection
+
+    def bump(self, *names):
+        if self._meta is None:
+            return
+        now = datetime.now(timezone.utc)
+        for name in names:
+            try:
+                self._meta.update_one(
+                    {'_id': _STAMP_PREFIX + name},
+                    {'$inc': {'version': 1}, '$set': {'updatedAt': now}},
+                    upsert=True
+                )
+            except Exception as e:
+                print(f"[CONDITIONAL] Failed to bump version of {name}: {e}")
+
+    def get(self, names):
+        """{name: (version, updatedAt)}; a collection that has never been bumped reports (0, None)"""
+        stamps = {name: (0, None) for name in names}
+        if self._meta is None:
+            return stamps
+        for doc in self._meta.find({'_id': {'$in': [_STAMP_PREFIX + n for n in names]}}):
+            updated = doc.get('updatedAt')
+            if isinstance(updated, datetime) and updated.tzinfo is None:
+                updated = updated.replace(tzinfo=timezone.utc)
+            stamps[doc['_id'][len(_STAMP_PREFIX):]] = (doc.get('version', 0), updated)
+        return stamps
+
+
+collection_versions = CollectionVersions()
+
+
+def init_conditional(app, collections):
+    """Point the version stamps at the app database"""
+    collection_versions.init(collections['system_meta'])
+
+
+def _version_validators(names, vary_claims):
+    """Strong ETag and Last-Modified of the current request from the collection stamps"""
+    stamps = collection_versions.get(names)
+    claims = (get_jwt() or {}) if vary_claims else {}
+    key = repr((
+        REPRESENTATION_VERSION,
+        request.path,
+        sorted(request.args.items(multi=True)),
+        [claims.get(c) for c in vary_claims],
+        # updatedAt too: a dropped and re-created stamp restarts its counter
+        [(name, stamps[name]) for name in names],
+    ))
+    etag = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    dates = [updated for _, updated in stamps.values()]
+    last_modified = max(dates) if dates and None not in dates else None
+    # Last-Modified has one-second resolution: a stamp from the current second could be
+    # followed by another write in the same second, so only the ETag validates it
+    if last_modified is not None and datetime.now(timezone.utc) - last_modified < timedelta(seconds=1):
+        last_modified = None
+    return etag, last_modified
+
+
+def _set_cache_headers(response, etag, last_modified, max_age):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Responses depend on the caller's token: browsers may keep them, shared caches may not
+    response.cache_control.private = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    response.vary.add('Authorization')
+    return response
+
+
+def conditional(versions=None, max_age=0, vary_claims=()):
+    """Add ETag/Cache-Control to a GET endpoint and answer matching revalidations with 304.
+
+    versions: collections the response is built from. The ETag is derived from their
+        version stamps, the path and the query string. Without it, a content hash is used.
+    max_age: seconds the client may reuse the response without asking (0 = always revalidate)
+    vary_claims: JWT claims the response depends on (e.g. 'userType')
+
+    Place below @jwt_required() so unauthenticated requests never get a 304:
+
+        @bp.route('/api/things')
+        @jwt_required()
+        @conditional(versions=('things',), max_age=300)
+        def list_things(): ...
+    """
+    names = tuple(versions or ())
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not current_app.config.get('CONDITIONAL_GET', True):
+                return func(*args, **kwargs)
+
+            if not names:
+                response = make_response(func(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    etag = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+                    _set_cache_headers(response, etag, None, max_age)
+                    response.make_conditional(request)
+                return response
+
+            etag, last_modified = _version_validators(names, vary_claims)
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                return _set_cache_headers(current_app.response_class(status=304), etag, last_modified, max_age)
+
+            response = make_response(func(*args, **kwargs))
+            if response.status_code == 200:
+                _set_cache_headers(response, etag, last_modified, max_age)
+            return response
+        return wrapper
+    return decorator
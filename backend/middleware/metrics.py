@@ -0,0 +1,258 @@
+"""
+Request and MongoDB command metrics
+Records per-endpoint latency histograms together with the number of Mongo
+commands (and the time spent in them) issued while serving each request.
+"""
+import threading
+import time
+from flask import request
+from pymongo import monitoring
+
+# Histogram bucket upper bounds in milliseconds (Prometheus "le" labels)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Per-thread accounting for the request currently being served
+_local = threading.local()
+_listener_registered = False
+_listener_lock = threading.Lock()
+
+
+def current_request_stats():
+    """Return the accounting dict of the request served by this thread (or None)"""
+    return getattr(_local, 'request', None)
+
+
+class EndpointStats:
+    """Aggregated statistics for a single (method, route) pair"""
+    __slots__ = ('count', 'errors', 'buckets', 'latency_sum_ms', 'latency_max_ms',
+                 'mongo_commands', 'mongo_time_ms', 'max_commands')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # last slot is +Inf
+        self.latency_sum_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.mongo_commands = 0
+        self.mongo_time_ms = 0.0
+        self.max_commands = 0
+
+    def observe(self, latency_ms, status_code, commands, mongo_ms):
+        self.count += 1
+        if status_code >= 500:
+            self.errors += 1
+        for idx, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.buckets[idx] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.latency_sum_ms += latency_ms
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+        self.mongo_commands += commands
+        self.mongo_time_ms += mongo_ms
+        self.max_commands = max(self.max_commands, commands)
+
+    def percentile(self, q):
+        """Approximate a latency percentile (ms) from the histogram buckets"""
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for idx, n in enumerate(self.buckets):
+            running += n
+            if running >= target:
+                return LATENCY_BUCKETS_MS[idx] if idx < len(LATENCY_BUCKETS_MS) else self.latency_max_ms
+        return self.latency_max_ms
+
+    def to_dict(self):
+        count = max(self.count, 1)
+        cumulative = 0
+        histogram = []
+        for idx, n in enumerate(self.buckets):
+            cumulative += n
+            le = LATENCY_BUCKETS_MS[idx] if idx < len(LATENCY_BUCKETS_MS) else '+Inf'
+            histogram.append({'le': le, 'count': cumulative})
+        return {
+            'requests': self.count,
+            'errors': self.errors,
+            'latencyMs': {
+                'avg': round(self.latency_sum_ms / count, 2),
+                'max': round(self.latency_max_ms, 2),
+                'p50': self.percentile(0.50),
+                'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99),
+                'histogram': histogram,
+            },
+            'mongo': {
+                'commands': self.mongo_commands,
+                'commandsPerRequest': round(self.mongo_commands / count, 2),
+                'maxCommandsPerRequest': self.max_commands,
+                'timeMs': round(self.mongo_time_ms, 2),
+                'timePerRequestMs': round(self.mongo_time_ms / count, 2),
+            },
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe, process-local store of endpoint statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started_at = time.time()
+        # Commands issued outside of any request (startup, background jobs)
+        self.background_commands = 0
+        self.background_time_ms = 0.0
+
+    def record(self, method, route, latency_ms, status_code, commands, mongo_ms):
+        key = (method, route)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats()
+            stats.observe(latency_ms, status_code, commands, mongo_ms)
+
+    def record_background(self, mongo_ms):
+        with self._lock:
+            self.background_commands += 1
+            self.background_time_ms += mongo_ms
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+            self.background_commands = 0
+            self.background_time_ms = 0.0
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """JSON-friendly view of all collected metrics"""
+        with self._lock:
+            endpoints = [
+                {'method': method, 'endpoint': route, **stats.to_dict()}
+                for (method, route), stats in self._endpoints.items()
+            ]
+            background = {
+                'commands': self.background_commands,
+                'timeMs': round(self.background_time_ms, 2),
+            }
+        endpoints.sort(key=lambda e: e['mongo']['timeMs'], reverse=True)
+        return {
+            'since': self.started_at,
+            'uptimeSeconds': round(time.time() - self.started_at, 1),
+            'endpoints': endpoints,
+            'backgroundMongo': background,
+        }
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        lines = [
+            '# HELP ashaassist_http_request_duration_seconds Request latency by endpoint',
+            '# TYPE ashaassist_http_request_duration_seconds histogram',
+        ]
+        with self._lock:
+            items = list(self._endpoints.items())
+            background_commands = self.background_commands
+            background_time_ms = self.background_time_ms
+
+        for (method, route), stats in items:
+            labels = f'method="{method}",endpoint="{route}"'
+            cumulative = 0
+            for idx, n in enumerate(stats.buckets):
+                cumulative += n
+                le = f'{LATENCY_BUCKETS_MS[idx] / 1000:g}' if idx < len(LATENCY_BUCKETS_MS) else '+Inf'
+                lines.append(f'ashaassist_http_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'ashaassist_http_request_duration_seconds_sum{{{labels}}} {stats.latency_sum_ms / 1000:.6f}')
+            lines.append(f'ashaassist_http_request_duration_seconds_count{{{labels}}} {stats.count}')
+
+        lines += [
+            '# HELP ashaassist_http_request_errors_total Requests answered with a 5xx status',
+            '# TYPE ashaassist_http_request_errors_total counter',
+        ]
+        for (method, route), stats in items:
+            lines.append(f'ashaassist_http_request_errors_total{{method="{method}",endpoint="{route}"}} {stats.errors}')
+
+        lines += [
+            '# HELP ashaassist_mongo_commands_total Mongo commands issued while serving the endpoint',
+            '# TYPE ashaassist_mongo_commands_total counter',
+        ]
+        for (method, route), stats in items:
+            lines.append(f'ashaassist_mongo_commands_total{{method="{method}",endpoint="{route}"}} {stats.mongo_commands}')
+        lines.append(f'ashaassist_mongo_commands_total{{method="",endpoint="background"}} {background_commands}')
+
+        lines += [
+            '# HELP ashaassist_mongo_command_seconds_total Time spent in Mongo commands per endpoint',
+            '# TYPE ashaassist_mongo_command_seconds_total counter',
+        ]
+        for (method, route), stats in items:
+            lines.append(f'ashaassist_mongo_command_seconds_total{{method="{method}",endpoint="{route}"}} {stats.mongo_time_ms / 1000:.6f}')
+        lines.append(f'ashaassist_mongo_command_seconds_total{{method="",endpoint="background"}} {background_time_ms / 1000:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry shared by the listener and the Flask hooks
+registry = MetricsRegistry()
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Attributes every completed Mongo command to the request that issued it"""
+
+    def started(self, event):
+        pass
+
+    def _finished(self, event):
+        mongo_ms = event.duration_micros / 1000.0
+        stats = current_request_stats()
+        if stats is None:
+            registry.record_background(mongo_ms)
+            return
+        stats['commands'] += 1
+        stats['mongoMs'] += mongo_ms
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+
+command_listener = MongoCommandListener()
+
+
+def register_command_listener():
+    """Register the command listener globally; must run before the MongoClient is created"""
+    global _listener_registered
+    with _listener_lock:
+        if not _listener_registered:
+            monitoring.register(command_listener)
+            _listener_registered = True
+
+
+def init_metrics(app):
+    """Attach request timing hooks to the Flask application"""
+    register_command_listener()
+
+    @app.before_request
+    def _start_request_metrics():
+        _local.request = {
+            'start': time.perf_counter(),
+            'commands': 0,
+            'mongoMs': 0.0,
+        }
+
+    @app.after_request
+    def _record_request_metrics(response):
+        stats = current_request_stats()
+        if stats is not None:
+            latency_ms = (time.perf_counter() - stats['start']) * 1000.0
+            route = request.url_rule.rule if request.url_rule else '<unmatched>'
+            registry.record(request.method, route, latency_ms, response.status_code,
+                            stats['commands'], stats['mongoMs'])
+        return response
+
+    @app.teardown_request
+    def _clear_request_metrics(exc):
+        _local.request = None
+
+    return registry
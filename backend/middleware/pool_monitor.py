@@ -0,0 +1,142 @@
+"""
+MongoDB connection pool monitoring
+Tracks open/checked-out connections and the time requests wait for a pooled
+connection, per server, from pymongo's connection pool events.
+"""
+import threading
+import time
+from pymongo import monitoring
+
+# Per-thread start time of the checkout in progress (checkout events fire on the requesting thread)
+_local = threading.local()
+
+
+class PoolStats:
+    """Counters for the pool of a single server address"""
+    __slots__ = ('open', 'checked_out', 'max_checked_out', 'created', 'closed', 'checkouts',
+                 'checkout_failures', 'wait_ms_sum', 'wait_ms_max', 'cleared')
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_ms_sum = 0.0
+        self.wait_ms_max = 0.0
+        self.cleared = 0
+
+    def to_dict(self):
+        return {
+            'open': self.open,
+            'checkedOut': self.checked_out,
+            'maxCheckedOut': self.max_checked_out,
+            'created': self.created,
+            'closed': self.closed,
+            'checkouts': self.checkouts,
+            'checkoutFailures': self.checkout_failures,
+            'cleared': self.cleared,
+            'waitMs': {
+                'avg': round(self.wait_ms_sum / self.checkouts, 3) if self.checkouts else 0.0,
+                'max': round(self.wait_ms_max, 3),
+                'total': round(self.wait_ms_sum, 2),
+            },
+        }
+
+
+class ConnectionPoolMonitor(monitoring.ConnectionPoolListener):
+    """Thread-safe connection pool statistics, keyed by 'host:port'"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools = {}
+
+    def _pool(self, address):
+        key = f'{address[0]}:{address[1]}'
+        stats = self._pools.get(key)
+        if stats is None:
+            stats = self._pools[key] = PoolStats()
+        return stats
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address).cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            stats = self._pool(event.address)
+            stats.created += 1
+            stats.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            stats = self._pool(event.address)
+            stats.closed += 1
+            stats.open = max(0, stats.open - 1)
+
+    def connection_check_out_started(self, event):
+        _local.checkout_started = time.perf_counter()
+
+    def _wait_ms(self):
+        started = getattr(_local, 'checkout_started', None)
+        _local.checkout_started = None
+        return (time.perf_counter() - started) * 1000.0 if started is not None else 0.0
+
+    def connection_check_out_failed(self, event):
+        self._wait_ms()
+        with self._lock:
+            self._pool(event.address).checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            stats = self._pool(event.address)
+            stats.checkouts += 1
+            stats.checked_out += 1
+            stats.max_checked_out = max(stats.max_checked_out, stats.checked_out)
+            stats.wait_ms_sum += wait_ms
+            stats.wait_ms_max = max(stats.wait_ms_max, wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            stats = self._pool(event.address)
+            stats.checked_out = max(0, stats.checked_out - 1)
+
+    def reset(self):
+        """Clear cumulative counters; live open/checked-out gauges are kept"""
+        with self._lock:
+            for stats in self._pools.values():
+                live = (stats.open, stats.checked_out)
+                stats.__init__()
+                stats.open, stats.checked_out = live
+                stats.max_checked_out = stats.checked_out
+
+    def snapshot(self):
+        """JSON-friendly per-server statistics plus totals"""
+        with self._lock:
+            servers = {address: stats.to_dict() for address, stats in self._pools.items()}
+        totals = {
+            key: sum(s[key] for s in servers.values())
+            for key in ('open', 'checkedOut', 'checkouts', 'checkoutFailures')
+        }
+        totals['maxWaitMs'] = max((s['waitMs']['max'] for s in servers.values()), default=0.0)
+        return {'servers': servers, 'totals': totals}
+
+
+# Process-wide monitor; passed to the shared MongoClient in config.database
+pool_monitor = ConnectionPoolMonitor()
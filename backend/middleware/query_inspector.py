@@ -0,0 +1,198 @@
+"""
+N+1 query detector and per-endpoint query budgets
+Watches the Mongo commands issued while serving a request, flags repeated
+same-shape queries and enforces declared query budgets (dev/staging only).
+"""
+import os
+import threading
+import traceback
+from collections import Counter
+from functools import wraps
+from flask import request, jsonify, current_app
+from pymongo import monitoring
+
+# Commands that are driver housekeeping rather than application queries
+IGNORED_COMMANDS = {'getMore', 'killCursors', 'endSessions', 'hello', 'isMaster', 'ismaster', 'ping', 'buildInfo'}
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_APP_DIRS = tuple(os.path.join(_BACKEND_DIR, d) + os.sep for d in ('routes', 'services', 'utils'))
+
+_local = threading.local()
+_listener_registered = False
+_listener_lock = threading.Lock()
+
+
+def query_budget(max_commands):
+    """Declare the maximum number of Mongo commands an endpoint may issue per request.
+
+    Place directly below the route decorator so the budget is attached to the view:
+
+        @bp.route('/api/things')
+        @query_budget(5)
+        @jwt_required()
+        def list_things(): ...
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+        wrapper._query_budget = int(max_commands)
+        return wrapper
+    return decorator
+
+
+def _shape(value, depth=0):
+    """Reduce a query document to its structure, replacing literal values with '?'"""
+    if depth > 6:
+        return '…'
+    if isinstance(value, dict):
+        return '{' + ','.join(f'{k}:{_shape(v, depth + 1)}' for k, v in sorted(value.items())) + '}'
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(v, dict) for v in value):
+            return '[' + ','.join(_shape(v, depth + 1) for v in value) + ']'
+        return '[?]'
+    return '?'
+
+
+def command_shape(command_name, command):
+    """Build a stable key describing what a command does, independent of its parameters"""
+    collection = command.get(command_name)
+    if command_name == 'find':
+        detail = _shape(command.get('filter', {}))
+    elif command_name == 'aggregate':
+        detail = _shape(command.get('pipeline', []))
+    elif command_name in ('update', 'delete'):
+        statements = command.get('updates') or command.get('deletes') or []
+        detail = _shape(statements[0].get('q', {})) if statements else ''
+    elif command_name == 'findAndModify':
+        detail = _shape(command.get('query', {}))
+    elif command_name in ('count', 'distinct'):
+        detail = _shape(command.get('query', {}))
+    else:
+        detail = ''
+    return f'{command_name} {collection} {detail}'.strip()
+
+
+def _call_site():
+    """Return 'file:line (function)' of the innermost application frame"""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_APP_DIRS):
+            return f'{os.path.relpath(frame.filename, _BACKEND_DIR)}:{frame.lineno} ({frame.name})'
+    return 'unknown'
+
+
+class QueryShapeListener(monitoring.CommandListener):
+    """Records the shape and call site of every command issued by the current request"""
+
+    def started(self, event):
+        commands = getattr(_local, 'commands', None)
+        if commands is None or event.command_name in IGNORED_COMMANDS:
+            return
+        try:
+            shape = command_shape(event.command_name, event.command)
+        except Exception:
+            shape = event.command_name
+        commands.append((shape, _call_site()))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+shape_listener = QueryShapeListener()
+
+
+def register_shape_listener():
+    """Register the shape listener globally; must run before the MongoClient is created"""
+    global _listener_registered
+    with _listener_lock:
+        if not _listener_registered:
+            monitoring.register(shape_listener)
+            _listener_registered = True
+
+
+def analyze_commands(commands, repeat_threshold):
+    """Group recorded commands by shape and return those repeated at least repeat_threshold times"""
+    counts = Counter(shape for shape, _ in commands)
+    repeated = []
+    for shape, count in counts.most_common():
+        if count < repeat_threshold:
+            break
+        sites = Counter(site for s, site in commands if s == shape)
+        repeated.append({
+            'shape': shape,
+            'count': count,
+            'callSites': [site for site, _ in sites.most_common(3)],
+        })
+    return repeated
+
+
+def init_query_inspector(app):
+    """Attach the detector to the application when QUERY_INSPECTOR_MODE is 'log' or 'strict'"""
+    mode = (app.config.get('QUERY_INSPECTOR_MODE') or 'off').lower()
+    if mode not in ('log', 'strict'):
+        return False
+
+    register_shape_listener()
+    repeat_threshold = int(app.config.get('QUERY_REPEAT_THRESHOLD') or 5)
+    default_budget = app.config.get('QUERY_DEFAULT_BUDGET')
+    configured_budgets = app.config.get('QUERY_BUDGETS') or {}
+
+    def _budget_for_request():
+        view = current_app.view_functions.get(request.endpoint) if request.endpoint else None
+        route = request.url_rule.rule if request.url_rule else None
+        if route in configured_budgets:
+            return int(configured_budgets[route])
+        if view is not None and getattr(view, '_query_budget', None) is not None:
+            return view._query_budget
+        return int(default_budget) if default_budget else None
+
+    @app.before_request
+    def _start_query_inspection():
+        _local.commands = []
+
+    @app.after_request
+    def _finish_query_inspection(response):
+        commands = getattr(_local, 'commands', None)
+        if commands is None:
+            return response
+        _local.commands = None
+
+        route = request.url_rule.rule if request.url_rule else request.path
+        repeated = analyze_commands(commands, repeat_threshold)
+        budget = _budget_for_request()
+        over_budget = budget is not None and len(commands) > budget
+
+        for item in repeated:
+            print(f"[QUERY] Possible N+1 on {request.method} {route}: "
+                  f"{item['count']}x {item['shape']} at {', '.join(item['callSites'])}")
+        if over_budget:
+            print(f"[QUERY] Budget exceeded on {request.method} {route}: "
+                  f"{len(commands)} commands (budget {budget})")
+
+        response.headers['X-Query-Count'] = str(len(commands))
+        if budget is not None:
+            response.headers['X-Query-Budget'] = str(budget)
+
+        if mode == 'strict' and over_budget:
+            failure = jsonify({
+                'error': 'Query budget exceeded',
+                'endpoint': route,
+                'commands': len(commands),
+                'budget': budget,
+                'repeated': repeated,
+            })
+            failure.status_code = 500
+            failure.headers['X-Query-Count'] = str(len(commands))
+            failure.headers['X-Query-Budget'] = str(budget)
+            return failure
+        return response
+
+    @app.teardown_request
+    def _clear_query_inspection(exc):
+        _local.commands = None
+
+    print(f"[QUERY] Query inspector enabled (mode={mode}, repeat threshold={repeat_threshold})")
+    return True
@@ -6,6 +6,11 @@ from flask_jwt_extended import jwt_required, get_jwt
 from datetime import datetime, timezone
 from bson import ObjectId
 from utils.helpers import to_iso_string
+from utils.pagination import KeysetPage
+from services.ward_stats_service import ward_stats
+from services.booking_expiry import booking_expiry, effective_status
+from services.vaccination_reminders import vaccination_reminders
+from utils.jobs import job_runner
 
 # Create blueprint
 admin_bp = Blueprint('admin', __name__)
@@ -109,16 +114,16 @@ def init_admin_routes(app, collections):
     @jwt_required()
     def admin_vaccination_overview():
         """Return vaccination schedules with booking stats for admin dashboard"""
+        page = KeysetPage.from_request([('date', -1)])
         try:
             admin_check = require_admin()
             if admin_check:
                 return admin_check
 
             # List schedules
-            schedules_cursor = collections['vaccination_schedules'].find({}).sort('date', -1)
-            schedules = list(schedules_cursor)
+            schedules = list(page.fetch(collections['vaccination_schedules']))
             if not schedules:
-                return jsonify({'schedules': []}), 200
+                return jsonify(page.wrap({'schedules': []})), 200
 
             schedule_ids = [s['_id'] for s in schedules]
 
@@ -132,10 +137,13 @@ def init_admin_routes(app, collections):
                 }}
             ]
             agg = list(collections['vaccination_bookings'].aggregate(pipeline))
+            schedule_dates = {s['_id']: s.get('date') for s in schedules}
             stats_map = {}
             for a in agg:
                 counts = { 'Booked': 0, 'Completed': 0, 'Expired': 0, 'Cancelled': 0 }
                 for st in a.get('byStatus', []):
+                    # Bookings of past schedules count as expired before the expiry job stores it
+                    st = effective_status(st, schedule_dates.get(a['_id']))
                     if st in counts:
                         counts[st] += 1
                     else:
@@ -163,14 +171,81 @@ def init_admin_routes(app, collections):
                     }
                 })
 
-            return jsonify({ 'schedules': result }), 200
+            return jsonify(page.wrap({ 'schedules': result })), 200
         except Exception as e:
             return jsonify({'error': f'Failed to load vaccination overview: {str(e)}'}), 500
 
+    @admin_bp.route('/api/admin/booking-expiry', methods=['GET'])
+    @jwt_required()
+    def admin_booking_expiry_status():
+        """Last run of the booking expiry job: duration and affected counts"""
+        try:
+            admin_check = require_admin()
+            if admin_check:
+                return admin_check
+
+            job = job_runner.jobs.get('booking_expiry')
+            return jsonify({
+                'lastRun': booking_expiry.last_run(),
+                'job': job.to_dict() if job else None,
+            }), 200
+        except Exception as e:
+            return jsonify({'error': f'Failed to load booking expiry status: {str(e)}'}), 500
+
+    @admin_bp.route('/api/admin/booking-expiry/run', methods=['POST'])
+    @jwt_required()
+    def admin_run_booking_expiry():
+        """Expire the bookings of past schedules now (normally done by the periodic job)"""
+        try:
+            admin_check = require_admin()
+            if admin_check:
+                return admin_check
+
+            result = booking_expiry.run()
+            return jsonify({'message': f"Expired {result['expired']} booking(s)", **result}), 200
+        except Exception as e:
+            return jsonify({'error': f'Failed to run booking expiry: {str(e)}'}), 500
+
+    @admin_bp.route('/api/admin/vaccination-reminders', methods=['GET'])
+    @jwt_required()
+    def admin_vaccination_reminders_status():
+        """Last run of the daily vaccination reminder job: counts and phase timings"""
+        try:
+            admin_check = require_admin()
+            if admin_check:
+                return admin_check
+
+            job = job_runner.jobs.get('vaccination_reminders')
+            return jsonify({
+                'lastRun': vaccination_reminders.last_run(),
+                'job': job.to_dict() if job else None,
+            }), 200
+        except Exception as e:
+            return jsonify({'error': f'Failed to load vaccination reminder status: {str(e)}'}), 500
+
+    @admin_bp.route('/api/admin/vaccination-reminders/run', methods=['POST'])
+    @jwt_required()
+    def admin_run_vaccination_reminders():
+        """Send today's vaccination reminders now; ?dryRun=true only reports what would be sent"""
+        try:
+            admin_check = require_admin()
+            if admin_check:
+                return admin_check
+
+            dry_run = request.args.get('dryRun', 'false').lower() in ('true', '1', 'yes')
+            result = vaccination_reminders.run(dry_run=dry_run)
+            verb = 'Would send' if dry_run else 'Sent'
+            return jsonify({'message': f"{verb} {result['reminders']} reminder(s) for {result['notifications']} child(ren)",
+                            **result}), 200
+        except Exception as e:
+            return jsonify({'error': f'Failed to run vaccination reminders: {str(e)}'}), 500
+
     @admin_bp.route('/api/admin/users', methods=['GET'])
     @jwt_required()
     def admin_list_users():
-        """List users with filters, pagination and search"""
+        """List users with filters, pagination and search (?after= switches from page/pageSize to keyset pages)"""
+        page = KeysetPage.from_request([('createdAt', -1)], default_limit=20, max_limit=100,
+                                       limit_param='pageSize')
         try:
             admin_check = require_admin()
             if admin_check:
@@ -182,9 +257,9 @@ def init_admin_routes(app, collections):
             category = (request.args.get('category') or '').strip()
             status = (request.args.get('status') or '').strip().lower()  # 'active' | 'inactive'
             try:
-                page = max(int(request.args.get('page') or 1), 1)
+                page_number = max(int(request.args.get('page') or 1), 1)
             except Exception:
-                page = 1
+                page_number = 1
             try:
                 page_size = int(request.args.get('pageSize') or 20)
                 page_size = max(1, min(page_size, 100))
@@ -203,14 +278,19 @@ def init_admin_routes(app, collections):
                     { 'phone': { '$regex': q, '$options': 'i' } }
                 ]
 
-            total = collections['users'].count_documents(query)
-            cursor = (
-                collections['users']
-                .find(query)
-                .sort('createdAt', -1)
-                .skip((page - 1) * page_size)
-                .limit(page_size)
-            )
+            if page.enabled:
+                # Keyset mode: constant cost per page, no total count
+                total = None
+                cursor = page.fetch(collections['users'], query)
+            else:
+                total = collections['users'].count_documents(query)
+                cursor = (
+                    collections['users']
+                    .find(query)
+                    .sort('createdAt', -1)
+                    .skip((page_number - 1) * page_size)
+                    .limit(page_size)
+                )
 
             users = []
             for doc in cursor:
@@ -226,10 +306,12 @@ def init_admin_routes(app, collections):
                     'lastLogin': to_iso_string(doc.get('lastLogin'))
                 })
 
+            if page.enabled:
+                return jsonify(page.wrap({'users': users, 'pageSize': page.limit})), 200
             return jsonify({
                 'users': users,
                 'total': int(total),
-                'page': page,
+                'page': page_number,
                 'pageSize': page_size
             }), 200
         except Exception as e:
@@ -286,11 +368,12 @@ def init_admin_routes(app, collections):
             payload = request.get_json() or {}
             isActive = bool(payload.get('isActive'))
 
-            res = collections['users'].update_one(
+            before = ward_stats.update_one(
+                'users',
                 { '_id': _id },
                 { '$set': { 'isActive': isActive, 'updatedAt': datetime.now(timezone.utc) } }
             )
-            if res.matched_count == 0:
+            if before is None:
                 return jsonify({'error': 'User not found'}), 404
 
             return jsonify({ 'message': 'Status updated', 'isActive': isActive }), 200
@@ -343,8 +426,8 @@ def init_admin_routes(app, collections):
 
             update['updatedAt'] = datetime.now(timezone.utc)
 
-            res = collections['users'].update_one({ '_id': _id }, { '$set': update })
-            if res.matched_count == 0:
+            before = ward_stats.update_one('users', { '_id': _id }, { '$set': update })
+            if before is None:
                 return jsonify({'error': 'User not found'}), 404
 
             return jsonify({ 'message': 'User updated' }), 200
@@ -3,11 +3,15 @@ Authentication routes for user login, registration, and Google sign-in
 """
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, create_access_token
-from firebase_admin import auth
+from config.firebase import ensure_firebase
 from datetime import datetime, timezone
 from bson import ObjectId
 from services.auth_service import AuthService
+from services.ward_stats_service import ward_stats
 from utils.validators import validate_email, validate_password
+from utils.lazy import lazy_module
+
+auth = lazy_module('firebase_admin.auth')
 
 # Create blueprint
 auth_bp = Blueprint('auth', __name__)
@@ -59,6 +63,7 @@ def init_auth_routes(app, collections):
             
             # Verify the Google ID token
             try:
+                ensure_firebase()
                 decoded_token = auth.verify_id_token(data['token'])
                 google_uid = decoded_token['uid']
                 email = (decoded_token.get('email') or '').strip().lower()
@@ -149,6 +154,7 @@ def init_auth_routes(app, collections):
                 
                 # Insert user
                 result = collections['users'].insert_one(user_doc)
+                ward_stats.record_insert('users', user_doc)
                 
                 # Create access token
                 access_token = create_access_token(
@@ -272,6 +278,7 @@ def init_auth_routes(app, collections):
             # Verify and reset password using Firebase
             try:
                 # Get the email associated with the reset code
+                ensure_firebase()
                 email = auth.verify_password_reset_code(oob_code)
 
                 # Reset password in Firebase
@@ -392,12 +399,9 @@ def init_auth_routes(app, collections):
             data['updatedAt'] = datetime.now(timezone.utc).isoformat()
             
             # Update user
-            result = collections['users'].update_one(
-                {'_id': ObjectId(user_id)},
-                {'$set': data}
-            )
+            before = ward_stats.update_one('users', {'_id': ObjectId(user_id)}, {'$set': data})
             
-            if result.matched_count == 0:
+            if before is None:
                 return jsonify({'error': 'User not found'}), 404
             
             # Initialize PMSMA benefits if LMP is being set
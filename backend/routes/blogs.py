@@ -7,6 +7,9 @@ from datetime import datetime, timezone
 from bson import ObjectId
 from services.file_service import FileService
 from utils.svg_generator import generate_svg_banner, slugify
+from utils.pagination import KeysetPage
+from middleware.conditional import conditional, collection_versions
+from services.ward_stats_service import ward_stats
 
 # Create blueprint
 blogs_bp = Blueprint('blogs', __name__)
@@ -61,14 +64,18 @@ def init_blogs_routes(app, collections):
                 'tags': data.get('tags') or []
             }
             result = collections['health_blogs'].insert_one(doc)
+            ward_stats.record_insert('health_blogs', doc)
+            collection_versions.bump('health_blogs')
             return jsonify({'message': 'Blog created', 'id': str(result.inserted_id)}), 201
         except Exception as e:
             return jsonify({'error': f'Failed to create blog: {str(e)}'}), 500
 
     @blogs_bp.route('/api/health-blogs', methods=['GET'])
     @jwt_required()
+    @conditional(versions=('health_blogs',), max_age=60, vary_claims=('userType',))
     def list_health_blogs():
         """List health blogs with optional filters"""
+        page = KeysetPage.from_request([('createdAt', -1)])
         try:
             claims = get_jwt() or {}
             user_type = claims.get('userType')
@@ -93,9 +100,8 @@ def init_blogs_routes(app, collections):
                 except Exception:
                     pass
 
-            cursor = collections['health_blogs'].find(query).sort('createdAt', -1)
             items = []
-            for doc in cursor:
+            for doc in page.fetch(collections['health_blogs'], query):
                 doc['id'] = str(doc['_id'])
                 doc.pop('_id', None)
                 doc['createdBy'] = str(doc['createdBy'])
@@ -104,12 +110,13 @@ def init_blogs_routes(app, collections):
                 if isinstance(doc.get('updatedAt'), datetime):
                     doc['updatedAt'] = doc['updatedAt'].isoformat()
                 items.append(doc)
-            return jsonify({'blogs': items}), 200
+            return jsonify(page.wrap({'blogs': items})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list blogs: {str(e)}'}), 500
 
     @blogs_bp.route('/api/health-blogs/<blog_id>', methods=['GET'])
     @jwt_required()
+    @conditional(versions=('health_blogs',), max_age=60, vary_claims=('userType',))
     def get_health_blog(blog_id):
         """Get a specific health blog"""
         try:
@@ -161,7 +168,8 @@ def init_blogs_routes(app, collections):
                 'tags': data.get('tags')
             }.items() if v is not None}
             update['updatedAt'] = datetime.now(timezone.utc)
-            collections['health_blogs'].update_one({'_id': ObjectId(blog_id)}, {'$set': update})
+            ward_stats.update_one('health_blogs', {'_id': ObjectId(blog_id)}, {'$set': update})
+            collection_versions.bump('health_blogs')
             return jsonify({'message': 'Blog updated'}), 200
         except Exception as e:
             return jsonify({'error': f'Failed to update blog: {str(e)}'}), 500
@@ -180,7 +188,9 @@ def init_blogs_routes(app, collections):
                 return jsonify({'error': 'Blog not found'}), 404
             if not is_privileged and str(existing['createdBy']) != str(ObjectId(user_id)):
                 return jsonify({'error': 'Not allowed'}), 403
-            collections['health_blogs'].delete_one({'_id': ObjectId(blog_id)})
+            if collections['health_blogs'].delete_one({'_id': ObjectId(blog_id)}).deleted_count:
+                ward_stats.record_delete('health_blogs', existing)
+            collection_versions.bump('health_blogs')
             return jsonify({'message': 'Blog deleted'}), 200
         except Exception as e:
             return jsonify({'error': f'Failed to delete blog: {str(e)}'}), 500
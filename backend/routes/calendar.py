@@ -6,6 +6,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timezone
 from bson import ObjectId
 from utils.helpers import parse_datetime
+from utils.pagination import KeysetPage
+from utils.projections import projection
 
 # Create blueprint
 calendar_bp = Blueprint('calendar', __name__)
@@ -17,6 +19,7 @@ def init_calendar_routes(app, collections):
     @jwt_required()
     def list_calendar_events():
         """List calendar events with optional month filter"""
+        page = KeysetPage.from_request([('date', 1)])
         try:
             # Optional month filter: ?month=YYYY-MM
             month = request.args.get('month')
@@ -34,9 +37,8 @@ def init_calendar_routes(app, collections):
                 except Exception:
                     pass
             
-            cursor = collections['calendar_events'].find(query).sort('date', 1)
             events = []
-            for doc in cursor:
+            for doc in page.fetch(collections['calendar_events'], query):
                 # Handle both old format (start/end) and new format (date)
                 if doc.get('date'):
                     event_date = doc.get('date')
@@ -62,7 +64,7 @@ def init_calendar_routes(app, collections):
                     'createdBy': str(doc.get('createdBy')) if doc.get('createdBy') else None,
                     'createdAt': doc.get('createdAt').isoformat() if isinstance(doc.get('createdAt'), datetime) else doc.get('createdAt'),
                 })
-            return jsonify({'events': events}), 200
+            return jsonify(page.wrap({'events': events})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to load events: {str(e)}'}), 500
 
@@ -135,7 +137,7 @@ def init_calendar_routes(app, collections):
                 if notify_users_param == 'none':
                     email_count = 0
                 elif notify_users_param == 'all' or not isinstance(notify_users_param, list):
-                    all_users = list(collections['users'].find({'email': {'$exists': True, '$ne': ''}}))
+                    all_users = list(collections['users'].find({'email': {'$exists': True, '$ne': ''}}, projection('user.contact')))
                     email_count = send_calendar_event_notification(all_users, doc)
                 else:
                     # notify_users_param is a list of user ID strings
@@ -147,7 +149,7 @@ def init_calendar_routes(app, collections):
                         except Exception:
                             pass
                     selected_users = list(collections['users'].find(
-                        {'_id': {'$in': selected_ids}, 'email': {'$exists': True, '$ne': ''}}
+                        {'_id': {'$in': selected_ids}, 'email': {'$exists': True, '$ne': ''}}, projection('user.contact')
                     )) if selected_ids else []
                     email_count = send_calendar_event_notification(selected_users, doc)
                 print(f"[EMAIL] Calendar event email sent to {email_count} users")
@@ -243,6 +245,7 @@ def init_calendar_routes(app, collections):
     @jwt_required()
     def list_users_for_notification():
         """List all registered users for ASHA worker notification targeting (ASHA/Admin only)"""
+        page = KeysetPage.from_request([('name', 1)], default_limit=100)
         try:
             claims = get_jwt() or {}
             if claims.get('userType') not in ['asha_worker', 'admin']:
@@ -256,10 +259,7 @@ def init_calendar_routes(app, collections):
             if user_type_filter:
                 query['userType'] = user_type_filter
 
-            cursor = collections['users'].find(
-                query,
-                {'name': 1, 'email': 1, 'userType': 1}
-            ).sort('name', 1)
+            cursor = page.fetch(collections['users'], query, {'name': 1, 'email': 1, 'userType': 1})
 
             users = [
                 {
@@ -271,7 +271,7 @@ def init_calendar_routes(app, collections):
                 }
                 for u in cursor
             ]
-            return jsonify({'users': users, 'total': len(users)}), 200
+            return jsonify(page.wrap({'users': users, 'total': len(users)})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list users: {str(e)}'}), 500
 
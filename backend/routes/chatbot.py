@@ -4,8 +4,10 @@ Uses Mistral AI API for healthcare-focused assistance
 """
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import requests
 import os
+from utils.lazy import lazy_module
+
+requests = lazy_module('requests')
 
 chatbot_bp = Blueprint('chatbot', __name__)
 
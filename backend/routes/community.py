@@ -6,6 +6,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timezone
 from bson import ObjectId
 import re
+from utils.pagination import KeysetPage
+from services.ward_stats_service import ward_stats
 
 community_bp = Blueprint('community', __name__)
 
@@ -20,6 +22,7 @@ def init_community_routes(app, collections):
     @community_bp.route('/api/community-classes', methods=['GET'])
     @jwt_required()
     def list_community_classes():
+        page = KeysetPage.from_request([('date', 1)])
         try:
             # Filters: status, dateFrom, dateTo
             status = request.args.get('status')
@@ -35,14 +38,13 @@ def init_community_routes(app, collections):
                 if date_to:
                     query['date']['$lte'] = date_to
 
-            cursor = collections['community_classes'].find(query).sort('date', 1)
             items = []
-            for doc in cursor:
+            for doc in page.fetch(collections['community_classes'], query):
                 doc['id'] = str(doc.get('_id'))
                 doc.pop('_id', None)
                 doc['createdBy'] = str(doc.get('createdBy', ''))
                 items.append(doc)
-            return jsonify({'classes': items}), 200
+            return jsonify(page.wrap({'classes': items})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list community classes: {str(e)}'}), 500
 
@@ -95,6 +97,7 @@ def init_community_routes(app, collections):
             }
 
             res = collections['community_classes'].insert_one(doc)
+            ward_stats.record_insert('community_classes', doc)
             doc['id'] = str(res.inserted_id)
             # Mirror to calendar events
             try:
@@ -134,6 +137,7 @@ def init_community_routes(app, collections):
     @community_bp.route('/api/local-camps', methods=['GET'])
     @jwt_required()
     def list_local_camps():
+        page = KeysetPage.from_request([('date', 1)])
         try:
             status = request.args.get('status')
             date_from = request.args.get('dateFrom')
@@ -148,14 +152,13 @@ def init_community_routes(app, collections):
                 if date_to:
                     query['date']['$lte'] = date_to
 
-            cursor = collections['local_camps'].find(query).sort('date', 1)
             items = []
-            for doc in cursor:
+            for doc in page.fetch(collections['local_camps'], query):
                 doc['id'] = str(doc.get('_id'))
                 doc.pop('_id', None)
                 doc['createdBy'] = str(doc.get('createdBy', ''))
                 items.append(doc)
-            return jsonify({'camps': items}), 200
+            return jsonify(page.wrap({'camps': items})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list local camps: {str(e)}'}), 500
 
@@ -209,6 +212,7 @@ def init_community_routes(app, collections):
             }
 
             res = collections['local_camps'].insert_one(doc)
+            ward_stats.record_insert('local_camps', doc)
             doc['id'] = str(res.inserted_id)
             # Mirror to calendar events
             try:
@@ -454,7 +458,8 @@ def init_community_routes(app, collections):
             # Fetch the document to enable fallback matching for older events
             doc = collections['community_classes'].find_one({'_id': ObjectId(item_id)})
 
-            collections['community_classes'].delete_one({'_id': ObjectId(item_id)})
+            if collections['community_classes'].delete_one({'_id': ObjectId(item_id)}).deleted_count:
+                ward_stats.record_delete('community_classes', doc)
 
             # Remove related calendar events (support legacy events without sourceId/sourceType)
             or_filters = [
@@ -483,7 +488,8 @@ def init_community_routes(app, collections):
             # Fetch the document to enable fallback matching for older events
             doc = collections['local_camps'].find_one({'_id': ObjectId(item_id)})
 
-            collections['local_camps'].delete_one({'_id': ObjectId(item_id)})
+            if collections['local_camps'].delete_one({'_id': ObjectId(item_id)}).deleted_count:
+                ward_stats.record_delete('local_camps', doc)
             # Remove related calendar events (support legacy events without sourceId/sourceType)
             or_filters = [
                 { 'sourceType': 'local_camp', 'sourceId': ObjectId(item_id) }
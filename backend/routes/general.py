@@ -6,6 +6,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timezone
 from bson import ObjectId
 import os
+import time
+from config.database import connection_manager
 
 # Create blueprint
 general_bp = Blueprint('general', __name__)
@@ -24,13 +26,22 @@ def init_general_routes(app, collections):
 
     @general_bp.route('/api/health', methods=['GET'])
     def health_check():
-        """Health check endpoint"""
+        """Health check endpoint (includes connection pool totals, without server addresses)"""
         try:
             # Test database connection
+            ping_start = time.perf_counter()
             collections['users'].database.command('ping')
+            ping_ms = (time.perf_counter() - ping_start) * 1000.0
+            pool = connection_manager.stats()
             return jsonify({
                 'status': 'healthy',
                 'database': 'connected',
+                'pingMs': round(ping_ms, 2),
+                'connectionPool': {
+                    **pool['pool']['totals'],
+                    'maxPoolSize': pool['options']['maxPoolSize'],
+                    'minPoolSize': pool['options']['minPoolSize'],
+                },
                 'timestamp': datetime.now(timezone.utc).isoformat()
             })
         except Exception as e:
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.government_benefits_service import GovernmentBenefitsService
 from bson import ObjectId
+from utils.projections import projection
 
 
 def init_government_benefits_routes(app, collections):
@@ -51,7 +52,7 @@ def init_government_benefits_routes(app, collections):
             current_user_id = get_jwt_identity()
             
             # Get current user to check role
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role'))
             if not current_user:
                 return jsonify({'error': 'User not found'}), 404
             
@@ -144,7 +145,7 @@ def init_government_benefits_routes(app, collections):
             print(f"[DEBUG] Looking up ASHA worker with ObjectId: {ObjectId(current_user_id)}")
             
             # Get current user to check role
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role', 'email'))
             print(f"[DEBUG] ASHA worker found: {current_user is not None}")
             if current_user:
                 print(f"[DEBUG] ASHA worker email: {current_user.get('email')}, userType: {current_user.get('userType')}")
@@ -170,7 +171,7 @@ def init_government_benefits_routes(app, collections):
             current_user_id = get_jwt_identity()
             
             # Get current user to check role
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role'))
             if not current_user:
                 return jsonify({'error': 'User not found'}), 404
             
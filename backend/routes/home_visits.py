@@ -9,6 +9,9 @@ from datetime import datetime, timezone
 from bson import ObjectId
 from werkzeug.utils import secure_filename
 import os
+from middleware.query_inspector import query_budget
+from utils.projections import projection
+from services.ward_stats_service import ward_stats
 
 home_visits_bp = Blueprint('home_visits', __name__)
 
@@ -30,6 +33,7 @@ def init_home_visits_routes(app, collections):
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
     @home_visits_bp.route('/api/home-visits/users', methods=['GET'])
+    @query_budget(4)
     @jwt_required()
     def get_users_for_visits():
         """Get all maternity and palliative users for ASHA worker to visit"""
@@ -41,7 +45,7 @@ def init_home_visits_routes(app, collections):
                 return jsonify({'error': 'Only ASHA workers can access this'}), 403
             
             current_user_id = get_jwt_identity()
-            asha_worker = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            asha_worker = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.ward'))
             
             if not asha_worker:
                 return jsonify({'error': 'ASHA worker not found'}), 404
@@ -57,18 +61,28 @@ def init_home_visits_routes(app, collections):
             
             # Only filter by ward if users have ward field
             # For now, get all active maternity/palliative users
-            users = list(collections['users'].find(query))
+            users = list(collections['users'].find(query, projection('user.visit_card')))
+            
+            # Last visit and visit count for every user in a single aggregation
+            user_ids = [str(user['_id']) for user in users]
+            visit_stats = {}
+            if user_ids:
+                for row in collections['home_visits'].aggregate([
+                    {'$match': {'userId': {'$in': user_ids}}},
+                    {'$sort': {'visitDate': -1}},
+                    {'$group': {
+                        '_id': '$userId',
+                        'lastVisitDate': {'$first': '$visitDate'},
+                        'lastVisitId': {'$first': '$_id'},
+                        'totalVisits': {'$sum': 1}
+                    }}
+                ]):
+                    visit_stats[row['_id']] = row
             
-            # Get last visit for each user
             user_list = []
             for user in users:
                 user_id_str = str(user['_id'])
-                
-                # Find last visit
-                last_visit = collections['home_visits'].find_one(
-                    {'userId': user_id_str},
-                    sort=[('visitDate', -1)]
-                )
+                last_visit = visit_stats.get(user_id_str)
                 
                 user_data = {
                     'id': user_id_str,
@@ -78,9 +92,9 @@ def init_home_visits_routes(app, collections):
                     'category': user.get('beneficiaryCategory'),
                     'ward': user.get('ward'),
                     'address': user.get('address', 'Not provided'),
-                    'lastVisitDate': last_visit['visitDate'].isoformat() if last_visit else None,
-                    'lastVisitId': str(last_visit['_id']) if last_visit else None,
-                    'totalVisits': collections['home_visits'].count_documents({'userId': user_id_str})
+                    'lastVisitDate': last_visit['lastVisitDate'].isoformat() if last_visit else None,
+                    'lastVisitId': str(last_visit['lastVisitId']) if last_visit else None,
+                    'totalVisits': last_visit['totalVisits'] if last_visit else 0
                 }
                 user_list.append(user_data)
             
@@ -131,7 +145,7 @@ def init_home_visits_routes(app, collections):
                 return jsonify({'error': 'Geotagged photo is required'}), 400
             
             # Get user details
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.visit_card'))
             if not user:
                 return jsonify({'error': 'User not found'}), 404
             
@@ -156,6 +170,7 @@ def init_home_visits_routes(app, collections):
             }
             
             result = collections['home_visits'].insert_one(visit_doc)
+            ward_stats.record_insert('home_visits', visit_doc)
             
             return jsonify({
                 'message': 'Visit recorded successfully',
@@ -212,6 +227,7 @@ def init_home_visits_routes(app, collections):
             return jsonify({'error': f'Failed to load visits: {str(e)}'}), 500
 
     @home_visits_bp.route('/api/home-visits/all', methods=['GET'])
+    @query_budget(3)
     @jwt_required()
     def get_all_visits():
         """Get all visits for admin monitoring"""
@@ -251,7 +267,13 @@ def init_home_visits_routes(app, collections):
             
             visits = list(collections['home_visits'].find(query).sort('visitDate', -1).limit(100))
             
-            # Get ASHA worker names
+            # Get ASHA worker names (single lookup for all workers on the page)
+            worker_ids = list({ObjectId(v['ashaWorkerId']) for v in visits if ObjectId.is_valid(v.get('ashaWorkerId'))})
+            worker_names = {}
+            if worker_ids:
+                for worker in collections['users'].find({'_id': {'$in': worker_ids}}, {'name': 1}):
+                    worker_names[str(worker['_id'])] = worker.get('name')
+            
             for visit in visits:
                 visit['_id'] = str(visit['_id'])
                 visit['visitDate'] = visit['visitDate'].isoformat() if visit.get('visitDate') else None
@@ -259,8 +281,7 @@ def init_home_visits_routes(app, collections):
                 visit['updatedAt'] = visit['updatedAt'].isoformat() if visit.get('updatedAt') else None
                 
                 # Get ASHA worker name
-                asha_worker = collections['users'].find_one({'_id': ObjectId(visit['ashaWorkerId'])})
-                visit['ashaWorkerName'] = asha_worker.get('name') if asha_worker else 'Unknown'
+                visit['ashaWorkerName'] = worker_names.get(str(visit.get('ashaWorkerId'))) or 'Unknown'
             
             return jsonify({'visits': visits}), 200
             
@@ -290,12 +311,9 @@ def init_home_visits_routes(app, collections):
                 'updatedAt': datetime.now(timezone.utc)
             }
             
-            result = collections['home_visits'].update_one(
-                {'_id': ObjectId(visit_id)},
-                {'$set': update_data}
-            )
+            before = ward_stats.update_one('home_visits', {'_id': ObjectId(visit_id)}, {'$set': update_data})
             
-            if result.matched_count == 0:
+            if before is None:
                 return jsonify({'error': 'Visit not found'}), 404
             
             return jsonify({'message': 'Visit verification updated'}), 200
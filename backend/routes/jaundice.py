@@ -4,52 +4,59 @@ AI-powered jaundice screening using pretrained CNN model
 """
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-import numpy as np
-import cv2
 import os
 from datetime import datetime, timezone
+from utils.lazy import lazy_module, lazy_resource, module_available
 
-# TensorFlow imports
-try:
-    from tensorflow import keras
-    import tensorflow as tf
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
+# NumPy, OpenCV and TensorFlow are imported on the first prediction (or by the warm-up thread)
+np = lazy_module('numpy')
+cv2 = lazy_module('cv2')
+tf = lazy_module('tensorflow')
+
+# Checked without importing TensorFlow, which alone takes seconds and hundreds of MB
+TENSORFLOW_AVAILABLE = module_available('tensorflow')
+if not TENSORFLOW_AVAILABLE:
     print("WARNING: TensorFlow not installed. Jaundice detection will use mock predictions.")
 
 # Create blueprint
 jaundice_bp = Blueprint('jaundice', __name__)
 
-# Global model variable (loaded once at startup)
-model = None
 CLASS_LABELS = ["Normal", "Mild Jaundice", "Severe Jaundice"]
 
-def load_model():
+def _build_model():
     """
     Load the pretrained jaundice detection model
     Model should be placed at: backend/models/jaundice_model.h5
     """
-    global model
-    
     if not TENSORFLOW_AVAILABLE:
         print("TensorFlow not available, skipping model load")
-        return False
+        return None
     
     model_path = os.path.join(os.path.dirname(__file__), '..', 'models', 'jaundice_model.h5')
     
     if not os.path.exists(model_path):
         print(f"WARNING: Model file not found at {model_path}")
         print("Jaundice detection will use mock predictions")
-        return False
+        return None
     
     try:
-        model = keras.models.load_model(model_path)
+        loaded = tf.keras.models.load_model(model_path)
         print(f"✅ Jaundice detection model loaded successfully from {model_path}")
-        return True
+        return loaded
     except Exception as e:
         print(f"❌ Error loading model: {str(e)}")
-        return False
+        return None
+
+# Loaded once per process: at startup, on first use in fast-boot mode, or by the warm-up thread
+_model = lazy_resource('jaundice_model', _build_model)
+
+def load_model():
+    """Load the model (at most once) and report whether it is usable"""
+    return _model.get() is not None
+
+def ensure_model_loaded():
+    """Load the model on first use when it was not preloaded at startup"""
+    return load_model()
 
 def preprocess_image(image_bytes):
     """
@@ -114,11 +121,12 @@ def get_mock_prediction(image_type):
         'isMockPrediction': True
     }
 
-def init_jaundice_routes(app, collections):
+def init_jaundice_routes(app, collections, preload=True):
     """Initialize jaundice detection routes with dependencies"""
     
-    # Try to load model at startup
-    load_model()
+    # Try to load model at startup (deferred to the first prediction when preload is False)
+    if preload:
+        load_model()
     
     @jaundice_bp.route('/api/jaundice/predict', methods=['POST'])
     @jwt_required()
@@ -170,7 +178,7 @@ def init_jaundice_routes(app, collections):
                 return jsonify({'error': 'File size must be less than 10MB'}), 400
             
             # If model is not loaded, return mock prediction
-            if model is None:
+            if not ensure_model_loaded():
                 print("Using mock prediction (model not loaded)")
                 result = get_mock_prediction(image_type)
                 return jsonify(result), 200
@@ -183,7 +191,7 @@ def init_jaundice_routes(app, collections):
             
             # Run model inference
             try:
-                predictions = model.predict(preprocessed_image, verbose=0)
+                predictions = _model.get().predict(preprocessed_image, verbose=0)
                 
                 # predictions shape: [1, 3] - probabilities for each class
                 probabilities = predictions[0]  # Get first (and only) prediction
@@ -220,7 +228,7 @@ def init_jaundice_routes(app, collections):
         """Check if jaundice detection service is ready"""
         return jsonify({
             'status': 'ready',
-            'modelLoaded': model is not None,
+            'modelLoaded': _model.peek() is not None,
             'tensorflowAvailable': TENSORFLOW_AVAILABLE,
             'classes': CLASS_LABELS
         }), 200
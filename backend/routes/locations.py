@@ -5,6 +5,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timezone
 from bson import ObjectId
+from middleware.conditional import conditional, collection_versions
+from services import reference_data
 
 locations_bp = Blueprint('locations', __name__)
 
@@ -13,23 +15,22 @@ def init_locations_routes(app, collections):
 
     @locations_bp.route('/api/locations', methods=['GET'])
     @jwt_required()
+    @conditional(versions=('locations',), max_age=300)
     def get_locations():
         """Get all active locations for dropdown"""
         try:
             # Optional ward filter
-            ward = request.args.get('ward')
-
-            query = {'active': True}
-            if ward:
-                query['ward'] = ward
-
-            locations = list(collections['locations'].find(query).sort('name', 1))
-
-            # Convert ObjectId to string
-            for loc in locations:
-                loc['_id'] = str(loc['_id'])
-                loc['createdAt'] = loc.get('createdAt').isoformat() if loc.get('createdAt') and hasattr(loc['createdAt'], 'isoformat') else None
-                loc['updatedAt'] = loc.get('updatedAt').isoformat() if loc.get('updatedAt') and hasattr(loc['updatedAt'], 'isoformat') else None
+            ward = request.args.get('ward') or None
+
+            # Cached documents are shared: convert into new dicts
+            locations = []
+            for loc in reference_data.active_locations(collections['locations'], ward):
+                locations.append({
+                    **loc,
+                    '_id': str(loc['_id']),
+                    'createdAt': loc.get('createdAt').isoformat() if loc.get('createdAt') and hasattr(loc['createdAt'], 'isoformat') else None,
+                    'updatedAt': loc.get('updatedAt').isoformat() if loc.get('updatedAt') and hasattr(loc['updatedAt'], 'isoformat') else None,
+                })
 
             return jsonify({'locations': locations}), 200
         except Exception as e:
@@ -71,6 +72,8 @@ def init_locations_routes(app, collections):
             }
 
             res = collections['locations'].insert_one(doc)
+            reference_data.invalidate_locations()
+            collection_versions.bump('locations')
             return jsonify({'id': str(res.inserted_id), 'message': 'Location created'}), 201
         except Exception as e:
             return jsonify({'error': f'Failed to create location: {str(e)}'}), 500
@@ -99,6 +102,8 @@ def init_locations_routes(app, collections):
 
             updates['updatedAt'] = datetime.now(timezone.utc)
             collections['locations'].update_one({'_id': ObjectId(location_id)}, {'$set': updates})
+            reference_data.invalidate_locations()
+            collection_versions.bump('locations')
             return jsonify({'message': 'Location updated'}), 200
         except Exception as e:
             return jsonify({'error': f'Failed to update location: {str(e)}'}), 500
@@ -117,6 +122,8 @@ def init_locations_routes(app, collections):
                 {'_id': ObjectId(location_id)},
                 {'$set': {'active': False, 'updatedAt': datetime.now(timezone.utc)}}
             )
+            reference_data.invalidate_locations()
+            collection_versions.bump('locations')
             return jsonify({'message': 'Location deactivated'}), 200
         except Exception as e:
             return jsonify({'error': f'Failed to delete location: {str(e)}'}), 500
@@ -5,6 +5,7 @@ Used by ASHA workers to generate a one-click comprehensive report.
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from bson import ObjectId
+from utils.projections import projection
 from datetime import datetime, timedelta
 
 maternal_report_bp = Blueprint('maternal_report', __name__)
@@ -20,7 +21,7 @@ def init_maternal_report_routes(app, collections):
         try:
             # Verify the requester is an ASHA worker
             requester_id = get_jwt_identity()
-            requester = collections['users'].find_one({'_id': ObjectId(requester_id)})
+            requester = collections['users'].find_one({'_id': ObjectId(requester_id)}, projection('user.role'))
             if not requester or requester.get('userType') != 'asha_worker':
                 return jsonify({'error': 'Access denied. ASHA workers only.'}), 403
 
@@ -6,30 +6,42 @@ import os
 import pickle
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from utils.lazy import lazy_resource
 
 maternal_risk_bp = Blueprint('maternal_risk', __name__)
 
-# Model loaded once at startup
-_model = None
-_label_encoder = None
-
 
 def _load_model():
-    """Load model from disk. Called once during app initialisation."""
-    global _model, _label_encoder
+    """Read the pickled model and label encoder from disk (None when unavailable)."""
     try:
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         model_path = os.path.join(base_dir, 'models', 'maternal_risk_model.pkl')
         if os.path.exists(model_path):
+            # Unpickling imports scikit-learn, which is the bulk of the cost
             with open(model_path, 'rb') as f:
                 payload = pickle.load(f)
-            _model = payload['model']
-            _label_encoder = payload['label_encoder']
             print("[MATERNAL-RISK] Model loaded successfully")
-        else:
-            print("[MATERNAL-RISK] WARNING: model file not found — using rule-based fallback")
+            return payload
+        print("[MATERNAL-RISK] WARNING: model file not found — using rule-based fallback")
     except Exception as e:
         print(f"[MATERNAL-RISK] Failed to load model: {e}")
+    return None
+
+
+# Loaded once per process: at startup, on first prediction in fast-boot mode, or by the warm-up thread
+_payload = lazy_resource('maternal_risk_model', _load_model)
+
+
+def _ensure_model():
+    """Load the model on first use; returns (model, label_encoder) or (None, None)."""
+    payload = _payload.get()
+    if payload is None:
+        return None, None
+    return payload['model'], payload['label_encoder']
+
+
+def _model_loaded():
+    return _payload.peek() is not None
 
 
 def _rule_based_predict(age, systolic, diastolic, bs, temp, heart_rate):
@@ -65,15 +77,15 @@ def predict_risk(age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate):
     """
     features = [[float(age), float(systolic_bp), float(diastolic_bp),
                  float(bs), float(body_temp), float(heart_rate)]]
+    model, label_encoder = _ensure_model()
 
-    if _model is not None:
+    if model is not None:
         try:
-            import numpy as np
-            proba = _model.predict_proba(features)[0]
+            proba = model.predict_proba(features)[0]
             predicted_idx = int(proba.argmax())
-            risk_level = _label_encoder.inverse_transform([predicted_idx])[0]
+            risk_level = label_encoder.inverse_transform([predicted_idx])[0]
             confidence = float(proba[predicted_idx])
-            all_probs = {cls: float(p) for cls, p in zip(_label_encoder.classes_, proba)}
+            all_probs = {cls: float(p) for cls, p in zip(label_encoder.classes_, proba)}
             return risk_level, confidence, all_probs
         except Exception as e:
             print(f"[MATERNAL-RISK] Prediction error: {e}")
@@ -112,16 +124,17 @@ def _get_recommendations(risk_level: str) -> list:
     return recs.get(risk_level, recs['low risk'])
 
 
-def init_maternal_risk_routes(app, collections):
-    """Initialise the maternal risk blueprint."""
-    _load_model()
+def init_maternal_risk_routes(app, collections, preload=True):
+    """Initialise the maternal risk blueprint (preload=False defers the model load to first use)."""
+    if preload:
+        _payload.get()
 
     @maternal_risk_bp.route('/api/maternal-risk/health', methods=['GET'])
     def health_check():
         return jsonify({
             'status': 'ready',
-            'modelLoaded': _model is not None,
-            'fallback': _model is None
+            'modelLoaded': _model_loaded(),
+            'fallback': not _model_loaded()
         }), 200
 
     @maternal_risk_bp.route('/api/maternal-risk/predict', methods=['POST'])
@@ -145,7 +158,7 @@ def init_maternal_risk_routes(app, collections):
                 'confidence': round(confidence * 100, 1),
                 'recommendations': _get_recommendations(risk_level),
                 'allProbabilities': {k: round(v * 100, 1) for k, v in all_probs.items()},
-                'modelUsed': 'ml' if _model else 'rule-based'
+                'modelUsed': 'ml' if _model_loaded() else 'rule-based'
             }), 200
 
         except ValueError as e:
@@ -154,4 +167,4 @@ def init_maternal_risk_routes(app, collections):
             return jsonify({'error': f'Prediction failed: {str(e)}'}), 500
 
     app.register_blueprint(maternal_risk_bp)
-    return _model is not None
+    return _model_loaded()
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.maternity_service import MaternityService
 from services.government_benefits_service import GovernmentBenefitsService
+from services.immunization_status import immunization_status
 from bson import ObjectId
 from datetime import datetime, timezone
 
@@ -267,6 +268,12 @@ def init_maternity_routes(app, collections):
             
             # Unlock installment 3 (birth recorded)
             benefits_service.check_and_unlock_installment3(user_id)
+
+            # Due dates of the newborn's vaccines
+            try:
+                immunization_status.rebuild_mother(ObjectId(user_id))
+            except Exception as e:
+                print(f"[IMMUNIZATION] Warning: could not build the immunization status: {e}")
             
             # Get updated user to return
             updated_user = collections['users'].find_one({'_id': ObjectId(user_id)})
@@ -0,0 +1,58 @@
+"""
+Admin metrics routes
+Exposes per-endpoint latency and Mongo command accounting
+"""
+from flask import Blueprint, request, jsonify, Response, current_app
+from middleware.auth import require_admin
+from middleware.metrics import registry
+from utils.lazy import status as lazy_status
+from middleware.pool_monitor import pool_monitor
+from config.database import connection_manager
+from utils.cache import cache_stats, reset_cache_stats
+from utils.shared_cache import shared_cache_stats, reset_shared_cache_stats
+from utils.jobs import job_runner
+from services.email_outbox import email_outbox
+from services.notification_stream import notification_hub
+from services.certificate_service import certificates
+
+# Create blueprint
+metrics_bp = Blueprint('metrics', __name__)
+
+def init_metrics_routes(app):
+    """Initialize metrics routes"""
+
+    @metrics_bp.route('/api/admin/metrics', methods=['GET'])
+    @require_admin
+    def get_metrics():
+        """Return collected metrics (plus the startup phase report, lazy dependency state and cache counters) as JSON or, with ?format=prometheus, as Prometheus text"""
+        try:
+            fmt = (request.args.get('format') or '').lower()
+            wants_text = 'text/plain' in (request.headers.get('Accept') or '')
+            if fmt == 'prometheus' or (not fmt and wants_text):
+                return Response(registry.to_prometheus(), mimetype='text/plain; version=0.0.4')
+            snapshot = registry.snapshot()
+            snapshot['startup'] = current_app.config.get('STARTUP_REPORT')
+            snapshot['lazyDependencies'] = lazy_status()
+            snapshot['connectionPool'] = connection_manager.stats()
+            snapshot['caches'] = cache_stats()
+            snapshot['sharedCache'] = shared_cache_stats()
+            snapshot['jobs'] = job_runner.status()
+            snapshot['emailOutbox'] = email_outbox.stats()
+            snapshot['notificationStream'] = notification_hub.stats()
+            snapshot['certificates'] = certificates.stats()
+            return jsonify(snapshot), 200
+        except Exception as e:
+            return jsonify({'error': f'Failed to load metrics: {str(e)}'}), 500
+
+    @metrics_bp.route('/api/admin/metrics', methods=['DELETE'])
+    @require_admin
+    def reset_metrics():
+        """Reset the collected metrics of this worker"""
+        registry.reset()
+        pool_monitor.reset()
+        reset_cache_stats()
+        reset_shared_cache_stats()
+        return jsonify({'message': 'Metrics reset'}), 200
+
+    # Register blueprint with app
+    app.register_blueprint(metrics_bp)
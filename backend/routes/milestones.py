@@ -5,6 +5,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.milestone_service import MilestoneService
 from bson import ObjectId
+from middleware.query_inspector import query_budget
+from utils.projections import projection
+from middleware.conditional import conditional, collection_versions
 
 # Create blueprint
 milestones_bp = Blueprint('milestones', __name__)
@@ -19,6 +22,7 @@ def init_milestone_routes(app, collections):
     
     @milestones_bp.route('/api/milestones', methods=['GET'])
     @jwt_required()
+    @conditional(versions=('developmental_milestones',), max_age=3600)
     def get_milestones():
         """Get all developmental milestones"""
         try:
@@ -33,7 +37,7 @@ def init_milestone_routes(app, collections):
         """Get user's milestone progress"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only maternity users can access
             if not user or user.get('beneficiaryCategory') != 'maternity':
@@ -50,7 +54,7 @@ def init_milestone_routes(app, collections):
         """Record a milestone achievement"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only maternity users can record
             if not user or user.get('beneficiaryCategory') != 'maternity':
@@ -86,7 +90,7 @@ def init_milestone_routes(app, collections):
         """Update a milestone record"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only maternity users can update
             if not user or user.get('beneficiaryCategory') != 'maternity':
@@ -110,7 +114,7 @@ def init_milestone_routes(app, collections):
         """Delete a milestone record"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only maternity users can delete
             if not user or user.get('beneficiaryCategory') != 'maternity':
@@ -127,25 +131,28 @@ def init_milestone_routes(app, collections):
         """Seed initial milestone data (Admin only)"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only admins can seed
             if not user or user.get('userType') != 'admin':
                 return jsonify({'error': 'Access denied. Admins only.'}), 403
             
             result, status_code = milestone_service.seed_milestones()
+            if status_code == 201:
+                collection_versions.bump('developmental_milestones')
             return jsonify(result), status_code
         except Exception as e:
             return jsonify({'error': f'Failed to seed milestones: {str(e)}'}), 500
 
     # ASHA Worker Routes
     @milestones_bp.route('/api/milestones/asha/maternal-users', methods=['GET'])
+    @query_budget(3)
     @jwt_required()
     def get_maternal_users_milestones():
         """Get all maternal users with milestone progress (ASHA worker)"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only ASHA workers can access
             if not user or user.get('userType') not in ['asha', 'asha_worker']:
@@ -162,7 +169,7 @@ def init_milestone_routes(app, collections):
         """Get detailed milestone information for a specific user (ASHA worker)"""
         try:
             asha_id = get_jwt_identity()
-            asha_user = collections['users'].find_one({'_id': ObjectId(asha_id)})
+            asha_user = collections['users'].find_one({'_id': ObjectId(asha_id)}, projection('user.role'))
             
             # Only ASHA workers can access
             if not asha_user or asha_user.get('userType') not in ['asha', 'asha_worker']:
@@ -179,7 +186,7 @@ def init_milestone_routes(app, collections):
         """Verify a milestone record (ASHA worker)"""
         try:
             asha_id = get_jwt_identity()
-            asha_user = collections['users'].find_one({'_id': ObjectId(asha_id)})
+            asha_user = collections['users'].find_one({'_id': ObjectId(asha_id)}, projection('user.role'))
             
             # Only ASHA workers can verify
             if not asha_user or asha_user.get('userType') not in ['asha', 'asha_worker']:
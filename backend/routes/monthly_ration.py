@@ -5,6 +5,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.monthly_ration_service import MonthlyRationService
 from bson import ObjectId
+from utils.projections import projection
+from services import reference_data
 
 # Create blueprint
 monthly_ration_bp = Blueprint('monthly_ration', __name__)
@@ -64,6 +66,8 @@ def init_monthly_ration_routes(app, collections):
                     )
         except Exception as e:
             print(f"[Stock] Warning: could not deduct stock for ration: {e}")
+        finally:
+            reference_data.invalidate_stock()
     
     @monthly_ration_bp.route('/api/monthly-rations', methods=['GET'])
     @jwt_required()
@@ -71,7 +75,7 @@ def init_monthly_ration_routes(app, collections):
         """Get all monthly rations for a specific month (Anganvaadi view)"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only anganvaadi workers can view all rations
             if not user or user.get('userType') != 'anganvaadi':
@@ -89,7 +93,7 @@ def init_monthly_ration_routes(app, collections):
         """Get current user's ration status for the month (Maternity user view)"""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             # Only maternity users can check their own status
             if not user or user.get('beneficiaryCategory') != 'maternity':
@@ -107,7 +111,7 @@ def init_monthly_ration_routes(app, collections):
         """Mark ration as collected (can be called by maternity user or anganvaadi)"""
         try:
             current_user_id = get_jwt_identity()
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role'))
             
             if not current_user:
                 return jsonify({'error': 'User not found'}), 404
@@ -142,7 +146,7 @@ def init_monthly_ration_routes(app, collections):
         """Mark ration as pending (undo collection) - Anganvaadi only"""
         try:
             current_user_id = get_jwt_identity()
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role'))
             
             # Only anganvaadi workers can undo collection
             if not current_user or current_user.get('userType') != 'anganvaadi':
@@ -166,7 +170,7 @@ def init_monthly_ration_routes(app, collections):
         """Get ration history for all months (Anganvaadi only)"""
         try:
             current_user_id = get_jwt_identity()
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role'))
             
             # Only anganvaadi workers can view history
             if not current_user or current_user.get('userType') != 'anganvaadi':
@@ -183,7 +187,7 @@ def init_monthly_ration_routes(app, collections):
         """Update all ration records with latest items (Admin/Anganvaadi only)"""
         try:
             current_user_id = get_jwt_identity()
-            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)})
+            current_user = collections['users'].find_one({'_id': ObjectId(current_user_id)}, projection('user.role'))
             
             # Only anganvaadi workers or admins can update items
             if not current_user or current_user.get('userType') not in ['anganvaadi', 'admin']:
@@ -2,10 +2,13 @@
 Notification management routes
 Handles in-app notifications for users
 """
-from flask import Blueprint, request, jsonify
+import json
+import queue
+import time
+from flask import Blueprint, Response, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
-from datetime import datetime, timezone
-from bson import ObjectId
+from services.notification_service import notification_service_for, serialize_notification
+from services.notification_stream import init_notification_stream, stream_tokens
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -13,49 +16,23 @@ notifications_bp = Blueprint('notifications', __name__)
 def init_notification_routes(app, collections):
     """Initialize notification routes with dependencies"""
     
+    notification_service = notification_service_for(collections)
+    notification_hub = init_notification_stream(app, collections)
+
     @notifications_bp.route('/api/notifications', methods=['GET'])
     @jwt_required()
     def get_notifications():
-        """Get all notifications for the current user"""
+        """Get the newest direct and broadcast notifications for the current user"""
         try:
             user_id = get_jwt_identity()
             claims = get_jwt() or {}
             user_type = claims.get('userType', 'user')
             
-            # Build query based on user type
-            # Regular users get notifications targeted to them
-            # ASHA workers can see their own notifications
-            query = {
-                '$or': [
-                    {'recipientId': user_id},  # Direct notifications
-                    {'recipientType': user_type}  # Role-based notifications
-                ]
-            }
-            
-            # Optional filters
-            if request.args.get('unreadOnly') == 'true':
-                query['isRead'] = False
-            
-            # Get notifications sorted by newest first
-            cursor = collections['notifications'].find(query).sort('createdAt', -1).limit(50)
-            
-            notifications = []
-            for doc in cursor:
-                notifications.append({
-                    'id': str(doc['_id']),
-                    'title': doc.get('title', ''),
-                    'message': doc.get('message', ''),
-                    'type': doc.get('type', 'info'),  # info, success, warning, event
-                    'isRead': doc.get('isRead', False),
-                    'relatedEntity': doc.get('relatedEntity'),  # {type: 'event'|'class'|'camp', id: '...'}
-                    'createdAt': doc.get('createdAt').isoformat() if isinstance(doc.get('createdAt'), datetime) else doc.get('createdAt'),
-                })
+            docs, unread_count = notification_service.list_for(
+                user_id, user_type, unread_only=request.args.get('unreadOnly') == 'true'
+            )
             
-            # Count unread notifications
-            unread_count = collections['notifications'].count_documents({
-                **query,
-                'isRead': False
-            })
+            notifications = [serialize_notification(doc) for doc in docs]
             
             return jsonify({
                 'notifications': notifications,
@@ -65,27 +42,112 @@ def init_notification_routes(app, collections):
         except Exception as e:
             return jsonify({'error': f'Failed to fetch notifications: {str(e)}'}), 500
     
+    @notifications_bp.route('/api/notifications/unread-count', methods=['GET'])
+    @jwt_required()
+    def get_unread_count():
+        """Unread notification count for the current user, read from the maintained counters"""
+        try:
+            user_id = get_jwt_identity()
+            claims = get_jwt() or {}
+            user_type = claims.get('userType', 'user')
+            
+            count = notification_service.unread_count(user_id, user_type, segment=claims.get('beneficiaryCategory'))
+            return jsonify({'unreadCount': count}), 200
+            
+        except Exception as e:
+            return jsonify({'error': f'Failed to fetch unread count: {str(e)}'}), 500
+    
+    @notifications_bp.route('/api/notifications/stream-token', methods=['POST'])
+    @jwt_required()
+    def create_stream_token():
+        """Single-use token for opening one notification stream (valid NOTIFICATION_STREAM_TOKEN_SECONDS).
+
+        Keeps the access token out of the stream URL, where proxies, access logs and browser
+        history would record it. Answers 503 when streaming is disabled; clients then poll.
+        """
+        if not app.config.get('NOTIFICATION_STREAM_ENABLED', True):
+            return jsonify({'error': 'Notification streaming is disabled; poll /api/notifications/unread-count'}), 503, \
+                {'Retry-After': '60'}
+        try:
+            claims = get_jwt() or {}
+            token = stream_tokens.issue(get_jwt_identity(), claims.get('userType', 'user'),
+                                        claims.get('beneficiaryCategory'))
+            return jsonify({'token': token, 'expiresIn': stream_tokens.ttl_seconds}), 201
+        except Exception as e:
+            return jsonify({'error': f'Failed to create stream token: {str(e)}'}), 500
+
+    @notifications_bp.route('/api/notifications/stream', methods=['GET'])
+    def stream_notifications():
+        """Server-Sent Events stream of new notifications for the current user.
+
+        EventSource cannot set headers: open it with ?token=<token> from POST
+        /api/notifications/stream-token (the access token itself is not accepted here). Each token
+        opens one stream, so clients fetch a new one to reconnect, passing ?lastEventId= (or the
+        Last-Event-ID header) to first receive what they missed. Answers 503 when this worker is at
+        NOTIFICATION_STREAM_MAX_CONNECTIONS (or streaming is disabled); clients then poll.
+        """
+        retry_after = {'Retry-After': '60'}
+        
+        if not app.config.get('NOTIFICATION_STREAM_ENABLED', True):
+            return jsonify({'error': 'Notification streaming is disabled; poll /api/notifications/unread-count'}), 503, retry_after
+        owner = stream_tokens.redeem(request.args.get('token'))
+        if owner is None:
+            return jsonify({'error': 'Invalid or expired stream token'}), 401
+        user_id, user_type = owner['userId'], owner['userType']
+        subscription = notification_hub.subscribe(user_id, user_type, owner.get('segment'))
+        if subscription is None:
+            return jsonify({'error': 'Too many open notification streams; poll /api/notifications/unread-count'}), 503, retry_after
+        
+        try:
+            last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+            missed = notification_service.since(user_id, user_type, last_event_id) if last_event_id else []
+        except Exception:
+            notification_hub.unsubscribe(subscription)
+            raise
+        heartbeat = float(app.config.get('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 15))
+        lifetime = float(app.config.get('NOTIFICATION_STREAM_MAX_SECONDS', 300))
+        
+        def event(doc):
+            payload = json.dumps(serialize_notification(doc, is_read=False), default=str)
+            return f"id: {doc['_id']}\nevent: notification\ndata: {payload}\n\n"
+        
+        def events():
+            try:
+                # Reconnect delay for the browser once this stream ends
+                yield f"retry: {int(heartbeat * 1000)}\n\n"
+                for doc in missed:
+                    yield event(doc)
+                # Streams are closed after NOTIFICATION_STREAM_MAX_SECONDS so workers are released
+                deadline = time.monotonic() + lifetime
+                while time.monotonic() < deadline:
+                    try:
+                        doc = subscription.queue.get(timeout=min(heartbeat, max(deadline - time.monotonic(), 0.01)))
+                    except queue.Empty:
+                        # Heartbeat: keeps proxies from closing the idle connection
+                        yield ": ping\n\n"
+                        continue
+                    yield event(doc)
+            finally:
+                notification_hub.unsubscribe(subscription)
+        
+        # Everything the generator needs is read above: it runs without the request context
+        return Response(events(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+    
     @notifications_bp.route('/api/notifications/<notification_id>/read', methods=['PUT'])
     @jwt_required()
     def mark_notification_read(notification_id):
         """Mark a specific notification as read"""
         try:
             user_id = get_jwt_identity()
+            claims = get_jwt() or {}
+            user_type = claims.get('userType', 'user')
             
-            # Verify the notification belongs to this user
-            notification = collections['notifications'].find_one({
-                '_id': ObjectId(notification_id),
-                'recipientId': user_id
-            })
-            
-            if not notification:
+            if not notification_service.mark_read(user_id, user_type, notification_id):
                 return jsonify({'error': 'Notification not found'}), 404
             
-            collections['notifications'].update_one(
-                {'_id': ObjectId(notification_id)},
-                {'$set': {'isRead': True, 'readAt': datetime.now(timezone.utc)}}
-            )
-            
             return jsonify({'message': 'Notification marked as read'}), 200
             
         except Exception as e:
@@ -100,21 +162,12 @@ def init_notification_routes(app, collections):
             claims = get_jwt() or {}
             user_type = claims.get('userType', 'user')
             
-            # Update all unread notifications for this user
-            result = collections['notifications'].update_many(
-                {
-                    '$or': [
-                        {'recipientId': user_id},
-                        {'recipientType': user_type}
-                    ],
-                    'isRead': False
-                },
-                {'$set': {'isRead': True, 'readAt': datetime.now(timezone.utc)}}
-            )
+            # Broadcasts are marked read through the user's own cursor, not on the shared document
+            count = notification_service.mark_all_read(user_id, user_type)
             
             return jsonify({
                 'message': 'All notifications marked as read',
-                'count': result.modified_count
+                'count': count
             }), 200
             
         except Exception as e:
@@ -126,14 +179,11 @@ def init_notification_routes(app, collections):
         """Delete a specific notification"""
         try:
             user_id = get_jwt_identity()
+            claims = get_jwt() or {}
+            user_type = claims.get('userType', 'user')
             
-            # Verify the notification belongs to this user
-            result = collections['notifications'].delete_one({
-                '_id': ObjectId(notification_id),
-                'recipientId': user_id
-            })
-            
-            if result.deleted_count == 0:
+            # Direct notifications are deleted; broadcasts are only hidden for this user
+            if not notification_service.delete_for(user_id, user_type, notification_id):
                 return jsonify({'error': 'Notification not found'}), 404
             
             return jsonify({'message': 'Notification deleted'}), 200
@@ -163,8 +213,8 @@ def init_notification_routes(app, collections):
             if recipient_type != 'all':
                 query['userType'] = recipient_type
 
-            users = list(collections['users'].find(query, {'email': 1}))
-            recipients = [u.get('email') for u in users if u.get('email')]
+            users = list(collections['users'].find(query, {'email': 1, 'name': 1}))
+            recipients = [u for u in users if u.get('email')]
 
             if not recipients:
                 return jsonify({'message': 'No recipients found', 'count': 0}), 200
@@ -192,68 +242,40 @@ def create_notification(collections, title, message, recipient_id=None, recipien
         title: Notification title
         message: Notification message
         recipient_id: Specific user ID to notify (optional)
-        recipient_type: User type to notify (e.g., 'maternity_user', 'palliative_user') (optional)
+        recipient_type: User type to notify (e.g., 'user', 'asha_worker'); without recipient_id this is a broadcast
         notification_type: Type of notification ('info', 'success', 'warning', 'event')
         related_entity: Related entity info (e.g., {'type': 'event', 'id': 'event_id'})
     """
     try:
-        notification_doc = {
-            'title': title,
-            'message': message,
-            'type': notification_type,
-            'isRead': False,
-            'createdAt': datetime.now(timezone.utc),
-        }
-        
-        # Add recipient targeting
+        service = notification_service_for(collections)
         if recipient_id:
-            notification_doc['recipientId'] = recipient_id
-        if recipient_type:
-            notification_doc['recipientType'] = recipient_type
-        
-        # Add related entity if provided
-        if related_entity:
-            notification_doc['relatedEntity'] = related_entity
-        
-        collections['notifications'].insert_one(notification_doc)
+            service.create(title, message, recipient_id, notification_type, related_entity)
+        else:
+            service.broadcast(title, message, audience=recipient_type,
+                              notification_type=notification_type, related_entity=related_entity)
         return True
     except Exception as e:
         print(f"Error creating notification: {str(e)}")
         return False
 
 
-def notify_all_users(collections, title, message, user_type=None, notification_type='info', related_entity=None):
+def notify_all_users(collections, title, message, user_type=None, notification_type='info', related_entity=None, segment=None):
     """
-    Helper function to create notifications for all users of a specific type
+    Helper function to notify all users of a specific type
+    Stores a single broadcast notification instead of one copy per user.
     
     Args:
         collections: Database collections dict
         title: Notification title
         message: Notification message
-        user_type: Filter by user type (e.g., 'maternity_user', 'palliative_user')
+        user_type: Filter by user type (e.g., 'user', 'asha_worker'); everyone if omitted
         notification_type: Type of notification
         related_entity: Related entity info
+        segment: Beneficiary category to narrow regular users to ('maternity' or 'palliative')
     """
     try:
-        # Query all users
-        query = {}
-        if user_type:
-            query['userType'] = user_type
-        
-        users = collections['users'].find(query)
-        
-        # Create notification for each user
-        for user in users:
-            create_notification(
-                collections,
-                title=title,
-                message=message,
-                recipient_id=str(user['_id']),
-                recipient_type=user_type,
-                notification_type=notification_type,
-                related_entity=related_entity
-            )
-        
+        notification_service_for(collections).broadcast(title, message, audience=user_type, segment=segment,
+                                        notification_type=notification_type, related_entity=related_entity)
         return True
     except Exception as e:
         print(f"Error notifying all users: {str(e)}")
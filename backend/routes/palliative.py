@@ -6,6 +6,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timezone
 from bson import ObjectId
 from services.file_service import FileService
+from utils.projections import projection
+from utils.pagination import KeysetPage
 
 palliative_bp = Blueprint('palliative', __name__)
 
@@ -102,6 +104,7 @@ def init_palliative_routes(app, collections):
     @palliative_bp.route('/api/palliative/records', methods=['GET'])
     @jwt_required()
     def list_records():
+        page = KeysetPage.from_request([('date', -1)])
         try:
             user_id = get_jwt_identity()
             testType = (request.args.get('testType') or '').strip()
@@ -110,9 +113,8 @@ def init_palliative_routes(app, collections):
             if testType:
                 query['testType'] = testType
 
-            cursor = collections['palliative_records'].find(query).sort('date', -1)
             items = []
-            for doc in cursor:
+            for doc in page.fetch(collections['palliative_records'], query):
                 record_data = {
                     'id': str(doc['_id']),
                     'date': doc.get('date'),
@@ -130,7 +132,7 @@ def init_palliative_routes(app, collections):
                 if record_data['attachments']:
                     print(f"Record {record_data['id']} has attachments: {record_data['attachments']}")
                 items.append(record_data)
-            return jsonify({'records': items}), 200
+            return jsonify(page.wrap({'records': items})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list records: {str(e)}'}), 500
 
@@ -163,7 +165,7 @@ def init_palliative_routes(app, collections):
         try:
             # Get user info to check if they're an ASHA worker
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             if not user or user.get('userType') != 'asha_worker':
                 return jsonify({'error': 'Access denied. ASHA workers only.'}), 403
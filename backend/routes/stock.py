@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services.stock_service import StockService
 from bson import ObjectId
+from utils.projections import projection
 
 stock_bp = Blueprint('stock', __name__)
 
@@ -15,7 +16,7 @@ def init_stock_routes(app, collections):
 
     def _require_anganvaadi(user_id):
         """Helper: verify the user is an Anganvaadi worker"""
-        user = collections['users'].find_one({'_id': ObjectId(user_id)})
+        user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
         if not user or user.get('userType') != 'anganvaadi':
             return None
         return user
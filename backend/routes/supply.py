@@ -6,8 +6,12 @@ from datetime import datetime, timezone
 from bson import ObjectId
 from bson.errors import InvalidId
 from middleware.auth import require_auth, require_admin
+from middleware.query_inspector import query_budget
 from config.database import get_collections
 from services.file_service import FileService
+from utils.pagination import KeysetPage
+from services import reference_data
+from services.ward_stats_service import ward_stats
 import traceback
 
 supply_bp = Blueprint('supply', __name__)
@@ -23,6 +27,25 @@ def init_supply_routes(app, collections):
     # Register blueprint
     app.register_blueprint(supply_bp, url_prefix='/api')
 
+def _to_object_id(value):
+    """Safely convert a value to ObjectId, returning None if invalid."""
+    if not value:
+        return None
+    if isinstance(value, ObjectId):
+        return value
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+def _load_users(db, user_ids, fields):
+    """Fetch the given users with a single $in query, keyed by string id"""
+    object_ids = list({oid for oid in (_to_object_id(uid) for uid in user_ids) if oid})
+    if not object_ids:
+        return {}
+    projection = {field: 1 for field in fields}
+    return {str(u['_id']): u for u in db['users'].find({'_id': {'$in': object_ids}}, projection)}
+
 @supply_bp.route('/supply-requests', methods=['POST'])
 @require_auth
 def submit_supply_request():
@@ -66,6 +89,7 @@ def submit_supply_request():
 
         # Insert into database
         result = db['supply_requests'].insert_one(supply_request)
+        ward_stats.record_insert('supply_requests', supply_request)
 
         return jsonify({
             'message': 'Supply request submitted successfully',
@@ -78,9 +102,11 @@ def submit_supply_request():
         return jsonify({'error': 'Internal server error'}), 500
 
 @supply_bp.route('/supply-requests', methods=['GET'])
+@query_budget(5)
 @require_admin
 def get_supply_requests():
-    """Get all supply requests for admin review"""
+    """Get all supply requests for admin review (?after= switches from page/limit to keyset pages)"""
+    keyset = KeysetPage.from_request([('createdAt', -1)], default_limit=10, max_limit=100)
     try:
         db = request.db
         print("db keys:", list(db.keys()))
@@ -98,14 +124,18 @@ def get_supply_requests():
         if category:
             query['category'] = category
 
-        # Get total count
-        total = db['supply_requests'].count_documents(query)
+        if keyset.enabled:
+            # Keyset mode: constant cost per page, no total count
+            requests = keyset.fetch(db['supply_requests'], query)
+        else:
+            # Get total count
+            total = db['supply_requests'].count_documents(query)
 
-        # Get requests with pagination
-        requests = list(db['supply_requests'].find(query)
-                       .sort('createdAt', -1)
-                       .skip((page - 1) * limit)
-                       .limit(limit))
+            # Get requests with pagination
+            requests = list(db['supply_requests'].find(query)
+                           .sort('createdAt', -1)
+                           .skip((page - 1) * limit)
+                           .limit(limit))
 
         # Convert ObjectId to string and format dates
         def format_datetime(value):
@@ -117,17 +147,6 @@ def get_supply_requests():
             # Fallback for stored string values
             return str(value)
 
-        def to_object_id(value):
-            """Safely convert a value to ObjectId, returning None if invalid."""
-            if not value:
-                return None
-            if isinstance(value, ObjectId):
-                return value
-            try:
-                return ObjectId(value)
-            except (InvalidId, TypeError):
-                return None
-
         def serialize_object_id(value):
             """Return string representation for ObjectId values."""
             if not value:
@@ -136,6 +155,10 @@ def get_supply_requests():
                 return str(value)
             return value
 
+        # Resolve all requesting users in one query instead of one per request
+        users_by_id = _load_users(db, [req.get('userId') for req in requests],
+                                  ('name', 'email', 'beneficiaryCategory'))
+
         for req in requests:
             # Convert all ObjectId fields to strings
             req['_id'] = serialize_object_id(req.get('_id'))
@@ -153,28 +176,24 @@ def get_supply_requests():
             req['deliveryCompletedAt'] = format_datetime(req.get('deliveryCompletedAt'))
 
             # Get user details
-            user_id = req.get('userId')
-            user_object_id = to_object_id(user_id)
             user_details = {
                 'name': 'Unknown User',
                 'email': 'unknown@example.com',
                 'beneficiaryCategory': 'unknown'
             }
 
-            if user_object_id:
-                try:
-                    user = db['users'].find_one({'_id': user_object_id})
-                    if user:
-                        user_details = {
-                            'name': user.get('name', 'Unknown User'),
-                            'email': user.get('email', 'unknown@example.com'),
-                            'beneficiaryCategory': user.get('beneficiaryCategory', 'unknown')
-                        }
-                except Exception as user_error:
-                    print(f"Error fetching user details for userId {req['userId']}: {user_error}")
+            user = users_by_id.get(str(req.get('userId')))
+            if user:
+                user_details = {
+                    'name': user.get('name', 'Unknown User'),
+                    'email': user.get('email', 'unknown@example.com'),
+                    'beneficiaryCategory': user.get('beneficiaryCategory', 'unknown')
+                }
 
             req['user'] = user_details
 
+        if keyset.enabled:
+            return jsonify(keyset.wrap({'requests': requests, 'pagination': {'limit': keyset.limit}})), 200
         return jsonify({
             'requests': requests,
             'pagination': {
@@ -214,12 +233,9 @@ def update_supply_request(request_id):
             'updatedAt': datetime.now(timezone.utc)
         }
 
-        result = db['supply_requests'].update_one(
-            {'_id': ObjectId(request_id)},
-            {'$set': update_data}
-        )
+        before = ward_stats.update_one('supply_requests', {'_id': ObjectId(request_id)}, {'$set': update_data})
 
-        if result.matched_count == 0:
+        if before is None:
             return jsonify({'error': 'Supply request not found'}), 404
 
         return jsonify({'message': f'Supply request {status} successfully'}), 200
@@ -267,7 +283,7 @@ def get_user_supply_requests():
             # Get Anganwadi location details if ward delivery
             if req.get('anganwadiLocationId'):
                 try:
-                    location = db['locations'].find_one({'_id': ObjectId(req['anganwadiLocationId'])})
+                    location = reference_data.find_location(db['locations'], req['anganwadiLocationId'])
                     if location:
                         req['anganwadiLocation'] = {
                             'name': location.get('name'),
@@ -287,6 +303,7 @@ def get_user_supply_requests():
         return jsonify({'error': 'Internal server error'}), 500
 
 @supply_bp.route('/supply-requests/approved', methods=['GET'])
+@query_budget(4)
 @require_auth
 def get_approved_supply_requests():
     """Get approved supply requests for ASHA workers to schedule delivery"""
@@ -302,6 +319,10 @@ def get_approved_supply_requests():
             ]
         }).sort('createdAt', -1))
 
+        # Resolve all requesting users in one query instead of one per request
+        users_by_id = _load_users(db, [req.get('userId') for req in requests],
+                                  ('name', 'email', 'beneficiaryCategory', 'phone', 'address'))
+
         # Convert ObjectId to string and format dates, add user details
         for req in requests:
             req['_id'] = str(req['_id'])
@@ -311,26 +332,16 @@ def get_approved_supply_requests():
             req['reviewedBy'] = str(req['reviewedBy']) if req.get('reviewedBy') else None
 
             # Get user details
-            try:
-                user = db['users'].find_one({'_id': ObjectId(req['userId'])})
-                if user:
-                    req['user'] = {
-                        'name': user.get('name', 'Unknown User'),
-                        'email': user.get('email', 'unknown@example.com'),
-                        'beneficiaryCategory': user.get('beneficiaryCategory', 'unknown'),
-                        'phone': user.get('phone', ''),
-                        'address': user.get('address', '')
-                    }
-                else:
-                    req['user'] = {
-                        'name': 'Unknown User',
-                        'email': 'unknown@example.com',
-                        'beneficiaryCategory': 'unknown',
-                        'phone': '',
-                        'address': ''
-                    }
-            except Exception as user_error:
-                print(f"Error fetching user details for userId {req['userId']}: {user_error}")
+            user = users_by_id.get(req['userId'])
+            if user:
+                req['user'] = {
+                    'name': user.get('name', 'Unknown User'),
+                    'email': user.get('email', 'unknown@example.com'),
+                    'beneficiaryCategory': user.get('beneficiaryCategory', 'unknown'),
+                    'phone': user.get('phone', ''),
+                    'address': user.get('address', '')
+                }
+            else:
                 req['user'] = {
                     'name': 'Unknown User',
                     'email': 'unknown@example.com',
@@ -347,6 +358,7 @@ def get_approved_supply_requests():
         return jsonify({'error': 'Internal server error'}), 500
 
 @supply_bp.route('/supply-requests/scheduled', methods=['GET'])
+@query_budget(4)
 @require_auth
 def get_scheduled_supply_requests():
     """Get scheduled supply requests history for ASHA workers"""
@@ -359,6 +371,10 @@ def get_scheduled_supply_requests():
             'expectedDeliveryDate': {'$exists': True, '$ne': None}
         }).sort('expectedDeliveryDate', 1))  # Sort by delivery date ascending
 
+        # Resolve all requesting users in one query instead of one per request
+        users_by_id = _load_users(db, [req.get('userId') for req in requests],
+                                  ('name', 'email', 'beneficiaryCategory', 'phone', 'address'))
+
         # Convert ObjectId to string and format dates, add user details
         for req in requests:
             req['_id'] = str(req['_id'])
@@ -372,26 +388,16 @@ def get_scheduled_supply_requests():
                 req['scheduledBy'] = str(req['scheduledBy'])
 
             # Get user details
-            try:
-                user = db['users'].find_one({'_id': ObjectId(req['userId'])})
-                if user:
-                    req['user'] = {
-                        'name': user.get('name', 'Unknown User'),
-                        'email': user.get('email', 'unknown@example.com'),
-                        'beneficiaryCategory': user.get('beneficiaryCategory', 'unknown'),
-                        'phone': user.get('phone', ''),
-                        'address': user.get('address', '')
-                    }
-                else:
-                    req['user'] = {
-                        'name': 'Unknown User',
-                        'email': 'unknown@example.com',
-                        'beneficiaryCategory': 'unknown',
-                        'phone': '',
-                        'address': ''
-                    }
-            except Exception as user_error:
-                print(f"Error fetching user details for userId {req['userId']}: {user_error}")
+            user = users_by_id.get(req['userId'])
+            if user:
+                req['user'] = {
+                    'name': user.get('name', 'Unknown User'),
+                    'email': user.get('email', 'unknown@example.com'),
+                    'beneficiaryCategory': user.get('beneficiaryCategory', 'unknown'),
+                    'phone': user.get('phone', ''),
+                    'address': user.get('address', '')
+                }
+            else:
                 req['user'] = {
                     'name': 'Unknown User',
                     'email': 'unknown@example.com',
@@ -435,12 +441,9 @@ def update_delivery_status(request_id):
             'updatedAt': datetime.now(timezone.utc)
         }
 
-        result = db['supply_requests'].update_one(
-            {'_id': ObjectId(request_id)},
-            {'$set': update_data}
-        )
+        before = ward_stats.update_one('supply_requests', {'_id': ObjectId(request_id)}, {'$set': update_data})
 
-        if result.matched_count == 0:
+        if before is None:
             return jsonify({'error': 'Supply request not found'}), 404
 
         message = 'Marked as delivered' if delivery_status == 'delivered' else 'Delivery cancelled'
@@ -478,7 +481,7 @@ def schedule_supply_delivery(request_id):
                 return jsonify({'error': 'Anganwadi location is required for ward delivery'}), 400
             
             try:
-                location = db['locations'].find_one({'_id': ObjectId(anganwadi_location_id), 'active': True})
+                location = reference_data.find_location(db['locations'], ObjectId(anganwadi_location_id), active_only=True)
                 if not location:
                     return jsonify({'error': 'Invalid or inactive Anganwadi location'}), 400
             except Exception as loc_error:
@@ -507,12 +510,9 @@ def schedule_supply_delivery(request_id):
         if delivery_location == 'ward' and anganwadi_location_id:
             update_data['anganwadiLocationId'] = ObjectId(anganwadi_location_id)
 
-        result = db['supply_requests'].update_one(
-            {'_id': ObjectId(request_id)},
-            {'$set': update_data}
-        )
+        before = ward_stats.update_one('supply_requests', {'_id': ObjectId(request_id)}, {'$set': update_data})
 
-        if result.matched_count == 0:
+        if before is None:
             return jsonify({'error': 'Supply request not found'}), 404
 
         return jsonify({'message': 'Delivery scheduled successfully'}), 200
@@ -1,41 +1,36 @@
 """
 Vaccination schedules and bookings management routes
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timezone
 from bson import ObjectId
 import json
 
-from utils.vaccination_utils import VACCINATION_SCHEDULE
+from utils.serializers import vaccination_schedule_serializer
+from utils.projections import projection
+from utils.pagination import KeysetPage
+from middleware.conditional import conditional
+from services import reference_data
+from services.ward_stats_service import ward_stats
+from services.booking_expiry import effective_status
+from services.immunization_status import immunization_status, milestones as immunization_milestones
+from services.certificate_service import certificates, certificate_fields, certificate_filename, init_certificates
 
 # Create blueprint
 vaccination_bp = Blueprint('vaccination', __name__)
 
 def init_vaccination_routes(app, collections):
     """Initialize vaccination routes with dependencies"""
+    init_certificates(app, collections)
     
     @vaccination_bp.route('/api/vaccination-vaccine-list', methods=['GET'])
     @jwt_required()
+    @conditional(max_age=86400)
     def get_vaccination_vaccine_list():
         """Return the list of available vaccines from the Indian Immunization Program schedule"""
         try:
-            seen = set()
-            vaccines = []
-            for v in VACCINATION_SCHEDULE:
-                # Skip birth vaccines — they are given at delivery, not scheduled
-                if v.get('category') == 'birth':
-                    continue
-                name = v['vaccineName']
-                if name not in seen:
-                    seen.add(name)
-                    vaccines.append({
-                        'name': name,
-                        'category': v.get('category', ''),
-                        'ageLabel': v.get('ageLabel', ''),
-                        'description': v.get('description', '')
-                    })
-            return jsonify({'vaccines': vaccines}), 200
+            return jsonify({'vaccines': reference_data.vaccine_list()}), 200
         except Exception as e:
             return jsonify({'error': f'Failed to get vaccine list: {str(e)}'}), 500
     
@@ -92,6 +87,7 @@ def init_vaccination_routes(app, collections):
             }
             
             res = collections['vaccination_schedules'].insert_one(doc)
+            ward_stats.record_insert('vaccination_schedules', doc)
             return jsonify({'id': str(res.inserted_id), 'message': 'Schedule created'}), 201
         except Exception as e:
             return jsonify({'error': f'Failed to create schedule: {str(e)}'}), 500
@@ -100,6 +96,7 @@ def init_vaccination_routes(app, collections):
     @jwt_required()
     def list_vaccination_schedules():
         """List vaccination schedules"""
+        page = KeysetPage.from_request([('date', 1)])
         try:
             user_id = get_jwt_identity()
             claims = get_jwt() or {}
@@ -116,30 +113,17 @@ def init_vaccination_routes(app, collections):
                     pass
 
             # Get candidate schedules
-            cursor = collections['vaccination_schedules'].find(query).sort('date', 1)
-            raw_schedules = list(cursor)
+            raw_schedules = list(page.fetch(collections['vaccination_schedules'], query,
+                                            vaccination_schedule_serializer.projection()))
 
             if not raw_schedules:
-                return jsonify({'schedules': []}), 200
+                return jsonify(page.wrap({'schedules': []})), 200
 
             schedules = []
 
             # ASHA workers and admins see all schedules (including expired ones for tracking)
             if user_type in ['asha_worker', 'admin']:
-                for doc in raw_schedules:
-                    schedules.append({
-                        'id': str(doc['_id']),
-                        'title': doc.get('title'),
-                        'date': doc.get('date'),
-                        'time': doc.get('time'),
-                        'location': doc.get('location'),
-                        'vaccines': doc.get('vaccines', []),
-                        'description': doc.get('description', ''),
-                        'status': doc.get('status', 'Scheduled'),
-                        'createdBy': str(doc.get('createdBy')) if doc.get('createdBy') else None,
-                        'createdAt': doc.get('createdAt').isoformat() if isinstance(doc.get('createdAt'), datetime) else doc.get('createdAt'),
-                        'updatedAt': doc.get('updatedAt').isoformat() if isinstance(doc.get('updatedAt'), datetime) else doc.get('updatedAt'),
-                    })
+                schedules = vaccination_schedule_serializer.many(raw_schedules)
             else:
                 # Regular users: filter expired schedules unless they have completed bookings
                 # Get schedule IDs for booking lookup
@@ -169,21 +153,9 @@ def init_vaccination_routes(app, collections):
                         if str(doc['_id']) not in completed_schedule_ids:
                             continue
 
-                    schedules.append({
-                        'id': str(doc['_id']),
-                        'title': doc.get('title'),
-                        'date': doc.get('date'),
-                        'time': doc.get('time'),
-                        'location': doc.get('location'),
-                        'vaccines': doc.get('vaccines', []),
-                        'description': doc.get('description', ''),
-                        'status': doc.get('status', 'Scheduled'),
-                        'createdBy': str(doc.get('createdBy')) if doc.get('createdBy') else None,
-                        'createdAt': doc.get('createdAt').isoformat() if isinstance(doc.get('createdAt'), datetime) else doc.get('createdAt'),
-                        'updatedAt': doc.get('updatedAt').isoformat() if isinstance(doc.get('updatedAt'), datetime) else doc.get('updatedAt'),
-                    })
-
-            return jsonify({'schedules': schedules}), 200
+                    schedules.append(vaccination_schedule_serializer.one(doc))
+
+            return jsonify(page.wrap({'schedules': schedules})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list schedules: {str(e)}'}), 500
 
@@ -242,11 +214,12 @@ def init_vaccination_routes(app, collections):
             }
             
             res = collections['vaccination_bookings'].insert_one(booking)
+            ward_stats.record_insert('vaccination_bookings', booking)
             
             # Send booking confirmation email to the user
             try:
                 from services.email_service import send_vaccination_booking_confirmation
-                user = collections['users'].find_one({'_id': ObjectId(user_id)})
+                user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.contact'))
                 if user:
                     send_vaccination_booking_confirmation(user, booking, schedule)
             except Exception as e:
@@ -260,6 +233,7 @@ def init_vaccination_routes(app, collections):
     @jwt_required()
     def list_vaccination_bookings(schedule_id):
         """List vaccination bookings for a schedule"""
+        page = KeysetPage.from_request([('createdAt', -1)])
         try:
             claims = get_jwt() or {}
             user_id = get_jwt_identity()
@@ -269,17 +243,11 @@ def init_vaccination_routes(app, collections):
             if claims.get('userType') == 'user':
                 query['userId'] = ObjectId(user_id)
             
-            cursor = collections['vaccination_bookings'].find(query).sort('createdAt', -1)
-            raw = list(cursor)
+            raw = list(page.fetch(collections['vaccination_bookings'], query))
 
-            # Get schedule date for auto-expire logic
-            schedule = collections['vaccination_schedules'].find_one({'_id': ObjectId(schedule_id)})
-            schedule_date = None
-            if schedule and schedule.get('date'):
-                try:
-                    schedule_date = datetime.strptime(schedule['date'], '%Y-%m-%d').date()
-                except:
-                    pass
+            # Schedule date: bookings of past schedules are shown as expired
+            schedule = collections['vaccination_schedules'].find_one({'_id': ObjectId(schedule_id)}, {'date': 1})
+            schedule_date = (schedule or {}).get('date')
 
             # Enrich with user info for ASHA/Admin
             user_map = {}
@@ -295,17 +263,9 @@ def init_vaccination_routes(app, collections):
                         }
 
             bookings = []
-            today = datetime.now().date()
             for doc in raw:
-                current_status = doc.get('status', 'Booked')
-                
-                # Auto-expire if schedule date has passed and status is still 'Booked'
-                if schedule_date and current_status == 'Booked' and today > schedule_date:
-                    collections['vaccination_bookings'].update_one(
-                        {'_id': doc['_id']}, 
-                        {'$set': {'status': 'Expired', 'updatedAt': datetime.now(timezone.utc)}}
-                    )
-                    current_status = 'Expired'
+                # Derived here; the booking_expiry job stores it (reads never write)
+                current_status = effective_status(doc.get('status'), schedule_date)
                 
                 booking = {
                     'id': str(doc['_id']),
@@ -319,7 +279,7 @@ def init_vaccination_routes(app, collections):
                 if user_map:
                     booking['user'] = user_map.get(booking['userId'])
                 bookings.append(booking)
-            return jsonify({'bookings': bookings}), 200
+            return jsonify(page.wrap({'bookings': bookings})), 200
         except Exception as e:
             return jsonify({'error': f'Failed to list bookings: {str(e)}'}), 500
 
@@ -429,11 +389,12 @@ def init_vaccination_routes(app, collections):
             if new_status not in ['Booked', 'Completed', 'Expired', 'Cancelled']:
                 return jsonify({'error': 'Invalid status. Must be one of: Booked, Completed, Expired, Cancelled'}), 400
 
-            res = collections['vaccination_bookings'].update_one(
-                {'_id': _id}, 
+            before = ward_stats.update_one(
+                'vaccination_bookings',
+                {'_id': _id},
                 {'$set': {'status': new_status, 'updatedAt': datetime.now(timezone.utc)}}
             )
-            if res.matched_count == 0:
+            if before is None:
                 return jsonify({'error': 'Booking not found'}), 404
             
             # Send completion email when ASHA marks a booking as Completed
@@ -442,7 +403,7 @@ def init_vaccination_routes(app, collections):
                     from services.email_service import send_vaccination_completed_notification
                     booking_doc = collections['vaccination_bookings'].find_one({'_id': _id})
                     if booking_doc:
-                        user_doc = collections['users'].find_one({'_id': booking_doc.get('userId')})
+                        user_doc = collections['users'].find_one({'_id': booking_doc.get('userId')}, projection('user.contact'))
                         schedule_doc = collections['vaccination_schedules'].find_one({'_id': booking_doc.get('scheduleId')})
                         if user_doc and schedule_doc:
                             send_vaccination_completed_notification(user_doc, booking_doc, schedule_doc)
@@ -530,192 +491,24 @@ def init_vaccination_routes(app, collections):
                 return jsonify({'error': 'Schedule not found'}), 404
             
             # Get user details
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.contact'))
             if not user:
                 return jsonify({'error': 'User not found'}), 404
-            
-            # Import required libraries
+
+            # Rendered and signed once per certificate content, then served from the cache
+            fields = certificate_fields(booking, schedule, user.get('name', ''))
             try:
-                from reportlab.lib.pagesizes import A4
-                from reportlab.pdfgen import canvas
-                from reportlab.lib import colors
-                from reportlab.lib.units import mm
-                from utils.crypto import (
-                    create_certificate_data, sign_certificate, 
-                    get_certificate_hash, generate_verification_url
-                )
-                import qrcode
-                from io import BytesIO
+                pdf = certificates.get(fields)
             except ImportError as e:
                 return jsonify({'error': f'Missing dependency: {str(e)}. Run pip install -r requirements.txt'}), 500
 
-            # Extract certificate data
-            child_name = booking.get('childName', '')
-            parent_name = user.get('name', '')
-            vaccines = booking.get('vaccines', [])
-            vaccination_date = schedule.get('date', '')
-            location = schedule.get('location', '')
-            certificate_id = str(booking['_id'])
-            issued_date = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-
-            # Create and sign certificate data
-            cert_data = create_certificate_data(
-                booking_id=certificate_id,
-                child_name=child_name,
-                parent_name=parent_name,
-                vaccines=vaccines,
-                vaccination_date=vaccination_date,
-                location=location
-            )
-            
-            # Generate digital signature
-            signature = sign_certificate(cert_data)
-            cert_hash = get_certificate_hash(cert_data)
-            verification_url = generate_verification_url(certificate_id, signature)
-
-            # Generate QR code with compact JSON payload — readable by all scanners
-            import json as _json
-            qr_payload = _json.dumps({
-                "type": "VACCINATION_CERTIFICATE",
-                "issuer": "AshaAssist Health Department",
-                "certificateId": certificate_id,
-                "childName": child_name,
-                "parentName": parent_name,
-                "vaccines": vaccines,
-                "vaccinationDate": vaccination_date,
-                "location": location,
-                "issuedAt": issued_date,
-                "verifyAt": verification_url,
-                "hash": cert_hash[:32],
-            }, separators=(',', ':'))
-
-            qr = qrcode.QRCode(version=None, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=2)
-            qr.add_data(qr_payload)
-            qr.make(fit=True)
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Convert QR to bytes for embedding in PDF
-            qr_buffer = BytesIO()
-            qr_img.save(qr_buffer, format='PNG')
-            qr_buffer.seek(0)
-
-            # Create PDF
-            pdf_buffer = BytesIO()
-            c = canvas.Canvas(pdf_buffer, pagesize=A4)
-            width, height = A4
-
-            # Header with gradient effect (simulated)
-            c.setFillColor(colors.HexColor('#1e3a5f'))
-            c.rect(0, height - 35*mm, width, 35*mm, fill=1, stroke=0)
-            c.setFillColor(colors.HexColor('#2d5a87'))
-            c.rect(0, height - 37*mm, width, 2*mm, fill=1, stroke=0)
-            
-            # Header text
-            c.setFillColor(colors.white)
-            c.setFont('Helvetica-Bold', 22)
-            c.drawCentredString(width/2, height - 15*mm, 'DIGITAL VACCINATION CERTIFICATE')
-            c.setFont('Helvetica', 11)
-            c.drawCentredString(width/2, height - 23*mm, 'Mother and Child Protection Program - AshaAssist')
-            c.setFont('Helvetica-Oblique', 9)
-            c.drawCentredString(width/2, height - 30*mm, 'Digitally Signed with RSA-SHA256 Cryptography')
-
-            # Security badge
-            c.setFillColor(colors.HexColor('#10b981'))
-            c.circle(30*mm, height - 22*mm, 8*mm, fill=1, stroke=0)
-            c.setFillColor(colors.white)
-            c.setFont('Helvetica-Bold', 12)
-            c.drawCentredString(30*mm, height - 24*mm, '✓')
-
-            # Main content area
-            margin_x = 20*mm
-            y = height - 50*mm
-            line_gap = 9*mm
-
-            def draw_field(label, value, bold_value=False):
-                nonlocal y
-                c.setFillColor(colors.HexColor('#374151'))
-                c.setFont('Helvetica-Bold', 11)
-                c.drawString(margin_x, y, f"{label}:")
-                c.setFont('Helvetica-Bold' if bold_value else 'Helvetica', 11)
-                c.setFillColor(colors.HexColor('#1f2937'))
-                c.drawString(margin_x + 55*mm, y, str(value or 'N/A'))
-                y -= line_gap
-
-            # Certificate details
-            c.setFillColor(colors.HexColor('#f3f4f6'))
-            c.roundRect(margin_x - 5*mm, y - 55*mm, width - 2*margin_x + 10*mm, 70*mm, 5*mm, fill=1, stroke=0)
-            y -= 3*mm
-
-            draw_field("Child's Name", child_name, True)
-            draw_field("Parent/Guardian", parent_name)
-            draw_field("Vaccination Date", vaccination_date)
-            draw_field("Location", location)
-            draw_field("Certificate ID", certificate_id)
-            draw_field("Issued Date", issued_date)
-
-            # Vaccines section
-            y -= 5*mm
-            c.setFillColor(colors.HexColor('#1e3a5f'))
-            c.setFont('Helvetica-Bold', 12)
-            c.drawString(margin_x, y, 'Vaccines Administered:')
-            y -= 7*mm
-            
-            c.setFillColor(colors.HexColor('#374151'))
-            c.setFont('Helvetica', 11)
-            for vaccine in vaccines:
-                c.drawString(margin_x + 5*mm, y, f"• {vaccine}")
-                y -= 6*mm
-
-            # QR Code section
-            y -= 10*mm
-            c.setFillColor(colors.HexColor('#f0fdf4'))
-            c.roundRect(margin_x - 5*mm, y - 55*mm, width - 2*margin_x + 10*mm, 60*mm, 5*mm, fill=1, stroke=0)
-            c.setStrokeColor(colors.HexColor('#86efac'))
-            c.roundRect(margin_x - 5*mm, y - 55*mm, width - 2*margin_x + 10*mm, 60*mm, 5*mm, fill=0, stroke=1)
-            
-            # QR code image
-            from reportlab.lib.utils import ImageReader
-            qr_reader = ImageReader(qr_buffer)
-            c.drawImage(qr_reader, width - 60*mm, y - 50*mm, 45*mm, 45*mm)
-            
-            # Digital signature info
-            c.setFillColor(colors.HexColor('#166534'))
-            c.setFont('Helvetica-Bold', 11)
-            c.drawString(margin_x, y - 5*mm, '🔐 Digital Signature & Quick Verification')
-            
-            c.setFont('Helvetica', 9)
-            c.setFillColor(colors.HexColor('#374151'))
-            c.drawString(margin_x, y - 15*mm, f"Algorithm: RSA-2048 with SHA-256")
-            c.drawString(margin_x, y - 22*mm, f"Hash: {cert_hash[:32]}...")
-            c.drawString(margin_x, y - 29*mm, f"Signature: {signature[:24]}...")
-            
-            c.setFont('Helvetica-Bold', 9)
-            c.setFillColor(colors.HexColor('#166534'))
-            c.drawString(margin_x, y - 38*mm, "📱 Scan QR Code to View Certificate Details")
-            
-            c.setFont('Helvetica-Oblique', 8)
-            c.setFillColor(colors.HexColor('#6b7280'))
-            c.drawString(margin_x, y - 45*mm, "QR code contains complete certificate information in JSON format")
-            c.drawString(margin_x, y - 51*mm, f"Online verification: {verification_url[:50]}...")
-
-            # Footer
-            y = 20*mm
-            c.setFillColor(colors.HexColor('#6b7280'))
-            c.setFont('Helvetica-Oblique', 9)
-            c.drawCentredString(width/2, y, 'This certificate is digitally signed and tamper-proof.')
-            c.drawCentredString(width/2, y - 5*mm, 'Any modification to the certificate data will invalidate the signature.')
-
-            c.showPage()
-            c.save()
-            pdf_buffer.seek(0)
-
             from flask import send_file
-            filename = f"vaccination-certificate-{certificate_id}.pdf"
+            from io import BytesIO
             return send_file(
-                pdf_buffer,
+                BytesIO(pdf),
                 mimetype='application/pdf',
                 as_attachment=True,
-                download_name=filename
+                download_name=certificate_filename(fields)
             )
             
         except Exception as e:
@@ -723,6 +516,45 @@ def init_vaccination_routes(app, collections):
             traceback.print_exc()
             return jsonify({'error': f'Failed to generate certificate: {str(e)}'}), 500
 
+    @vaccination_bp.route('/api/vaccination-schedules/<schedule_id>/certificates', methods=['GET'])
+    @jwt_required()
+    def download_schedule_certificates(schedule_id):
+        """ZIP of the certificates of every completed booking of a schedule (ASHA/Admin only)"""
+        try:
+            claims = get_jwt() or {}
+            if claims.get('userType') not in ['asha_worker', 'admin']:
+                return jsonify({'error': 'Only ASHA workers or admins can export certificates'}), 403
+
+            try:
+                _id = ObjectId(schedule_id)
+            except Exception:
+                return jsonify({'error': 'Invalid schedule id'}), 400
+
+            schedule = collections['vaccination_schedules'].find_one({'_id': _id})
+            if not schedule:
+                return jsonify({'error': 'Schedule not found'}), 404
+
+            bookings = list(collections['vaccination_bookings'].find({'scheduleId': _id, 'status': 'Completed'}))
+            if not bookings:
+                return jsonify({'error': 'No completed vaccinations for this schedule'}), 404
+            user_ids = list({b['userId'] for b in bookings if b.get('userId')})
+            names = {u['_id']: u.get('name', '') for u in collections['users'].find({'_id': {'$in': user_ids}}, {'name': 1})}
+            items = [certificate_fields(b, schedule, names.get(b.get('userId'), '')) for b in bookings]
+
+            if not certificates.begin_export():
+                return jsonify({'error': 'Too many certificate exports in progress; try again shortly'}), 503, \
+                    {'Retry-After': '30'}
+            filename = f"vaccination-certificates-{schedule.get('date') or schedule_id}.zip"
+            response = Response(certificates.zip_stream(items), mimetype='application/zip', headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'X-Certificate-Count': str(len(items)),
+            })
+            # Runs when the server closes the response: finished, failed or abandoned by the client
+            response.call_on_close(certificates.end_export)
+            return response
+        except Exception as e:
+            return jsonify({'error': f'Failed to export certificates: {str(e)}'}), 500
+
     @vaccination_bp.route('/api/verify-certificate/<booking_id>', methods=['GET'])
     def verify_vaccination_certificate(booking_id):
         """Public endpoint to verify vaccination certificate authenticity"""
@@ -746,7 +578,7 @@ def init_vaccination_routes(app, collections):
             
             # Get schedule and user details
             schedule = collections['vaccination_schedules'].find_one({'_id': booking['scheduleId']})
-            user = collections['users'].find_one({'_id': booking['userId']})
+            user = collections['users'].find_one({'_id': booking['userId']}, projection('user.contact'))
             
             if not schedule or not user:
                 return jsonify({
@@ -798,7 +630,7 @@ def init_vaccination_routes(app, collections):
         try:
             # Get user info to check if they're an ASHA worker
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             if not user or user.get('userType') != 'asha_worker':
                 return jsonify({'error': 'Access denied. ASHA workers only.'}), 403
@@ -853,7 +685,7 @@ def init_vaccination_routes(app, collections):
                     'id': str(doc['_id']),
                     'vaccines': doc.get('vaccines', []),
                     'childName': doc.get('childName'),
-                    'status': doc.get('status'),
+                    'status': effective_status(doc.get('status'), doc['schedule'].get('date')),
                     'date': doc['schedule'].get('date'),
                     'location': doc['schedule'].get('location'),
                     'createdAt': doc.get('createdAt').isoformat() if isinstance(doc.get('createdAt'), datetime) else doc.get('createdAt'),
@@ -883,14 +715,11 @@ def init_vaccination_routes(app, collections):
         try:
             # Get user info to check if they're an ASHA worker
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.role'))
             
             if not user or user.get('userType') != 'asha_worker':
                 return jsonify({'error': 'Access denied. ASHA workers only.'}), 403
 
-            # Import vaccination utilities
-            from utils.vaccination_utils import calculate_vaccination_milestones, get_vaccination_status
-            
             # Find all delivered mothers (they have children)
             query = {
                 'beneficiaryCategory': 'maternity',
@@ -898,54 +727,23 @@ def init_vaccination_routes(app, collections):
                 'maternalHealth.children': {'$exists': True, '$ne': []}
             }
             
-            mothers = collections['users'].find(query)
+            mothers = list(collections['users'].find(query, projection('user.mother_children')))
+            # Precomputed per-child rows (services/immunization_status.py), one query for all mothers
+            rows_by_mother = immunization_status.rows_for(mothers)
+            as_of = datetime.now().date()
             
             children_data = []
             
             for mother in mothers:
-                maternal_health = mother.get('maternalHealth', {})
-                children = maternal_health.get('children', [])
-                
-                # Get completed vaccination bookings for this mother
-                completed_bookings = list(collections['vaccination_bookings'].find({
-                    'userId': mother['_id'],
-                    'status': 'Completed'
-                }))
-                # Build a set of completed vaccine names from bookings
-                completed_vaccine_names = set()
-                for booking in completed_bookings:
-                    for v in booking.get('vaccines', []):
-                        completed_vaccine_names.add(v.strip())
+                children = mother.get('maternalHealth', {}).get('children', [])
+                rows = rows_by_mother.get(mother['_id'], [])
                 
                 for idx, child in enumerate(children):
-                    # Get or calculate vaccination milestones
-                    if 'vaccinationMilestones' in child:
-                        milestones = child['vaccinationMilestones']
-                        # Update status based on current date
-                        for milestone in milestones:
-                            milestone['status'] = get_vaccination_status(milestone['dueDate'])
-                    else:
-                        # Calculate milestones if not present
-                        dob = child.get('dateOfBirth')
-                        if dob:
-                            milestones = calculate_vaccination_milestones(dob)
-                        else:
-                            milestones = []
-                    
-                    # Cross-reference with completed bookings
-                    for milestone in milestones:
-                        if milestone.get('vaccineName') in completed_vaccine_names:
-                            milestone['status'] = 'completed'
+                    milestones = immunization_milestones(rows[idx], as_of) if idx < len(rows) else []
                     
                     # Filter only pending/due/overdue vaccinations (exclude completed)
-                    due_vaccinations = [
-                        m for m in milestones 
-                        if m.get('status') in ['pending', 'due', 'overdue', 'upcoming']
-                        and not m.get('completedAt')
-                    ]
-                    
-                    # Count completed for stats
-                    completed_count = len([m for m in milestones if m.get('status') == 'completed'])
+                    due_vaccinations = [m for m in milestones if m['status'] != 'completed']
+                    completed_count = len(milestones) - len(due_vaccinations)
                     
                     # Calculate child age
                     dob = child.get('dateOfBirth')
@@ -1002,6 +800,46 @@ def init_vaccination_routes(app, collections):
             traceback.print_exc()
             return jsonify({'error': f'Failed to get children details: {str(e)}'}), 500
 
+    @vaccination_bp.route('/api/vaccination/overdue', methods=['GET'])
+    @jwt_required()
+    def list_overdue_vaccinations():
+        """Children whose given vaccine is overdue, e.g. ?vaccine=Pentavalent-3 (ASHA/Admin only)"""
+        try:
+            claims = get_jwt() or {}
+            if claims.get('userType') not in ['asha_worker', 'admin']:
+                return jsonify({'error': 'Only ASHA workers or admins can list overdue vaccinations'}), 403
+
+            vaccine_name = (request.args.get('vaccine') or '').strip()
+            if not vaccine_name:
+                return jsonify({'error': 'vaccine is required'}), 400
+
+            today = datetime.now().date()
+            rows = immunization_status.overdue(vaccine_name, today)
+            mother_ids = list({row['motherId'] for row in rows})
+            mothers = {m['_id']: m for m in collections['users'].find({'_id': {'$in': mother_ids}}, projection('user.contact'))}
+
+            children = []
+            for row in rows:
+                mother = mothers.get(row['motherId'], {})
+                # The earliest pending dose of that name (TT appears twice in the schedule)
+                dose = min((v for v in row['vaccines'] if v['vaccineName'] == vaccine_name and v['status'] == 'pending'),
+                           key=lambda v: v['dueDate'])
+                children.append({
+                    'id': row['_id'],
+                    'childName': row.get('childName'),
+                    'dateOfBirth': row.get('dateOfBirth'),
+                    'dueDate': dose['dueDate'],
+                    'daysOverdue': (today - datetime.fromisoformat(dose['dueDate']).date()).days,
+                    'motherId': str(row['motherId']),
+                    'motherName': mother.get('name', 'Unknown'),
+                    'motherPhone': mother.get('phone', ''),
+                    'motherEmail': mother.get('email', ''),
+                })
+            children.sort(key=lambda c: c['dueDate'])
+            return jsonify({'vaccineName': vaccine_name, 'children': children}), 200
+        except Exception as e:
+            return jsonify({'error': f'Failed to list overdue vaccinations: {str(e)}'}), 500
+
     @vaccination_bp.route('/api/vaccination/send-reminder', methods=['POST'])
     @jwt_required()
     def send_vaccination_reminder_email():
@@ -1096,7 +934,7 @@ def init_vaccination_routes(app, collections):
         cross-referencing completed vaccination bookings."""
         try:
             user_id = get_jwt_identity()
-            user = collections['users'].find_one({'_id': ObjectId(user_id)})
+            user = collections['users'].find_one({'_id': ObjectId(user_id)}, projection('user.maternal_health'))
             if not user:
                 return jsonify({'error': 'User not found'}), 404
 
@@ -1117,44 +955,9 @@ def init_vaccination_routes(app, collections):
             if not dob:
                 return jsonify({'error': 'Child date of birth not found'}), 400
 
-            from utils.vaccination_utils import calculate_vaccination_milestones
-
-            milestones = calculate_vaccination_milestones(dob)
-
-            # Get completed vaccination bookings for this user
-            completed_bookings = list(collections['vaccination_bookings'].find({
-                'userId': ObjectId(user_id),
-                'status': 'Completed'
-            }))
-
-            # Build a set of completed vaccine names
-            completed_vaccine_names = set()
-            # Also track completion dates per vaccine
-            vaccine_completion_dates = {}
-            for booking in completed_bookings:
-                # Try to get the schedule date as completion date
-                schedule = None
-                if booking.get('scheduleId'):
-                    schedule = collections['vaccination_schedules'].find_one({'_id': booking['scheduleId']})
-                completion_date = None
-                if schedule and schedule.get('date'):
-                    completion_date = schedule['date']
-                elif booking.get('createdAt'):
-                    ca = booking['createdAt']
-                    completion_date = ca.isoformat() if isinstance(ca, datetime) else ca
-
-                for v in booking.get('vaccines', []):
-                    vname = v.strip()
-                    completed_vaccine_names.add(vname)
-                    if vname not in vaccine_completion_dates:
-                        vaccine_completion_dates[vname] = completion_date
-
-            # Mark milestones as completed where applicable
-            for milestone in milestones:
-                vname = milestone['vaccineName']
-                if vname in completed_vaccine_names:
-                    milestone['status'] = 'completed'
-                    milestone['completedAt'] = vaccine_completion_dates.get(vname)
+            # Precomputed row of the first child, completion dates included (services/immunization_status.py)
+            row = immunization_status.row_for(user, 0)
+            milestones = immunization_milestones(row) if row else []
 
             # Build child info
             child_dob = dob
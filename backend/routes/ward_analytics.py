@@ -1,10 +1,12 @@
 """
 Ward Analytics routes for admin dashboard
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt
 from datetime import datetime, timezone, timedelta
-from bson import ObjectId
+from services import reference_data
+from services.ward_stats_service import ward_stats
+from services.activity_rollup_service import activity_rollups, METRICS, PERIODS
 
 # Create blueprint
 ward_analytics_bp = Blueprint('ward_analytics', __name__)
@@ -31,58 +33,48 @@ def init_ward_analytics_routes(app, collections):
             # Define Ward 1 as the focus
             ward_name = "Ward 1"
             
+            # Counters are maintained incrementally by the write paths (services/ward_stats_service.py)
+            stats = ward_stats.get()
+            counters = stats.get('counters') or {}
+            groups = stats.get('groups') or {}
+            
+            def counter(name):
+                section, key = name.split('.', 1)
+                return int((counters.get(section) or {}).get(key, 0) or 0)
+            
             # === USER STATISTICS ===
-            total_users = collections['users'].count_documents({'userType': 'user'})
-            maternal_users = collections['users'].count_documents({
-                'userType': 'user',
-                'beneficiaryCategory': 'maternity'
-            })
-            palliative_users = collections['users'].count_documents({
-                'userType': 'user',
-                'beneficiaryCategory': 'palliative'
-            })
-            active_users = collections['users'].count_documents({
-                'userType': 'user',
-                'isActive': True
-            })
+            total_users = counter('users.total')
+            maternal_users = counter('users.maternal')
+            palliative_users = counter('users.palliative')
+            active_users = counter('users.active')
             
             # === SUPPLY REQUEST STATISTICS ===
-            total_supply_requests = collections['supply_requests'].count_documents({})
-            pending_supplies = collections['supply_requests'].count_documents({'status': 'pending'})
-            approved_supplies = collections['supply_requests'].count_documents({'status': 'approved'})
-            rejected_supplies = collections['supply_requests'].count_documents({'status': 'rejected'})
-            delivered_supplies = collections['supply_requests'].count_documents({'deliveryStatus': 'delivered'})
-            
-            # Supply requests by category
-            supply_by_category = list(collections['supply_requests'].aggregate([
-                {
-                    '$group': {
-                        '_id': '$category',
-                        'count': {'$sum': 1}
-                    }
-                }
-            ]))
+            total_supply_requests = counter('supply.total')
+            pending_supplies = counter('supply.pending')
+            approved_supplies = counter('supply.approved')
+            rejected_supplies = counter('supply.rejected')
+            delivered_supplies = counter('supply.delivered')
+            supply_by_category = [
+                {'category': category, 'count': int(count)}
+                for category, count in (groups.get('supplyByCategory') or {}).items() if count > 0
+            ]
             
             # === VACCINATION STATISTICS ===
-            total_vaccinations = collections['vaccination_schedules'].count_documents({})
-            total_bookings = collections['vaccination_bookings'].count_documents({})
-            completed_vaccinations = collections['vaccination_bookings'].count_documents({'status': 'Completed'})
+            total_vaccinations = counter('vaccination.schedules')
+            total_bookings = counter('vaccination.bookings')
+            completed_vaccinations = counter('vaccination.completed')
             
             # === HOME VISITS STATISTICS ===
-            total_home_visits = collections['home_visits'].count_documents({})
-            verified_visits = collections['home_visits'].count_documents({'verified': True})
-            pending_verification = collections['home_visits'].count_documents({'verified': False})
-            
-            # Home visits by category
-            maternal_visits = collections['home_visits'].count_documents({})  # Would need userCategory field
-            palliative_visits = collections['home_visits'].count_documents({})
+            total_home_visits = counter('homeVisits.total')
+            verified_visits = counter('homeVisits.verified')
+            pending_verification = counter('homeVisits.pending')
             
             # === MONTHLY RATION STATISTICS ===
-            collected_rations = collections['monthly_rations'].count_documents({'status': 'collected'})
-            pending_rations = collections['monthly_rations'].count_documents({'status': 'pending'})
+            collected_rations = counter('rations.collected')
+            pending_rations = counter('rations.pending')
             
             # === LOCATION STATISTICS ===
-            locations = list(collections['locations'].find({'ward': ward_name}))
+            locations = [loc for loc in reference_data.locations(collections['locations']) if loc.get('ward') == ward_name]
             location_stats = {
                 'anganwadi': 0,
                 'community_hall': 0,
@@ -97,77 +89,27 @@ def init_ward_analytics_routes(app, collections):
                     location_stats['other'] += 1
             
             # === ACTIVITY HEAT MAP DATA ===
-            # Get activity by month for the last 6 months
+            # Activity by month for the last 6 months (whole months, from the month 180 days ago),
+            # read from the pre-aggregated monthly rollups
             six_months_ago = datetime.now(timezone.utc) - timedelta(days=180)
             
-            # Supply requests over time
-            supply_timeline = list(collections['supply_requests'].aggregate([
-                {
-                    '$match': {
-                        'createdAt': {'$gte': six_months_ago}
-                    }
-                },
-                {
-                    '$group': {
-                        '_id': {
-                            'year': {'$year': '$createdAt'},
-                            'month': {'$month': '$createdAt'}
-                        },
-                        'count': {'$sum': 1}
-                    }
-                },
-                {'$sort': {'_id.year': 1, '_id.month': 1}}
-            ]))
-            
-            # Home visits over time
-            visits_timeline = list(collections['home_visits'].aggregate([
-                {
-                    '$match': {
-                        'visitDate': {'$gte': six_months_ago}
-                    }
-                },
-                {
-                    '$group': {
-                        '_id': {
-                            'year': {'$year': '$visitDate'},
-                            'month': {'$month': '$visitDate'}
-                        },
-                        'count': {'$sum': 1}
-                    }
-                },
-                {'$sort': {'_id.year': 1, '_id.month': 1}}
-            ]))
-            
-            # User registrations over time
-            user_timeline = list(collections['users'].aggregate([
-                {
-                    '$match': {
-                        'userType': 'user',
-                        'createdAt': {'$gte': six_months_ago}
-                    }
-                },
-                {
-                    '$group': {
-                        '_id': {
-                            'year': {'$year': '$createdAt'},
-                            'month': {'$month': '$createdAt'}
-                        },
-                        'count': {'$sum': 1}
-                    }
-                },
-                {'$sort': {'_id.year': 1, '_id.month': 1}}
-            ]))
+            def timeline(metric):
+                return [{'month': point['bucket'], 'count': point['count']}
+                        for point in activity_rollups.series(metric, six_months_ago, period='month')]
             
             # === HEALTH BLOGS & COMMUNITY ENGAGEMENT ===
-            total_blogs = collections['health_blogs'].count_documents({})
-            published_blogs = collections['health_blogs'].count_documents({'status': 'published'})
-            total_classes = collections['community_classes'].count_documents({})
-            total_camps = collections['local_camps'].count_documents({})
+            total_blogs = counter('content.blogs')
+            published_blogs = counter('content.publishedBlogs')
+            total_classes = counter('content.classes')
+            total_camps = counter('content.camps')
             
             # === PREPARE RESPONSE ===
             analytics_data = {
                 'ward': ward_name,
                 'lastUpdated': datetime.now(timezone.utc).isoformat(),
+                # When the counters last changed / were last fully recounted
+                'asOf': stats['asOf'].isoformat() if stats.get('asOf') else None,
+                'reconciledAt': stats['reconciledAt'].isoformat() if stats.get('reconciledAt') else None,
                 
                 # User statistics
                 'userStats': {
@@ -188,7 +130,7 @@ def init_ward_analytics_routes(app, collections):
                     'approved': int(approved_supplies),
                     'rejected': int(rejected_supplies),
                     'delivered': int(delivered_supplies),
-                    'byCategory': [{'category': item['_id'] or 'Other', 'count': int(item['count'])} for item in supply_by_category]
+                    'byCategory': supply_by_category
                 },
                 
                 # Vaccination statistics
@@ -227,9 +169,12 @@ def init_ward_analytics_routes(app, collections):
                 
                 # Activity timelines for charts
                 'activityTimeline': {
-                    'supplyRequests': [{'month': f"{item['_id']['year']}-{item['_id']['month']:02d}", 'count': int(item['count'])} for item in supply_timeline],
-                    'homeVisits': [{'month': f"{item['_id']['year']}-{item['_id']['month']:02d}", 'count': int(item['count'])} for item in visits_timeline],
-                    'userRegistrations': [{'month': f"{item['_id']['year']}-{item['_id']['month']:02d}", 'count': int(item['count'])} for item in user_timeline]
+                    'supplyRequests': timeline('supplyRequests'),
+                    'homeVisits': timeline('homeVisits'),
+                    'userRegistrations': timeline('userRegistrations'),
+                    'vaccinationsCompleted': timeline('vaccinationsCompleted'),
+                    'rationsCollected': timeline('rationsCollected'),
+                    'milestonesRecorded': timeline('milestonesRecorded')
                 },
                 
                 # Heat map intensity data (0-100 scale)
@@ -248,5 +193,66 @@ def init_ward_analytics_routes(app, collections):
             print(f"Error fetching ward analytics: {str(e)}")
             return jsonify({'error': f'Failed to fetch ward analytics: {str(e)}'}), 500
     
+    @ward_analytics_bp.route('/api/admin/ward-analytics/reconcile', methods=['POST'])
+    @jwt_required()
+    def reconcile_ward_analytics():
+        """Recount the ward analytics counters now (normally done by the periodic job)"""
+        try:
+            admin_check = require_admin()
+            if admin_check:
+                return admin_check
+            
+            result = ward_stats.reconcile()
+            return jsonify({'message': 'Ward analytics recounted', **result}), 200
+            
+        except Exception as e:
+            print(f"Error reconciling ward analytics: {str(e)}")
+            return jsonify({'error': f'Failed to reconcile ward analytics: {str(e)}'}), 500
+    
+    @ward_analytics_bp.route('/api/admin/activity-rollups', methods=['GET'])
+    @jwt_required()
+    def get_activity_rollups():
+        """Activity time series for a date range.
+        
+        Query: metrics (comma separated, default all), period (day|month, default day),
+        from / to (YYYY-MM-DD, to exclusive; default the last 30 days), fill (1: include empty buckets)
+        """
+        try:
+            admin_check = require_admin()
+            if admin_check:
+                return admin_check
+            
+            period = (request.args.get('period') or 'day').lower()
+            if period not in PERIODS:
+                return jsonify({'error': f"period must be one of: {', '.join(PERIODS)}"}), 400
+            metrics = [m.strip() for m in (request.args.get('metrics') or '').split(',') if m.strip()] or list(METRICS)
+            unknown = [m for m in metrics if m not in METRICS]
+            if unknown:
+                return jsonify({'error': f"Unknown metric(s): {', '.join(unknown)}", 'metrics': list(METRICS)}), 400
+            try:
+                end = request.args.get('to')
+                end = datetime.strptime(end, '%Y-%m-%d').replace(tzinfo=timezone.utc) if end else None
+                start = request.args.get('from')
+                if start:
+                    start = datetime.strptime(start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+                else:
+                    start = (end or datetime.now(timezone.utc)) - timedelta(days=30)
+            except ValueError:
+                return jsonify({'error': 'from and to must be dates in YYYY-MM-DD format'}), 400
+            fill = request.args.get('fill', '').lower() in ('1', 'true', 'yes')
+            
+            series = {metric: activity_rollups.series(metric, start, end, period=period, fill=fill) for metric in metrics}
+            return jsonify({
+                'ward': activity_rollups.ward,
+                'period': period,
+                'from': start.date().isoformat(),
+                'to': end.date().isoformat() if end else None,
+                'series': series
+            }), 200
+            
+        except Exception as e:
+            print(f"Error fetching activity rollups: {str(e)}")
+            return jsonify({'error': f'Failed to fetch activity rollups: {str(e)}'}), 500
+    
     # Register blueprint with app
     app.register_blueprint(ward_analytics_bp)
@@ -0,0 +1,44 @@
+"""
+One-shot bootstrap: create indexes and seed default data
+Idempotent - a version marker in system_meta makes repeated runs a no-op.
+Run once per deploy (e.g. before switching traffic to FAST_BOOT instances).
+
+Usage (from backend/):
+    python -m scripts.bootstrap            # apply if not yet applied
+    python -m scripts.bootstrap --force    # re-run every phase
+    python -m scripts.bootstrap --status   # show the marker
+"""
+import argparse
+import sys
+from config.database import get_database, get_collections
+from services.bootstrap_service import BootstrapService, BOOTSTRAP_VERSION
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create indexes and seed default data')
+    parser.add_argument('--force', action='store_true', help='Run every phase even if the marker is current')
+    parser.add_argument('--status', action='store_true', help='Only print the bootstrap marker')
+    args = parser.parse_args(argv)
+
+    service = BootstrapService(get_collections(get_database()))
+
+    if args.status:
+        marker = service.get_marker()
+        if not marker:
+            print(f"Bootstrap has not been run (code version {BOOTSTRAP_VERSION})")
+        else:
+            state = 'current' if service.is_current() else 'outdated'
+            print(f"Bootstrap version {marker.get('version')} ({state}; code version {BOOTSTRAP_VERSION}), "
+                  f"completed at {marker.get('completedAt')}")
+        return
+
+    applied, report = service.run(force=args.force)
+    if report:
+        for item in report['phases']:
+            print(f"  {item['phase']:<24s} {item['ms']:>9.1f}ms")
+        if report['failed']:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,825 @@
+"""
+Deterministic synthetic data generator for load and scale testing
+Fills every collection returned by config.database.get_collections with
+cross-referenced documents (mothers with children, bookings on real schedules,
+milestone records, PMSMA benefit state, notifications, ...).
+
+The same --seed and --now always produce the same documents, including _ids.
+
+Usage (from backend/):
+    python -m scripts.generate_synthetic_data --scale 0.1 --drop
+    python -m scripts.generate_synthetic_data --users 1000000 --set home_visits=5000000 --drop
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timezone, timedelta
+from bson import ObjectId
+
+# Document volumes at scale 1.0 (counts of the main collections; per-user
+# collections such as ANC visits, rations and milestone records follow from these)
+DEFAULT_VOLUMES = {
+    'users': 50000,
+    'vaccination_bookings': 200000,
+    'home_visits': 100000,
+    'ration_months': 12,
+    'supply_requests': 5000,
+    'visit_requests': 5000,
+    'palliative_records': 40000,
+    'asha_feedback': 5000,
+    'notifications': 100000,
+    'calendar_events': 300,
+    'community_classes': 100,
+    'local_camps': 50,
+    'health_blogs': 200,
+}
+
+# Volumes that are not multiplied by --scale
+FIXED_VOLUMES = ('ration_months',)
+
+DEFAULT_BATCH_SIZE = 5000
+
+ADMIN_EMAIL = 'synthetic-admin@ashaassist.local'
+ASHA_EMAIL = 'synthetic-asha-{}@ashaassist.local'
+ANGANVAADI_EMAIL = 'synthetic-anganvaadi@ashaassist.local'
+
+FIRST_NAMES = ['Anjali', 'Priya', 'Lakshmi', 'Meera', 'Divya', 'Sreeja', 'Aswathy', 'Reshma', 'Bindu',
+               'Sunitha', 'Deepa', 'Remya', 'Neethu', 'Athira', 'Gopika', 'Fathima', 'Ammini', 'Mary']
+LAST_NAMES = ['Nair', 'Menon', 'Pillai', 'Kurian', 'Thomas', 'Varghese', 'Joseph', 'Krishnan', 'Das', 'Rahman']
+CHILD_NAMES = ['Aarav', 'Adhya', 'Ishaan', 'Diya', 'Vihaan', 'Anika', 'Arjun', 'Navya', 'Kabir', 'Saanvi']
+CENTERS = ['Manarcad Health Center (HC)', 'Ward 1 Anganwadi', 'Kottayam Medical College', 'PHC Manarcad']
+PALLIATIVE_TESTS = [('Blood Pressure', None), ('Blood Sugar', 'mg/dL'), ('Pulse', 'bpm'),
+                    ('Oxygen Saturation', '%'), ('Weight', 'kg')]
+SUPPLY_ITEMS = {
+    'maternity': ['Iron tablets', 'Calcium tablets', 'Nutrition kit', 'Maternity pads'],
+    'palliative': ['Adult diapers', 'Wheelchair', 'Air mattress', 'Bandages', 'Walker'],
+}
+BLOG_CATEGORIES = ['maternal', 'vaccination', 'nutrition', 'palliative', 'general']
+NOTIFICATION_TYPES = ['info', 'success', 'warning', 'event']
+
+
+def scaled_volumes(scale=1.0, overrides=None):
+    """DEFAULT_VOLUMES multiplied by scale, with explicit per-collection overrides applied last"""
+    volumes = {}
+    for key, value in DEFAULT_VOLUMES.items():
+        volumes[key] = value if key in FIXED_VOLUMES else max(1, int(value * scale))
+    volumes.update(overrides or {})
+    return volumes
+
+
+class SyntheticDataGenerator:
+    """Generates a cross-referenced ward dataset into the application collections"""
+
+    def __init__(self, collections, seed=42, scale=1.0, volumes=None, now=None,
+                 batch_size=DEFAULT_BATCH_SIZE, verbose=True):
+        self.collections = collections
+        self.rng = random.Random(seed)
+        self.volumes = scaled_volumes(scale, volumes)
+        self.now = now or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.counts = {}
+
+        # Cross-reference state filled while generating
+        self.admin_id = None
+        self.asha_ids = []
+        self.anganvaadi_id = None
+        self.maternity = []    # (user_id, name)
+        self.palliative = []   # (user_id, name)
+        self.children = []     # (mother_id, child_name, dob_date)
+        self.pregnancies = []  # (mother_id, lmp_date, delivery_date or None)
+        self.schedules = []    # (schedule_id, date, vaccines)
+        self.milestones = []   # developmental milestone documents
+
+    # ---------------------------------------------------------------- helpers
+
+    def _log(self, message):
+        if self.verbose:
+            print(f"[SYNTH] {message}")
+
+    def _oid(self, when=None):
+        """Deterministic ObjectId whose timestamp part matches `when`"""
+        when = when or self.now
+        return ObjectId(int(when.timestamp()).to_bytes(4, 'big') + self.rng.getrandbits(64).to_bytes(8, 'big'))
+
+    def _days_ago(self, low, high):
+        return self.now - timedelta(days=self.rng.randint(low, high), minutes=self.rng.randint(0, 1439))
+
+    def _name(self):
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+    def _insert(self, name, docs):
+        """Insert an iterable of documents with insert_many in batch_size chunks"""
+        collection = self.collections[name]
+        total = 0
+        batch = []
+        for doc in docs:
+            if '_id' not in doc:
+                created = doc.get('createdAt')
+                doc['_id'] = self._oid(created if isinstance(created, datetime) else None)
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                collection.insert_many(batch, ordered=False)
+                total += len(batch)
+                batch = []
+        if batch:
+            collection.insert_many(batch, ordered=False)
+            total += len(batch)
+        self.counts[name] = self.counts.get(name, 0) + total
+        return total
+
+    # ------------------------------------------------------------- generators
+
+    def generate(self, drop=False):
+        """Generate every collection in dependency order and return a summary"""
+        if drop:
+            for collection in self.collections.values():
+                collection.drop()
+
+        steps = [
+            ('reference data', self.generate_reference_data),
+            ('users', self.generate_users),
+            ('maternity_profiles', self.generate_maternity_profiles),
+            ('visits', self.generate_anc_visits),
+            ('vaccination', self.generate_vaccination),
+            ('milestone_records', self.generate_milestone_records),
+            ('home_visits', self.generate_home_visits),
+            ('visit_requests', self.generate_visit_requests),
+            ('supply_requests', self.generate_supply_requests),
+            ('palliative_records', self.generate_palliative_records),
+            ('asha_feedback', self.generate_asha_feedback),
+            ('monthly_rations', self.generate_monthly_rations),
+            ('community', self.generate_community),
+            ('notifications', self.generate_notifications),
+        ]
+        for label, step in steps:
+            start = time.perf_counter()
+            step()
+            self._log(f"{label} done in {time.perf_counter() - start:.1f}s")
+
+        # Written behind the routes' backs: invalidate the ETags of the version-stamped endpoints
+        from middleware.conditional import CollectionVersions
+        CollectionVersions(self.collections['system_meta']).bump('health_blogs', 'locations', 'developmental_milestones')
+        # ... and recount the write-time aggregates
+        from services.ward_stats_service import WardStatsService
+        from services.activity_rollup_service import ActivityRollupService
+        from services.notification_service import notification_service_for
+        from services.immunization_status import ImmunizationStatusService
+        WardStatsService(self.collections).reconcile()
+        ActivityRollupService(self.collections).rebuild()
+        notification_service_for(self.collections).reconcile_counters()
+        ImmunizationStatusService(self.collections).rebuild()
+
+        return {
+            'adminId': str(self.admin_id),
+            'ashaWorkerIds': [str(i) for i in self.asha_ids],
+            'anganvaadiWorkerId': str(self.anganvaadi_id),
+            'maternityUserIds': [str(u) for u, _ in self.maternity[:10]],
+            'counts': dict(self.counts),
+        }
+
+    def generate_reference_data(self):
+        """Milestones, stock and locations via the application's own seeders"""
+        from services.milestone_service import MilestoneService
+        from services.stock_service import StockService
+        from services.seed_service import SeedService
+
+        MilestoneService(self.collections['users'], self.collections['developmental_milestones'],
+                         self.collections['milestone_records']).seed_milestones()
+
+        StockService(self.collections['anganwadi_stock'])._seed_default_items()
+        SeedService(self.collections).create_default_locations()
+
+        for name in ('developmental_milestones', 'anganwadi_stock', 'locations'):
+            self._rekey(name)
+            self.counts[name] = self.collections[name].count_documents({})
+
+        self.milestones = list(self.collections['developmental_milestones'].find({'isActive': True}).sort('order', 1))
+        stock = self.collections['anganwadi_stock']
+        for item in stock.find({}, {'minThreshold': 1}).sort('_id', 1):
+            stock.update_one({'_id': item['_id']},
+                             {'$set': {'quantity': float(item.get('minThreshold', 0) * self.rng.randint(1, 20))}})
+
+    def _rekey(self, name):
+        """Give documents written by the application seeders deterministic _ids and timestamps"""
+        collection = self.collections[name]
+        docs = list(collection.find().sort('_id', 1))
+        if not docs:
+            return
+        collection.delete_many({'_id': {'$in': [d['_id'] for d in docs]}})
+        for doc in docs:
+            doc['_id'] = self._oid()
+            for field in ('createdAt', 'updatedAt', 'lastUpdated'):
+                if isinstance(doc.get(field), datetime):
+                    doc[field] = self.now
+        collection.insert_many(docs)
+
+    def generate_users(self):
+        rng, now = self.rng, self.now
+        self.admin_id = self._oid()
+        self.anganvaadi_id = self._oid()
+        staff = [
+            {'_id': self.admin_id, 'email': ADMIN_EMAIL, 'name': 'Synthetic Admin', 'phone': '7000000000',
+             'userType': 'admin', 'isActive': True, 'createdAt': now, 'updatedAt': now},
+            {'_id': self.anganvaadi_id, 'email': ANGANVAADI_EMAIL, 'name': 'Synthetic Anganvaadi Worker',
+             'phone': '7000000001', 'userType': 'anganvaadi', 'ward': 'Ward 1', 'isActive': True,
+             'createdAt': now, 'updatedAt': now},
+        ]
+        for i in range(max(1, self.volumes['users'] // 1000)):
+            asha_id = self._oid()
+            self.asha_ids.append(asha_id)
+            staff.append({'_id': asha_id, 'email': ASHA_EMAIL.format(i), 'name': f'ASHA Worker {i + 1}',
+                          'phone': f'71{i:08d}', 'userType': 'asha_worker', 'ward': 'Ward 1',
+                          'isActive': True, 'createdAt': now, 'updatedAt': now})
+        self._insert('users', staff)
+        self._insert('users', (self._beneficiary(i) for i in range(self.volumes['users'])))
+
+    def _beneficiary(self, i):
+        rng, now = self.rng, self.now
+        created = self._days_ago(0, 720)
+        user_id = self._oid(created)
+        name = self._name()
+        doc = {
+            '_id': user_id,
+            'email': f'synthetic-user-{i}@ashaassist.local',
+            'phone': f'9{i:09d}',
+            'name': name,
+            'userType': 'user',
+            'ward': 'Ward 1',
+            'address': f'House No. {i + 1}, Ward 1, Manarcad',
+            'authProvider': 'firebase',
+            'isFirstLogin': False,
+            'profileCompleted': True,
+            'isActive': rng.random() < 0.95,
+            'createdAt': created,
+            'updatedAt': created,
+        }
+        if rng.random() >= 0.7:
+            doc['beneficiaryCategory'] = 'palliative'
+            self.palliative.append((user_id, name))
+            return doc
+
+        doc['beneficiaryCategory'] = 'maternity'
+        self.maternity.append((user_id, name))
+        if rng.random() < 0.4:
+            # Pregnant: LMP within the last 9 months
+            lmp = (now - timedelta(days=rng.randint(20, 270))).date()
+            registered = min(lmp + timedelta(days=rng.randint(30, 150)), now.date())
+            self.pregnancies.append((user_id, lmp, None))
+            doc['maternalHealth'] = {
+                'pregnancyStatus': 'pregnant',
+                'lmp': lmp.isoformat(),
+                'edd': (lmp + timedelta(days=280)).isoformat(),
+                'deliveryDate': None,
+                'deliveryDetails': None,
+                'children': [],
+            }
+            doc['governmentBenefits'] = {'pmsma': self._pmsma(lmp, registered, delivered=False)}
+            return doc
+
+        # Delivered: one or two children up to five years old
+        children = []
+        for c in range(1 if rng.random() < 0.8 else 2):
+            dob = (now - timedelta(days=rng.randint(0, 5 * 365))).date()
+            child = {
+                'name': f'{rng.choice(CHILD_NAMES)} {name.split()[-1]}' + (f' {c + 1}' if c else ''),
+                'gender': rng.choice(['male', 'female']),
+                'weight': rng.randint(2200, 4200),
+                'height': rng.randint(45, 55),
+                'dateOfBirth': dob.isoformat(),
+            }
+            if rng.random() < 0.3:
+                from utils.vaccination_utils import calculate_vaccination_milestones
+                child['vaccinationMilestones'] = calculate_vaccination_milestones(child['dateOfBirth'])
+            children.append(child)
+            self.children.append((user_id, child['name'], dob))
+        children.sort(key=lambda ch: ch['dateOfBirth'])
+        delivery = datetime.fromisoformat(children[-1]['dateOfBirth']).date()
+        lmp = delivery - timedelta(days=rng.randint(259, 287))
+        self.pregnancies.append((user_id, lmp, delivery))
+        doc['maternalHealth'] = {
+            'pregnancyStatus': 'delivered',
+            'lmp': lmp.isoformat(),
+            'edd': (lmp + timedelta(days=280)).isoformat(),
+            'deliveryDate': delivery.isoformat(),
+            'deliveryDetails': {
+                'type': rng.choice(['normal', 'normal', 'c-section']),
+                'location': rng.choice(CENTERS),
+                'complications': 'None',
+            },
+            'children': children,
+        }
+        doc['governmentBenefits'] = {
+            'pmsma': self._pmsma(lmp, lmp + timedelta(days=rng.randint(30, 150)), delivered=True)
+        }
+        return doc
+
+    def _pmsma(self, lmp, registered, delivered):
+        """PMSMA benefit state consistent with registration date and delivery"""
+        rng = self.rng
+        early = (registered - lmp).days <= 84
+        # Installment 2 unlocks after an ANC visit; generate_anc_visits gives one to every mother past week 8
+        anc_done = delivered or (self.now.date() - lmp).days >= 56
+        installments = []
+        for number, amount, unlocked, criteria in (
+                (1, 1000, early, 'pregnancy_registration_within_3_months'),
+                (2, 2000, anc_done, 'anc_visit_recorded'),
+                (3, 2000, delivered, 'birth_recorded')):
+            status = 'locked'
+            paid_date = None
+            if unlocked:
+                status = rng.choice(['eligible_to_apply', 'applied', 'paid', 'paid'])
+                if status == 'paid':
+                    paid_date = (registered + timedelta(days=30 * number)).isoformat()
+            installments.append({
+                'installmentNumber': number,
+                'amount': amount,
+                'eligibilityDate': registered.isoformat() if unlocked else None,
+                'status': status,
+                'paidDate': paid_date,
+                'transactionId': f'PMSMA{rng.getrandbits(40):012d}' if paid_date else None,
+                'eligibilityCriteria': criteria,
+            })
+        eligible = sum(i['amount'] for i in installments if i['status'] != 'locked')
+        paid = sum(i['amount'] for i in installments if i['status'] == 'paid')
+        return {
+            'installments': installments,
+            'totalAmount': 5000,
+            'totalEligible': eligible,
+            'totalPaid': paid,
+            'progress': f"{sum(1 for i in installments if i['status'] != 'locked')}/3",
+            'programName': 'Pradhan Mantri Surakshit Matritva Abhiyan',
+            'programShortName': 'PMSMA',
+            'createdAt': datetime.combine(registered, datetime.min.time(), tzinfo=timezone.utc),
+        }
+
+    def generate_maternity_profiles(self):
+        rng = self.rng
+
+        def profiles():
+            for user_id, _ in self.maternity:
+                yield {
+                    'userId': user_id,
+                    'bloodGroup': rng.choice(['A+', 'B+', 'O+', 'AB+', 'O-', 'A-']),
+                    'heightCm': rng.randint(145, 175),
+                    'prePregnancyWeightKg': rng.randint(40, 85),
+                    'gravida': rng.randint(1, 4),
+                    'para': rng.randint(0, 3),
+                    'createdAt': self.now,
+                    'updatedAt': self.now,
+                }
+
+        self._insert('maternity_profiles', profiles())
+
+    def generate_anc_visits(self):
+        rng = self.rng
+
+        def visits():
+            for user_id, lmp_date, delivery_date in self.pregnancies:
+                lmp = datetime.combine(lmp_date, datetime.min.time(), tzinfo=timezone.utc)
+                end = datetime.combine(delivery_date, datetime.min.time(), tzinfo=timezone.utc) if delivery_date else self.now
+                weeks = (end - lmp).days // 7
+                if weeks < 8:
+                    continue
+                for week in sorted(rng.sample(range(8, weeks + 1), min(rng.randint(1, 6), weeks - 7))):
+                    visit_date = lmp + timedelta(weeks=week)
+                    yield {
+                        'userId': user_id,
+                        'visitDate': visit_date.date().isoformat(),
+                        'week': week,
+                        'center': rng.choice(CENTERS),
+                        'notes': 'Routine antenatal checkup',
+                        'doctorNotes': None,
+                        'vitals': {
+                            'systolicBP': rng.randint(100, 145),
+                            'diastolicBP': rng.randint(60, 95),
+                            'bloodSugar': rng.randint(70, 160),
+                            'heartRate': rng.randint(65, 100),
+                        },
+                        'createdAt': visit_date,
+                    }
+
+        self._insert('visits', visits())
+
+    def generate_vaccination(self):
+        from utils.vaccination_utils import VACCINATION_SCHEDULE
+        rng, now = self.rng, self.now
+        vaccine_names = list(dict.fromkeys(v['vaccineName'] for v in VACCINATION_SCHEDULE))
+
+        # Weekly Wednesday sessions over the past year and the next two months
+        wednesday = now - timedelta(days=(now.weekday() - 2) % 7)
+        docs = []
+        for week in range(-8, 52):
+            date = (wednesday - timedelta(weeks=week)).date()
+            schedule_id = self._oid(datetime.combine(date, datetime.min.time(), tzinfo=timezone.utc))
+            vaccines = rng.sample(vaccine_names, 8)
+            self.schedules.append((schedule_id, date, vaccines))
+            docs.append({
+                '_id': schedule_id,
+                'title': f'Immunization Session - {date.strftime("%d %b %Y")}',
+                'date': date.isoformat(),
+                'time': '10:00',
+                'location': 'Ward 1 Anganwadi',
+                'vaccines': vaccines,
+                'description': 'Weekly immunization session',
+                'createdBy': rng.choice(self.asha_ids),
+                'createdAt': now,
+                'updatedAt': now,
+                'status': 'Scheduled',
+            })
+        self._insert('vaccination_schedules', docs)
+
+        if not self.children:
+            return
+        today = now.date()
+
+        def bookings():
+            for _ in range(self.volumes['vaccination_bookings']):
+                mother_id, child_name, dob = rng.choice(self.children)
+                schedule_id, date, vaccines = rng.choice(self.schedules)
+                if date >= today:
+                    status = 'Booked'
+                else:
+                    status = rng.choice(['Completed'] * 7 + ['Expired', 'Cancelled'])
+                created = datetime.combine(date, datetime.min.time(), tzinfo=timezone.utc) - timedelta(days=rng.randint(1, 14))
+                yield {
+                    'scheduleId': schedule_id,
+                    'userId': mother_id,
+                    'childName': child_name,
+                    'vaccines': rng.sample(vaccines, rng.randint(1, 3)),
+                    'status': status,
+                    'createdAt': created,
+                }
+
+        self._insert('vaccination_bookings', bookings())
+
+    def generate_milestone_records(self):
+        rng, now = self.rng, self.now
+        if not self.milestones:
+            return
+
+        def records():
+            for mother_id, _, dob in self.children:
+                age_months = (now.date() - dob).days / 30.44
+                for milestone in self.milestones:
+                    if milestone.get('minMonths', 0) > age_months or rng.random() < 0.2:
+                        continue
+                    achieved_months = rng.uniform(milestone.get('minMonths', 0), min(age_months, milestone.get('maxMonths', age_months)))
+                    achieved = datetime.combine(dob, datetime.min.time(), tzinfo=timezone.utc) + timedelta(days=int(achieved_months * 30.44))
+                    verification = rng.choice(['approved', 'approved', 'pending', 'flagged'])
+                    yield {
+                        'userId': mother_id,
+                        'milestoneId': milestone['_id'],
+                        'milestoneName': milestone.get('milestoneName'),
+                        'achievedDate': achieved.date().isoformat(),
+                        'childAgeInMonths': round(achieved_months, 1),
+                        'childAgeInDays': int(achieved_months * 30.44),
+                        'notes': '',
+                        'photoUrl': None,
+                        'status': 'achieved',
+                        'verificationStatus': verification,
+                        'verifiedBy': rng.choice(self.asha_ids) if verification != 'pending' else None,
+                        'verificationNotes': None,
+                        'verificationDate': achieved + timedelta(days=3) if verification != 'pending' else None,
+                        'recordedBy': mother_id,
+                        'recordedByType': 'parent',
+                        'createdAt': achieved,
+                        'updatedAt': achieved,
+                    }
+
+        self._insert('milestone_records', records())
+
+    def _beneficiaries(self):
+        return [(u, n, 'maternity') for u, n in self.maternity] + [(u, n, 'palliative') for u, n in self.palliative]
+
+    def generate_home_visits(self):
+        rng = self.rng
+        beneficiaries = self._beneficiaries()
+        if not beneficiaries:
+            return
+
+        def visits():
+            for _ in range(self.volumes['home_visits']):
+                user_id, name, category = rng.choice(beneficiaries)
+                visit_date = self._days_ago(0, 365)
+                verified = rng.random() < 0.7
+                yield {
+                    # userId / ashaWorkerId are stored as strings by the visit routes
+                    'userId': str(user_id),
+                    'userName': name,
+                    'userCategory': category,
+                    'userWard': 'Ward 1',
+                    'ashaWorkerId': str(rng.choice(self.asha_ids)),
+                    'visitDate': visit_date,
+                    'visitNotes': 'Routine home visit',
+                    'gpsLocation': {'latitude': 9.57 + rng.random() / 100, 'longitude': 76.58 + rng.random() / 100},
+                    'photoUrl': None,
+                    'status': 'completed',
+                    'verified': verified,
+                    'createdAt': visit_date,
+                    'updatedAt': visit_date,
+                }
+
+        self._insert('home_visits', visits())
+
+    def generate_visit_requests(self):
+        rng = self.rng
+        beneficiaries = self._beneficiaries()
+        if not beneficiaries:
+            return
+
+        def requests():
+            for i in range(self.volumes['visit_requests']):
+                user_id, name, category = rng.choice(beneficiaries)
+                created = self._days_ago(0, 365)
+                yield {
+                    'userId': user_id,
+                    'requestType': category,
+                    'priority': rng.choice(['Urgent', 'High', 'Medium', 'Medium']),
+                    'reason': 'Requesting a home visit',
+                    'address': 'Ward 1, Manarcad',
+                    'phone': f'9{i:09d}',
+                    'requestedDate': (created + timedelta(days=rng.randint(1, 10))).date().isoformat(),
+                    'status': rng.choice(['Pending', 'Approved', 'Scheduled', 'Completed', 'Completed', 'Rejected']),
+                    'createdAt': created,
+                    'updatedAt': created,
+                }
+
+        self._insert('visit_requests', requests())
+
+    def generate_supply_requests(self):
+        rng = self.rng
+        beneficiaries = self._beneficiaries()
+        if not beneficiaries:
+            return
+
+        def requests():
+            for _ in range(self.volumes['supply_requests']):
+                user_id, _, category = rng.choice(beneficiaries)
+                created = self._days_ago(0, 365)
+                status = rng.choice(['pending', 'approved', 'approved', 'rejected'])
+                doc = {
+                    # Stored as the JWT identity string by the supply routes
+                    'userId': str(user_id),
+                    'supplyName': rng.choice(SUPPLY_ITEMS[category]),
+                    'description': 'Required for ongoing care',
+                    'category': category,
+                    'proofFile': None,
+                    'status': status,
+                    'createdAt': created,
+                    'updatedAt': created,
+                }
+                if status == 'approved':
+                    doc['deliveryStatus'] = rng.choice(['pending', 'scheduled', 'delivered', 'delivered'])
+                    doc['deliveryLocation'] = rng.choice(CENTERS)
+                yield doc
+
+        self._insert('supply_requests', requests())
+
+    def generate_palliative_records(self):
+        rng = self.rng
+        if not self.palliative:
+            return
+
+        def records():
+            for _ in range(self.volumes['palliative_records']):
+                user_id, _ = rng.choice(self.palliative)
+                test_type, unit = rng.choice(PALLIATIVE_TESTS)
+                created = self._days_ago(0, 365)
+                doc = {
+                    'userId': user_id,
+                    'date': created.date().isoformat(),
+                    'testType': test_type,
+                    'notes': '',
+                    'value': None,
+                    'unit': unit,
+                    'systolic': None,
+                    'diastolic': None,
+                    'pulse': None,
+                    'subvalues': {},
+                    'attachments': [],
+                    'createdAt': created,
+                    'updatedAt': created,
+                }
+                if test_type == 'Blood Pressure':
+                    doc['systolic'] = float(rng.randint(100, 170))
+                    doc['diastolic'] = float(rng.randint(60, 105))
+                    doc['pulse'] = float(rng.randint(60, 100))
+                else:
+                    doc['value'] = float(rng.randint(40, 200))
+                yield doc
+
+        self._insert('palliative_records', records())
+
+    def generate_asha_feedback(self):
+        rng = self.rng
+        beneficiaries = self._beneficiaries()
+        if not beneficiaries:
+            return
+
+        def feedback():
+            for _ in range(self.volumes['asha_feedback']):
+                user_id, _, _ = rng.choice(beneficiaries)
+                rating = rng.randint(2, 5)
+                created = self._days_ago(0, 365)
+                yield {
+                    'userId': user_id,
+                    'ashaWorkerId': str(rng.choice(self.asha_ids)),
+                    'rating': rating,
+                    'timeliness': rating,
+                    'communication': max(1, rating - rng.randint(0, 1)),
+                    'supportiveness': rating,
+                    'comments': '',
+                    'createdAt': created,
+                    'updatedAt': created,
+                }
+
+        self._insert('asha_feedback', feedback())
+
+    def generate_monthly_rations(self):
+        rng = self.rng
+        items = ['Rice 5kg', 'Wheat 4kg', 'Lentils 2kg', 'Oil 2L', 'Sugar 2kg', 'Child Oil 400ml',
+                 'Iron and Folic Acid (IFA) tablets', 'Calcium tablets', 'Vitamin A',
+                 'Amrutham Nutrimix (Amrutham Podi)']
+        months = []
+        year, month = self.now.year, self.now.month
+        for _ in range(self.volumes['ration_months']):
+            months.append(datetime(year, month, 1, tzinfo=timezone.utc))
+            month -= 1
+            if month == 0:
+                year, month = year - 1, 12
+
+        def rations():
+            for month_start in months:
+                current = month_start.year == self.now.year and month_start.month == self.now.month
+                for user_id, _ in self.maternity:
+                    collected = rng.random() < (0.4 if current else 0.9)
+                    collection_date = month_start + timedelta(days=rng.randint(0, 20)) if collected else None
+                    yield {
+                        'userId': user_id,
+                        'monthStartDate': month_start.date().isoformat(),
+                        'items': items,
+                        'status': 'collected' if collected else 'pending',
+                        'collectionDate': collection_date,
+                        'createdAt': month_start,
+                        'updatedAt': collection_date or month_start,
+                    }
+
+        self._insert('monthly_rations', rations())
+
+    def generate_community(self):
+        rng, now = self.rng, self.now
+        events, classes, camps = [], [], []
+
+        for i in range(self.volumes['community_classes']):
+            date = (now + timedelta(days=rng.randint(-180, 60))).date().isoformat()
+            class_id = self._oid()
+            classes.append({
+                '_id': class_id, 'title': f'Community Class {i + 1}', 'category': 'General Health',
+                'date': date, 'time': '11:00', 'location': rng.choice(CENTERS), 'instructor': self._name(),
+                'maxParticipants': 40, 'registeredParticipants': rng.randint(0, 40),
+                'targetAudience': 'Mothers', 'status': rng.choice(['Pending', 'Approved', 'Completed']),
+                'description': '', 'topics': ['Nutrition', 'Hygiene'], 'publishedDate': date,
+                'lastUpdated': now.isoformat(), 'createdBy': str(self.anganvaadi_id), 'createdAt': now.isoformat(),
+            })
+            events.append(self._calendar_event(f'Class: Community Class {i + 1}', date, 'community_class', class_id))
+
+        for i in range(self.volumes['local_camps']):
+            date = (now + timedelta(days=rng.randint(-180, 60))).date().isoformat()
+            camp_id = self._oid()
+            camps.append({
+                '_id': camp_id, 'title': f'Health Camp {i + 1}', 'campType': rng.choice(['General', 'Eye', 'Dental']),
+                'date': date, 'time': '09:00', 'location': rng.choice(CENTERS), 'organizer': 'PHC Manarcad',
+                'services': ['Screening', 'Consultation'], 'targetAudience': 'All', 'expectedParticipants': 100,
+                'registeredParticipants': rng.randint(0, 100), 'status': rng.choice(['Pending', 'Approved', 'Completed']),
+                'description': '', 'requirements': '', 'contactPerson': self._name(), 'publishedDate': date,
+                'lastUpdated': now.isoformat(), 'createdBy': str(self.anganvaadi_id), 'createdAt': now.isoformat(),
+            })
+            events.append(self._calendar_event(f'Camp: Health Camp {i + 1}', date, 'local_camp', camp_id))
+
+        for i in range(self.volumes['calendar_events']):
+            date = (now + timedelta(days=rng.randint(-180, 90))).date().isoformat()
+            events.append(self._calendar_event(f'Ward Event {i + 1}', date, rng.choice(['meeting', 'awareness', 'other'])))
+
+        self._insert('community_classes', classes)
+        self._insert('local_camps', camps)
+        self._insert('calendar_events', events)
+
+        def blogs():
+            for i in range(self.volumes['health_blogs']):
+                created = self._days_ago(0, 720)
+                yield {
+                    'title': f'Health Tips #{i + 1}',
+                    'content': 'Practical guidance for families in the ward.',
+                    'category': rng.choice(BLOG_CATEGORIES),
+                    'authorName': self._name(),
+                    'imageUrl': None,
+                    'status': rng.choice(['published'] * 4 + ['draft']),
+                    'createdBy': rng.choice(self.asha_ids),
+                    'createdAt': created,
+                    'updatedAt': created,
+                    'views': rng.randint(0, 5000),
+                    'likes': rng.randint(0, 300),
+                    'tags': [],
+                }
+
+        self._insert('health_blogs', blogs())
+
+    def _calendar_event(self, title, date, category, source_id=None):
+        doc = {
+            'title': title,
+            'description': '',
+            'place': self.rng.choice(CENTERS),
+            'date': date,
+            'allDay': False,
+            'category': category,
+            'createdBy': self.anganvaadi_id if source_id else self.rng.choice(self.asha_ids),
+            'createdAt': self.now,
+            'updatedAt': self.now,
+        }
+        if source_id:
+            doc['sourceType'] = category
+            doc['sourceId'] = source_id
+        return doc
+
+    def generate_notifications(self):
+        rng = self.rng
+        beneficiaries = self._beneficiaries()
+        if not beneficiaries:
+            return
+        # Notification volume is skewed: a small set of recipients gets most of it
+        heavy = [str(u) for u, _, _ in beneficiaries[:max(1, len(beneficiaries) // 100)]]
+
+        def notifications():
+            for i in range(self.volumes['notifications']):
+                created = self._days_ago(0, 180)
+                doc = {
+                    'title': f'Update #{i + 1}',
+                    'message': 'There is a new update in your ward.',
+                    'type': rng.choice(NOTIFICATION_TYPES),
+                    'createdAt': created,
+                }
+                roll = rng.random()
+                if roll < 0.05:
+                    # Broadcast: one document per audience (read state lives in notification_reads)
+                    doc['audience'] = rng.choice(['user', 'asha_worker', 'all'])
+                elif roll < 0.5:
+                    doc['recipientId'] = rng.choice(heavy)
+                    doc['isRead'] = rng.random() < 0.6
+                else:
+                    doc['recipientId'] = str(rng.choice(beneficiaries)[0])
+                    doc['isRead'] = rng.random() < 0.6
+                if doc['type'] == 'event' and self.schedules:
+                    doc['relatedEntity'] = {'type': 'vaccination', 'id': str(rng.choice(self.schedules)[0])}
+                yield doc
+
+        self._insert('notifications', notifications())
+
+
+def _parse_overrides(pairs):
+    overrides = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition('=')
+        if key not in DEFAULT_VOLUMES or not value.isdigit():
+            raise argparse.ArgumentTypeError(f'invalid --set {pair!r}; expected one of {", ".join(DEFAULT_VOLUMES)}=N')
+        overrides[key] = int(value)
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic AshaAssist dataset')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplier for the default volumes (1.0 = 50k users, 200k bookings, ...)')
+    parser.add_argument('--users', type=int, help='Shortcut for --set users=N')
+    parser.add_argument('--set', action='append', metavar='COLLECTION=N', help='Override one volume')
+    parser.add_argument('--now', help='Reference date YYYY-MM-DD (default: today); fix it for reproducible runs')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--drop', action='store_true', help='Drop every collection before generating')
+    args = parser.parse_args(argv)
+
+    overrides = _parse_overrides(args.set)
+    if args.users:
+        overrides['users'] = args.users
+    now = datetime.strptime(args.now, '%Y-%m-%d').replace(tzinfo=timezone.utc) if args.now else None
+
+    from config.database import get_database, get_collections
+    from config.settings import Config
+    collections = get_collections(get_database())
+
+    if not args.drop and collections['users'].estimated_document_count():
+        print(f"Database '{Config.DATABASE_NAME}' is not empty; rerun with --drop to replace its contents.")
+        sys.exit(1)
+
+    generator = SyntheticDataGenerator(collections, seed=args.seed, scale=args.scale, volumes=overrides,
+                                       now=now, batch_size=args.batch_size)
+    start = time.perf_counter()
+    summary = generator.generate(drop=args.drop)
+    print(f"[SYNTH] Generated {sum(summary['counts'].values())} documents in {time.perf_counter() - start:.1f}s")
+    for name, count in sorted(summary['counts'].items()):
+        print(f"  {name:26s} {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Run the periodic background jobs once
+For deployments without long-lived processes (JOBS_ENABLED=False, e.g. Vercel):
+schedule this from cron or a scheduled function instead. Jobs whose lease is held
+by another worker are skipped unless --force is given.
+
+Usage (from backend/):
+    python -m scripts.run_jobs                           # every periodic job that is due
+    python -m scripts.run_jobs ward_stats_reconcile      # only the named job(s)
+    python -m scripts.run_jobs activity_rollups_rebuild  # on-demand job: full rollup recount
+    python -m scripts.run_jobs --force                   # ignore the leases
+    python -m scripts.run_jobs --list                    # show the registered jobs
+"""
+import argparse
+import json
+from flask import Flask
+from config.database import get_database, get_collections
+from config.settings import Config
+from services.email_service import init_mail
+from services.email_outbox import init_email_outbox
+from services.scheduled_jobs import init_jobs
+from utils.jobs import job_runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the periodic background jobs once')
+    parser.add_argument('jobs', nargs='*', help='Job names (default: every periodic job)')
+    parser.add_argument('--force', action='store_true', help='Run even if another worker holds the lease')
+    parser.add_argument('--list', action='store_true', help='Only list the registered jobs')
+    args = parser.parse_args(argv)
+
+    # A bare app carries the config and the mail extension for the jobs
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    init_mail(app)
+    collections = get_collections(get_database())
+    init_email_outbox(app, collections, start_workers=False)
+    init_jobs(app, collections)
+
+    if args.list:
+        for name, job in sorted(job_runner.jobs.items()):
+            print(f"  {name:<28s} {f'every {job.interval}s' if job.interval else 'on demand'}")
+        return
+
+    # Without names: the periodic jobs (on-demand ones must be named)
+    names = args.jobs or sorted(name for name, job in job_runner.jobs.items() if job.interval)
+    unknown = [name for name in names if name not in job_runner.jobs]
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(unknown)}")
+
+    for name in names:
+        result = job_runner.run(name, force=args.force)
+        job = job_runner.jobs[name]
+        if job.runs == 0:
+            print(f"  {name:<28s} skipped (lease held by another worker)")
+        elif job.last_error:
+            print(f"  {name:<28s} FAILED: {job.last_error}")
+        else:
+            print(f"  {name:<28s} {job.last_duration_ms:>9.1f}ms  {json.dumps(result, default=str)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ Run this after starting the backend server
 """
 from config.database import get_database, get_collections
 from services.milestone_service import MilestoneService
+from middleware.conditional import CollectionVersions
 
 def seed_milestones():
     """Seed the developmental milestones"""
@@ -22,6 +23,7 @@ def seed_milestones():
     result, status = milestone_service.seed_milestones()
     
     if status == 200 or status == 201:
+        CollectionVersions(collections['system_meta']).bump('developmental_milestones')
         print(f"✓ Success: {result.get('message')}")
     else:
         print(f"✗ Error: {result.get('error')}")
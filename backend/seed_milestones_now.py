@@ -4,6 +4,7 @@ Seed developmental milestones into the database
 from config.database import get_database, get_collections
 from datetime import datetime, timezone
 from bson import ObjectId
+from middleware.conditional import CollectionVersions
 
 def seed_milestones():
     print("Connecting to database...")
@@ -131,6 +132,7 @@ def seed_milestones():
     
     result = collections['developmental_milestones'].insert_many(milestones)
     print(f"✓ Successfully seeded {len(result.inserted_ids)} developmental milestones!")
+    CollectionVersions(collections['system_meta']).bump('developmental_milestones')
     
     # Create indexes
     collections['developmental_milestones'].create_index('order')
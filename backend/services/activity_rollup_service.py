@@ -0,0 +1,227 @@
+"""
+Activity rollups: pre-aggregated time series for the analytics charts
+One `activity_rollups` document per metric, ward, period ('day' or 'month') and
+bucket holds the number of matching events in that bucket, so a chart reads a
+handful of small documents instead of grouping raw documents by $year/$month.
+
+Buckets are maintained at write time: the rollups listen to the write hooks of
+services/ward_stats_service.py and $inc the day and month buckets an inserted,
+updated or deleted document falls into. A catch-up job rebuilds the recent
+window from the source collections to repair drift; `rebuild()` without `since`
+recounts everything (after imports or when a metric is added).
+Buckets are UTC calendar days and months.
+"""
+from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne, ReplaceOne
+from services.ward_stats_service import WARD_NAME, matches
+
+# Metrics: name -> (collection, equality filter, date field the event is bucketed by)
+METRICS = {
+    'supplyRequests': ('supply_requests', {}, 'createdAt'),
+    'homeVisits': ('home_visits', {}, 'visitDate'),
+    'userRegistrations': ('users', {'userType': 'user'}, 'createdAt'),
+    'vaccinationsCompleted': ('vaccination_bookings', {'status': 'Completed'}, 'updatedAt'),
+    'rationsCollected': ('monthly_rations', {'status': 'collected'}, 'collectionDate'),
+    'milestonesRecorded': ('milestone_records', {}, 'createdAt'),
+}
+PERIODS = ('day', 'month')
+
+TRACKED_FIELDS = {}
+for _collection, _filter, _field in METRICS.values():
+    TRACKED_FIELDS.setdefault(_collection, set()).update(_filter, [_field])
+
+_BUILT_MARKER = 'activity_rollups_built'
+
+
+def _as_datetime(value):
+    """UTC datetime of a stored date (datetime or ISO string), None if it has none"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def bucket_start(when, period):
+    when = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    return when.replace(day=1) if period == 'month' else when
+
+
+def bucket_label(start, period):
+    return start.strftime('%Y-%m' if period == 'month' else '%Y-%m-%d')
+
+
+def _next_bucket(start, period):
+    if period == 'day':
+        return start + timedelta(days=1)
+    return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+class ActivityRollupService:
+    def __init__(self, collections=None):
+        self.collections = collections
+        self.ward = WARD_NAME
+        self._built = set()
+
+    def init(self, collections):
+        self.collections = collections
+
+    @property
+    def rollups(self):
+        return self.collections['activity_rollups']
+
+    def tracked_fields(self, collection_name):
+        return TRACKED_FIELDS.get(collection_name, set())
+
+    # Write-time maintenance
+
+    def _events(self, collection_name, doc):
+        """(metric, datetime) of every metric the document counts towards"""
+        events = []
+        if doc is None:
+            return events
+        for metric, (collection, query, field) in METRICS.items():
+            if collection == collection_name and matches(doc, query):
+                when = _as_datetime(doc.get(field))
+                if when is not None:
+                    events.append((metric, when))
+        return events
+
+    def _bucket_update(self, metric, start, period, inc):
+        label = bucket_label(start, period)
+        return UpdateOne(
+            {'_id': f'{metric}:{self.ward}:{period}:{label}'},
+            {'$inc': {'count': inc},
+             '$setOnInsert': {'metric': metric, 'ward': self.ward, 'period': period, 'bucket': label, 'start': start}},
+            upsert=True
+        )
+
+    def record_change(self, collection_name, before, after, count=1):
+        """Adjust the buckets for `count` documents that changed from `before` to `after` (None: inserted/deleted)"""
+        deltas = {}
+        for metric, when in self._events(collection_name, before):
+            for period in PERIODS:
+                key = (metric, bucket_start(when, period), period)
+                deltas[key] = deltas.get(key, 0) - count
+        for metric, when in self._events(collection_name, after):
+            for period in PERIODS:
+                key = (metric, bucket_start(when, period), period)
+                deltas[key] = deltas.get(key, 0) + count
+        operations = [self._bucket_update(metric, start, period, n)
+                      for (metric, start, period), n in deltas.items() if n]
+        if not operations or self.collections is None:
+            return
+        try:
+            self.rollups.bulk_write(operations, ordered=False)
+        except Exception as e:
+            # The catch-up job rebuilds the recent buckets
+            print(f"[ROLLUPS] Failed to update buckets: {e}")
+
+    # Rebuild from the source collections
+
+    def rebuild(self, metrics=None, since=None):
+        """Recount the buckets of `metrics` (default: all) from the month of `since` on (default: everything)"""
+        metrics = list(metrics or METRICS)
+        start = bucket_start(_as_datetime(since), 'month') if since is not None else None
+        summary = {}
+        for metric in metrics:
+            collection, query, field = METRICS[metric]
+            source_query = dict(query)
+            if start is not None:
+                # Dates are stored as datetimes or ISO strings; each comparison only matches its own type
+                source_query['$or'] = [{field: {'$gte': start}}, {field: {'$gte': start.isoformat()[:10]}}]
+            counts = {}
+            for doc in self.collections[collection].find(source_query, {field: 1, '_id': 0}).batch_size(5000):
+                when = _as_datetime(doc.get(field))
+                if when is None or (start is not None and when < start):
+                    continue
+                for period in PERIODS:
+                    key = (bucket_start(when, period), period)
+                    counts[key] = counts.get(key, 0) + 1
+
+            stale = {'metric': metric, 'ward': self.ward}
+            if start is not None:
+                stale['start'] = {'$gte': start}
+            self.rollups.delete_many(stale)
+            operations = []
+            for (bucket, period), n in counts.items():
+                label = bucket_label(bucket, period)
+                operations.append(ReplaceOne(
+                    {'_id': f'{metric}:{self.ward}:{period}:{label}'},
+                    {'metric': metric, 'ward': self.ward, 'period': period, 'bucket': label, 'start': bucket, 'count': n},
+                    upsert=True
+                ))
+            if operations:
+                self.rollups.bulk_write(operations, ordered=False)
+            summary[metric] = sum(n for (_, period), n in counts.items() if period == 'day')
+        if start is None:
+            self.collections['system_meta'].update_one(
+                {'_id': _BUILT_MARKER},
+                {'$addToSet': {'metrics': {'$each': metrics}}, '$set': {'builtAt': datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        return {'since': start.isoformat() if start else None, 'events': summary}
+
+    def catch_up(self, days=35):
+        """Rebuild the buckets of the last `days` days (whole months), and fully build metrics never built"""
+        marker = self.collections['system_meta'].find_one({'_id': _BUILT_MARKER}) or {}
+        unbuilt = [m for m in METRICS if m not in (marker.get('metrics') or [])]
+        result = {}
+        if unbuilt:
+            result['built'] = self.rebuild(unbuilt)
+        recent = [m for m in METRICS if m not in unbuilt]
+        if recent:
+            result['recent'] = self.rebuild(recent, since=datetime.now(timezone.utc) - timedelta(days=days))
+        return result
+
+    def ensure_built(self):
+        """Fully build metrics that have never been built (first use on an existing database)"""
+        if self._built.issuperset(METRICS):
+            return
+        marker = self.collections['system_meta'].find_one({'_id': _BUILT_MARKER}) or {}
+        unbuilt = [m for m in METRICS if m not in (marker.get('metrics') or [])]
+        if unbuilt:
+            self.rebuild(unbuilt)
+        self._built.update(METRICS)
+
+    # Queries
+
+    def series(self, metric, start, end=None, period='month', fill=False):
+        """[{'bucket', 'count'}] of `metric` for buckets from the one containing `start` up to `end` (exclusive).
+
+        Empty buckets are left out unless `fill`.
+        """
+        if metric not in METRICS:
+            raise ValueError(f'Unknown metric: {metric}')
+        if period not in PERIODS:
+            raise ValueError(f'Unknown period: {period}')
+        self.ensure_built()
+        first = bucket_start(_as_datetime(start), period)
+        query = {'metric': metric, 'ward': self.ward, 'period': period, 'start': {'$gte': first}}
+        end = _as_datetime(end) if end is not None else None
+        if end is not None:
+            query['start']['$lt'] = end
+        counts = {doc['bucket']: int(doc.get('count', 0))
+                  for doc in self.rollups.find(query, {'bucket': 1, 'count': 1, '_id': 0})}
+        if not fill:
+            return [{'bucket': label, 'count': counts[label]} for label in sorted(counts) if counts[label] > 0]
+        last = end or datetime.now(timezone.utc)
+        points = []
+        current = first
+        while current < last:
+            label = bucket_label(current, period)
+            points.append({'bucket': label, 'count': max(counts.get(label, 0), 0)})
+            current = _next_bucket(current, period)
+        return points
+
+
+activity_rollups = ActivityRollupService()
+
+
+def init_activity_rollups(collections):
+    from services.ward_stats_service import ward_stats
+    activity_rollups.init(collections)
+    ward_stats.add_listener(activity_rollups)
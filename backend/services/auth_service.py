@@ -6,9 +6,13 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from pymongo.errors import DuplicateKeyError
 from bson import ObjectId
 from flask_jwt_extended import create_access_token
-from firebase_admin import auth as firebase_auth
+from config.firebase import ensure_firebase
 from utils.validators import validate_email, validate_phone, validate_user_type, validate_beneficiary_category
 from utils.helpers import normalize_inputs
+from utils.lazy import lazy_module
+from services.ward_stats_service import ward_stats
+
+firebase_auth = lazy_module('firebase_admin.auth')
 
 class AuthService:
     def __init__(self, users_collection):
@@ -26,6 +30,7 @@ class AuthService:
             if password:
                 user_data['password'] = password
 
+            ensure_firebase()
             firebase_user = firebase_auth.create_user(**user_data)
             return firebase_user.uid
         except Exception as e:
@@ -161,6 +166,7 @@ class AuthService:
             error_text = str(e)
             field = 'email' if 'email' in error_text else ('phone' if 'phone' in error_text else 'field')
             return {'error': f'User with this {field} already exists'}, 409
+        ward_stats.record_insert('users', user_doc)
 
         # Create access token
         access_token = create_access_token(
@@ -251,7 +257,7 @@ class AuthService:
         }, 200
 
     def create_default_accounts(self):
-        """Create default ASHA worker, admin, and Anganvaadi accounts if they don't exist"""
+        """Create default ASHA worker, admin, and Anganvaadi accounts if they don't exist; False on error"""
         try:
             # Check if ASHA worker exists
             asha_exists = self.users_collection.find_one({"email": "asha@gmail.com"})
@@ -308,6 +314,7 @@ class AuthService:
                 }
                 self.users_collection.insert_one(admin_account)
                 print("✓ Default admin account created: admin@example.com / admin123")
-
+            return True
         except Exception as e:
             print(f"Error creating default accounts: {e}")
+            return False
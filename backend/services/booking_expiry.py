@@ -0,0 +1,103 @@
+"""
+Vaccination booking expiry
+A booking that is still 'Booked' once its schedule's date has passed is expired.
+Reads derive that with effective_status() and never write; the periodic
+`booking_expiry` job persists it with one update_many per run:
+
+  1. the schedules that still have 'Booked' bookings (distinct on an index)
+  2. of those, the ones whose date has passed
+  3. update_many the 'Booked' bookings of those schedules to 'Expired'
+
+Each run is recorded in system_meta (`booking_expiry`) so every worker's admin
+API reports the last run's duration and counts.
+"""
+import time
+from datetime import datetime, timezone
+from services.ward_stats_service import ward_stats
+
+BOOKED = 'Booked'
+EXPIRED = 'Expired'
+
+_RUN_RECORD = 'booking_expiry'
+
+
+def _today():
+    # Schedule dates are local calendar dates (YYYY-MM-DD), as entered by the ASHA worker
+    return datetime.now().date()
+
+
+def schedule_has_passed(schedule_date, today=None):
+    """True once the day after a schedule's date (YYYY-MM-DD) has begun"""
+    if not schedule_date:
+        return False
+    try:
+        day = datetime.strptime(schedule_date, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return False
+    return (today or _today()) > day
+
+
+def effective_status(status, schedule_date, today=None):
+    """A booking's status as users should see it, whether or not the expiry job has run yet"""
+    status = status or BOOKED
+    if status == BOOKED and schedule_has_passed(schedule_date, today):
+        return EXPIRED
+    return status
+
+
+class BookingExpiryService:
+    def __init__(self, collections=None):
+        self.collections = collections
+
+    def init(self, collections):
+        self.collections = collections
+
+    def run(self):
+        """Expire the 'Booked' bookings of every past schedule; returns and records a summary"""
+        started = time.perf_counter()
+        bookings = self.collections['vaccination_bookings']
+        today = _today()
+        candidates = bookings.distinct('scheduleId', {'status': BOOKED})
+        past = [doc['_id'] for doc in self.collections['vaccination_schedules'].find(
+            {'_id': {'$in': candidates}, 'date': {'$lt': today.isoformat()}}, {'_id': 1})]
+        expired = 0
+        if past:
+            now = datetime.now(timezone.utc)
+            changes = {'status': EXPIRED, 'updatedAt': now}
+            result = bookings.update_many({'scheduleId': {'$in': past}, 'status': BOOKED}, {'$set': changes})
+            expired = result.modified_count
+            ward_stats.record_update('vaccination_bookings', {'status': BOOKED}, changes, count=expired)
+        summary = {
+            'lastRunAt': datetime.now(timezone.utc),
+            'durationMs': round((time.perf_counter() - started) * 1000.0, 1),
+            'cutoffDate': today.isoformat(),
+            'schedulesWithBookings': len(candidates),
+            'pastSchedules': len(past),
+            'expired': expired,
+        }
+        self.collections['system_meta'].update_one(
+            {'_id': _RUN_RECORD},
+            {'$set': summary, '$inc': {'runs': 1, 'totalExpired': expired}},
+            upsert=True
+        )
+        if expired:
+            print(f"[BOOKING-EXPIRY] Expired {expired} booking(s) of {len(past)} past schedule(s) "
+                  f"in {summary['durationMs']}ms")
+        return {**summary, 'lastRunAt': summary['lastRunAt'].isoformat()}
+
+    def last_run(self):
+        """The recorded summary of the most recent run (any worker), None if it never ran"""
+        doc = self.collections['system_meta'].find_one({'_id': _RUN_RECORD})
+        if doc is None:
+            return None
+        doc.pop('_id', None)
+        if isinstance(doc.get('lastRunAt'), datetime):
+            doc['lastRunAt'] = doc['lastRunAt'].isoformat()
+        return doc
+
+
+booking_expiry = BookingExpiryService()
+
+
+def init_booking_expiry(collections):
+    booking_expiry.init(collections)
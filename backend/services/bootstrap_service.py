@@ -0,0 +1,99 @@
+"""
+Bootstrap service: one-shot index creation and seeding
+Tracks what has been applied with a version marker document in system_meta so
+that running it again is a no-op until BOOTSTRAP_VERSION is bumped.
+"""
+from datetime import datetime, timezone
+from config.database import ensure_indexes
+from middleware.conditional import CollectionVersions
+from services.auth_service import AuthService
+from services.notification_service import notification_service_for
+from services.seed_service import SeedService
+from utils.startup_timer import StartupTimer
+
+# Bump whenever ensure_indexes, the default seeds or the data migrations change
+BOOTSTRAP_VERSION = 11
+
+MARKER_ID = 'bootstrap'
+
+
+class BootstrapService:
+    def __init__(self, collections):
+        self.collections = collections
+        self.meta = collections['system_meta']
+
+    def get_marker(self):
+        """Return the bootstrap marker document (or None if bootstrap never ran)"""
+        return self.meta.find_one({'_id': MARKER_ID})
+
+    def is_current(self):
+        marker = self.get_marker()
+        return bool(marker) and marker.get('version', 0) >= BOOTSTRAP_VERSION
+
+    def run(self, force=False, timer=None):
+        """Create indexes and seed default data unless the marker is already current.
+
+        The marker is only written when every phase succeeded. Returns (applied, report);
+        report holds the per-phase timings and the names of the phases that failed.
+        """
+        if not force and self.is_current():
+            print(f"[BOOTSTRAP] Version {BOOTSTRAP_VERSION} already applied; nothing to do")
+            return False, None
+
+        timer = timer or StartupTimer()
+        seed_service = SeedService(self.collections)
+        failed = []
+
+        with timer.phase('indexes'):
+            if not ensure_indexes(self.collections):
+                failed.append('indexes')
+        with timer.phase('default accounts'):
+            if not AuthService(self.collections['users']).create_default_accounts():
+                failed.append('default accounts')
+        # (phase, seed, version-stamped collection it writes to)
+        seeds = (
+            ('seed health blogs', seed_service.create_default_health_blogs, 'health_blogs'),
+            ('seed supply requests', seed_service.create_sample_supply_requests, None),
+            ('seed locations', seed_service.create_default_locations, 'locations'),
+        )
+        changed = []
+        for phase, seed, stamped in seeds:
+            with timer.phase(phase):
+                inserted = seed()
+            if inserted is None:
+                failed.append(phase)
+            elif inserted and stamped:
+                changed.append(stamped)
+        with timer.phase('notifications'):
+            try:
+                notifications = notification_service_for(self.collections)
+                migrated = notifications.migrate_role_notifications()
+                if migrated:
+                    print(f"[BOOTSTRAP] Converted {migrated} role-wide notification(s) to broadcasts")
+                    # The converted ones change every reader's counts; otherwise drift is left to the
+                    # notification_counters_reconcile job (a full recount has no place on the startup path)
+                    notifications.reconcile_counters()
+            except Exception as e:
+                print(f"[BOOTSTRAP] Notification migration failed: {e}")
+                failed.append('notifications')
+        # Only collections a seed actually wrote to: a bump drops every client's ETag for them
+        if changed:
+            CollectionVersions(self.meta).bump(*changed)
+
+        report = timer.report()
+        report['failed'] = failed
+        if failed:
+            # Leave the marker as it was so the next boot (or bootstrap run) retries every phase
+            print(f"[BOOTSTRAP] Version {BOOTSTRAP_VERSION} NOT applied; failed phase(s): {', '.join(failed)}")
+            return False, report
+        self.meta.update_one(
+            {'_id': MARKER_ID},
+            {'$set': {
+                'version': BOOTSTRAP_VERSION,
+                'completedAt': datetime.now(timezone.utc),
+                'phases': report['phases'],
+            }},
+            upsert=True
+        )
+        print(f"[BOOTSTRAP] Version {BOOTSTRAP_VERSION} applied")
+        return True, report
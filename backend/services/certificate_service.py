@@ -0,0 +1,410 @@
+"""
+Vaccination certificate rendering and cache
+A certificate only depends on its booking, schedule and parent name, so each is
+rendered (signed, QR-encoded and drawn) once and kept in GridFS (`certificates`
+files) under its booking id and a hash of that content. Downloads read the
+stored PDF; a change to any field (or to TEMPLATE_VERSION) gives a new hash and
+a new render, and the older versions are dropped.
+
+The page is the static artwork (header, badge, details panel, footer), built
+once per process as a reportlab Drawing, with the certificate's fields drawn
+over it.
+
+render_certificate() is a plain function of the fields so the bulk export can
+run it in a process pool; it imports reportlab and qrcode on first use. By
+default (CERTIFICATE_RENDER_WORKERS=0) exports render in the request thread and
+nothing is forked. When workers are configured, the pool is forked once, by
+start_render_pool() at the top of create_app, and only if the process has no
+other thread yet (forking once the Mongo client, job runner and outbox threads
+are running can leave a worker stuck on a lock one of them held); otherwise it
+is not started. Spawned or forkserver workers are not an option: they re-import
+the entry module, and app.py creates the app at import time. At most
+CERTIFICATE_EXPORT_CONCURRENCY exports run at once per process.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from datetime import datetime, timezone
+
+# Bump when the layout changes: every certificate is rendered again on its next download
+TEMPLATE_VERSION = 1
+
+BUCKET = 'certificates'
+
+_template = None
+
+
+def certificate_fields(booking, schedule, parent_name):
+    """The content of a booking's certificate"""
+    return {
+        'certificateId': str(booking['_id']),
+        'childName': booking.get('childName', ''),
+        'parentName': parent_name or '',
+        'vaccines': booking.get('vaccines', []),
+        'vaccinationDate': schedule.get('date', ''),
+        'location': schedule.get('location', ''),
+    }
+
+
+def content_hash(fields):
+    payload = json.dumps({**fields, 'template': TEMPLATE_VERSION}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def certificate_filename(fields):
+    return f"vaccination-certificate-{fields['certificateId']}.pdf"
+
+
+# Rendering
+
+def _static_template(width, height):
+    """The artwork shared by every certificate (built once per process)"""
+    global _template
+    if _template is None:
+        from reportlab.graphics.shapes import Circle, Drawing, Rect, String
+        from reportlab.lib import colors
+        from reportlab.lib.units import mm
+        margin_x = 20*mm
+        details_y = height - 50*mm
+        drawing = Drawing(width, height)
+        # Header with gradient effect (simulated)
+        drawing.add(Rect(0, height - 35*mm, width, 35*mm, fillColor=colors.HexColor('#1e3a5f'), strokeColor=None))
+        drawing.add(Rect(0, height - 37*mm, width, 2*mm, fillColor=colors.HexColor('#2d5a87'), strokeColor=None))
+        # Header text
+        drawing.add(String(width/2, height - 15*mm, 'DIGITAL VACCINATION CERTIFICATE', textAnchor='middle',
+                           fontName='Helvetica-Bold', fontSize=22, fillColor=colors.white))
+        drawing.add(String(width/2, height - 23*mm, 'Mother and Child Protection Program - AshaAssist',
+                           textAnchor='middle', fontName='Helvetica', fontSize=11, fillColor=colors.white))
+        drawing.add(String(width/2, height - 30*mm, 'Digitally Signed with RSA-SHA256 Cryptography',
+                           textAnchor='middle', fontName='Helvetica-Oblique', fontSize=9, fillColor=colors.white))
+        # Security badge
+        drawing.add(Circle(30*mm, height - 22*mm, 8*mm, fillColor=colors.HexColor('#10b981'), strokeColor=None))
+        drawing.add(String(30*mm, height - 24*mm, '✓', textAnchor='middle', fontName='Helvetica-Bold',
+                           fontSize=12, fillColor=colors.white))
+        # Certificate details panel
+        drawing.add(Rect(margin_x - 5*mm, details_y - 55*mm, width - 2*margin_x + 10*mm, 70*mm, rx=5*mm, ry=5*mm,
+                         fillColor=colors.HexColor('#f3f4f6'), strokeColor=None))
+        # Footer
+        grey = colors.HexColor('#6b7280')
+        drawing.add(String(width/2, 20*mm, 'This certificate is digitally signed and tamper-proof.',
+                           textAnchor='middle', fontName='Helvetica-Oblique', fontSize=9, fillColor=grey))
+        drawing.add(String(width/2, 15*mm, 'Any modification to the certificate data will invalidate the signature.',
+                           textAnchor='middle', fontName='Helvetica-Oblique', fontSize=9, fillColor=grey))
+        _template = drawing
+    return _template
+
+
+def render_certificate(fields, issued_at):
+    """The signed certificate PDF (bytes) of `fields`, issued at `issued_at` (UTC datetime)"""
+    from reportlab.graphics import renderPDF
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+    import qrcode
+    from utils.crypto import create_certificate_data, sign_certificate, get_certificate_hash, generate_verification_url
+
+    certificate_id = fields['certificateId']
+    issued_date = issued_at.strftime('%Y-%m-%d %H:%M:%S UTC')
+
+    # Create and sign certificate data
+    cert_data = create_certificate_data(
+        booking_id=certificate_id,
+        child_name=fields['childName'],
+        parent_name=fields['parentName'],
+        vaccines=fields['vaccines'],
+        vaccination_date=fields['vaccinationDate'],
+        location=fields['location']
+    )
+    cert_data['issued_at'] = issued_at.replace(tzinfo=None).isoformat()
+    signature = sign_certificate(cert_data)
+    cert_hash = get_certificate_hash(cert_data)
+    verification_url = generate_verification_url(certificate_id, signature)
+
+    # QR code with compact JSON payload — readable by all scanners
+    qr_payload = json.dumps({
+        "type": "VACCINATION_CERTIFICATE",
+        "issuer": "AshaAssist Health Department",
+        "certificateId": certificate_id,
+        "childName": fields['childName'],
+        "parentName": fields['parentName'],
+        "vaccines": fields['vaccines'],
+        "vaccinationDate": fields['vaccinationDate'],
+        "location": fields['location'],
+        "issuedAt": issued_date,
+        "verifyAt": verification_url,
+        "hash": cert_hash[:32],
+    }, separators=(',', ':'))
+    qr = qrcode.QRCode(version=None, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=10, border=2)
+    qr.add_data(qr_payload)
+    qr.make(fit=True)
+    qr_buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(qr_buffer, format='PNG')
+    qr_buffer.seek(0)
+
+    pdf_buffer = io.BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=A4)
+    width, height = A4
+    renderPDF.draw(_static_template(width, height), c, 0, 0)
+
+    margin_x = 20*mm
+    y = height - 53*mm
+    line_gap = 9*mm
+
+    def draw_field(label, value, bold_value=False):
+        nonlocal y
+        c.setFillColor(colors.HexColor('#374151'))
+        c.setFont('Helvetica-Bold', 11)
+        c.drawString(margin_x, y, f"{label}:")
+        c.setFont('Helvetica-Bold' if bold_value else 'Helvetica', 11)
+        c.setFillColor(colors.HexColor('#1f2937'))
+        c.drawString(margin_x + 55*mm, y, str(value or 'N/A'))
+        y -= line_gap
+
+    draw_field("Child's Name", fields['childName'], True)
+    draw_field("Parent/Guardian", fields['parentName'])
+    draw_field("Vaccination Date", fields['vaccinationDate'])
+    draw_field("Location", fields['location'])
+    draw_field("Certificate ID", certificate_id)
+    draw_field("Issued Date", issued_date)
+
+    # Vaccines section
+    y -= 5*mm
+    c.setFillColor(colors.HexColor('#1e3a5f'))
+    c.setFont('Helvetica-Bold', 12)
+    c.drawString(margin_x, y, 'Vaccines Administered:')
+    y -= 7*mm
+    c.setFillColor(colors.HexColor('#374151'))
+    c.setFont('Helvetica', 11)
+    for vaccine in fields['vaccines']:
+        c.drawString(margin_x + 5*mm, y, f"• {vaccine}")
+        y -= 6*mm
+
+    # QR code section (placed below the vaccine list)
+    y -= 10*mm
+    c.setFillColor(colors.HexColor('#f0fdf4'))
+    c.roundRect(margin_x - 5*mm, y - 55*mm, width - 2*margin_x + 10*mm, 60*mm, 5*mm, fill=1, stroke=0)
+    c.setStrokeColor(colors.HexColor('#86efac'))
+    c.roundRect(margin_x - 5*mm, y - 55*mm, width - 2*margin_x + 10*mm, 60*mm, 5*mm, fill=0, stroke=1)
+    c.drawImage(ImageReader(qr_buffer), width - 60*mm, y - 50*mm, 45*mm, 45*mm)
+
+    # Digital signature info
+    c.setFillColor(colors.HexColor('#166534'))
+    c.setFont('Helvetica-Bold', 11)
+    c.drawString(margin_x, y - 5*mm, '🔐 Digital Signature & Quick Verification')
+    c.setFont('Helvetica', 9)
+    c.setFillColor(colors.HexColor('#374151'))
+    c.drawString(margin_x, y - 15*mm, "Algorithm: RSA-2048 with SHA-256")
+    c.drawString(margin_x, y - 22*mm, f"Hash: {cert_hash[:32]}...")
+    c.drawString(margin_x, y - 29*mm, f"Signature: {signature[:24]}...")
+    c.setFont('Helvetica-Bold', 9)
+    c.setFillColor(colors.HexColor('#166534'))
+    c.drawString(margin_x, y - 38*mm, "📱 Scan QR Code to View Certificate Details")
+    c.setFont('Helvetica-Oblique', 8)
+    c.setFillColor(colors.HexColor('#6b7280'))
+    c.drawString(margin_x, y - 45*mm, "QR code contains complete certificate information in JSON format")
+    c.drawString(margin_x, y - 51*mm, f"Online verification: {verification_url[:50]}...")
+
+    c.showPage()
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+def _render_job(fields, issued_at):
+    # Process pool entry point: (fields, pdf)
+    return fields, render_certificate(fields, issued_at)
+
+
+class _ZipStream:
+    """Write-only file for zipfile that hands out what has been written so far"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def write(self, data):
+        self.buffer += data
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+class CertificateService:
+    def __init__(self, collections=None):
+        self.collections = collections
+        self.workers = 0
+        self._pool = None
+        self._pool_pid = None
+        self._fs = None
+        self.max_exports = 2
+        self._exports = threading.BoundedSemaphore(self.max_exports)
+        self.hits = self.misses = self.rejected = 0
+
+    def init(self, collections, max_exports=2):
+        self.collections = collections
+        self.max_exports = max(1, max_exports)
+        self._exports = threading.BoundedSemaphore(self.max_exports)
+        self._fs = None
+
+    def start_pool(self, workers):
+        """Fork `workers` render processes, once per process; skipped unless this is the only thread"""
+        if self._pool is not None or workers <= 1:
+            return
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            print("[CERTIFICATES] fork is unavailable; bulk exports render in the request thread")
+            return
+        if threading.active_count() > 1:
+            names = ', '.join(t.name for t in threading.enumerate() if t is not threading.current_thread())
+            print(f"[CERTIFICATES] Not forking render workers with other threads running ({names}); "
+                  f"bulk exports render in the request thread")
+            return
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+        self._pool_pid = os.getpid()
+        # The first task forks every worker now, not later from a threaded process
+        self._pool.submit(int).result()
+        self.workers = workers
+        print(f"[CERTIFICATES] {workers} render worker process(es) started")
+
+    @property
+    def pool(self):
+        # Not usable in a process forked from the one that started it (e.g. gunicorn --preload workers)
+        return self._pool if self._pool_pid == os.getpid() else None
+
+    @property
+    def fs(self):
+        if self._fs is None:
+            from gridfs import GridFS
+            self._fs = GridFS(self.collections['vaccination_bookings'].database, collection=BUCKET)
+        return self._fs
+
+    @staticmethod
+    def _name(fields, digest):
+        return f"{fields['certificateId']}/{digest}.pdf"
+
+    def cached(self, fields):
+        """The stored PDF of `fields`, None if it was never rendered (or its content changed)"""
+        grid_out = self.fs.find_one({'filename': self._name(fields, content_hash(fields))}, sort=[('uploadDate', -1)])
+        if grid_out is None:
+            return None
+        self.hits += 1
+        return grid_out.read()
+
+    def store(self, fields, pdf, issued_at):
+        digest = content_hash(fields)
+        # Earlier versions of this certificate (anchored prefix: served by GridFS's filename index)
+        stale = [f._id for f in self.fs.find({'filename': {'$regex': f"^{re.escape(fields['certificateId'])}/"}})]
+        self.fs.put(pdf, filename=self._name(fields, digest), contentType='application/pdf', metadata={
+            'certificateId': fields['certificateId'],
+            'contentHash': digest,
+            'templateVersion': TEMPLATE_VERSION,
+            'issuedAt': issued_at,
+        })
+        for file_id in stale:
+            try:
+                self.fs.delete(file_id)
+            except Exception:
+                pass
+
+    def get(self, fields):
+        """The certificate PDF of `fields`: from the cache, else rendered and stored"""
+        pdf = self.cached(fields)
+        if pdf is None:
+            self.misses += 1
+            issued_at = datetime.now(timezone.utc)
+            pdf = render_certificate(fields, issued_at)
+            self.store(fields, pdf, issued_at)
+        return pdf
+
+    def zip_stream(self, items):
+        """Yield a ZIP of the certificates of `items` (fields dicts) as it is built.
+
+        Cached certificates are streamed first; the rest are rendered in the render pool
+        (CERTIFICATE_RENDER_WORKERS) and added, and stored, as each one finishes.
+        """
+        sink = _ZipStream()
+        archive = zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED)
+        missing = []
+        for fields in items:
+            pdf = self.cached(fields)
+            if pdf is None:
+                missing.append(fields)
+                continue
+            archive.writestr(certificate_filename(fields), pdf)
+            yield sink.pop()
+
+        if missing:
+            self.misses += len(missing)
+            issued_at = datetime.now(timezone.utc)
+            for fields, pdf in self._render_many(missing, issued_at):
+                self.store(fields, pdf, issued_at)
+                archive.writestr(certificate_filename(fields), pdf)
+                yield sink.pop()
+        archive.close()
+        yield sink.pop()
+
+    def begin_export(self):
+        """Take an export slot; False when CERTIFICATE_EXPORT_CONCURRENCY exports are already running"""
+        if self._exports.acquire(blocking=False):
+            return True
+        self.rejected += 1
+        return False
+
+    def end_export(self):
+        self._exports.release()
+
+    def _render_many(self, items, issued_at):
+        pool = self.pool
+        if pool is None or len(items) < 2:
+            for fields in items:
+                yield fields, render_certificate(fields, issued_at)
+            return
+        from concurrent.futures import as_completed
+        from concurrent.futures.process import BrokenProcessPool
+        # The workers only render; they were forked before the Mongo client existed
+        futures = {pool.submit(_render_job, fields, issued_at): fields for fields in items}
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+                del futures[future]
+        except BrokenProcessPool as e:
+            # Not re-forked from this (threaded) process: render the rest here from now on
+            print(f"[CERTIFICATES] Render pool failed ({e}); rendering in the request thread")
+            self._pool = None
+            for fields in futures.values():
+                yield fields, render_certificate(fields, issued_at)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'workers': self.workers if self.pool else 0,
+                'maxExports': self.max_exports, 'rejectedExports': self.rejected}
+
+
+certificates = CertificateService()
+
+
+def start_render_pool(app):
+    certificates.start_pool(int(app.config.get('CERTIFICATE_RENDER_WORKERS', 0)))
+
+
+def init_certificates(app, collections):
+    certificates.init(collections, int(app.config.get('CERTIFICATE_EXPORT_CONCURRENCY', 2)))
+    return certificates
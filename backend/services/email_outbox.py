@@ -0,0 +1,321 @@
+"""
+Durable email outbox
+send_email() stores each message in the `email_outbox` collection and returns;
+a small, fixed pool of worker threads (EMAIL_OUTBOX_WORKERS) delivers them. A
+message survives the process that queued it: any worker, in any process, can
+claim it later.
+
+  pending --claim--> sending --sent--> sent (kept EMAIL_OUTBOX_RETENTION_DAYS)
+                        |--error--> pending again after a backoff
+                        |           (failed once EMAIL_MAX_ATTEMPTS is reached)
+                        '--lease expired (worker died)--> claimable again
+
+Claims are a single find_one_and_update, so a message is claimed by one worker
+at a time. Delivery is at-least-once: a worker that dies after the SMTP send but
+before recording it lets the message be sent again when its lease expires.
+Where processes are short-lived, set EMAIL_OUTBOX_WORKERS=0 and let the
+`email_outbox_drain` job (scripts/run_jobs.py) deliver the queue.
+
+Bulk messages (kind 'bulk', from send_bulk_email) carry a recipient list and
+are sent as one personalised message per recipient over a single SMTP
+connection (reopened every MAIL_MAX_EMAILS messages). Progress is saved after
+every EMAIL_BULK_CHUNK_SIZE recipients, so a retry resumes where it stopped.
+"""
+import html as html_lib
+import os
+import smtplib
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+BULK = 'bulk'
+NAME_PLACEHOLDER = '{{name}}'
+
+
+def personalise(text, name):
+    """Replace the {{name}} placeholder (HTML-escaped) in a bulk message body"""
+    if not text or NAME_PLACEHOLDER not in text:
+        return text
+    return text.replace(NAME_PLACEHOLDER, html_lib.escape(name or 'there'))
+
+
+def send_bulk(app, job, on_progress=None, chunk_size=100):
+    """Send a bulk job's recipients from job['position'] on over one SMTP connection.
+
+    on_progress(position, rejected) is called after every chunk. Recipients the server refuses
+    are skipped and reported; connection errors propagate (the caller retries from the saved
+    position). Returns {'sent', 'rejected', 'seconds', 'perSecond'}.
+    """
+    from flask_mail import Message
+    from services.email_service import mail
+    recipients = job['recipients']
+    position = job.get('position', 0)
+    sent = 0
+    rejected = []
+    started = time.perf_counter()
+    with app.app_context():
+        with mail.connect() as connection:
+            while position < len(recipients):
+                chunk = recipients[position:position + chunk_size]
+                chunk_rejected = []
+                for recipient in chunk:
+                    message = Message(
+                        subject=job['subject'],
+                        recipients=[recipient['email']],
+                        html=personalise(job.get('html'), recipient.get('name')),
+                        body=personalise(job.get('body'), recipient.get('name')),
+                        sender=job.get('sender')
+                    )
+                    try:
+                        connection.send(message)
+                        sent += 1
+                    except smtplib.SMTPRecipientsRefused:
+                        chunk_rejected.append(recipient['email'])
+                position += len(chunk)
+                rejected += chunk_rejected
+                if on_progress is not None:
+                    on_progress(position, chunk_rejected)
+    seconds = time.perf_counter() - started
+    return {
+        'sent': sent,
+        'rejected': rejected,
+        'seconds': round(seconds, 3),
+        'perSecond': round(sent / seconds, 1) if seconds > 0 else None,
+    }
+
+
+class EmailOutbox:
+    def __init__(self):
+        self.collection = None
+        self.app = None
+        self.max_attempts = 5
+        self.retry_base_seconds = 30
+        self.retry_max_seconds = 3600
+        self.lease_seconds = 120
+        self.retention_days = 30
+        self.bulk_chunk_size = 100
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self.sent = self.retried = self.failed = 0
+        self.bulk_messages = 0
+        self.bulk_seconds = 0.0
+
+    def init(self, app, collection):
+        self.app = app
+        self.collection = collection
+        self.max_attempts = int(app.config.get('EMAIL_MAX_ATTEMPTS', 5))
+        self.retry_base_seconds = float(app.config.get('EMAIL_RETRY_BASE_SECONDS', 30))
+        self.retention_days = int(app.config.get('EMAIL_OUTBOX_RETENTION_DAYS', 30))
+        self.bulk_chunk_size = int(app.config.get('EMAIL_BULK_CHUNK_SIZE', 100))
+
+    @property
+    def ready(self):
+        return self.collection is not None and self.app is not None
+
+    # Queue
+
+    def enqueue(self, message):
+        """Store a message (subject, recipients, html, body, sender); returns its id"""
+        now = datetime.now(timezone.utc)
+        doc = {
+            **message,
+            'status': PENDING,
+            'attempts': 0,
+            'nextAttemptAt': now,
+            'createdAt': now,
+            'updatedAt': now,
+        }
+        result = self.collection.insert_one(doc)
+        self._wake.set()
+        return result.inserted_id
+
+    def enqueue_many(self, messages):
+        """Store a batch of messages with one insert; returns how many were queued"""
+        if not messages:
+            return 0
+        now = datetime.now(timezone.utc)
+        docs = [{**message, 'status': PENDING, 'attempts': 0, 'nextAttemptAt': now, 'createdAt': now, 'updatedAt': now}
+                for message in messages]
+        self.collection.insert_many(docs, ordered=False)
+        self._wake.set()
+        return len(docs)
+
+    def claim(self):
+        """Atomically take the next due message (or one whose sender's lease ran out); None if there is none"""
+        now = datetime.now(timezone.utc)
+        return self.collection.find_one_and_update(
+            {'$or': [
+                {'status': PENDING, 'nextAttemptAt': {'$lte': now}},
+                {'status': SENDING, 'lockedUntil': {'$lte': now}},
+            ]},
+            {'$set': {'status': SENDING, 'lockedBy': self.owner,
+                      'lockedUntil': now + timedelta(seconds=self.lease_seconds), 'updatedAt': now},
+             '$inc': {'attempts': 1}},
+            sort=[('nextAttemptAt', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _backoff(self, attempts):
+        return min(self.retry_base_seconds * (2 ** max(attempts - 1, 0)), self.retry_max_seconds)
+
+    def _mark_sent(self, job, result=None):
+        now = datetime.now(timezone.utc)
+        update = {'status': SENT, 'sentAt': now, 'updatedAt': now, 'lastError': None,
+                  'expiresAt': now + timedelta(days=self.retention_days)}
+        if result is not None:
+            update['result'] = result
+        self.collection.update_one(
+            {'_id': job['_id'], 'lockedBy': self.owner},
+            {'$set': update, '$unset': {'lockedUntil': '', 'lockedBy': ''}}
+        )
+
+    def _save_progress(self, job, position, rejected):
+        """Record a bulk job's progress and extend its lease"""
+        now = datetime.now(timezone.utc)
+        update = {'$set': {'position': position, 'updatedAt': now,
+                           'lockedUntil': now + timedelta(seconds=self.lease_seconds)}}
+        if rejected:
+            update['$push'] = {'rejected': {'$each': rejected}}
+        self.collection.update_one({'_id': job['_id'], 'lockedBy': self.owner}, update)
+
+    def _mark_failed(self, job, error):
+        now = datetime.now(timezone.utc)
+        attempts = job.get('attempts', 1)
+        if attempts >= self.max_attempts:
+            update = {'status': FAILED, 'lastError': error, 'updatedAt': now,
+                      'expiresAt': now + timedelta(days=self.retention_days)}
+        else:
+            update = {'status': PENDING, 'lastError': error, 'updatedAt': now,
+                      'nextAttemptAt': now + timedelta(seconds=self._backoff(attempts))}
+        self.collection.update_one(
+            {'_id': job['_id'], 'lockedBy': self.owner},
+            {'$set': update, '$unset': {'lockedUntil': '', 'lockedBy': ''}}
+        )
+        return update['status']
+
+    # Delivery
+
+    def deliver(self, job):
+        """Send one claimed message (or bulk job) and record the outcome; True if it was sent"""
+        from flask_mail import Message
+        from services.email_service import mail
+        result = None
+        try:
+            if job.get('kind') == BULK:
+                result = send_bulk(self.app, job, chunk_size=self.bulk_chunk_size,
+                                   on_progress=lambda position, rejected: self._save_progress(job, position, rejected))
+                with self._lock:
+                    self.bulk_messages += result['sent']
+                    self.bulk_seconds += result['seconds']
+                print(f"[EMAIL] Bulk '{job['subject']}': {result['sent']} message(s) in {result['seconds']}s "
+                      f"({result['perSecond']}/s), {len(result['rejected'])} rejected")
+            else:
+                with self.app.app_context():
+                    mail.send(Message(
+                        subject=job['subject'],
+                        recipients=job['recipients'],
+                        html=job.get('html'),
+                        body=job.get('body'),
+                        sender=job.get('sender')
+                    ))
+        except Exception as e:
+            status = self._mark_failed(job, str(e))
+            with self._lock:
+                if status == FAILED:
+                    self.failed += 1
+                else:
+                    self.retried += 1
+            print(f"[EMAIL] Failed to send '{job['subject']}' to {len(job['recipients'])} recipient(s) "
+                  f"(attempt {job.get('attempts')}, {status}): {e}")
+            return False
+        self._mark_sent(job, result)
+        with self._lock:
+            self.sent += 1
+        return True
+
+    def drain(self, limit=None):
+        """Deliver due messages until the queue is empty (or `limit` were tried); returns a summary"""
+        sent = tried = 0
+        while limit is None or tried < limit:
+            job = self.claim()
+            if job is None:
+                break
+            tried += 1
+            sent += self.deliver(job)
+        return {'tried': tried, 'sent': sent}
+
+    # Worker pool
+
+    def _work(self, poll_seconds):
+        while not self._stop.is_set():
+            try:
+                job = self.claim()
+            except Exception as e:
+                print(f"[EMAIL] Outbox claim failed: {e}")
+                job = None
+            if job is None:
+                # Sleep until a message is queued in this process (or the poll interval, for other processes' retries)
+                self._wake.wait(poll_seconds)
+                self._wake.clear()
+                continue
+            self.deliver(job)
+
+    def start(self, workers=2, poll_seconds=5.0):
+        """Start `workers` delivery threads (once per process)"""
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if self._threads or workers <= 0:
+                return
+            self._stop.clear()
+            for i in range(workers):
+                thread = threading.Thread(target=self._work, args=(poll_seconds,), name=f'email-outbox-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        print(f"[EMAIL] Outbox started with {workers} worker(s)")
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        self._wake.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+    def stats(self):
+        counts = {}
+        if self.collection is not None:
+            try:
+                for row in self.collection.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+                    counts[row['_id']] = row['count']
+            except Exception as e:
+                counts['error'] = str(e)
+        return {
+            'workers': sum(1 for t in self._threads if t.is_alive()),
+            'queue': counts,
+            'sent': self.sent,
+            'retried': self.retried,
+            'failed': self.failed,
+            'bulkMessages': self.bulk_messages,
+            'bulkPerSecond': round(self.bulk_messages / self.bulk_seconds, 1) if self.bulk_seconds else None,
+        }
+
+
+email_outbox = EmailOutbox()
+
+
+def init_email_outbox(app, collections, start_workers=True):
+    """Bind the outbox to its collection and start the in-process workers (EMAIL_OUTBOX_WORKERS)"""
+    email_outbox.init(app, collections['email_outbox'])
+    if start_workers and app.config.get('MAIL_USERNAME'):
+        email_outbox.start(int(app.config.get('EMAIL_OUTBOX_WORKERS', 2)),
+                           float(app.config.get('EMAIL_OUTBOX_POLL_SECONDS', 5.0)))
+    return email_outbox
@@ -1,9 +1,9 @@
 """
 Email Notification Service for AshaAssist
 Provides SMTP email delivery using Flask-Mail with branded HTML templates.
-All sends are non-blocking (fire-and-forget via threading).
+All sends are non-blocking: messages are queued in the durable outbox
+(services/email_outbox.py) and delivered by its bounded worker pool.
 """
-import threading
 from flask import current_app
 from flask_mail import Mail, Message
 
@@ -25,19 +25,10 @@ def init_mail(app):
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-def _send_async(app, msg):
-    """Send a message in a background thread so the API response is not blocked."""
-    with app.app_context():
-        try:
-            mail.send(msg)
-        except Exception as e:
-            print(f"[EMAIL] Failed to send email to {msg.recipients}: {e}")
-
-
 def send_email(subject: str, recipients: list, html_body: str, text_body: str = ""):
     """
-    Low-level helper — fire-and-forget email send.
-    Returns True if dispatch was attempted, False if credentials are missing.
+    Low-level helper — queue an email in the outbox for background delivery.
+    Returns True if the message was queued (or sent), False if credentials are missing.
     """
     try:
         app = current_app._get_current_object()
@@ -50,23 +41,76 @@ def send_email(subject: str, recipients: list, html_body: str, text_body: str =
         if not valid_recipients:
             return False
 
-        msg = Message(
-            subject=subject,
-            recipients=valid_recipients,
-            html=html_body,
-            body=text_body or _strip_html(html_body),
-            sender=app.config.get('MAIL_USERNAME')
-        )
-        thread = threading.Thread(target=_send_async, args=(app, msg))
-        thread.daemon = True
-        thread.start()
-        print(f"[EMAIL] Dispatched '{subject}' → {valid_recipients}")
+        message = {
+            'subject': subject,
+            'recipients': valid_recipients,
+            'html': html_body,
+            'body': text_body or _strip_html(html_body),
+            'sender': app.config.get('MAIL_USERNAME')
+        }
+        from services.email_outbox import email_outbox
+        if not email_outbox.ready:
+            # No outbox outside the app (scripts): send inline
+            mail.send(Message(**message))
+            print(f"[EMAIL] Sent '{subject}' → {len(valid_recipients)} recipient(s)")
+            return True
+        email_outbox.enqueue(message)
+        print(f"[EMAIL] Queued '{subject}' → {len(valid_recipients)} recipient(s)")
         return True
     except Exception as e:
         print(f"[EMAIL] Error dispatching email: {e}")
         return False
 
 
+def send_bulk_email(subject: str, recipients: list, html_body: str, text_body: str = "") -> int:
+    """
+    Queue one personalised copy of a message per recipient, sent over a single
+    reused SMTP connection (see services/email_outbox.py).
+    recipients: user dicts (email, name) or plain addresses. A {{name}} placeholder
+    in the bodies is replaced with each recipient's name.
+    Returns the number of recipients queued.
+    """
+    try:
+        app = current_app._get_current_object()
+        if not app.config.get('MAIL_USERNAME'):
+            print(f"[EMAIL] Skipped (no credentials): {subject}")
+            return 0
+
+        seen = set()
+        targets = []
+        for r in recipients:
+            email, name = (r.get('email'), r.get('name')) if isinstance(r, dict) else (r, None)
+            email = str(email or '').strip()
+            if '@' in email and email.lower() not in seen:
+                seen.add(email.lower())
+                targets.append({'email': email, 'name': name or ''})
+        if not targets:
+            return 0
+
+        job = {
+            'kind': 'bulk',
+            'subject': subject,
+            'recipients': targets,
+            'html': html_body,
+            'body': text_body or _strip_html(html_body),
+            'sender': app.config.get('MAIL_USERNAME'),
+            'position': 0,
+            'rejected': []
+        }
+        from services.email_outbox import email_outbox, send_bulk
+        if not email_outbox.ready:
+            # No outbox outside the app (scripts): send inline
+            result = send_bulk(app, job, chunk_size=int(app.config.get('EMAIL_BULK_CHUNK_SIZE', 100)))
+            print(f"[EMAIL] Sent '{subject}' → {result['sent']} recipient(s) in {result['seconds']}s")
+            return result['sent']
+        email_outbox.enqueue(job)
+        print(f"[EMAIL] Queued bulk '{subject}' → {len(targets)} recipient(s)")
+        return len(targets)
+    except Exception as e:
+        print(f"[EMAIL] Error dispatching bulk email: {e}")
+        return 0
+
+
 def _strip_html(html: str) -> str:
     """Minimal HTML → plain text fallback."""
     import re
@@ -178,7 +222,7 @@ def send_calendar_event_notification(users: list, event: dict) -> int:
     content = f"""
       <h2 style="margin:0 0 6px;color:#1a6b4a;font-size:20px;">📅 New Event Scheduled</h2>
       <p style="margin:0 0 20px;color:#6b7280;font-size:14px;">
-        Your ASHA worker has scheduled a new community event.
+        Dear <strong>{{{{name}}}}</strong>, your ASHA worker has scheduled a new community event.
       </p>
 
       <div style="background:#f0f9f4;border-radius:10px;padding:20px 22px;margin-bottom:16px;">
@@ -193,15 +237,11 @@ def send_calendar_event_notification(users: list, event: dict) -> int:
     """
 
     html = _base_template(f"New Event: {title}", content)
-    recipients = [u.get('email') for u in users if u.get('email')]
-    if not recipients:
-        return 0
-    send_email(
+    return send_bulk_email(
         subject=f"📅 New Event: {title} — AshaAssist",
-        recipients=recipients,
+        recipients=[u for u in users if u.get('email')],
         html_body=html
     )
-    return len(recipients)
 
 
 # ---------------------------------------------------------------------------
@@ -326,19 +366,19 @@ def send_vaccination_completed_notification(user: dict, booking: dict, schedule:
 
 def send_custom_email(recipients: list, subject: str, message: str) -> int:
     """
-    Send a custom broadcast email to a list of email addresses.
+    Send a custom broadcast email to a list of users (dicts with email/name) or email addresses.
     Returns number of recipients.
     """
     content = f"""
       <h2 style="margin:0 0 16px;color:#1a6b4a;font-size:20px;">📢 Message from AshaAssist</h2>
+      <p style="margin:0 0 12px;color:#4a5568;font-size:14px;">Dear {{{{name}}}},</p>
       <div style="background:#f8fafb;border-radius:10px;padding:20px 22px;
                   color:#1a202c;font-size:15px;line-height:1.8;white-space:pre-wrap;">
         {message}
       </div>
     """
     html = _base_template(subject, content)
-    send_email(subject=subject, recipients=recipients, html_body=html)
-    return len([r for r in recipients if r and '@' in str(r)])
+    return send_bulk_email(subject=subject, recipients=recipients, html_body=html)
 
 
 # ---------------------------------------------------------------------------
@@ -353,6 +393,28 @@ def send_vaccination_reminder(mother_email: str, mother_name: str,
     When a single vaccination is provided, renders a focused single-vaccine email.
     Returns True if dispatched.
     """
+    subject, html = render_vaccination_reminder(mother_name, child_name, vaccinations)
+    return send_email(subject=subject, recipients=[mother_email], html_body=html)
+
+
+def vaccination_reminder_message(sender: str, mother_email: str, mother_name: str,
+                                 child_name: str, vaccinations: list) -> dict:
+    """
+    Outbox message (see services/email_outbox.py) of a vaccination reminder, for the
+    batch reminder job, which queues its emails in bulk instead of one send_email() each.
+    """
+    subject, html = render_vaccination_reminder(mother_name, child_name, vaccinations)
+    return {
+        'subject': subject,
+        'recipients': [mother_email],
+        'html': html,
+        'body': _strip_html(html),
+        'sender': sender
+    }
+
+
+def render_vaccination_reminder(mother_name: str, child_name: str, vaccinations: list) -> tuple:
+    """Subject and HTML of a vaccination reminder (see send_vaccination_reminder)."""
     # Colour map for status badges
     STATUS_COLORS = {
         'overdue':  ('#dc2626', '#fef2f2', '#991b1b'),
@@ -429,11 +491,7 @@ def send_vaccination_reminder(mother_email: str, mother_name: str,
         """
 
         html = _base_template("Vaccination Reminder", content)
-        return send_email(
-            subject=f"💉 {vaccine_name} — Vaccination Reminder for {child_name} — AshaAssist",
-            recipients=[mother_email],
-            html_body=html
-        )
+        return f"💉 {vaccine_name} — Vaccination Reminder for {child_name} — AshaAssist", html
 
     # ---------- Multi-vaccine table email (backward compat) ----------
     rows = ""
@@ -493,8 +551,4 @@ def send_vaccination_reminder(mother_email: str, mother_name: str,
     """
 
     html = _base_template("Vaccination Reminder", content)
-    return send_email(
-        subject=f"💉 Vaccination Reminder for {child_name} — AshaAssist",
-        recipients=[mother_email],
-        html_body=html
-    )
+    return f"💉 Vaccination Reminder for {child_name} — AshaAssist", html
@@ -0,0 +1,255 @@
+"""
+Immunization status ledger
+One `immunization_status` document per child (`<motherId>_<childIndex>`) holds
+every vaccine of the schedule with its due date, whether it is done and when:
+
+  {'_id', 'motherId', 'childIndex', 'childName', 'dateOfBirth', 'completedCount',
+   'vaccines': [{'vaccineName', 'ageInDays', 'dueDate', 'status', 'completedAt'}]}
+
+Stored status is 'pending' or 'completed' only; 'due'/'overdue'/'upcoming' depend
+on today's date and are derived from dueDate on read, so rows never go stale and
+"every overdue Pentavalent-3" is one indexed $elemMatch on dueDate.
+
+A mother's rows are rebuilt (from her children, her Completed bookings and their
+schedules) when a birth is recorded and, through the write hooks of
+services/ward_stats_service.py, when a booking becomes or stops being Completed.
+Mothers without rows (existing data) are built on first read; the
+`immunization_status_rebuild` job rebuilds everything.
+"""
+from datetime import datetime, timedelta, timezone
+from pymongo import ReplaceOne
+from utils.vaccination_utils import VACCINATION_SCHEDULE, calculate_vaccination_milestones
+
+PENDING = 'pending'
+COMPLETED = 'completed'
+BOOKING_COMPLETED = 'Completed'
+# A pending vaccine counts as overdue this many days after its due date (get_vaccination_status)
+OVERDUE_AFTER_DAYS = 7
+
+MOTHERS_QUERY = {
+    'beneficiaryCategory': 'maternity',
+    'maternalHealth.children': {'$exists': True, '$ne': []},
+}
+
+# Static schedule fields merged back into a row's vaccines on read
+_SCHEDULE = {(v['vaccineName'], v['ageInDays']): v for v in VACCINATION_SCHEDULE}
+
+
+def child_id(mother_id, index):
+    return f'{mother_id}_{index}'
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _name_key(name):
+    return (name or '').strip().lower()
+
+
+def booking_children(children, child_name):
+    """Indexes of the children a Completed booking counts for.
+
+    Bookings name the child; older ones that do not match a child count for all of them.
+    """
+    key = _name_key(child_name)
+    return [i for i, child in enumerate(children) if _name_key(child.get('name')) == key] or range(len(children))
+
+
+def milestones(row, today=None):
+    """A row's vaccines in the shape of calculate_vaccination_milestones(), status derived for today"""
+    today = today or datetime.now().date()
+    result = []
+    for vaccine in row.get('vaccines', []):
+        info = _SCHEDULE.get((vaccine['vaccineName'], vaccine.get('ageInDays')), {})
+        status = COMPLETED if vaccine.get('status') == COMPLETED else _status_on(vaccine['dueDate'], today)
+        result.append({
+            'vaccineName': vaccine['vaccineName'],
+            'ageInDays': vaccine.get('ageInDays'),
+            'ageLabel': info.get('ageLabel'),
+            'description': info.get('description'),
+            'dueDate': vaccine['dueDate'],
+            'status': status,
+            'completedAt': vaccine.get('completedAt'),
+            'category': info.get('category'),
+            'notificationsSent': [],
+        })
+    return result
+
+
+def _status_on(due_date, today):
+    # Same bands as utils.vaccination_utils.get_vaccination_status
+    days = (datetime.fromisoformat(due_date).date() - today).days
+    if days < -OVERDUE_AFTER_DAYS:
+        return 'overdue'
+    return 'due' if days <= OVERDUE_AFTER_DAYS else 'upcoming'
+
+
+class ImmunizationStatusService:
+    def __init__(self, collections=None):
+        self.collections = collections
+
+    def init(self, collections):
+        self.collections = collections
+
+    @property
+    def ledger(self):
+        return self.collections['immunization_status']
+
+    # Write hooks (services/ward_stats_service.py)
+
+    def tracked_fields(self, collection_name):
+        return {'status', 'userId'} if collection_name == 'vaccination_bookings' else set()
+
+    def record_change(self, collection_name, before, after, count=1):
+        """Rebuild the mother's rows when one of her bookings becomes or stops being Completed"""
+        if collection_name != 'vaccination_bookings' or self.collections is None:
+            return
+        statuses = {(doc or {}).get('status') for doc in (before, after)}
+        mother_id = (after or before or {}).get('userId')
+        if BOOKING_COMPLETED not in statuses or mother_id is None:
+            return
+        try:
+            self.rebuild_mother(mother_id)
+        except Exception as e:
+            # The rebuild job (or the next change) repairs the rows
+            print(f"[IMMUNIZATION] Failed to update the status of mother {mother_id}: {e}")
+
+    # Building rows
+
+    def _completions(self, mothers):
+        """{motherId: {childIndex: {vaccineName: completedAt}}} from the mothers' Completed bookings"""
+        mother_ids = [mother['_id'] for mother in mothers]
+        bookings = list(self.collections['vaccination_bookings'].find(
+            {'userId': {'$in': mother_ids}, 'status': BOOKING_COMPLETED},
+            {'userId': 1, 'childName': 1, 'vaccines': 1, 'scheduleId': 1, 'createdAt': 1}))
+        schedule_ids = list({b['scheduleId'] for b in bookings if b.get('scheduleId')})
+        schedule_dates = {s['_id']: s.get('date') for s in self.collections['vaccination_schedules'].find(
+            {'_id': {'$in': schedule_ids}}, {'date': 1})} if schedule_ids else {}
+
+        children_of = {mother['_id']: (mother.get('maternalHealth') or {}).get('children') or [] for mother in mothers}
+        completions = {mother_id: {} for mother_id in mother_ids}
+        for booking in sorted(bookings, key=lambda b: str(_iso(b.get('createdAt')) or '')):
+            children = children_of.get(booking['userId'], [])
+            completed_at = schedule_dates.get(booking.get('scheduleId')) or _iso(booking.get('createdAt'))
+            for index in booking_children(children, booking.get('childName')):
+                done = completions[booking['userId']].setdefault(index, {})
+                for name in booking.get('vaccines', []):
+                    done.setdefault(name.strip(), completed_at)
+        return completions
+
+    @staticmethod
+    def _row(mother, index, child, done, now):
+        if child.get('vaccinationMilestones'):
+            schedule = child['vaccinationMilestones']
+        elif child.get('dateOfBirth'):
+            schedule = calculate_vaccination_milestones(child['dateOfBirth'])
+        else:
+            schedule = []
+        vaccines = []
+        for milestone in schedule:
+            name = milestone['vaccineName']
+            completed_at = milestone.get('completedAt') or done.get(name)
+            completed = name in done or bool(milestone.get('completedAt'))
+            vaccines.append({
+                'vaccineName': name,
+                'ageInDays': milestone.get('ageInDays'),
+                'dueDate': milestone['dueDate'],
+                'status': COMPLETED if completed else PENDING,
+                'completedAt': completed_at if completed else None,
+            })
+        return {
+            '_id': child_id(mother['_id'], index),
+            'motherId': mother['_id'],
+            'childIndex': index,
+            'childName': child.get('name', 'Unknown'),
+            'dateOfBirth': _iso(child.get('dateOfBirth')),
+            'vaccines': vaccines,
+            'completedCount': sum(1 for v in vaccines if v['status'] == COMPLETED),
+            'updatedAt': now,
+        }
+
+    def rebuild_mothers(self, mothers):
+        """Recompute and store the rows of `mothers` (documents with maternalHealth.children); returns them"""
+        if not mothers:
+            return []
+        completions = self._completions(mothers)
+        now = datetime.now(timezone.utc)
+        rows = []
+        for mother in mothers:
+            children = (mother.get('maternalHealth') or {}).get('children') or []
+            done = completions.get(mother['_id'], {})
+            rows += [self._row(mother, i, child, done.get(i, {}), now) for i, child in enumerate(children)]
+        if rows:
+            self.ledger.bulk_write([ReplaceOne({'_id': row['_id']}, row, upsert=True) for row in rows], ordered=False)
+        # Children removed from a profile
+        for mother in mothers:
+            count = len((mother.get('maternalHealth') or {}).get('children') or [])
+            self.ledger.delete_many({'motherId': mother['_id'], 'childIndex': {'$gte': count}})
+        return rows
+
+    def rebuild_mother(self, mother_id):
+        mother = self.collections['users'].find_one({'_id': mother_id}, {'maternalHealth.children': 1})
+        if mother is None:
+            self.ledger.delete_many({'motherId': mother_id})
+            return []
+        return self.rebuild_mothers([mother])
+
+    def rebuild(self, batch_size=200):
+        """Rebuild every mother's rows (after imports or schedule changes); returns a summary"""
+        mothers = children = 0
+        batch = []
+        cursor = self.collections['users'].find(MOTHERS_QUERY, {'maternalHealth.children': 1}).batch_size(batch_size)
+        for mother in cursor:
+            batch.append(mother)
+            if len(batch) >= batch_size:
+                children += len(self.rebuild_mothers(batch))
+                mothers += len(batch)
+                batch = []
+        if batch:
+            children += len(self.rebuild_mothers(batch))
+            mothers += len(batch)
+        return {'mothers': mothers, 'children': children}
+
+    # Reads
+
+    def rows_for(self, mothers):
+        """{motherId: [rows by childIndex]}; mothers whose rows are missing are built now"""
+        rows = {mother['_id']: [] for mother in mothers}
+        if not rows:
+            return rows
+        for row in self.ledger.find({'motherId': {'$in': list(rows)}}):
+            rows.setdefault(row['motherId'], []).append(row)
+        missing = [mother for mother in mothers
+                   if len(rows[mother['_id']]) != len((mother.get('maternalHealth') or {}).get('children') or [])]
+        if missing:
+            for mother in missing:
+                rows[mother['_id']] = []
+            for row in self.rebuild_mothers(missing):
+                rows[row['motherId']].append(row)
+        for mother_rows in rows.values():
+            mother_rows.sort(key=lambda row: row['childIndex'])
+        return rows
+
+    def row_for(self, mother, index=0):
+        """One child's row (built if missing); None if the mother has no such child"""
+        row = self.ledger.find_one({'_id': child_id(mother['_id'], index)})
+        if row is None:
+            rows = self.rows_for([mother]).get(mother['_id'], [])
+            row = rows[index] if index < len(rows) else None
+        return row
+
+    def overdue(self, vaccine_name, today=None, limit=500):
+        """Rows of children whose `vaccine_name` is still pending more than OVERDUE_AFTER_DAYS past its due date"""
+        cutoff = ((today or datetime.now().date()) - timedelta(days=OVERDUE_AFTER_DAYS)).isoformat()
+        return list(self.ledger.find({'vaccines': {'$elemMatch': {
+            'vaccineName': vaccine_name, 'status': PENDING, 'dueDate': {'$lt': cutoff}}}}).limit(limit))
+
+
+immunization_status = ImmunizationStatusService()
+
+
+def init_immunization_status(collections):
+    from services.ward_stats_service import ward_stats
+    immunization_status.init(collections)
+    ward_stats.add_listener(immunization_status)
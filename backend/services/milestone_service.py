@@ -4,6 +4,9 @@ MilestoneService: business logic for developmental milestone tracking
 from datetime import datetime, timezone
 from typing import Tuple, Dict, Any, List
 from bson import ObjectId
+from utils.projections import projection
+from services import reference_data
+from services.ward_stats_service import ward_stats
 
 
 class MilestoneService:
@@ -15,9 +18,7 @@ class MilestoneService:
     def get_all_milestones(self) -> Tuple[Dict[str, Any], int]:
         """Get all developmental milestones"""
         try:
-            milestones = list(self.developmental_milestones.find(
-                {'isActive': True}
-            ).sort('order', 1))
+            milestones = reference_data.active_milestones(self.developmental_milestones)
             
             result = []
             for milestone in milestones:
@@ -45,9 +46,7 @@ class MilestoneService:
         """Get all milestones with user's achievement status"""
         try:
             # Get all milestones
-            milestones = list(self.developmental_milestones.find(
-                {'isActive': True}
-            ).sort('order', 1))
+            milestones = reference_data.active_milestones(self.developmental_milestones)
             
             # Get user's milestone records
             user_records = list(self.milestone_records.find({
@@ -58,7 +57,7 @@ class MilestoneService:
             records_map = {str(record['milestoneId']): record for record in user_records}
             
             # Get user info for age calculation
-            user = self.users.find_one({'_id': ObjectId(user_id)})
+            user = self.users.find_one({'_id': ObjectId(user_id)}, projection('user.child_dob'))
             child_dob = user.get('childDOB') if user else None
             child_age_months = None
             
@@ -135,7 +134,7 @@ class MilestoneService:
         """Record a milestone achievement"""
         try:
             # Check if milestone exists
-            milestone = self.developmental_milestones.find_one({'_id': ObjectId(milestone_id)})
+            milestone = reference_data.find_milestone(self.developmental_milestones, milestone_id)
             if not milestone:
                 return {'error': 'Milestone not found'}, 404
             
@@ -149,7 +148,7 @@ class MilestoneService:
                 return {'error': 'Milestone already recorded'}, 400
             
             # Get user info for age calculation
-            user = self.users.find_one({'_id': ObjectId(user_id)})
+            user = self.users.find_one({'_id': ObjectId(user_id)}, projection('user.child_dob'))
             if not user:
                 return {'error': 'User not found'}, 404
             
@@ -203,6 +202,7 @@ class MilestoneService:
             }
             
             result = self.milestone_records.insert_one(record)
+            ward_stats.record_insert('milestone_records', record)
             
             return {
                 'message': 'Milestone recorded successfully',
@@ -239,7 +239,7 @@ class MilestoneService:
                 update_data['achievedDate'] = achieved_date
                 
                 # Recalculate age if date changed
-                user = self.users.find_one({'_id': ObjectId(user_id)})
+                user = self.users.find_one({'_id': ObjectId(user_id)}, projection('user.child_dob'))
                 child_dob = user.get('childDOB')
                 
                 if child_dob:
@@ -279,13 +279,14 @@ class MilestoneService:
     def delete_milestone_record(self, user_id: str, record_id: str) -> Tuple[Dict[str, Any], int]:
         """Delete a milestone record"""
         try:
-            result = self.milestone_records.delete_one({
+            deleted = self.milestone_records.find_one_and_delete({
                 '_id': ObjectId(record_id),
                 'userId': ObjectId(user_id)
-            })
+            }, projection=ward_stats.tracked_projection('milestone_records') or {'_id': 1})
             
-            if result.deleted_count == 0:
+            if deleted is None:
                 return {'error': 'Milestone record not found'}, 404
+            ward_stats.record_delete('milestone_records', deleted)
             
             return {'message': 'Milestone record deleted successfully'}, 200
         except Exception as e:
@@ -301,17 +302,21 @@ class MilestoneService:
             # if asha_worker_id:
             #     query['ashaWorkerId'] = ObjectId(asha_worker_id)
             
-            users = list(self.users.find(query))
+            users = list(self.users.find(query, projection('user.milestone_card')))
+            
+            # Get all milestones once, and every user's records in a single query
+            all_milestones = reference_data.active_milestones(self.developmental_milestones)
+            records_by_user = {}
+            if users:
+                for record in self.milestone_records.find({'userId': {'$in': [u['_id'] for u in users]}}):
+                    records_by_user.setdefault(record['userId'], []).append(record)
             
             result = []
             for user in users:
                 user_id = str(user['_id'])
                 
                 # Get user's milestone records
-                records = list(self.milestone_records.find({'userId': user['_id']}))
-                
-                # Get all milestones
-                all_milestones = list(self.developmental_milestones.find({'isActive': True}))
+                records = records_by_user.get(user['_id'], [])
                 
                 # Calculate statistics
                 total_milestones = len(all_milestones)
@@ -364,12 +369,12 @@ class MilestoneService:
         """Get detailed milestone information for a specific user (for ASHA workers)"""
         try:
             # Get user info
-            user = self.users.find_one({'_id': ObjectId(user_id)})
+            user = self.users.find_one({'_id': ObjectId(user_id)}, projection('user.milestone_card'))
             if not user:
                 return {'error': 'User not found'}, 404
             
             # Get all milestones with user's records
-            milestones = list(self.developmental_milestones.find({'isActive': True}).sort('order', 1))
+            milestones = reference_data.active_milestones(self.developmental_milestones)
             user_records = list(self.milestone_records.find({'userId': ObjectId(user_id)}))
             
             # Create a map of milestone_id -> record
@@ -833,6 +838,7 @@ class MilestoneService:
             ]
             
             self.developmental_milestones.insert_many(milestones)
+            reference_data.invalidate_milestones()
             
             return {'message': f'Successfully seeded {len(milestones)} milestones'}, 201
         except Exception as e:
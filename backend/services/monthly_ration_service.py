@@ -4,6 +4,8 @@ MonthlyRationService: business logic for monthly ration distribution to maternit
 from datetime import datetime, timezone
 from typing import Tuple, Dict, Any, List
 from bson import ObjectId
+from utils.projections import projection
+from services.ward_stats_service import ward_stats
 
 
 class MonthlyRationService:
@@ -28,7 +30,7 @@ class MonthlyRationService:
         maternity_users = list(self.users.find({
             'beneficiaryCategory': 'maternity',
             'isActive': True
-        }))
+        }, projection('user.id')))
 
         # Monthly ration items (increased quantities for monthly distribution)
         ration_items = [
@@ -53,7 +55,7 @@ class MonthlyRationService:
             
             if not existing:
                 # Create new ration record
-                self.monthly_rations.insert_one({
+                ration = {
                     'userId': user['_id'],
                     'monthStartDate': month_start_date,
                     'items': ration_items,
@@ -61,7 +63,9 @@ class MonthlyRationService:
                     'collectionDate': None,
                     'createdAt': datetime.now(timezone.utc),
                     'updatedAt': datetime.now(timezone.utc)
-                })
+                }
+                self.monthly_rations.insert_one(ration)
+                ward_stats.record_insert('monthly_rations', ration)
             else:
                 # Update existing record with new items if different
                 if existing.get('items') != ration_items:
@@ -141,7 +145,8 @@ class MonthlyRationService:
             return {'error': 'Ration already marked as collected'}, 400
 
         # Update to collected
-        result = self.monthly_rations.update_one(
+        before = ward_stats.update_one(
+            'monthly_rations',
             {'_id': ration['_id']},
             {
                 '$set': {
@@ -152,7 +157,7 @@ class MonthlyRationService:
             }
         )
 
-        if result.modified_count == 0:
+        if before is None:
             return {'error': 'Failed to update ration status'}, 500
 
         return {'message': 'Ration marked as collected'}, 200
@@ -172,7 +177,8 @@ class MonthlyRationService:
             return {'error': 'Ration record not found'}, 404
 
         # Update to pending
-        result = self.monthly_rations.update_one(
+        before = ward_stats.update_one(
+            'monthly_rations',
             {'_id': ration['_id']},
             {
                 '$set': {
@@ -183,7 +189,7 @@ class MonthlyRationService:
             }
         )
 
-        if result.modified_count == 0:
+        if before is None:
             return {'error': 'Failed to update ration status'}, 500
 
         return {'message': 'Ration marked as pending'}, 200
@@ -0,0 +1,373 @@
+"""
+NotificationService: direct and broadcast in-app notifications
+Direct notifications (recipientId) are one document per recipient and carry
+their own isRead flag. A broadcast is a single document for everyone in an
+audience ('user', 'asha_worker', 'admin' or 'all'), optionally narrowed to a
+beneficiary segment ('maternity', 'palliative'); it is never fanned out.
+
+Whether a user has read a broadcast is kept in that user's
+`notification_reads` document:
+  - readAllAt: every broadcast created up to then is read (mark-all-read)
+  - readIds:   broadcasts created after readAllAt that were read one by one
+  - hiddenIds: broadcasts the user deleted
+Users only see broadcasts created after they registered, as they would have
+with one copy per existing user.
+
+Unread counts are maintained rather than counted on every poll:
+  - notification_counters holds the number of broadcasts per audience and
+    segment, $inc'd when one is created
+  - the user's notification_reads document holds directUnread ($inc'd and
+    decremented with the direct notifications) and broadcastSeen, how many of
+    the broadcasts the user can see are read, hidden or predate the user
+so unread = directUnread + (visible broadcasts - broadcastSeen) costs two point
+reads. A user's counters are initialized from a count on first use and
+reconcile_counters() recounts them to repair drift (role or segment changes,
+concurrent writes, scripts).
+"""
+from datetime import datetime, timezone
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+ALL = 'all'
+# Segments are beneficiary categories
+SEGMENTS = ('maternity', 'palliative')
+
+
+def serialize_notification(doc, is_read=None):
+    """API representation of a notification document"""
+    created = doc.get('createdAt')
+    return {
+        'id': str(doc['_id']),
+        'title': doc.get('title', ''),
+        'message': doc.get('message', ''),
+        'type': doc.get('type', 'info'),  # info, success, warning, event
+        'isRead': doc.get('isRead', False) if is_read is None else is_read,
+        'relatedEntity': doc.get('relatedEntity'),  # {type: 'event'|'class'|'camp', id: '...'}
+        'createdAt': created.isoformat() if isinstance(created, datetime) else created,
+    }
+
+
+def _counter_id(audience, segment=None):
+    return f"{audience}:{segment or '*'}"
+
+
+def _object_id(value):
+    try:
+        return ObjectId(value)
+    except Exception:
+        return None
+
+
+class NotificationService:
+    def __init__(self, notifications_collection, reads_collection, counters_collection, users_collection):
+        self.notifications = notifications_collection
+        self.reads = reads_collection
+        self.counters = counters_collection
+        self.users = users_collection
+
+    # Writes
+
+    def create(self, title, message, recipient_id, notification_type='info', related_entity=None):
+        """Insert a notification for one user; returns its id"""
+        doc = {
+            'title': title,
+            'message': message,
+            'type': notification_type,
+            'recipientId': recipient_id,
+            'isRead': False,
+            'createdAt': datetime.now(timezone.utc),
+        }
+        if related_entity:
+            doc['relatedEntity'] = related_entity
+        inserted_id = self.notifications.insert_one(doc).inserted_id
+        self._inc_direct(recipient_id, 1)
+        return inserted_id
+
+    def create_many(self, notifications):
+        """Insert direct notifications in one batch: dicts of title, message, recipientId and optionally
+        type and relatedEntity. Returns the number inserted."""
+        if not notifications:
+            return 0
+        now = datetime.now(timezone.utc)
+        docs = []
+        per_user = {}
+        for n in notifications:
+            doc = {
+                'title': n['title'],
+                'message': n['message'],
+                'type': n.get('type', 'info'),
+                'recipientId': n['recipientId'],
+                'isRead': False,
+                'createdAt': now,
+            }
+            if n.get('relatedEntity'):
+                doc['relatedEntity'] = n['relatedEntity']
+            docs.append(doc)
+            per_user[doc['recipientId']] = per_user.get(doc['recipientId'], 0) + 1
+        self.notifications.insert_many(docs, ordered=False)
+        self.reads.bulk_write([UpdateOne({'_id': user_id}, {'$inc': {'directUnread': n}}, upsert=True)
+                               for user_id, n in per_user.items()], ordered=False)
+        return len(docs)
+
+    def broadcast(self, title, message, audience=None, segment=None, notification_type='info', related_entity=None):
+        """Insert one notification for every user of `audience` (default: everyone); returns its id"""
+        if segment is not None and segment not in SEGMENTS:
+            raise ValueError(f'Unknown segment: {segment}')
+        doc = {
+            'title': title,
+            'message': message,
+            'type': notification_type,
+            'audience': audience or ALL,
+            'createdAt': datetime.now(timezone.utc),
+        }
+        if segment:
+            doc['segment'] = segment
+        if related_entity:
+            doc['relatedEntity'] = related_entity
+        inserted_id = self.notifications.insert_one(doc).inserted_id
+        self.counters.update_one({'_id': _counter_id(doc['audience'], segment)}, {'$inc': {'count': 1}}, upsert=True)
+        return inserted_id
+
+    # Counters
+
+    def _inc_direct(self, user_id, n):
+        # A user without counters yet is initialized from a count on first read
+        self.reads.update_one({'_id': user_id}, {'$inc': {'directUnread': n}}, upsert=True)
+
+    def _visible_broadcasts(self, user_type, segment):
+        """Number of broadcasts for this role and segment (from the counters)"""
+        keys = [_counter_id(audience, s) for audience in (user_type, ALL) for s in {None, segment}]
+        return sum(doc.get('count', 0) for doc in self.counters.find({'_id': {'$in': keys}}))
+
+    def _count_counters(self, reader):
+        """The user's counters from the notifications themselves"""
+        direct = self.notifications.count_documents({'recipientId': reader['userId'], 'isRead': False})
+        unread = self.notifications.count_documents(self._broadcast_query(reader, unread=True))
+        seen = self._visible_broadcasts(reader['audience'][0], reader['segment']) - unread
+        return {'directUnread': direct, 'broadcastSeen': seen}
+
+    def _ensure_counters(self, reader, state):
+        if 'broadcastSeen' in state and 'directUnread' in state:
+            return state
+        counters = self._count_counters(reader)
+        self.reads.update_one({'_id': reader['userId']}, {'$set': counters}, upsert=True)
+        return {**state, **counters}
+
+    # Reader state
+
+    @staticmethod
+    def _reader_from(user_id, user_type, user, state):
+        joined = (user or {}).get('createdAt')
+        return {
+            'userId': user_id,
+            'audience': [user_type, ALL],
+            'segment': (user or {}).get('beneficiaryCategory') if user_type == 'user' else None,
+            'joinedAt': joined if isinstance(joined, datetime) else None,
+            'readAllAt': state.get('readAllAt'),
+            'readIds': state.get('readIds') or [],
+            'hiddenIds': state.get('hiddenIds') or [],
+        }
+
+    def _reader(self, user_id, user_type):
+        """What a user can see and has read: audience, segment, joinedAt, read state and counters"""
+        user = None
+        oid = _object_id(user_id)
+        if oid is not None:
+            user = self.users.find_one({'_id': oid}, {'createdAt': 1, 'beneficiaryCategory': 1})
+        state = self.reads.find_one({'_id': user_id}) or {}
+        reader = self._reader_from(user_id, user_type, user, state)
+        state = self._ensure_counters(reader, state)
+        reader['directUnread'] = state['directUnread']
+        reader['broadcastSeen'] = state['broadcastSeen']
+        return reader
+
+    def _broadcast_query(self, reader, unread=False):
+        query = {'audience': {'$in': reader['audience']}, 'segment': {'$in': [None, reader['segment']]}}
+        since = [t for t in (reader['joinedAt'], reader['readAllAt'] if unread else None) if t is not None]
+        if since:
+            query['createdAt'] = {'$gt': max(since)}
+        excluded = reader['hiddenIds'] + (reader['readIds'] if unread else [])
+        if excluded:
+            query['_id'] = {'$nin': excluded}
+        return query
+
+    def _broadcast_is_read(self, reader, doc):
+        read_all = reader['readAllAt']
+        created = doc.get('createdAt')
+        if read_all is not None and isinstance(created, datetime) and created <= read_all:
+            return True
+        return doc['_id'] in reader['readIds']
+
+    # Reads
+
+    def unread_count(self, user_id, user_type, segment=None, reader=None):
+        """Unread notifications from the counters: the user's document and the broadcast totals"""
+        if reader is None:
+            state = self.reads.find_one({'_id': user_id}, {'directUnread': 1, 'broadcastSeen': 1}) or {}
+            if 'directUnread' in state and 'broadcastSeen' in state:
+                reader = {**state, 'segment': segment if user_type == 'user' else None}
+            else:
+                reader = self._reader(user_id, user_type)
+        visible = self._visible_broadcasts(user_type, reader['segment'])
+        return max(reader['directUnread'], 0) + max(visible - reader['broadcastSeen'], 0)
+
+    def list_for(self, user_id, user_type, unread_only=False, limit=50):
+        """Newest direct and broadcast notifications merged; returns (docs with isRead, unread count)"""
+        reader = self._reader(user_id, user_type)
+        direct_query = {'recipientId': user_id}
+        if unread_only:
+            direct_query['isRead'] = False
+        docs = list(self.notifications.find(direct_query).sort('createdAt', -1).limit(limit))
+        for doc in self.notifications.find(self._broadcast_query(reader, unread=unread_only)).sort('createdAt', -1).limit(limit):
+            doc['isRead'] = self._broadcast_is_read(reader, doc)
+            docs.append(doc)
+        docs.sort(key=lambda d: d['createdAt'] if isinstance(d.get('createdAt'), datetime) else datetime.min, reverse=True)
+        return docs[:limit], self.unread_count(user_id, user_type, reader=reader)
+
+    def since(self, user_id, user_type, after_id, limit=50):
+        """Notifications for this user created after `after_id` (oldest first), e.g. missed while disconnected"""
+        oid = _object_id(after_id)
+        if oid is None:
+            return []
+        reader = self._reader(user_id, user_type)
+        broadcasts = self._broadcast_query(reader)
+        broadcasts['_id'] = {**broadcasts.get('_id', {}), '$gt': oid}
+        docs = list(self.notifications.find({'recipientId': user_id, '_id': {'$gt': oid}}).sort('_id', 1).limit(limit))
+        docs += self.notifications.find(broadcasts).sort('_id', 1).limit(limit)
+        docs.sort(key=lambda d: d['_id'])
+        return docs[:limit]
+
+    # Read state
+
+    def mark_read(self, user_id, user_type, notification_id):
+        """Mark one notification read for this user; False if the user cannot see it"""
+        oid = _object_id(notification_id)
+        if oid is None:
+            return False
+        now = datetime.now(timezone.utc)
+        before = self.notifications.find_one_and_update(
+            {'_id': oid, 'recipientId': user_id},
+            {'$set': {'isRead': True, 'readAt': now}},
+            projection={'isRead': 1}, return_document=ReturnDocument.BEFORE
+        )
+        if before is not None:
+            if not before.get('isRead'):
+                self._inc_direct(user_id, -1)
+            return True
+        reader = self._reader(user_id, user_type)
+        doc = self.notifications.find_one({**self._broadcast_query(reader), '_id': oid}, {'createdAt': 1})
+        if doc is None:
+            return False
+        if not self._broadcast_is_read(reader, doc):
+            # The readIds condition keeps a repeated request from counting twice
+            self.reads.update_one(
+                {'_id': user_id, 'readIds': {'$ne': oid}},
+                {'$addToSet': {'readIds': oid}, '$inc': {'broadcastSeen': 1}, '$set': {'updatedAt': now}}
+            )
+        return True
+
+    def mark_all_read(self, user_id, user_type):
+        """Mark everything read for this user only; returns how many notifications became read"""
+        now = datetime.now(timezone.utc)
+        reader = self._reader(user_id, user_type)
+        broadcasts = self.notifications.count_documents(self._broadcast_query(reader, unread=True))
+        result = self.notifications.update_many(
+            {'recipientId': user_id, 'isRead': False},
+            {'$set': {'isRead': True, 'readAt': now}}
+        )
+        # Moving the cursor covers the broadcasts read one by one as well
+        self.reads.update_one(
+            {'_id': user_id},
+            {'$set': {'readAllAt': now, 'readIds': [], 'updatedAt': now, 'directUnread': 0,
+                      'broadcastSeen': self._visible_broadcasts(user_type, reader['segment'])}},
+            upsert=True
+        )
+        return result.modified_count + broadcasts
+
+    def delete_for(self, user_id, user_type, notification_id):
+        """Delete a direct notification, or hide a broadcast from this user only; False if the user cannot see it"""
+        oid = _object_id(notification_id)
+        if oid is None:
+            return False
+        deleted = self.notifications.find_one_and_delete({'_id': oid, 'recipientId': user_id}, projection={'isRead': 1})
+        if deleted is not None:
+            if not deleted.get('isRead'):
+                self._inc_direct(user_id, -1)
+            return True
+        reader = self._reader(user_id, user_type)
+        doc = self.notifications.find_one({**self._broadcast_query(reader), '_id': oid}, {'createdAt': 1})
+        if doc is None:
+            return False
+        update = {'$addToSet': {'hiddenIds': oid}, '$pull': {'readIds': oid},
+                  '$set': {'updatedAt': datetime.now(timezone.utc)}}
+        if not self._broadcast_is_read(reader, doc):
+            # A hidden broadcast no longer counts as unread
+            update['$inc'] = {'broadcastSeen': 1}
+        self.reads.update_one({'_id': user_id, 'hiddenIds': {'$ne': oid}}, update)
+        return True
+
+    # Reconciliation
+
+    def reconcile_counters(self, batch_size=500):
+        """Recount the broadcast totals and every user's counters; returns a summary of the corrections"""
+        totals = {}
+        for row in self.notifications.aggregate([
+            {'$match': {'audience': {'$exists': True}}},
+            {'$group': {'_id': {'audience': '$audience', 'segment': '$segment'}, 'count': {'$sum': 1}}},
+        ]):
+            key = _counter_id(row['_id']['audience'], row['_id'].get('segment'))
+            totals[key] = totals.get(key, 0) + row['count']
+        previous = {doc['_id']: doc.get('count', 0) for doc in self.counters.find({})}
+        for key in set(previous) | set(totals):
+            if previous.get(key) != totals.get(key, 0):
+                self.counters.replace_one({'_id': key}, {'count': totals.get(key, 0)}, upsert=True)
+
+        users = corrected = 0
+        batch = []
+
+        def flush():
+            nonlocal corrected
+            accounts = {str(u['_id']): u for u in self.users.find(
+                {'_id': {'$in': [oid for oid in (_object_id(s['_id']) for s in batch) if oid is not None]}},
+                {'userType': 1, 'createdAt': 1, 'beneficiaryCategory': 1})}
+            for state in batch:
+                account = accounts.get(state['_id'])
+                if account is None:
+                    continue
+                reader = self._reader_from(state['_id'], account.get('userType', 'user'), account, state)
+                counters = self._count_counters(reader)
+                if any(state.get(field) != value for field, value in counters.items()):
+                    self.reads.update_one({'_id': state['_id']}, {'$set': counters})
+                    corrected += 1
+            batch.clear()
+
+        for state in self.reads.find({}).batch_size(batch_size):
+            users += 1
+            batch.append(state)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        if corrected:
+            print(f"[NOTIFICATIONS] Reconciled unread counters; corrected {corrected} of {users} user(s)")
+        return {'broadcastTotals': totals, 'users': users, 'corrected': corrected}
+
+    # Migration
+
+    def migrate_role_notifications(self):
+        """Turn legacy role-wide notifications (recipientType without recipientId) into broadcasts"""
+        migrated = 0
+        for role in self.notifications.distinct('recipientType', {'recipientId': None, 'audience': None}):
+            if not role:
+                continue
+            result = self.notifications.update_many(
+                {'recipientType': role, 'recipientId': None, 'audience': None},
+                {'$set': {'audience': role}, '$unset': {'isRead': '', 'readAt': ''}}
+            )
+            migrated += result.modified_count
+        return migrated
+
+
+def notification_service_for(collections):
+    return NotificationService(collections['notifications'], collections['notification_reads'],
+                               collections['notification_counters'], collections['users'])
@@ -0,0 +1,262 @@
+"""
+Notification stream hub (Server-Sent Events)
+Each worker process runs one watcher thread that learns about new notifications
+and hands them to the open /api/notifications/stream connections they are for,
+so connected clients stop polling.
+
+  - change streams: a `watch()` on the notifications collection (replica sets
+    and Atlas only)
+  - tailing poll: otherwise, one query every NOTIFICATION_STREAM_POLL_SECONDS
+    for notifications created since the last one, while anyone is connected
+
+Either way the database cost is per worker, not per connected user. Every
+connection holds a worker thread, so a process accepts at most
+NOTIFICATION_STREAM_MAX_CONNECTIONS; beyond that the endpoint answers 503 and
+clients keep polling.
+
+EventSource cannot send an Authorization header, and an access token in a URL
+ends up in access logs and browser history. A stream is therefore opened with a
+StreamTokens token: issued to an authenticated caller, valid for
+NOTIFICATION_STREAM_TOKEN_SECONDS and redeemable once. Only its hash is stored
+(`notification_stream_tokens`, TTL on expiresAt), so any worker can redeem it.
+"""
+import hashlib
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from services.notification_service import ALL
+
+
+class Subscription:
+    """One open stream: the user it belongs to and its queue of pending notifications"""
+
+    def __init__(self, user_id, user_type, segment=None, maxsize=100):
+        self.user_id = user_id
+        self.user_type = user_type
+        self.segment = segment if user_type == 'user' else None
+        self.queue = queue.Queue(maxsize)
+        self.opened_at = datetime.now(timezone.utc)
+
+    def wants(self, doc):
+        # The poll looks back a few seconds: leave out what was created before the stream opened
+        created = doc.get('createdAt')
+        if isinstance(created, datetime):
+            created = created.replace(tzinfo=timezone.utc) if created.tzinfo is None else created
+            if created < self.opened_at:
+                return False
+        if doc.get('recipientId'):
+            return doc['recipientId'] == self.user_id
+        audience = doc.get('audience')
+        return audience in (self.user_type, ALL) and doc.get('segment') in (None, self.segment)
+
+    def push(self, doc):
+        try:
+            self.queue.put_nowait(doc)
+            return True
+        except queue.Full:
+            # A stalled client loses the event; it still sees it in the list and the unread count
+            return False
+
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class StreamTokens:
+    """Short-lived, single-use tokens that open one notification stream"""
+
+    def __init__(self, collection=None, ttl_seconds=60):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+
+    def init(self, collection, ttl_seconds=60):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+
+    def issue(self, user_id, user_type, segment=None):
+        token = secrets.token_urlsafe(32)
+        self.collection.insert_one({
+            '_id': _token_hash(token),
+            'userId': user_id,
+            'userType': user_type,
+            'segment': segment,
+            'expiresAt': datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+        })
+        return token
+
+    def redeem(self, token):
+        """The {'userId', 'userType', 'segment'} a token was issued for; None if unknown, used or expired"""
+        if not token:
+            return None
+        # Deleted as it is read: a token opens one stream. The TTL monitor lags, so expiry is checked too.
+        return self.collection.find_one_and_delete(
+            {'_id': _token_hash(token), 'expiresAt': {'$gt': datetime.now(timezone.utc)}},
+            projection={'_id': 0, 'userId': 1, 'userType': 1, 'segment': 1})
+
+
+class NotificationHub:
+    def __init__(self):
+        self.collection = None
+        self.max_connections = 100
+        self.poll_seconds = 2.0
+        self.poll_lag_seconds = 5.0
+        self.poll_batch_size = 1000
+        self.use_change_streams = True
+        self.mode = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.published = self.delivered = self.dropped = self.rejected = 0
+
+    def init(self, collection, max_connections=100, poll_seconds=2.0, use_change_streams=True):
+        self.collection = collection
+        self.max_connections = max_connections
+        self.poll_seconds = poll_seconds
+        self.use_change_streams = use_change_streams
+
+    # Connections
+
+    def subscribe(self, user_id, user_type, segment=None):
+        """Register a stream; None when this process is at NOTIFICATION_STREAM_MAX_CONNECTIONS"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_connections:
+                self.rejected += 1
+                return None
+            subscription = Subscription(user_id, user_type, segment)
+            self._subscribers.add(subscription)
+        self._ensure_watcher()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, doc):
+        """Queue a new notification on every stream it is for"""
+        with self._lock:
+            subscribers = [s for s in self._subscribers if s.wants(doc)]
+            self.published += 1
+        dropped = sum(1 for subscription in subscribers if not subscription.push(doc))
+        with self._lock:
+            self.delivered += len(subscribers) - dropped
+            self.dropped += dropped
+
+    # Watcher
+
+    def _ensure_watcher(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='notification-stream', daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        if self.use_change_streams and self._watch_change_stream():
+            return
+        self._tail()
+
+    def _watch_change_stream(self):
+        """Follow inserts with a change stream; False if the deployment does not support them"""
+        resume_token = None
+        opened = False
+        while not self._stop.is_set():
+            try:
+                with self.collection.watch([{'$match': {'operationType': 'insert'}}],
+                                           resume_after=resume_token, max_await_time_ms=1000) as stream:
+                    if not opened:
+                        opened = True
+                        self.mode = 'change_stream'
+                        print("[NOTIFY-STREAM] Following notifications with a change stream")
+                    while not self._stop.is_set() and stream.alive:
+                        change = stream.try_next()
+                        resume_token = stream.resume_token
+                        if change is not None:
+                            self.publish(change['fullDocument'])
+            except Exception as e:
+                if not opened:
+                    print(f"[NOTIFY-STREAM] Change streams unavailable ({e}); falling back to polling")
+                    return False
+                print(f"[NOTIFY-STREAM] Change stream interrupted ({e}); resuming")
+                time.sleep(1.0)
+        return True
+
+    def _tail(self):
+        """Poll for notifications created since the last poll while there are subscribers.
+
+        ObjectIds from different processes are only roughly ordered, so every poll looks
+        poll_lag_seconds back and skips ids it has already published. A poll pages through
+        everything new (bulk inserts can add thousands at once) before moving on.
+        """
+        self.mode = 'poll'
+        print(f"[NOTIFY-STREAM] Polling for new notifications every {self.poll_seconds}s")
+        # Published ids a later poll can still read again (those at or above its floor)
+        seen = deque()
+        seen_ids = set()
+        since = datetime.now(timezone.utc)
+        while not self._stop.wait(self.poll_seconds):
+            with self._lock:
+                idle = not self._subscribers
+            if idle:
+                since = datetime.now(timezone.utc)
+                continue
+            now = datetime.now(timezone.utc)
+            floor = ObjectId.from_datetime(since - timedelta(seconds=self.poll_lag_seconds))
+            while seen and seen[0] < floor:
+                seen_ids.discard(seen.popleft())
+            try:
+                after = {'$gte': floor}
+                while True:
+                    docs = list(self.collection.find({'_id': after}).sort('_id', 1).limit(self.poll_batch_size))
+                    for doc in docs:
+                        if doc['_id'] in seen_ids:
+                            continue
+                        seen.append(doc['_id'])
+                        seen_ids.add(doc['_id'])
+                        self.publish(doc)
+                    if len(docs) < self.poll_batch_size:
+                        break
+                    after = {'$gt': docs[-1]['_id']}
+            except Exception as e:
+                # `since` stays put: the next poll reads the rest (published ids are skipped)
+                print(f"[NOTIFY-STREAM] Poll failed: {e}")
+                continue
+            since = now
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'connections': len(self._subscribers),
+                'maxConnections': self.max_connections,
+                'published': self.published,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'rejected': self.rejected,
+            }
+
+
+notification_hub = NotificationHub()
+stream_tokens = StreamTokens()
+
+
+def init_notification_stream(app, collections):
+    stream_tokens.init(collections['notification_stream_tokens'],
+                       ttl_seconds=int(app.config.get('NOTIFICATION_STREAM_TOKEN_SECONDS', 60)))
+    notification_hub.init(
+        collections['notifications'],
+        max_connections=int(app.config.get('NOTIFICATION_STREAM_MAX_CONNECTIONS', 100)),
+        poll_seconds=float(app.config.get('NOTIFICATION_STREAM_POLL_SECONDS', 2.0)),
+        use_change_streams=bool(app.config.get('NOTIFICATION_STREAM_CHANGE_STREAMS', True)),
+    )
+    return notification_hub
@@ -0,0 +1,132 @@
+"""
+Reference data lookups backed by the two-tier cache (utils/shared_cache.py)
+Milestones, locations, stock items and the vaccine list are read on most requests
+and change rarely. The write paths call the matching invalidate_* function, which
+reaches every worker through the shared cache version counter.
+Entries are keyed by collection namespace, so apps bound to different databases
+in one process do not share entries.
+
+Milestones and locations are also served by version-stamped endpoints
+(middleware/conditional.py), whose ETag comes from the collection's stamp in
+system_meta. Their entries are keyed by that stamp too, so a body is never served
+under a newer ETag than the data it was built from: a bump by any worker or
+offline script makes every process reload, whatever the cache backend.
+"""
+from bson import ObjectId
+from flask import g, has_request_context
+from middleware.conditional import CollectionVersions
+from utils.cache import get_cache
+from utils.shared_cache import shared_cache
+from utils.vaccination_utils import VACCINATION_SCHEDULE
+
+milestone_cache = shared_cache('developmental_milestones', maxsize=8, ttl=3600)
+location_cache = shared_cache('locations', maxsize=8, ttl=300)
+# Stock quantities change with every distribution; keep copies short-lived
+stock_cache = shared_cache('anganwadi_stock', maxsize=8, ttl=60)
+# Derived from a constant: identical in every process, so it stays local
+vaccine_list_cache = get_cache('vaccine_list', maxsize=1, ttl=None)
+
+
+def _oid(value):
+    try:
+        return value if isinstance(value, ObjectId) else ObjectId(value)
+    except Exception:
+        return None
+
+
+def _stamp(collection):
+    """The collection's version stamp, read once per request.
+
+    Read before the data is loaded: writers bump after writing, so the data is never older than its key.
+    """
+    memo = g.setdefault('reference_stamps', {}) if has_request_context() else {}
+    if collection.full_name not in memo:
+        name = collection.name
+        memo[collection.full_name] = CollectionVersions(collection.database['system_meta']).get([name])[name]
+    return memo[collection.full_name]
+
+
+# Developmental milestones
+
+def milestones(collection):
+    """Every milestone document, sorted by order"""
+    return milestone_cache.get_or_load(
+        (collection.full_name, _stamp(collection)), lambda: list(collection.find().sort('order', 1)))
+
+
+def active_milestones(collection):
+    return [m for m in milestones(collection) if m.get('isActive') is True]
+
+
+def find_milestone(collection, milestone_id):
+    """Milestone document by id (active or not), or None"""
+    oid = _oid(milestone_id)
+    return next((m for m in milestones(collection) if m['_id'] == oid), None)
+
+
+def invalidate_milestones():
+    milestone_cache.invalidate()
+
+
+# Locations
+
+def locations(collection):
+    """Every location document (active and inactive), sorted by name"""
+    return location_cache.get_or_load(
+        (collection.full_name, _stamp(collection)), lambda: list(collection.find().sort('name', 1)))
+
+
+def active_locations(collection, ward=None):
+    return [loc for loc in locations(collection)
+            if loc.get('active') is True and (ward is None or loc.get('ward') == ward)]
+
+
+def find_location(collection, location_id, active_only=False):
+    """Location document by id, or None (also for inactive ones when active_only)"""
+    oid = _oid(location_id)
+    for loc in locations(collection):
+        if loc['_id'] == oid:
+            return loc if not active_only or loc.get('active') is True else None
+    return None
+
+
+def invalidate_locations():
+    location_cache.invalidate()
+
+
+# Anganwadi stock
+
+def stock_items(collection, load=None):
+    """Every stock item document sorted by category and name. load() replaces the default query on a miss."""
+    loader = load or (lambda: list(collection.find().sort([('category', 1), ('itemName', 1)])))
+    return stock_cache.get_or_load(collection.full_name, loader)
+
+
+def invalidate_stock():
+    stock_cache.invalidate()
+
+
+# Vaccines of the immunization schedule (static, never expires)
+
+def _build_vaccine_list():
+    seen = set()
+    vaccines = []
+    for v in VACCINATION_SCHEDULE:
+        # Skip birth vaccines — they are given at delivery, not scheduled
+        if v.get('category') == 'birth':
+            continue
+        name = v['vaccineName']
+        if name not in seen:
+            seen.add(name)
+            vaccines.append({
+                'name': name,
+                'category': v.get('category', ''),
+                'ageLabel': v.get('ageLabel', ''),
+                'description': v.get('description', '')
+            })
+    return vaccines
+
+
+def vaccine_list():
+    """Distinct schedulable vaccines of the Indian Immunization Program schedule"""
+    return vaccine_list_cache.get_or_load('all', _build_vaccine_list)
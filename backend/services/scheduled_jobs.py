@@ -0,0 +1,41 @@
+"""
+Background job registration
+The single place that wires the write-time aggregates and registers the periodic
+jobs, shared by create_app and `python -m scripts.run_jobs`.
+"""
+from services.ward_stats_service import init_ward_stats, ward_stats
+from services.activity_rollup_service import init_activity_rollups, activity_rollups
+from services.email_outbox import email_outbox
+from services.notification_service import notification_service_for
+from services.booking_expiry import init_booking_expiry, booking_expiry
+from services.immunization_status import init_immunization_status, immunization_status
+from services.vaccination_reminders import init_vaccination_reminders, vaccination_reminders
+from utils.jobs import job_runner
+
+
+def init_jobs(app, collections):
+    """Initialize the aggregates and register their jobs (intervals from the app config)"""
+    settings = app.config
+    init_ward_stats(collections)
+    init_activity_rollups(collections)
+    init_booking_expiry(collections)
+    init_immunization_status(collections)
+    init_vaccination_reminders(app, collections)
+    job_runner.init(collections['system_meta'])
+
+    job_runner.register('ward_stats_reconcile', ward_stats.reconcile, settings.get('WARD_STATS_RECONCILE_SECONDS', 3600))
+    catch_up_days = settings.get('ROLLUP_CATCHUP_DAYS', 35)
+    job_runner.register('activity_rollups_catch_up', lambda: activity_rollups.catch_up(catch_up_days),
+                        settings.get('ROLLUP_CATCHUP_SECONDS', 3600))
+    # On demand only (after imports): full recount of every bucket
+    job_runner.register('activity_rollups_rebuild', activity_rollups.rebuild, 0)
+    # Periodic only when no in-process workers deliver the email outbox
+    drain_interval = 0 if settings.get('EMAIL_OUTBOX_WORKERS', 2) else settings.get('EMAIL_OUTBOX_DRAIN_SECONDS', 60)
+    job_runner.register('email_outbox_drain', email_outbox.drain, drain_interval)
+    job_runner.register('notification_counters_reconcile', notification_service_for(collections).reconcile_counters,
+                        settings.get('NOTIFICATION_COUNTERS_RECONCILE_SECONDS', 3600))
+    job_runner.register('booking_expiry', booking_expiry.run, settings.get('BOOKING_EXPIRY_SECONDS', 3600))
+    # On demand only (after imports or schedule changes): rebuild every child's immunization status
+    job_runner.register('immunization_status_rebuild', immunization_status.rebuild, 0)
+    job_runner.register('vaccination_reminders', vaccination_reminders.run, settings.get('VACCINATION_REMINDERS_SECONDS', 86400))
+    return job_runner
@@ -4,13 +4,14 @@ Service for seeding default data and health blogs
 from datetime import datetime, timezone
 from bson import ObjectId
 from utils.svg_generator import generate_svg_banner, slugify
+from services import reference_data
 
 class SeedService:
     def __init__(self, collections):
         self.collections = collections
 
     def create_default_health_blogs(self):
-        """Create default general health blogs on startup"""
+        """Create default general health blogs on startup; returns the number inserted (None on error)"""
         try:
             # Only seed if collection is empty or missing our demo entries
             existing_count = self.collections['health_blogs'].count_documents({})
@@ -37,7 +38,7 @@ class SeedService:
             if not creator:
                 # No users available; skip seeding safely
                 print("No users found; skipping demo health blog seeding.")
-                return
+                return 0
 
             creator_id = creator['_id']
             now = datetime.now(timezone.utc)
@@ -109,23 +110,25 @@ class SeedService:
                 print(f"✓ Seeded {len(demo_docs)} demo general health blogs.")
             else:
                 print("Demo health blogs already present; no seeding needed.")
+            return len(demo_docs)
         except Exception as e:
             print(f"Error seeding demo health blogs: {e}")
+            return None
 
     def create_sample_supply_requests(self):
-        """Create sample supply requests for testing"""
+        """Create sample supply requests for testing; returns the number inserted (None on error)"""
         try:
             # Check if we already have sample requests
             existing_count = self.collections['supply_requests'].count_documents({})
             if existing_count > 0:
                 print("Sample supply requests already exist; skipping seeding.")
-                return
+                return 0
 
             # Get some sample users
             users = list(self.collections['users'].find({}, {'_id': 1, 'name': 1, 'beneficiaryCategory': 1}).limit(4))
             if len(users) < 2:
                 print("Not enough users for sample supply requests; skipping seeding.")
-                return
+                return 0
 
             now = datetime.now(timezone.utc)
 
@@ -178,17 +181,19 @@ class SeedService:
 
             self.collections['supply_requests'].insert_many(sample_requests)
             print(f"✓ Seeded {len(sample_requests)} sample supply requests.")
+            return len(sample_requests)
         except Exception as e:
             print(f"Error seeding sample supply requests: {e}")
+            return None
 
     def create_default_locations(self):
-        """Create default locations for ward1"""
+        """Create default locations for ward1; returns the number inserted (None on error)"""
         try:
             # Only seed if collection is empty
             existing_count = self.collections['locations'].count_documents({})
             if existing_count > 0:
                 print("Locations already exist; skipping seeding.")
-                return
+                return 0
 
             now = datetime.now(timezone.utc)
 
@@ -241,6 +246,9 @@ class SeedService:
             ]
 
             self.collections['locations'].insert_many(default_locations)
+            reference_data.invalidate_locations()
             print(f"✓ Seeded {len(default_locations)} default locations for Ward 1.")
+            return len(default_locations)
         except Exception as e:
             print(f"Error seeding default locations: {e}")
+            return None
@@ -4,6 +4,7 @@ StockService: business logic for Anganwadi stock/inventory management
 from datetime import datetime, timezone
 from typing import Tuple, Dict, Any
 from bson import ObjectId
+from services import reference_data
 
 
 class StockService:
@@ -45,14 +46,17 @@ class StockService:
             })
         if docs:
             self.stock.insert_many(docs)
+            reference_data.invalidate_stock()
             print(f"[Stock] Seeded {len(docs)} default ration items into stock collection")
 
-    def get_all_stock(self) -> Tuple[Dict[str, Any], int]:
-        """Get all stock items sorted by category, with low-stock flags"""
+    def _load_items(self):
         # Auto-seed on first access if empty
         self._seed_default_items()
+        return list(self.stock.find().sort([('category', 1), ('itemName', 1)]))
 
-        items = list(self.stock.find().sort([('category', 1), ('itemName', 1)]))
+    def get_all_stock(self) -> Tuple[Dict[str, Any], int]:
+        """Get all stock items sorted by category, with low-stock flags"""
+        items = reference_data.stock_items(self.stock, load=self._load_items)
         result = []
         for item in items:
             qty = item.get('quantity', 0)
@@ -103,6 +107,7 @@ class StockService:
             'updatedAt': now,
         }
         result = self.stock.insert_one(doc)
+        reference_data.invalidate_stock()
         doc['id'] = str(result.inserted_id)
         doc.pop('_id', None)
         doc['lastUpdated'] = now.isoformat()
@@ -134,6 +139,7 @@ class StockService:
                 update_fields[field] = max(0, float(data[field]))
 
         self.stock.update_one({'_id': oid}, {'$set': update_fields})
+        reference_data.invalidate_stock()
         return {'message': 'Stock item updated'}, 200
 
     def delete_stock_item(self, item_id: str) -> Tuple[Dict[str, Any], int]:
@@ -146,19 +152,15 @@ class StockService:
         result = self.stock.delete_one({'_id': oid})
         if result.deleted_count == 0:
             return {'error': 'Stock item not found'}, 404
+        reference_data.invalidate_stock()
 
         return {'message': 'Stock item deleted'}, 200
 
     def get_low_stock_items(self) -> Tuple[Dict[str, Any], int]:
         """Get items where quantity is at or below the minimum threshold"""
-        pipeline = [
-            {'$addFields': {
-                'isLow': {'$lte': ['$quantity', '$minThreshold']}
-            }},
-            {'$match': {'isLow': True}},
-            {'$sort': {'quantity': 1}}
-        ]
-        items = list(self.stock.aggregate(pipeline))
+        items = [item for item in reference_data.stock_items(self.stock, load=self._load_items)
+                 if item.get('quantity', 0) <= item.get('minThreshold', 0)]
+        items.sort(key=lambda item: item.get('quantity', 0))
         result = []
         for item in items:
             qty = item.get('quantity', 0)
@@ -215,6 +217,7 @@ class StockService:
                 '$push': {'usageLog': log_entry}
             }
         )
+        reference_data.invalidate_stock()
 
         return {
             'message': f'Recorded usage of {quantity_used} {item.get("unit", "")}. Remaining: {new_qty}',
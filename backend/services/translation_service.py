@@ -3,12 +3,18 @@ Translation service using deep-translator for offline translation.
 Provides English-Malayalam translation for dynamic content.
 """
 
-from deep_translator import GoogleTranslator
-from functools import lru_cache
 import logging
+from utils.lazy import lazy_module
+from utils.shared_cache import shared_cache
+
+# deep_translator (and the requests/bs4 stack under it) is imported on the first translation
+deep_translator = lazy_module('deep_translator')
 
 logger = logging.getLogger(__name__)
 
+# Translations are shared by every worker; the text never changes, so entries just age out
+translation_cache = shared_cache('translations', maxsize=1000, ttl=7 * 24 * 3600)
+
 
 class TranslationService:
     """Service for translating dynamic content using deep-translator"""
@@ -17,7 +23,6 @@ class TranslationService:
         self.initialized = True
         logger.info("Translation service initialized successfully")
     
-    @lru_cache(maxsize=1000)
     def translate(self, text: str, source_lang: str = "en", target_lang: str = "ml") -> str:
         """
         Translate text from source language to target language.
@@ -34,28 +39,34 @@ class TranslationService:
             return text
         
         try:
-            # Map language codes to full names for Google Translator
-            lang_map = {
-                'en': 'english',
-                'ml': 'malayalam'
-            }
-            
-            source = lang_map.get(source_lang, source_lang)
-            target = lang_map.get(target_lang, target_lang)
-            
-            # Create translator instance
-            translator = GoogleTranslator(source=source, target=target)
-            
-            # Perform translation
-            translated_text = translator.translate(text)
-            logger.info(f"Translated text from {source_lang} to {target_lang}")
-            
-            return translated_text
-            
+            # Failed translations raise and are therefore not cached
+            return translation_cache.get_or_load(
+                f'{source_lang}:{target_lang}:{text}',
+                lambda: self._translate_uncached(text, source_lang, target_lang)
+            )
         except Exception as e:
             logger.error(f"Translation error: {str(e)}")
             return text
     
+    def _translate_uncached(self, text: str, source_lang: str, target_lang: str) -> str:
+        # Map language codes to full names for Google Translator
+        lang_map = {
+            'en': 'english',
+            'ml': 'malayalam'
+        }
+        
+        source = lang_map.get(source_lang, source_lang)
+        target = lang_map.get(target_lang, target_lang)
+        
+        # Create translator instance
+        translator = deep_translator.GoogleTranslator(source=source, target=target)
+        
+        # Perform translation
+        translated_text = translator.translate(text)
+        logger.info(f"Translated text from {source_lang} to {target_lang}")
+        
+        return translated_text
+    
     def translate_batch(self, texts: list, source_lang: str = "en", target_lang: str = "ml") -> list:
         """
         Translate multiple texts at once.
@@ -0,0 +1,292 @@
+"""
+Daily vaccination reminders
+Replaces one-child-at-a-time reminders from the ASHA dashboard with a daily
+batch over every child (the `vaccination_reminders` job):
+
+  1. load: one pass over the mothers' children (users) and one over the
+     Completed bookings, folded into a completed-vaccine bitmask per child.
+     A vaccine counts as done on the same terms as in the immunization_status
+     ledger: a Completed booking names it, or the child's milestone for it has
+     a completedAt
+  2. compute: due_table() (utils/vaccination_batch.py) gives every child's due
+     and overdue vaccines at once
+  3. dedupe: `vaccination_reminders` holds one document per child, dose and
+     kind ('due', 'overdue'), so each dose is reminded about at most once as
+     due and once as overdue. New ones are claimed with an unordered
+     insert_many: a dose another run claimed first is skipped
+  4. send: one in-app notification per child (insert_many) and, when mail is
+     configured, one email per child queued in the outbox in chunks
+
+Birth doses (BCG, Hepatitis B birth dose, OPV-0) are given at delivery and
+cannot be booked, so they are never reminded about. Overdue doses are only
+reminded about within VACCINATION_REMINDER_OVERDUE_DAYS
+of their due date (older gaps are for the ASHA worker's overdue list, not a
+reminder). A dry run stops after step 3 and reports what would be sent. Each
+real run is recorded in system_meta (`vaccination_reminders`).
+"""
+import time
+from datetime import date, datetime, timedelta, timezone
+from pymongo.errors import BulkWriteError
+from services.immunization_status import MOTHERS_QUERY, booking_children, child_id
+from utils.vaccination_batch import (BIRTH_POSITIONS, DUE, OVERDUE, VACCINE_NAMES, completed_mask, due_table,
+                                     milestones_mask, np)
+from utils.vaccination_utils import VACCINATION_SCHEDULE
+
+KINDS = {DUE: 'due', OVERDUE: 'overdue'}
+
+_RUN_RECORD = 'vaccination_reminders'
+
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000.0, 1)
+
+
+def _birth_day(value):
+    """A child's date of birth as 'YYYY-MM-DD', None when missing or unreadable"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+class VaccinationReminderService:
+    def __init__(self, collections=None):
+        self.collections = collections
+        self.overdue_days = 90
+        self.email_chunk_size = 500
+        self.send_emails = True
+        self.sender = None
+
+    def init(self, app, collections):
+        self.collections = collections
+        self.overdue_days = int(app.config.get('VACCINATION_REMINDER_OVERDUE_DAYS', 90))
+        self.email_chunk_size = int(app.config.get('VACCINATION_REMINDER_EMAIL_CHUNK_SIZE', 500))
+        self.send_emails = bool(app.config.get('VACCINATION_REMINDER_EMAILS', True))
+        self.sender = app.config.get('MAIL_USERNAME')
+
+    @property
+    def reminders(self):
+        return self.collections['vaccination_reminders']
+
+    # 1. Load
+
+    def _load(self, batch_size=2000):
+        """Children with a birth date: (ids, mothers, names, birth days, completed bitmasks)"""
+        completed = {}
+        for booking in self.collections['vaccination_bookings'].find(
+                {'status': 'Completed'}, {'userId': 1, 'childName': 1, 'vaccines': 1}).batch_size(batch_size):
+            completed.setdefault(booking.get('userId'), []).append(
+                (booking.get('childName'), completed_mask(booking.get('vaccines') or [])))
+
+        ids, mothers, names, births, masks = [], [], [], [], []
+        cursor = self.collections['users'].find(
+            MOTHERS_QUERY, {'name': 1, 'email': 1, 'maternalHealth.children': 1}).batch_size(batch_size)
+        for mother in cursor:
+            children = (mother.get('maternalHealth') or {}).get('children') or []
+            child_masks = [milestones_mask(child.get('vaccinationMilestones') or []) for child in children]
+            for child_name, mask in completed.get(mother['_id'], ()):
+                for index in booking_children(children, child_name):
+                    child_masks[index] |= mask
+            for index, child in enumerate(children):
+                born = _birth_day(child.get('dateOfBirth'))
+                if born is None:
+                    continue
+                ids.append(child_id(mother['_id'], index))
+                mothers.append(mother)
+                names.append(child.get('name') or 'your child')
+                births.append(born)
+                masks.append(child_masks[index])
+        return ids, mothers, names, births, masks
+
+    # 3. Dedupe
+
+    def _already_sent(self, keys, chunk_size=1000):
+        sent = set()
+        for start in range(0, len(keys), chunk_size):
+            sent.update(doc['_id'] for doc in self.reminders.find(
+                {'_id': {'$in': keys[start:start + chunk_size]}}, {'_id': 1}))
+        return sent
+
+    def _claim(self, reminders, now):
+        """Record the reminders as sent; returns those this run claimed (others were taken concurrently)"""
+        docs = [{
+            '_id': r['key'],
+            'childId': r['childId'],
+            'vaccineName': r['vaccineName'],
+            'kind': r['kind'],
+            'dueDate': r['dueDate'],
+            'sentAt': now,
+            # Kept while the dose can still be reminded about
+            'expiresAt': datetime.fromisoformat(r['dueDate']).replace(tzinfo=timezone.utc)
+                         + timedelta(days=self.overdue_days + 30),
+        } for r in reminders]
+        if not docs:
+            return []
+        try:
+            self.reminders.insert_many(docs, ordered=False)
+            return reminders
+        except BulkWriteError as e:
+            taken = {error['index'] for error in e.details.get('writeErrors', []) if error.get('code') == 11000}
+            if len(taken) != len(e.details.get('writeErrors', [])):
+                raise
+            return [r for i, r in enumerate(reminders) if i not in taken]
+
+    # 4. Send
+
+    @staticmethod
+    def _by_child(reminders):
+        grouped = {}
+        for reminder in reminders:
+            grouped.setdefault(reminder['childId'], []).append(reminder)
+        return grouped
+
+    def _notifications(self, grouped):
+        notifications = []
+        for child_reminders in grouped.values():
+            first = child_reminders[0]
+            overdue = [r for r in child_reminders if r['kind'] == 'overdue']
+            listed = ', '.join(f"{r['vaccineName']} ({'overdue since' if r['kind'] == 'overdue' else 'due'} {r['dueDate']})"
+                               for r in child_reminders)
+            notifications.append({
+                'title': f"💉 {'🚨 Overdue' if overdue else '⏰ Due'}: vaccinations for {first['childName']}",
+                'message': f"Dear {first['motherName']}, {first['childName']} has vaccinations to take: {listed}. "
+                           f"Please contact your ASHA worker to schedule an appointment.",
+                'recipientId': str(first['motherId']),
+                'type': 'warning' if overdue else 'info',
+                'relatedEntity': {'type': 'vaccination_reminder', 'childId': first['childId'],
+                                  'vaccines': [r['vaccineName'] for r in child_reminders]},
+            })
+        return notifications
+
+    def _emails(self, grouped):
+        from services.email_service import vaccination_reminder_message
+        messages = []
+        for child_reminders in grouped.values():
+            first = child_reminders[0]
+            if '@' not in first['motherEmail']:
+                continue
+            vaccinations = [{'vaccineName': r['vaccineName'], 'dueDate': r['dueDate'], 'status': r['kind'],
+                             'ageLabel': VACCINATION_SCHEDULE[r['position']]['ageLabel']} for r in child_reminders]
+            messages.append(vaccination_reminder_message(
+                self.sender, first['motherEmail'], first['motherName'], first['childName'], vaccinations))
+        return messages
+
+    def _queue_emails(self, messages):
+        from services.email_outbox import email_outbox
+        queued = 0
+        for start in range(0, len(messages), self.email_chunk_size):
+            queued += email_outbox.enqueue_many(messages[start:start + self.email_chunk_size])
+        return queued
+
+    # Run
+
+    def run(self, dry_run=False, today=None, sample_size=20):
+        """Compute, dedupe and send today's reminders; returns (and unless dry_run records) a summary"""
+        from services.email_outbox import email_outbox
+        from services.notification_service import notification_service_for
+        started = time.perf_counter()
+        phases = {}
+
+        step = time.perf_counter()
+        ids, mothers, names, births, masks = self._load()
+        phases['load'] = _ms(step)
+
+        step = time.perf_counter()
+        table = due_table(births, masks, today)
+        wanted = (table.status == DUE) | ((table.status == OVERDUE) & (table.days_overdue <= self.overdue_days))
+        wanted[:, list(BIRTH_POSITIONS)] = False
+        children, positions = np.nonzero(wanted)
+        candidates = []
+        for child, position in zip(children.tolist(), positions.tolist()):
+            kind = KINDS[int(table.status[child, position])]
+            mother = mothers[child]
+            candidates.append({
+                'key': f'{ids[child]}:{position}:{kind}',
+                'childId': ids[child],
+                'childName': names[child],
+                'motherId': mother['_id'],
+                'motherName': mother.get('name') or 'Parent',
+                'motherEmail': mother.get('email') or '',
+                'position': position,
+                'vaccineName': VACCINE_NAMES[position],
+                'kind': kind,
+                'dueDate': str(table.due_date[child, position]),
+            })
+        phases['compute'] = _ms(step)
+
+        step = time.perf_counter()
+        sent = self._already_sent([c['key'] for c in candidates])
+        pending = [c for c in candidates if c['key'] not in sent]
+        phases['dedupe'] = _ms(step)
+
+        summary = {
+            'dryRun': dry_run,
+            'date': str(table.today),
+            'children': len(ids),
+            'mothers': len({mother['_id'] for mother in mothers}),
+            'candidates': {kind: sum(1 for c in candidates if c['kind'] == kind) for kind in KINDS.values()},
+            'alreadySent': len(candidates) - len(pending),
+        }
+        emails_enabled = self.send_emails and bool(self.sender) and email_outbox.ready
+        if dry_run:
+            grouped = self._by_child(pending)
+            summary.update({
+                'reminders': len(pending),
+                'notifications': len(grouped),
+                'emails': sum(1 for rs in grouped.values() if '@' in rs[0]['motherEmail']) if emails_enabled else 0,
+                'sample': [{key: str(value) if key == 'motherId' else value
+                            for key, value in c.items() if key not in ('motherEmail', 'position')}
+                           for c in pending[:sample_size]],
+            })
+        else:
+            now = datetime.now(timezone.utc)
+            step = time.perf_counter()
+            claimed = self._claim(pending, now)
+            grouped = self._by_child(claimed)
+            notified = notification_service_for(self.collections).create_many(self._notifications(grouped))
+            phases['notifications'] = _ms(step)
+            step = time.perf_counter()
+            emailed = self._queue_emails(self._emails(grouped)) if emails_enabled else 0
+            phases['emails'] = _ms(step)
+            summary.update({
+                'reminders': len(claimed),
+                'claimedElsewhere': len(pending) - len(claimed),
+                'notifications': notified,
+                'emails': emailed,
+            })
+
+        seconds = time.perf_counter() - started
+        summary.update({
+            'phasesMs': phases,
+            'durationMs': round(seconds * 1000.0, 1),
+            'childrenPerSecond': round(len(ids) / seconds) if seconds > 0 else None,
+        })
+        if not dry_run:
+            self.collections['system_meta'].update_one(
+                {'_id': _RUN_RECORD},
+                {'$set': {**summary, 'lastRunAt': datetime.now(timezone.utc)},
+                 '$inc': {'runs': 1, 'totalReminders': summary['reminders']}},
+                upsert=True
+            )
+            print(f"[REMINDERS] {summary['reminders']} reminder(s) for {summary['notifications']} child(ren), "
+                  f"{summary['emails']} email(s) queued; {summary['children']} children in {summary['durationMs']}ms")
+        return summary
+
+    def last_run(self):
+        """The recorded summary of the most recent run (any worker), None if it never ran"""
+        doc = self.collections['system_meta'].find_one({'_id': _RUN_RECORD})
+        if doc is None:
+            return None
+        doc.pop('_id', None)
+        if isinstance(doc.get('lastRunAt'), datetime):
+            doc['lastRunAt'] = doc['lastRunAt'].isoformat()
+        return doc
+
+
+vaccination_reminders = VaccinationReminderService()
+
+
+def init_vaccination_reminders(app, collections):
+    vaccination_reminders.init(app, collections)
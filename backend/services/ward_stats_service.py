@@ -0,0 +1,231 @@
+"""
+Ward statistics materialized view
+The admin ward analytics used to be computed with ~25 count/aggregate queries per
+page load. They now live in one `ward_stats` document:
+  - write paths report inserted/updated/deleted documents, and the counters they
+    affect are adjusted with a single $inc
+  - a periodic job recounts everything (reconcile) to correct any drift, e.g. from
+    scripts or writes that bypass the routes
+Counters are declared once below; the same declarations drive both the
+incremental deltas and the full recount. Other write-time aggregates (the
+activity rollups) subscribe to the same hooks with add_listener().
+"""
+from datetime import datetime, timezone
+from pymongo import ReturnDocument
+
+WARD_NAME = 'Ward 1'
+
+# Plain counters: name -> (collection, equality filter)
+COUNTERS = {
+    'users.total': ('users', {'userType': 'user'}),
+    'users.maternal': ('users', {'userType': 'user', 'beneficiaryCategory': 'maternity'}),
+    'users.palliative': ('users', {'userType': 'user', 'beneficiaryCategory': 'palliative'}),
+    'users.active': ('users', {'userType': 'user', 'isActive': True}),
+    'supply.total': ('supply_requests', {}),
+    'supply.pending': ('supply_requests', {'status': 'pending'}),
+    'supply.approved': ('supply_requests', {'status': 'approved'}),
+    'supply.rejected': ('supply_requests', {'status': 'rejected'}),
+    'supply.delivered': ('supply_requests', {'deliveryStatus': 'delivered'}),
+    'vaccination.schedules': ('vaccination_schedules', {}),
+    'vaccination.bookings': ('vaccination_bookings', {}),
+    'vaccination.completed': ('vaccination_bookings', {'status': 'Completed'}),
+    'homeVisits.total': ('home_visits', {}),
+    'homeVisits.verified': ('home_visits', {'verified': True}),
+    'homeVisits.pending': ('home_visits', {'verified': False}),
+    'rations.collected': ('monthly_rations', {'status': 'collected'}),
+    'rations.pending': ('monthly_rations', {'status': 'pending'}),
+    'content.blogs': ('health_blogs', {}),
+    'content.publishedBlogs': ('health_blogs', {'status': 'published'}),
+    'content.classes': ('community_classes', {}),
+    'content.camps': ('local_camps', {}),
+}
+
+
+def _category(value):
+    return value or 'Other'
+
+
+# Grouped counters: name -> (collection, equality filter, field, key function)
+GROUPS = {
+    'supplyByCategory': ('supply_requests', {}, 'category', _category),
+}
+
+# Fields of each collection the counters depend on (what a write path must report)
+TRACKED_FIELDS = {}
+for _collection, _filter in COUNTERS.values():
+    TRACKED_FIELDS.setdefault(_collection, set()).update(_filter)
+for _collection, _filter, _field, _ in GROUPS.values():
+    TRACKED_FIELDS.setdefault(_collection, set()).update(_filter, [_field])
+
+
+def _escape_key(key):
+    # Group keys become field names: '.' and a leading '$' are not allowed there
+    return str(key).replace('%', '%25').replace('.', '%2E').replace('$', '%24')
+
+
+def _unescape_key(key):
+    return key.replace('%24', '$').replace('%2E', '.').replace('%25', '%')
+
+
+def matches(doc, query):
+    for field, expected in query.items():
+        value = doc.get(field)
+        # Match like MongoDB: True does not equal 1
+        if value != expected or isinstance(value, bool) != isinstance(expected, bool):
+            return False
+    return True
+
+
+class WardStatsService:
+    def __init__(self, collections=None):
+        self.collections = collections
+        # Notified of every reported change: record_change(collection, before, after, count)
+        self.listeners = []
+
+    def init(self, collections):
+        self.collections = collections
+
+    def add_listener(self, listener):
+        """Subscribe an object with tracked_fields(collection) and record_change(collection, before, after, count)"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def _tracked(self, collection_name):
+        fields = set(TRACKED_FIELDS.get(collection_name, ()))
+        for listener in self.listeners:
+            fields |= listener.tracked_fields(collection_name)
+        return fields
+
+    @property
+    def stats(self):
+        return self.collections['ward_stats']
+
+    def tracked_projection(self, collection_name):
+        return {field: 1 for field in self._tracked(collection_name)}
+
+    # Incremental updates
+
+    def _contributions(self, collection_name, doc):
+        """Counter fields a document contributes 1 to"""
+        fields = []
+        if doc is None:
+            return fields
+        for name, (collection, query) in COUNTERS.items():
+            if collection == collection_name and matches(doc, query):
+                fields.append(f'counters.{name}')
+        for name, (collection, query, field, key_fn) in GROUPS.items():
+            if collection == collection_name and matches(doc, query):
+                key = key_fn(doc.get(field))
+                if key is not None:
+                    fields.append(f'groups.{name}.{_escape_key(key)}')
+        return fields
+
+    def _apply(self, increments):
+        increments = {field: n for field, n in increments.items() if n}
+        if not increments or self.collections is None:
+            return
+        try:
+            self.stats.update_one(
+                {'_id': WARD_NAME},
+                {'$inc': increments, '$set': {'asOf': datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as e:
+            # The next reconciliation corrects the counters
+            print(f"[WARD-STATS] Failed to update counters: {e}")
+
+    def _notify(self, collection_name, before, after, count=1):
+        for listener in self.listeners:
+            listener.record_change(collection_name, before, after, count)
+
+    def record_insert(self, collection_name, doc):
+        self._apply({field: 1 for field in self._contributions(collection_name, doc)})
+        self._notify(collection_name, None, doc)
+
+    def record_delete(self, collection_name, doc):
+        self._apply({field: -1 for field in self._contributions(collection_name, doc)})
+        self._notify(collection_name, doc, None)
+
+    def record_update(self, collection_name, before, changes, count=1):
+        """Adjust counters for `count` documents that looked like `before` and had `changes` ($set) applied"""
+        if before is None or not self._tracked(collection_name) & set(changes):
+            return
+        after = {**before, **changes}
+        increments = {}
+        for field in self._contributions(collection_name, before):
+            increments[field] = increments.get(field, 0) - count
+        for field in self._contributions(collection_name, after):
+            increments[field] = increments.get(field, 0) + count
+        self._apply(increments)
+        self._notify(collection_name, before, after, count)
+
+    def update_one(self, collection_name, query, update):
+        """update_one that also adjusts the counters; returns the document before the update (None if not found).
+
+        The update must be {'$set': ...} (other operators may be included but must not touch tracked fields).
+        """
+        collection = self.collections[collection_name]
+        before = collection.find_one_and_update(
+            query, update, projection=self.tracked_projection(collection_name) or {'_id': 1},
+            return_document=ReturnDocument.BEFORE)
+        if before is not None:
+            self.record_update(collection_name, before, update.get('$set', {}))
+        return before
+
+    # Full recount
+
+    def compute(self):
+        """Count everything from the source collections (the slow path the counters replace)"""
+        collections = self.collections
+        counters = {}
+        for name, (collection, query) in COUNTERS.items():
+            section, key = name.split('.', 1)
+            counters.setdefault(section, {})[key] = collections[collection].count_documents(query)
+        groups = {}
+        for name, (collection, query, field, key_fn) in GROUPS.items():
+            buckets = {}
+            for row in collections[collection].aggregate([
+                {'$match': query},
+                {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}},
+            ]):
+                key = _escape_key(key_fn(row['_id']))
+                buckets[key] = buckets.get(key, 0) + row['count']
+            groups[name] = buckets
+        return counters, groups
+
+    def reconcile(self):
+        """Replace the counters with a full recount; returns a summary of the corrections"""
+        previous = self.stats.find_one({'_id': WARD_NAME}) or {}
+        counters, groups = self.compute()
+        now = datetime.now(timezone.utc)
+        self.stats.replace_one(
+            {'_id': WARD_NAME},
+            {'counters': counters, 'groups': groups, 'asOf': now, 'reconciledAt': now},
+            upsert=True
+        )
+        drift = {}
+        for section, values in counters.items():
+            for key, value in values.items():
+                old = previous.get('counters', {}).get(section, {}).get(key)
+                if old is not None and old != value:
+                    drift[f'{section}.{key}'] = value - old
+        if drift:
+            print(f"[WARD-STATS] Reconciled; corrected drift: {drift}")
+        return {'reconciledAt': now.isoformat(), 'drift': drift}
+
+    def get(self):
+        """The stats document, computed on first use"""
+        doc = self.stats.find_one({'_id': WARD_NAME})
+        if doc is None or 'reconciledAt' not in doc:
+            self.reconcile()
+            doc = self.stats.find_one({'_id': WARD_NAME})
+        doc['groups'] = {name: {_unescape_key(k): v for k, v in (buckets or {}).items()}
+                         for name, buckets in (doc.get('groups') or {}).items()}
+        return doc
+
+
+ward_stats = WardStatsService()
+
+
+def init_ward_stats(collections):
+    ward_stats.init(collections)
@@ -0,0 +1,65 @@
+"""
+Tests that write paths keep the activity rollups (services/activity_rollup_service.py)
+current without waiting for the catch-up job. Runs against mongomock.
+Run from: backend/
+  pip install pytest mongomock
+  python -m pytest test_activity_rollups.py
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from config.database import get_collections
+from services.activity_rollup_service import ActivityRollupService
+from services.monthly_ration_service import MonthlyRationService
+from services.ward_stats_service import ward_stats
+
+mongomock = pytest.importorskip('mongomock')
+
+
+@pytest.fixture
+def collections():
+    collections = get_collections(mongomock.MongoClient().db)
+    saved = ward_stats.collections, list(ward_stats.listeners)
+    ward_stats.init(collections)
+    yield collections
+    ward_stats.collections, ward_stats.listeners = saved
+
+
+@pytest.fixture
+def rollups(collections):
+    service = ActivityRollupService(collections)
+    ward_stats.add_listener(service)
+    # Built (empty) before any writes, so only write-time updates can produce counts
+    service.ensure_built()
+    return service
+
+
+@pytest.fixture
+def rations(collections):
+    mother_id = collections['users'].insert_one({
+        'name': 'Mother', 'email': 'mother@example.com', 'userType': 'user',
+        'beneficiaryCategory': 'maternity', 'isActive': True,
+    }).inserted_id
+    return MonthlyRationService(collections['users'], collections['monthly_rations']), str(mother_id)
+
+
+def this_month():
+    return datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def test_collecting_a_ration_counts_immediately(rollups, rations):
+    service, mother_id = rations
+    body, status = service.mark_ration_collected(mother_id)
+    assert status == 200, body
+    assert rollups.series('rationsCollected', this_month()) == [
+        {'bucket': this_month().strftime('%Y-%m'), 'count': 1}]
+
+
+def test_undoing_a_collection_removes_it(rollups, rations):
+    service, mother_id = rations
+    service.mark_ration_collected(mother_id)
+    body, status = service.mark_ration_pending(mother_id)
+    assert status == 200, body
+    assert rollups.series('rationsCollected', this_month()) == []
+
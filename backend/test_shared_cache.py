@@ -0,0 +1,178 @@
+"""
+Tests for the shared cache tier (utils/shared_cache.py) against local stand-ins:
+fakeredis for RedisBackend and mongomock for MongoBackend. No server is needed.
+Run from: backend/
+  pip install pytest fakeredis mongomock
+  python -m pytest test_shared_cache.py
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from utils import shared_cache as sc
+from utils.cache import TTLCache
+
+fakeredis = pytest.importorskip('fakeredis')
+mongomock = pytest.importorskip('mongomock')
+
+
+@pytest.fixture
+def redis_backend():
+    return sc.RedisBackend(client=fakeredis.FakeRedis(), prefix='test:')
+
+
+@pytest.fixture
+def mongo_backend():
+    return sc.MongoBackend(mongomock.MongoClient().db.cache_entries)
+
+
+@pytest.fixture(params=['redis', 'mongo'])
+def backend(request):
+    return request.getfixturevalue(f'{request.param}_backend')
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    yield
+    sc.set_backend(sc.MemoryBackend(), 0.0)
+
+
+def worker_cache(namespace, ttl=300):
+    """A SharedCache with its own local tier, as a separate worker process would have"""
+    cache = sc.SharedCache(namespace, ttl=ttl)
+    cache.local = TTLCache(namespace, ttl=ttl)
+    return cache
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+# RedisBackend
+
+def test_redis_get_set_delete(redis_backend):
+    assert redis_backend.get('k') is None
+    redis_backend.set('k', b'raw')
+    assert redis_backend.get('k') == b'raw'
+    redis_backend.delete('k')
+    assert redis_backend.get('k') is None
+
+
+def test_redis_set_with_ttl_expires(redis_backend):
+    redis_backend.set('k', b'raw', ttl=30)
+    assert 0 < redis_backend.client.ttl('test:k') <= 30
+    # Sub-second TTLs are rounded up to Redis' one-second minimum
+    redis_backend.set('short', b'raw', ttl=0.2)
+    assert redis_backend.client.ttl('test:short') == 1
+
+
+def test_redis_counter(redis_backend):
+    assert redis_backend.get_int('n') == 0
+    assert redis_backend.incr('n') == 1
+    assert redis_backend.incr('n') == 2
+    assert redis_backend.get_int('n') == 2
+
+
+# MongoBackend
+
+def test_mongo_get_set_delete(mongo_backend):
+    assert mongo_backend.get('k') is None
+    mongo_backend.set('k', b'raw')
+    assert mongo_backend.get('k') == b'raw'
+    assert mongo_backend.collection.find_one({'_id': 'k'})['expiresAt'] is None
+    mongo_backend.delete('k')
+    assert mongo_backend.get('k') is None
+
+
+def test_mongo_sets_expires_at(mongo_backend):
+    before = datetime.now(timezone.utc)
+    mongo_backend.set('k', b'raw', ttl=60)
+    expires_at = mongo_backend.collection.find_one({'_id': 'k'})['expiresAt'].replace(tzinfo=timezone.utc)
+    assert before + timedelta(seconds=59) <= expires_at <= datetime.now(timezone.utc) + timedelta(seconds=61)
+
+
+def test_mongo_expired_entry_is_a_miss_before_the_ttl_monitor_runs(mongo_backend):
+    mongo_backend.set('k', b'raw', ttl=60)
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    mongo_backend.collection.update_one({'_id': 'k'}, {'$set': {'expiresAt': past}})
+    # The document is still there (the TTL monitor has not removed it) but is not served
+    assert mongo_backend.collection.count_documents({'_id': 'k'}) == 1
+    assert mongo_backend.get('k') is None
+
+
+def test_mongo_counter(mongo_backend):
+    assert mongo_backend.get_int('n') == 0
+    assert mongo_backend.incr('n') == 1
+    assert mongo_backend.incr('n') == 2
+    assert mongo_backend.get_int('n') == 2
+
+
+# SharedCache over a shared backend
+
+def test_values_keep_bson_types(backend):
+    sc.set_backend(backend, 0.0)
+    value = {'_id': ObjectId(), 'at': datetime(2024, 1, 2, 3, 4, 5), 'items': [1, 'two']}
+    worker_cache('types').get_or_load('k', lambda: value)
+    assert worker_cache('types').get_or_load('k', Loader(None)) == value
+
+
+def test_second_worker_reads_the_shared_entry(backend):
+    sc.set_backend(backend, 0.0)
+    first, second = worker_cache('ns'), worker_cache('ns')
+    load = Loader({'name': 'BCG'})
+    assert first.get_or_load('k', load) == {'name': 'BCG'}
+    assert second.get_or_load('k', load) == {'name': 'BCG'}
+    assert load.calls == 1
+    assert second.stats()['sharedHits'] == 1
+
+
+def test_invalidation_reaches_the_other_worker(backend):
+    sc.set_backend(backend, 0.0)
+    first, second = worker_cache('ns'), worker_cache('ns')
+    first.get_or_load('k', Loader('old'))
+    assert second.get_or_load('k', Loader('unused')) == 'old'
+
+    first.invalidate()
+    assert second.version() == first.version() == 1
+    reload = Loader('new')
+    assert second.get_or_load('k', reload) == 'new'
+    assert reload.calls == 1
+    # The first worker now reads the value the second one stored under the new version
+    assert first.get_or_load('k', Loader('unused')) == 'new'
+
+
+def test_other_worker_notices_invalidation_after_the_check_interval(backend, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(sc.time, 'monotonic', lambda: clock[0])
+    sc.set_backend(backend, 5.0)
+    first, second = worker_cache('ns'), worker_cache('ns')
+    first.get_or_load('k', Loader('old'))
+    assert second.get_or_load('k', Loader('unused')) == 'old'
+
+    first.invalidate()
+    clock[0] += 1
+    # Within CACHE_VERSION_CHECK_SECONDS the second worker still uses the version it read
+    assert second.get_or_load('k', Loader('unused')) == 'old'
+    clock[0] += 5
+    assert second.get_or_load('k', Loader('new')) == 'new'
+
+
+def test_backend_errors_are_misses(backend):
+    sc.set_backend(backend, 0.0)
+
+    def fail(*args, **kwargs):
+        raise ConnectionError('down')
+
+    backend.get = backend.set = fail
+    cache = worker_cache('ns')
+    load = Loader('value')
+    assert cache.get_or_load('k', load) == 'value'
+    assert load.calls == 1
+    assert cache.stats()['errors'] == 2
@@ -4,6 +4,7 @@ Run this once to add educational fields to milestones already in the database
 """
 from config.database import get_database, get_collections
 from datetime import datetime, timezone
+from middleware.conditional import CollectionVersions
 
 def update_milestones_with_educational_content():
     """Update existing milestones with educational fields"""
@@ -325,6 +326,8 @@ def update_milestones_with_educational_content():
         else:
             print(f"⚠ Skipped: {update['milestoneName']} (not found or already updated)")
     
+    if updated_count:
+        CollectionVersions(collections['system_meta']).bump('developmental_milestones')
     print(f"\n✅ Successfully updated {updated_count} milestones with educational content!")
 
 if __name__ == '__main__':
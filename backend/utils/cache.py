@@ -0,0 +1,146 @@
+"""
+In-process cache for reference data
+Bounded LRU caches with a per-entry TTL, for collections that are read by almost
+every request but rarely written (milestones, locations, stock, vaccine list).
+Writers call invalidate() after changing the underlying data. Other worker
+processes do not see the invalidation, so the TTL bounds how stale they can be.
+Cached values are shared between requests: treat them as read-only.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache; entries expire `ttl` seconds after they were stored (None = never)"""
+
+    def __init__(self, name, maxsize=128, ttl=300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.RLock()
+        # Bumped by every invalidation; a load that started before it is not stored
+        self._generation = 0
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=_MISSING, generation=None):
+        if not self.enabled or self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is _MISSING else ttl
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return  # invalidated while the value was being loaded
+            self._data[key] = (None if ttl is None else time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, ttl=_MISSING):
+        """Cached value of `key`, calling loader() and storing its result on a miss"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        generation = self._generation
+        value = loader()
+        self.set(key, value, ttl=ttl, generation=generation)
+        return value
+
+    def invalidate(self, key=_MISSING):
+        """Drop one key, or every entry when called without a key"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if key is _MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+# Set by init_cache; also applied to caches created afterwards
+_settings = {'enabled': True, 'ttls': {}}
+
+
+def _configure(cache):
+    cache.enabled = _settings['enabled']
+    if cache.name in _settings['ttls']:
+        cache.ttl = _settings['ttls'][cache.name]
+    if not cache.enabled:
+        cache.invalidate()
+
+
+def get_cache(name, maxsize=128, ttl=300):
+    """The process-wide cache `name`, created with the given limits on first use"""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = TTLCache(name, maxsize=maxsize, ttl=ttl)
+            _configure(cache)
+        return cache
+
+
+def invalidate(*names):
+    """Clear the named caches (call after writing to the data they hold)"""
+    for name in names:
+        cache = _caches.get(name)
+        if cache is not None:
+            cache.invalidate()
+
+
+def cache_stats():
+    """Hit/miss counters of every cache (name -> stats)"""
+    return {name: cache.stats() for name, cache in sorted(_caches.items())}
+
+
+def reset_cache_stats():
+    for cache in list(_caches.values()):
+        cache.reset_stats()
+
+
+def init_cache(app):
+    """Apply CACHE_ENABLED and the per-cache CACHE_TTLS overrides from the app config"""
+    _settings['enabled'] = app.config.get('CACHE_ENABLED', True)
+    _settings['ttls'] = dict(app.config.get('CACHE_TTLS') or {})
+    with _caches_lock:
+        for cache in _caches.values():
+            _configure(cache)
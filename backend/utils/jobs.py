@@ -0,0 +1,144 @@
+"""
+Periodic background jobs
+Jobs register a function and an interval. A daemon thread runs them while the app is
+up (JOBS_ENABLED), and `python -m scripts.run_jobs` runs them from cron on platforms
+without long-lived processes. A lease document in system_meta ensures each job runs
+at most once per interval across every worker and instance.
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError
+
+_LEASE_PREFIX = 'job:'
+
+
+class Job:
+    __slots__ = ('name', 'func', 'interval', 'runs', 'failures', 'last_run_at', 'last_duration_ms',
+                 'last_error', 'last_result', 'next_check')
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.runs = self.failures = 0
+        self.last_run_at = self.last_duration_ms = self.last_error = self.last_result = None
+        self.next_check = 0.0
+
+    def to_dict(self):
+        return {
+            'intervalSeconds': self.interval,
+            'runs': self.runs,
+            'failures': self.failures,
+            'lastRunAt': self.last_run_at.isoformat() if self.last_run_at else None,
+            'lastDurationMs': self.last_duration_ms,
+            'lastError': self.last_error,
+            'lastResult': self.last_result,
+        }
+
+
+class JobRunner:
+    def __init__(self):
+        self.jobs = {}
+        self._meta = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+
+    def init(self, meta_collection):
+        self._meta = meta_collection
+
+    def register(self, name, func, interval_seconds):
+        """Run func() every interval_seconds (0 or None: only on demand). func may return a JSON-able summary."""
+        with self._lock:
+            self.jobs[name] = Job(name, func, interval_seconds or 0)
+        return func
+
+    def _acquire(self, job, force):
+        """Take the job's lease for one interval; False if another worker holds it"""
+        if self._meta is None:
+            return True
+        now = datetime.now(timezone.utc)
+        # A little shorter than the interval, so the next scheduled check finds it expired
+        lease_until = now + timedelta(seconds=max(job.interval * 0.9, 30))
+        query = {'_id': _LEASE_PREFIX + job.name}
+        if not force:
+            query['$or'] = [{'leaseUntil': {'$lte': now}}, {'leaseUntil': {'$exists': False}}]
+        try:
+            self._meta.find_one_and_update(
+                query, {'$set': {'leaseUntil': lease_until, 'owner': self.owner, 'startedAt': now}}, upsert=True)
+            return True
+        except DuplicateKeyError:
+            return False  # the lease document exists and is still held
+
+    def run(self, name, force=False):
+        """Run job `name` now if its lease is free (force ignores the lease). Returns its result or None."""
+        job = self.jobs[name]
+        if not self._acquire(job, force):
+            return None
+        started = time.perf_counter()
+        job.last_run_at = datetime.now(timezone.utc)
+        try:
+            job.last_result = job.func()
+            job.last_error = None
+            return job.last_result
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            print(f"[JOBS] {name} failed: {e}")
+            traceback.print_exc()
+            return None
+        finally:
+            job.runs += 1
+            job.last_duration_ms = round((time.perf_counter() - started) * 1000.0, 1)
+            if self._meta is not None:
+                try:
+                    self._meta.update_one({'_id': _LEASE_PREFIX + name}, {'$set': {
+                        'lastRunAt': job.last_run_at, 'lastDurationMs': job.last_duration_ms,
+                        'lastError': job.last_error}})
+                except Exception:
+                    pass
+
+    def run_async(self, name, force=False):
+        """Run job `name` in a separate daemon thread"""
+        thread = threading.Thread(target=self.run, args=(name, force), name=f'job-{name}', daemon=True)
+        thread.start()
+        return thread
+
+    def _loop(self, poll_seconds):
+        while not self._stop.wait(poll_seconds):
+            now = time.monotonic()
+            for job in list(self.jobs.values()):
+                if job.interval and now >= job.next_check:
+                    job.next_check = now + job.interval
+                    self.run(job.name)
+
+    def start(self, poll_seconds=15):
+        """Start the scheduler thread (once per process)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            now = time.monotonic()
+            # First runs are spread out so a fresh worker does not start every job at boot
+            for i, job in enumerate(self.jobs.values()):
+                job.next_check = now + poll_seconds * (i + 1)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(poll_seconds,), name='job-runner', daemon=True)
+            self._thread.start()
+        print(f"[JOBS] Scheduler started with {len(self.jobs)} job(s): {', '.join(sorted(self.jobs))}")
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'jobs': {name: job.to_dict() for name, job in sorted(self.jobs.items())},
+        }
+
+
+job_runner = JobRunner()
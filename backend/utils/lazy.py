@@ -0,0 +1,192 @@
+"""
+Lazy loading of heavy optional dependencies
+Modules (TensorFlow, OpenCV, firebase_admin, deep_translator, ...) and models
+registered here are imported/built on the first request that needs them, at
+most once per process, and can optionally be warmed up in a background thread.
+"""
+import importlib
+import importlib.util
+import threading
+import time
+
+# name -> LazyModule | LazyResource
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    Internal attributes are prefixed with _lazy_ so they never shadow attributes
+    of the wrapped module (numpy has `load`, many modules have `name`, ...).
+    """
+
+    kind = 'module'
+
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+        self._lazy_error = None
+        self._lazy_load_ms = None
+        self._lazy_lock = threading.Lock()
+
+    def _lazy_load(self):
+        """Import the module (once) and return it; re-raises the original ImportError on failure"""
+        if self._lazy_module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    if self._lazy_error is not None:
+                        raise self._lazy_error
+                    start = time.perf_counter()
+                    try:
+                        module = importlib.import_module(self._lazy_name)
+                    except ImportError as e:
+                        self._lazy_error = e
+                        print(f"[LAZY] Could not import {self._lazy_name}: {e}")
+                        raise
+                    self._lazy_load_ms = (time.perf_counter() - start) * 1000.0
+                    self._lazy_module = module
+                    print(f"[LAZY] Imported {self._lazy_name} in {self._lazy_load_ms:.0f}ms")
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        if attr.startswith('_lazy_'):
+            raise AttributeError(attr)
+        return getattr(self._lazy_load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._lazy_module is not None else 'not loaded'
+        return f"<lazy module '{self._lazy_name}' ({state})>"
+
+    def _lazy_status(self):
+        return {
+            'name': self._lazy_name,
+            'kind': self.kind,
+            'loaded': self._lazy_module is not None,
+            'loadMs': round(self._lazy_load_ms, 1) if self._lazy_load_ms is not None else None,
+            'error': str(self._lazy_error) if self._lazy_error else None,
+        }
+
+
+class LazyResource:
+    """Value built by a factory on first use (e.g. an ML model read from disk)"""
+
+    kind = 'resource'
+
+    def __init__(self, name, factory):
+        self.name = name
+        self._factory = factory
+        self._value = None
+        self._loaded = False
+        self._error = None
+        self._load_ms = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Build the value on first call; later calls return the cached value (None if the factory failed)"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    try:
+                        self._value = self._factory()
+                    except Exception as e:
+                        self._error = e
+                        print(f"[LAZY] Failed to load {self.name}: {e}")
+                    self._load_ms = (time.perf_counter() - start) * 1000.0
+                    self._loaded = True
+        return self._value
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def peek(self):
+        """Return the value if it is already loaded, without triggering the load"""
+        return self._value if self._loaded else None
+
+    def _lazy_status(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'loaded': self._loaded,
+            'ready': self._value is not None,
+            'loadMs': round(self._load_ms, 1) if self._load_ms is not None else None,
+            'error': str(self._error) if self._error else None,
+        }
+
+
+def lazy_module(name):
+    """Return the process-wide lazy proxy for module `name`"""
+    with _registry_lock:
+        entry = _registry.get(name)
+        if entry is None:
+            entry = _registry[name] = LazyModule(name)
+        return entry
+
+
+def lazy_resource(name, factory):
+    """Register (or return the already registered) lazily built resource `name`"""
+    with _registry_lock:
+        entry = _registry.get(name)
+        if entry is None:
+            entry = _registry[name] = LazyResource(name, factory)
+        return entry
+
+
+def module_available(name):
+    """Whether a module can be imported, checked without importing it"""
+    entry = _registry.get(name)
+    if isinstance(entry, LazyModule):
+        if entry._lazy_module is not None:
+            return True
+        if entry._lazy_error is not None:
+            return False
+    try:
+        return importlib.util.find_spec(name.split('.')[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _load_entry(entry):
+    if isinstance(entry, LazyModule):
+        entry._lazy_load()
+    else:
+        entry.get()
+
+
+def warm_up(names=None, background=True):
+    """Load registered entries ahead of the first request.
+
+    names: iterable of registry names (unknown names are treated as module names);
+    None loads everything registered. Returns the warm-up thread when background.
+    """
+    if names is None:
+        with _registry_lock:
+            entries = list(_registry.values())
+    else:
+        entries = [_registry.get(name) or lazy_module(name) for name in names]
+
+    def _run():
+        start = time.perf_counter()
+        for entry in entries:
+            try:
+                _load_entry(entry)
+            except Exception:
+                pass  # already logged; the request path reports the failure
+        print(f"[LAZY] Warm-up of {len(entries)} dependencies finished in "
+              f"{(time.perf_counter() - start) * 1000.0:.0f}ms")
+
+    if not background:
+        _run()
+        return None
+    thread = threading.Thread(target=_run, name='lazy-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def status():
+    """Load state of every registered dependency"""
+    with _registry_lock:
+        entries = list(_registry.values())
+    return [entry._lazy_status() for entry in entries]
@@ -0,0 +1,123 @@
+"""
+Keyset (cursor) pagination
+A page is fetched with a range filter on the sort key plus _id, so the cost of
+page N does not grow with N (no skip, no count_documents). The `after` token is
+an opaque, URL-safe encoding of the last document's sort values.
+
+Requests opt in with ?after=<token> (empty for the first page) or
+?paginate=cursor, plus an optional ?limit=. Without them endpoints keep their
+previous response shape.
+"""
+import base64
+from bson import json_util
+from flask import request
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Canonical extended JSON keeps ObjectId/datetime types; naive datetimes match what pymongo returns
+_JSON_OPTIONS = json_util.CANONICAL_JSON_OPTIONS.with_options(tz_aware=False)
+
+
+class InvalidCursor(ValueError):
+    """Raised for a malformed or foreign `after` token (answered with 400)"""
+
+
+def encode_cursor(values):
+    """Opaque token for a list of sort values (ObjectId/datetime safe)"""
+    raw = json_util.dumps(values, json_options=_JSON_OPTIONS).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, expected_length):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json_util.loads(raw.decode('utf-8'), json_options=_JSON_OPTIONS)
+    except Exception:
+        raise InvalidCursor('Invalid pagination cursor') from None
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise InvalidCursor('Invalid pagination cursor')
+    return values
+
+
+def _get_path(doc, path):
+    value = doc
+    for part in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def keyset_filter(sort, values):
+    """Filter matching documents strictly after `values` in `sort` order.
+
+    For sort [(a, 1), (_id, 1)] and values [x, y]: {a > x} or {a == x and _id > y}.
+    null/missing sorts first in MongoDB, so "after null" ascending means any non-null
+    value and nothing comes after null descending.
+    """
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        value = values[i]
+        if value is None:
+            if direction < 0:
+                continue
+            branch[field] = {'$ne': None}
+        else:
+            branch[field] = {'$gt' if direction > 0 else '$lt': value}
+        branches.append(branch)
+    if not branches:
+        return {'_id': {'$exists': False}}  # nothing left
+    return branches[0] if len(branches) == 1 else {'$or': branches}
+
+
+class KeysetPage:
+    """Pagination state for one request; a no-op in compatibility mode (enabled=False)"""
+
+    def __init__(self, sort, enabled=False, limit=DEFAULT_PAGE_SIZE, after=None):
+        sort = list(sort)
+        if sort[-1][0] != '_id':
+            # _id makes the order total, so ties on the sort key are not skipped or repeated
+            sort.append(('_id', sort[-1][1]))
+        self.sort = sort
+        self.enabled = enabled
+        self.limit = limit
+        self.after = decode_cursor(after, len(sort)) if after else None
+        self.next_cursor = None
+
+    @classmethod
+    def from_request(cls, sort, default_limit=DEFAULT_PAGE_SIZE, max_limit=MAX_PAGE_SIZE,
+                     limit_param='limit', args=None):
+        args = request.args if args is None else args
+        enabled = 'after' in args or (args.get('paginate') or '').lower() == 'cursor'
+        try:
+            limit = int(args.get(limit_param) or default_limit)
+        except (TypeError, ValueError):
+            limit = default_limit
+        limit = max(1, min(limit, max_limit))
+        return cls(sort, enabled=enabled, limit=limit, after=(args.get('after') or None) if enabled else None)
+
+    def fetch(self, collection, query=None, projection=None):
+        """Documents of this page (a plain sorted cursor in compatibility mode)"""
+        query = query or {}
+        if projection:
+            projection = {**projection, **{field: 1 for field, _ in self.sort}}
+        if not self.enabled:
+            return collection.find(query, projection).sort(self.sort)
+
+        if self.after is not None:
+            after = keyset_filter(self.sort, self.after)
+            query = {'$and': [query, after]} if query else after
+        docs = list(collection.find(query, projection).sort(self.sort).limit(self.limit + 1))
+        if len(docs) > self.limit:
+            docs = docs[:self.limit]
+            self.next_cursor = encode_cursor([_get_path(docs[-1], field) for field, _ in self.sort])
+        return docs
+
+    def wrap(self, body):
+        """Add nextCursor/hasMore to the response body when paginating"""
+        if self.enabled:
+            body['nextCursor'] = self.next_cursor
+            body['hasMore'] = self.next_cursor is not None
+        return body
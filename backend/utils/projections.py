@@ -0,0 +1,56 @@
+"""
+Shared field projections
+Named Mongo projections for the lookups routes and services repeat, so each
+query fetches only the fields its caller reads. Use projection(name) to get a
+copy that is safe to extend.
+"""
+
+_registry = {}
+
+
+def register_projection(name, fields):
+    """Declare projection `name` as the given field names (or a ready projection dict)"""
+    if isinstance(fields, dict):
+        _registry[name] = dict(fields)
+    else:
+        _registry[name] = {field: 1 for field in fields}
+    return _registry[name]
+
+
+def projection(name, *extra_fields):
+    """Copy of the registered projection `name`, plus any extra fields"""
+    try:
+        spec = dict(_registry[name])
+    except KeyError:
+        raise KeyError(f"Unknown projection '{name}'") from None
+    for field in extra_fields:
+        spec[field] = 1
+    return spec
+
+
+def registered_projections():
+    """All registered projections (name -> projection)"""
+    return {name: dict(spec) for name, spec in _registry.items()}
+
+
+# Users
+# Role/permission checks only read the account type and beneficiary category
+register_projection('user.role', ['userType', 'beneficiaryCategory'])
+# Recipient of an email/notification
+register_projection('user.contact', ['name', 'email', 'phone'])
+# ASHA worker looking up their own ward
+register_projection('user.ward', ['ward'])
+# Beneficiary card on the home visit list and visit records
+register_projection('user.visit_card', ['name', 'email', 'phone', 'beneficiaryCategory', 'ward', 'address'])
+# Mother with her children (vaccination tracking); skips benefits, ANC visits and the rest of maternalHealth
+register_projection('user.mother_children', ['name', 'email', 'phone', 'maternalHealth.pregnancyStatus',
+                                             'maternalHealth.children'])
+register_projection('user.maternal_health', ['maternalHealth'])
+# Developmental milestone tracking: child age plus the mother's contact card
+register_projection('user.child_dob', ['childDOB'])
+register_projection('user.milestone_card', ['name', 'phone', 'childDOB'])
+# Only the _id (fan-out jobs that create one document per user)
+register_projection('user.id', {'_id': 1})
+
+# Vaccination bookings: the vaccine names given, for cross-referencing milestones
+register_projection('vaccination_booking.vaccines', ['vaccines'])
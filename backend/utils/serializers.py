@@ -0,0 +1,52 @@
+"""
+Document-to-DTO serializers
+Map Mongo documents to API dicts in one pass. ObjectId and datetime values are
+left as-is: the app's JSON provider (utils/json_provider.py) serializes them.
+"""
+
+
+class DocumentSerializer:
+    """Picks `fields` from a document, renames `_id` to `id` and fills in defaults.
+
+    fields: field names copied as-is, or (output_name, source_name) pairs
+    defaults: value used when a field is missing or None
+    """
+
+    def __init__(self, fields, defaults=None, id_field='id'):
+        self.id_field = id_field
+        self.defaults = dict(defaults or {})
+        self.fields = tuple((f, f) if isinstance(f, str) else tuple(f) for f in fields)
+
+    def one(self, doc):
+        """Serialize a single document (None stays None)"""
+        if doc is None:
+            return None
+        get = doc.get
+        out = {}
+        if self.id_field:
+            _id = get('_id')
+            out[self.id_field] = str(_id) if _id is not None else None
+        defaults = self.defaults
+        for name, source in self.fields:
+            value = get(source)
+            if value is None:
+                value = defaults.get(name)
+            out[name] = value
+        return out
+
+    def many(self, docs):
+        """Serialize an iterable of documents (e.g. a cursor) into a list"""
+        one = self.one
+        return [one(doc) for doc in docs]
+
+    def projection(self):
+        """Mongo projection fetching only the serialized fields"""
+        return {source: 1 for _, source in self.fields}
+
+
+# Vaccination schedule as returned by /api/vaccination-schedules
+vaccination_schedule_serializer = DocumentSerializer(
+    fields=('title', 'date', 'time', 'location', 'vaccines', 'description', 'status',
+            'createdBy', 'createdAt', 'updatedAt'),
+    defaults={'vaccines': [], 'description': '', 'status': 'Scheduled'},
+)
@@ -0,0 +1,339 @@
+"""
+Shared cache tier
+A cache that every worker process and instance can see, placed behind the
+per-process TTLCache of utils/cache.py:
+  local tier  - a TTLCache in each process (memory reads)
+  shared tier - a CacheBackend (in-memory, Redis protocol or a Mongo collection)
+Invalidation increments a version counter in the backend. Keys embed the
+version, so every worker starts missing the old entries once it has re-read the
+counter, at most CACHE_VERSION_CHECK_SECONDS later.
+
+CACHE_BACKEND selects the backend:
+  memory (default) - process-local; invalidation does not leave the process
+  redis            - CACHE_REDIS_URL; needs the `redis` package (also works with
+                     fakeredis or any Redis-protocol server)
+  mongo            - the cache_entries collection, expired by a TTL index
+Values go through BSON, so documents keep their ObjectId/datetime types. The
+backend is a cache only: its errors are logged and treated as misses.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from bson import decode as bson_decode, encode as bson_encode
+from utils.cache import get_cache
+
+_MISSING = object()
+
+
+def _encode(value):
+    return bson_encode({'v': value})
+
+
+def _decode(raw):
+    return bson_decode(bytes(raw))['v']
+
+
+class CacheBackend:
+    """Shared key-value store with expiry. Values are BSON bytes."""
+
+    name = 'base'
+    # False when the backend lives in this process: the local tier then holds the values alone
+    shared = True
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, raw, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key):
+        """Atomically increment the counter `key` (created at 0) and return the new value"""
+        raise NotImplementedError
+
+    def get_int(self, key):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local backend (single worker, development)"""
+
+    name = 'memory'
+    shared = False
+
+    def __init__(self):
+        self._data = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key, raw, ttl=None):
+        with self._lock:
+            # Drop expired entries now and then so the dict does not grow without bound
+            if len(self._data) > 10000:
+                now = time.monotonic()
+                self._data = {k: e for k, e in self._data.items() if e[0] is None or e[0] > now}
+            self._data[key] = (None if ttl is None else time.monotonic() + ttl, raw)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._data.get(key, (None, 0))[1]) + 1
+            self._data[key] = (None, value)
+            return value
+
+    def get_int(self, key):
+        with self._lock:
+            return int(self._data.get(key, (None, 0))[1])
+
+
+class RedisBackend(CacheBackend):
+    """Redis-protocol backend (Redis, Valkey, KeyDB, fakeredis, ...)"""
+
+    name = 'redis'
+
+    def __init__(self, url=None, client=None, prefix='ashaassist:'):
+        if client is None:
+            import redis  # optional dependency, only needed for this backend
+            client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, raw, ttl=None):
+        if ttl is None:
+            self.client.set(self.prefix + key, raw)
+        else:
+            self.client.set(self.prefix + key, raw, ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key):
+        return int(self.client.incr(self.prefix + key))
+
+    def get_int(self, key):
+        value = self.client.get(self.prefix + key)
+        return int(value) if value is not None else 0
+
+
+class MongoBackend(CacheBackend):
+    """Backend on a Mongo collection; a TTL index on expiresAt removes expired entries.
+
+    The TTL monitor only runs about once a minute, so reads check expiresAt too.
+    """
+
+    name = 'mongo'
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get(self, key):
+        doc = self.collection.find_one({'_id': key}, {'value': 1, 'expiresAt': 1})
+        if doc is None:
+            return None
+        expires_at = doc.get('expiresAt')
+        if expires_at is not None:
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at <= datetime.now(timezone.utc):
+                return None
+        return doc.get('value')
+
+    def set(self, key, raw, ttl=None):
+        expires_at = None if ttl is None else datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        self.collection.replace_one({'_id': key}, {'value': raw, 'expiresAt': expires_at}, upsert=True)
+
+    def delete(self, key):
+        self.collection.delete_one({'_id': key})
+
+    def incr(self, key):
+        from pymongo import ReturnDocument
+        doc = self.collection.find_one_and_update(
+            {'_id': key}, {'$inc': {'counter': 1}}, upsert=True,
+            return_document=ReturnDocument.AFTER, projection={'counter': 1})
+        return int(doc['counter'])
+
+    def get_int(self, key):
+        doc = self.collection.find_one({'_id': key}, {'counter': 1})
+        return int(doc.get('counter', 0)) if doc else 0
+
+
+_state = {'backend': MemoryBackend(), 'version_check_seconds': 0.0}
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_backend():
+    return _state['backend']
+
+
+def set_backend(backend, version_check_seconds=None):
+    """Switch every shared cache to `backend` (local tiers are cleared)"""
+    _state['backend'] = backend
+    if version_check_seconds is not None:
+        _state['version_check_seconds'] = version_check_seconds
+    with _shared_lock:
+        for cache in _shared_caches.values():
+            cache.reset_local()
+
+
+def init_shared_cache(app, collections):
+    """Select the backend configured by CACHE_BACKEND; falls back to memory if it is unavailable"""
+    kind = (app.config.get('CACHE_BACKEND') or 'memory').lower()
+    check = float(app.config.get('CACHE_VERSION_CHECK_SECONDS', 1.0))
+    try:
+        if kind == 'redis':
+            backend = RedisBackend(app.config.get('CACHE_REDIS_URL'))
+        elif kind == 'mongo':
+            backend = MongoBackend(collections['cache_entries'])
+        else:
+            backend, check = MemoryBackend(), 0.0
+    except Exception as e:
+        print(f"[CACHE] {kind} backend unavailable ({e}); using the in-memory backend")
+        backend, check = MemoryBackend(), 0.0
+    set_backend(backend, check)
+    print(f"[CACHE] Shared cache backend: {backend.name}")
+    return backend
+
+
+class SharedCache:
+    """Two-tier cache: a local TTLCache in front of the shared backend, with versioned invalidation.
+
+    Same get_or_load/invalidate interface as TTLCache. Loaded values must be BSON-encodable
+    (dicts, lists, strings, numbers, ObjectId, datetime).
+    """
+
+    def __init__(self, namespace, maxsize=128, ttl=300):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = get_cache(namespace, maxsize=maxsize, ttl=ttl)
+        self._version = None
+        self._version_checked = 0.0
+        self._lock = threading.Lock()
+        self.shared_hits = self.shared_misses = self.errors = 0
+
+    @property
+    def _version_key(self):
+        return f'{self.namespace}:version'
+
+    def reset_local(self):
+        with self._lock:
+            self._version = None
+        self.local.invalidate()
+
+    def version(self):
+        """Current invalidation version; re-read from the backend at most every CACHE_VERSION_CHECK_SECONDS"""
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._version_checked < _state['version_check_seconds']:
+                return self._version
+        try:
+            version = get_backend().get_int(self._version_key)
+        except Exception as e:
+            self.errors += 1
+            print(f"[CACHE] Version check of {self.namespace} failed: {e}")
+            version = self._version or 0
+        with self._lock:
+            self._version, self._version_checked = version, now
+        return version
+
+    def _backend_key(self, version, key):
+        digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=16).hexdigest()
+        return f'{self.namespace}:{version}:{digest}'
+
+    def get_or_load(self, key, loader):
+        version = self.version()
+        local_key = (version, key)
+        value = self.local.get(local_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        backend = get_backend()
+        if not backend.shared:
+            value = loader()
+            self.local.set(local_key, value)
+            return value
+
+        backend_key = self._backend_key(version, key)
+        try:
+            raw = backend.get(backend_key)
+        except Exception as e:
+            self.errors += 1
+            print(f"[CACHE] Shared read of {self.namespace} failed: {e}")
+            raw = None
+        if raw is not None:
+            self.shared_hits += 1
+            value = _decode(raw)
+        else:
+            self.shared_misses += 1
+            value = loader()
+            try:
+                backend.set(backend_key, _encode(value), self.ttl)
+            except Exception as e:
+                self.errors += 1
+                print(f"[CACHE] Shared write of {self.namespace} failed: {e}")
+        self.local.set(local_key, value)
+        return value
+
+    def invalidate(self):
+        """Invalidate every entry in every worker (they notice within CACHE_VERSION_CHECK_SECONDS)"""
+        try:
+            version = get_backend().incr(self._version_key)
+        except Exception as e:
+            self.errors += 1
+            print(f"[CACHE] Invalidation of {self.namespace} failed: {e}")
+            version = None
+        with self._lock:
+            self._version, self._version_checked = version, time.monotonic()
+        self.local.invalidate()
+
+    def stats(self):
+        lookups = self.shared_hits + self.shared_misses
+        return {
+            'version': self._version,
+            'sharedHits': self.shared_hits,
+            'sharedMisses': self.shared_misses,
+            'sharedHitRatio': round(self.shared_hits / lookups, 3) if lookups else None,
+            'errors': self.errors,
+        }
+
+    def reset_stats(self):
+        self.shared_hits = self.shared_misses = self.errors = 0
+
+
+def shared_cache(namespace, maxsize=128, ttl=300):
+    """The process-wide SharedCache `namespace`, created on first use"""
+    with _shared_lock:
+        cache = _shared_caches.get(namespace)
+        if cache is None:
+            cache = _shared_caches[namespace] = SharedCache(namespace, maxsize=maxsize, ttl=ttl)
+        return cache
+
+
+def shared_cache_stats():
+    return {
+        'backend': get_backend().name,
+        'caches': {name: cache.stats() for name, cache in sorted(_shared_caches.items())},
+    }
+
+
+def reset_shared_cache_stats():
+    for cache in list(_shared_caches.values()):
+        cache.reset_stats()
@@ -0,0 +1,49 @@
+"""
+Startup phase timing
+Measures how long each phase of create_app() takes so cold starts can be profiled.
+"""
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Collects (phase, seconds) pairs and renders a startup report"""
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at or time.perf_counter()
+        self.phases = []
+        self._lap_start = self.started_at
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases.append((name, end - start))
+            self._lap_start = end
+
+    def lap(self, name):
+        """Record the time elapsed since the previous lap/phase as `name`"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._lap_start))
+        self._lap_start = now
+
+    def record(self, name, seconds):
+        """Record a phase measured elsewhere (e.g. module imports before create_app)"""
+        self.phases.append((name, seconds))
+
+    def report(self):
+        """JSON-friendly report with per-phase and total durations in milliseconds"""
+        return {
+            'totalMs': round((time.perf_counter() - self.started_at) * 1000.0, 1),
+            'phases': [{'phase': name, 'ms': round(seconds * 1000.0, 1)} for name, seconds in self.phases],
+        }
+
+    def print_report(self, title='Startup'):
+        report = self.report()
+        print(f"[STARTUP] {title} finished in {report['totalMs']:.0f}ms")
+        for item in sorted(report['phases'], key=lambda p: p['ms'], reverse=True):
+            print(f"[STARTUP]   {item['phase']:<28s} {item['ms']:>9.1f}ms")
+        return report
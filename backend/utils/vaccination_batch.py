@@ -0,0 +1,126 @@
+"""
+Batch vaccination due-date engine
+calculate_vaccination_milestones() works one child at a time with datetime
+arithmetic per vaccine. For ward-wide work (reminders, overdue lists, reports)
+due_table() takes the birth dates and completed-vaccine bitmasks of any number
+of children and computes every due date, status and days overdue at once with
+NumPy datetime64 operations. Results are columns: (children x vaccines) arrays
+in VACCINATION_SCHEDULE order.
+
+Completed vaccines are a bitmask per child: bit i is set when vaccine i of
+VACCINATION_SCHEDULE was given (see completed_mask()). Statuses use the bands of
+get_vaccination_status(): overdue more than 7 days after the due date, due
+within 7 days either side, upcoming before that.
+"""
+from datetime import date, datetime
+from utils.lazy import lazy_module
+from utils.vaccination_utils import VACCINATION_SCHEDULE
+
+# Imported on first use
+np = lazy_module('numpy')
+
+VACCINE_NAMES = tuple(v['vaccineName'] for v in VACCINATION_SCHEDULE)
+AGE_IN_DAYS = tuple(v['ageInDays'] for v in VACCINATION_SCHEDULE)
+# Completed bitmasks are uint64 (the schedule has 24 entries); a name's bits cover all its doses
+_NAME_BITS = {}
+for _position, _name in enumerate(VACCINE_NAMES):
+    _NAME_BITS[_name] = _NAME_BITS.get(_name, 0) | 1 << _position
+_POSITION_BITS = {(v['vaccineName'], v['ageInDays']): 1 << i for i, v in enumerate(VACCINATION_SCHEDULE)}
+# Given at delivery, never booked (reference_data.vaccine_list leaves them out)
+BIRTH_POSITIONS = tuple(i for i, v in enumerate(VACCINATION_SCHEDULE) if v.get('category') == 'birth')
+
+# Status codes of DueTable.status
+UPCOMING, DUE, OVERDUE, COMPLETED = 0, 1, 2, 3
+STATUS_LABELS = ('upcoming', 'due', 'overdue', 'completed')
+DUE_WINDOW_DAYS = 7
+
+
+def completed_mask(vaccine_names):
+    """Bitmask of the schedule positions whose vaccine is in `vaccine_names`.
+
+    Matches by name like the booking cross-reference does, so a name given twice in the
+    schedule (TT) marks both doses.
+    """
+    mask = 0
+    for name in vaccine_names:
+        mask |= _NAME_BITS.get(name.strip(), 0)
+    return mask
+
+
+def milestones_mask(milestones):
+    """Bitmask of the schedule positions of a child's vaccinationMilestones that have a completedAt"""
+    mask = 0
+    for milestone in milestones:
+        if milestone.get('completedAt'):
+            name = milestone.get('vaccineName', '').strip()
+            mask |= _POSITION_BITS.get((name, milestone.get('ageInDays')), _NAME_BITS.get(name, 0))
+    return mask
+
+
+def _day(value):
+    """A birth date (date, datetime or ISO string) as 'YYYY-MM-DD'"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+class DueTable:
+    """Due dates, statuses and days overdue of every vaccine for a batch of children (columnar)"""
+
+    def __init__(self, today, due_date, status, days_overdue):
+        self.today = today                # numpy.datetime64[D]
+        self.vaccine_names = VACCINE_NAMES
+        self.due_date = due_date          # (children, vaccines) datetime64[D]
+        self.status = status              # (children, vaccines) int8 status codes
+        self.days_overdue = days_overdue  # (children, vaccines) int32, 0 unless overdue
+
+    def __len__(self):
+        return self.status.shape[0]
+
+    def vaccine_index(self, vaccine_name):
+        """Schedule positions of a vaccine name (TT has two)"""
+        return [i for i, name in enumerate(VACCINE_NAMES) if name == vaccine_name]
+
+    def children_with(self, status, vaccine_name=None):
+        """Indexes of the children with at least one vaccine (or `vaccine_name`) in `status`"""
+        columns = self.status if vaccine_name is None else self.status[:, self.vaccine_index(vaccine_name)]
+        return np.flatnonzero((columns == status).any(axis=1))
+
+    def milestones(self, child):
+        """One child's vaccines as dicts (status label, ISO due date), in schedule order"""
+        return [{
+            'vaccineName': VACCINE_NAMES[i],
+            'dueDate': str(self.due_date[child, i]),
+            'status': STATUS_LABELS[self.status[child, i]],
+            'daysOverdue': int(self.days_overdue[child, i]),
+        } for i in range(len(VACCINE_NAMES))]
+
+
+def due_table(birth_dates, completed=None, today=None):
+    """Compute the DueTable of children born on `birth_dates` with `completed` bitmasks (default none).
+
+    birth_dates: sequence of dates, datetimes or ISO strings, or a datetime64 array.
+    today: the date statuses are computed for (default: the local date, as get_vaccination_status does).
+    """
+    if isinstance(birth_dates, np.ndarray) and np.issubdtype(birth_dates.dtype, np.datetime64):
+        births = birth_dates.astype('datetime64[D]')
+    else:
+        births = np.array([_day(value) for value in birth_dates], dtype='datetime64[D]')
+    today = np.datetime64(_day(today or datetime.now().date()), 'D')
+    offsets = np.array(AGE_IN_DAYS, dtype='timedelta64[D]')
+
+    due_date = births[:, None] + offsets[None, :]
+    days_past_due = (today - due_date).astype(np.int32)
+
+    status = np.full(due_date.shape, UPCOMING, dtype=np.int8)
+    status[days_past_due >= -DUE_WINDOW_DAYS] = DUE
+    status[days_past_due > DUE_WINDOW_DAYS] = OVERDUE
+    if completed is not None:
+        masks = np.asarray(completed, dtype=np.uint64)
+        bits = np.arange(len(VACCINE_NAMES), dtype=np.uint64)
+        done = ((masks[:, None] >> bits[None, :]) & np.uint64(1)).astype(bool)
+        status[done] = COMPLETED
+    days_overdue = np.where(status == OVERDUE, days_past_due, 0).astype(np.int32)
+    return DueTable(today, due_date, status, days_overdue)
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../../context/AuthContext';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { useTranslation } from 'react-i18next';
@@ -12,6 +12,7 @@ import ChatBot from '../../components/ChatBot';
 import LanguageToggle from '../../components/LanguageToggle';
 import NotificationPanel from '../../components/NotificationPanel';
 import ToastNotification from '../../components/ToastNotification';
+import { openNotificationStream } from '../../services/notificationStream';
 
 
 interface PalliativeLayoutProps {
@@ -27,6 +28,9 @@ const PalliativeLayout: React.FC<PalliativeLayoutProps> = ({ children, title })
   const [sidebarOpen, setSidebarOpen] = useState(true);
   const [notificationOpen, setNotificationOpen] = useState(false);
   const [unreadCount, setUnreadCount] = useState(0);
+  const unreadCountRef = useRef(0);
+  // Latest count for the polling closure (the panel and the stream also change it)
+  useEffect(() => { unreadCountRef.current = unreadCount; }, [unreadCount]);
   const [showToast, setShowToast] = useState(false);
   const [latestNotification, setLatestNotification] = useState<{ title: string, message: string } | null>(null);
 
@@ -36,20 +40,23 @@ const PalliativeLayout: React.FC<PalliativeLayoutProps> = ({ children, title })
       try {
         const token = localStorage.getItem('token');
         const apiUrl = process.env.REACT_APP_API_URL || 'http://localhost:5000/api';
-        const response = await axios.get(`${apiUrl}/notifications`, {
-          headers: { Authorization: `Bearer ${token}` }
-        });
+        const headers = { Authorization: `Bearer ${token}` };
+        // Poll only the counter; fetch the list when it grows
+        const response = await axios.get(`${apiUrl}/notifications/unread-count`, { headers });
         const newCount = response.data.unreadCount || 0;
 
         // Show toast only if count increased (new notification arrived)
-        if (newCount > unreadCount && response.data.notifications?.length > 0) {
-          const latest = response.data.notifications[0];
-          setLatestNotification({
-            title: latest.title,
-            message: latest.message
-          });
-          setShowToast(true);
-          setTimeout(() => setShowToast(false), 5000); // Auto-dismiss after 5 seconds
+        if (newCount > unreadCountRef.current) {
+          const list = await axios.get(`${apiUrl}/notifications?unreadOnly=true`, { headers });
+          const latest = list.data.notifications?.[0];
+          if (latest) {
+            setLatestNotification({
+              title: latest.title,
+              message: latest.message
+            });
+            setShowToast(true);
+            setTimeout(() => setShowToast(false), 5000); // Auto-dismiss after 5 seconds
+          }
         }
 
         setUnreadCount(newCount);
@@ -59,9 +66,25 @@ const PalliativeLayout: React.FC<PalliativeLayoutProps> = ({ children, title })
     };
 
     fetchUnreadCount();
-    // Poll every 30 seconds for new notifications
-    const interval = setInterval(fetchUnreadCount, 30000);
-    return () => clearInterval(interval);
+
+    // New notifications are pushed over Server-Sent Events; poll every 30 seconds
+    // only if the server refuses the stream (busy or disabled)
+    let interval: ReturnType<typeof setInterval> | undefined;
+    const closeStream = openNotificationStream({
+      onNotification: (latest) => {
+        setLatestNotification({ title: latest.title, message: latest.message });
+        setShowToast(true);
+        setTimeout(() => setShowToast(false), 5000); // Auto-dismiss after 5 seconds
+        setUnreadCount(count => count + 1);
+      },
+      onUnavailable: () => {
+        if (!interval) interval = setInterval(fetchUnreadCount, 30000);
+      },
+    });
+    return () => {
+      closeStream();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   // Navigation items with translation keys
@@ -0,0 +1,70 @@
+import { api } from './api';
+
+const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000/api';
+// Pause before reopening a stream the server ended (it closes them every few minutes)
+const RECONNECT_DELAY_MS = 3000;
+
+export interface NotificationStreamHandlers {
+  onNotification: (notification: any) => void;
+  // Streaming is disabled, refused or unsupported: the caller falls back to polling
+  onUnavailable: () => void;
+}
+
+/**
+ * Subscribe to new notifications over Server-Sent Events; returns a function that closes the stream.
+ *
+ * EventSource cannot send the Authorization header, and the access token must not appear in a URL
+ * (proxy logs, browser history). Each connection is opened with a single-use token from
+ * POST /notifications/stream-token, so when a stream ends it is closed here (the browser's own retry
+ * would reuse the spent token) and reopened with a new token, resuming after the last event received.
+ */
+export function openNotificationStream({ onNotification, onUnavailable }: NotificationStreamHandlers): () => void {
+  let source: EventSource | undefined;
+  let reconnect: ReturnType<typeof setTimeout> | undefined;
+  let closed = false;
+  let lastEventId = '';
+
+  const connect = async () => {
+    let token: string;
+    try {
+      const response = await api.post('/notifications/stream-token');
+      token = response.data.token;
+    } catch (error) {
+      if (!closed) onUnavailable();
+      return;
+    }
+    if (closed) return;
+
+    const params = new URLSearchParams({ token });
+    if (lastEventId) params.set('lastEventId', lastEventId);
+    let opened = false;
+    source = new EventSource(`${API_BASE_URL}/notifications/stream?${params.toString()}`);
+    source.onopen = () => { opened = true; };
+    source.addEventListener('notification', (event) => {
+      const message = event as MessageEvent;
+      lastEventId = message.lastEventId || lastEventId;
+      onNotification(JSON.parse(message.data));
+    });
+    source.onerror = () => {
+      source?.close();
+      if (closed) return;
+      if (!opened) {
+        // Refused before it opened (busy worker or rejected token)
+        onUnavailable();
+        return;
+      }
+      reconnect = setTimeout(connect, RECONNECT_DELAY_MS);
+    };
+  };
+
+  if (!localStorage.getItem('token') || typeof EventSource === 'undefined') {
+    onUnavailable();
+  } else {
+    connect();
+  }
+  return () => {
+    closed = true;
+    source?.close();
+    if (reconnect) clearTimeout(reconnect);
+  };
+}